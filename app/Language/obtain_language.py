@@ -33,6 +33,64 @@ from loguru import logger
 # 获取语言数据
 Language = get_current_language_data()
 
+# 索引中不存在的键
+_MISSING = object()
+
+
+# ==================================================
+# 语言键索引
+# ==================================================
+class LanguageIndex:
+    """当前语言的扁平键索引
+
+    values 以 (第一层键, 第二层键, *后续键) 为键保存语言数据中每一层的值，
+    combo_items 以 (第一层键, 第二层键) 为键保存预先转换为列表的下拉框内容，
+    查询只需一次字典查找。返回的列表为共享对象，调用方不得修改。
+    """
+
+    def __init__(self, language_data: dict):
+        self.values: dict = {}
+        self.combo_items: dict = {}
+        for first_level_key, section in language_data.items():
+            if not isinstance(section, dict):
+                continue
+            for second_level_key, item in section.items():
+                path = (first_level_key, second_level_key)
+                self._index_value(path, item)
+                if isinstance(item, dict):
+                    self.combo_items[path] = _materialize_combo_items(
+                        item.get("combo_items")
+                    )
+
+    def _index_value(self, path: tuple, value) -> None:
+        self.values[path] = value
+        if isinstance(value, dict):
+            for key, child in value.items():
+                self._index_value(path + (key,), child)
+
+
+def _materialize_combo_items(combo_items):
+    """将字典格式的下拉框内容（如 {"0": "Item1", "1": "Item2"}）转换为列表"""
+    if isinstance(combo_items, dict):
+        # 按数字键排序并返回值列表
+        try:
+            sorted_keys = sorted(combo_items.keys(), key=lambda x: int(x))
+            return [combo_items[k] for k in sorted_keys]
+        except (ValueError, TypeError):
+            # 如果键不是数字，按原顺序返回值
+            return list(combo_items.values())
+    return combo_items
+
+
+_language_index = LanguageIndex(Language)
+
+
+def rebuild_language_index() -> None:
+    """按当前语言重新构建语言数据及索引（切换语言后调用）"""
+    global Language, _language_index
+    Language = get_current_language_data()
+    _language_index = LanguageIndex(Language)
+
 
 # ==================================================
 # 异步语言读取工作线程
@@ -223,16 +281,14 @@ def get_content_name(first_level_key: str, second_level_key: str):
     Returns:
         内容文本项的名称，如果不存在则返回该内容本身或None
     """
-    if first_level_key in Language:
-        if second_level_key in Language[first_level_key]:
-            # logger.debug(f"获取内容文本项: {first_level_key}.{second_level_key}")
-            content = Language[first_level_key][second_level_key]
-            # 如果是字典类型，尝试获取name属性
-            if isinstance(content, dict):
-                return content.get("name") or content
-            # 否则直接返回内容
-            return content
-    return None
+    content = _language_index.values.get((first_level_key, second_level_key), _MISSING)
+    if content is _MISSING:
+        return None
+    # 如果是字典类型，尝试获取name属性
+    if isinstance(content, dict):
+        return content.get("name") or content
+    # 否则直接返回内容
+    return content
 
 
 def get_content_description(first_level_key: str, second_level_key: str):
@@ -245,11 +301,10 @@ def get_content_description(first_level_key: str, second_level_key: str):
     Returns:
         内容文本项的描述，如果不存在则返回None
     """
-    if first_level_key in Language:
-        if second_level_key in Language[first_level_key]:
-            # logger.debug(f"获取内容文本项描述: {first_level_key}.{second_level_key}")
-            return Language[first_level_key][second_level_key]["description"]
-    return None
+    content = _language_index.values.get((first_level_key, second_level_key), _MISSING)
+    if content is _MISSING:
+        return None
+    return content["description"]
 
 
 def get_content_pushbutton_name(first_level_key: str, second_level_key: str):
@@ -262,11 +317,10 @@ def get_content_pushbutton_name(first_level_key: str, second_level_key: str):
     Returns:
         内容文本项的按钮名称，如果不存在则返回None
     """
-    if first_level_key in Language:
-        if second_level_key in Language[first_level_key]:
-            # logger.debug(f"获取内容文本项按钮名称: {first_level_key}.{second_level_key}")
-            return Language[first_level_key][second_level_key]["pushbutton_name"]
-    return None
+    content = _language_index.values.get((first_level_key, second_level_key), _MISSING)
+    if content is _MISSING:
+        return None
+    return content["pushbutton_name"]
 
 
 def get_content_switchbutton_name(
@@ -282,14 +336,9 @@ def get_content_switchbutton_name(
     Returns:
         内容文本项的开关按钮名称，如果不存在则返回None
     """
-    if first_level_key in Language:
-        if second_level_key in Language[first_level_key]:
-            # logger.debug(f"获取内容文本项开关按钮名称: {first_level_key}.{second_level_key}")
-            item = Language[first_level_key][second_level_key]
-            switchbutton = item.get("switchbutton_name")
-            if switchbutton is not None:
-                return switchbutton.get(is_enable)
-    return None
+    return _language_index.values.get(
+        (first_level_key, second_level_key, "switchbutton_name", is_enable)
+    )
 
 
 def get_content_combo_name(first_level_key: str, second_level_key: str):
@@ -300,23 +349,9 @@ def get_content_combo_name(first_level_key: str, second_level_key: str):
         second_level_key: 第二层的键
 
     Returns:
-        内容文本项的下拉框内容（列表格式），如果不存在则返回None
+        内容文本项的下拉框内容（列表格式，共享对象，调用方不得修改），如果不存在则返回None
     """
-    if first_level_key in Language:
-        if second_level_key in Language[first_level_key]:
-            # logger.debug(f"获取内容文本项下拉框内容: {first_level_key}.{second_level_key}")
-            combo_items = Language[first_level_key][second_level_key].get("combo_items")
-            # 如果是字典格式（如 {"0": "Item1", "1": "Item2"}），转换为列表
-            if isinstance(combo_items, dict):
-                # 按数字键排序并返回值列表
-                try:
-                    sorted_keys = sorted(combo_items.keys(), key=lambda x: int(x))
-                    return [combo_items[k] for k in sorted_keys]
-                except (ValueError, TypeError):
-                    # 如果键不是数字，按原顺序返回值
-                    return list(combo_items.values())
-            return combo_items
-    return None
+    return _language_index.combo_items.get((first_level_key, second_level_key))
 
 
 def get_any_position_value(first_level_key: str, second_level_key: str, *keys):
@@ -330,18 +365,7 @@ def get_any_position_value(first_level_key: str, second_level_key: str, *keys):
     Returns:
         指定位置的值，如果不存在则返回None
     """
-    if first_level_key in Language:
-        current = Language[first_level_key]
-        if second_level_key in current:
-            current = current[second_level_key]
-            for key in keys:
-                if isinstance(current, dict) and key in current:
-                    # logger.debug(f"获取内容文本项: {first_level_key}.{second_level_key}.{key}")
-                    current = current[key]
-                else:
-                    return None
-            return current
-    return None
+    return _language_index.values.get((first_level_key, second_level_key, *keys))
 
 
 # ==================================================
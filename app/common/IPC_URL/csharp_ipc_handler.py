@@ -1,13 +1,93 @@
 import sys
+import time
 import asyncio
 import threading
-from typing import Optional
+from typing import NamedTuple, Optional
 from loguru import logger
 
 from app.tools.path_utils import get_data_path
 
 CSHARP_AVAILABLE = False
 
+# 课程状态快照的兜底轮询间隔（秒），正常情况下由 ClassIsland 推送的事件触发刷新
+LESSON_STATE_POLL_INTERVAL = 5.0
+
+# 两次刷新课程状态快照的最短间隔（秒），短时间内的多个推送事件合并为一次刷新
+LESSON_STATE_MIN_REFRESH_INTERVAL = 0.5
+
+# 检查 IPC 连接是否存活的间隔（秒），也是客户端循环等待推送事件的最长时间
+IPC_ALIVE_CHECK_INTERVAL = 1.0
+
+# ClassIsland 推送后需要刷新课程状态的事件
+LESSON_STATE_NOTIFY_IDS = (
+    "OnClassNotifyId",
+    "OnBreakingTimeNotifyId",
+    "OnAfterSchoolNotifyId",
+    "CurrentTimeStateChangedNotifyId",
+)
+
+
+class LessonStateSnapshot(NamedTuple):
+    """ClassIsland 课程状态快照"""
+
+    current_subject: str  # 当前课程名称，没有课程时为 ""
+    next_subject: str  # 下一节课名称，没有下一节课时为 ""
+    is_breaking: bool  # 是否处于下课时间
+    on_class_left_time: int  # 刷新时距离上课的剩余时间（秒）
+    updated_at: float  # 刷新时刻（time.monotonic()）
+
+    def seconds_to_class(self, now: Optional[float] = None) -> int:
+        """按刷新后经过的时间推算当前距离上课的剩余秒数"""
+        if self.on_class_left_time <= 0:
+            return 0
+        if now is None:
+            now = time.monotonic()
+        return max(0, self.on_class_left_time - int(now - self.updated_at))
+
+    def same_state(self, other: Optional["LessonStateSnapshot"]) -> bool:
+        """课程及上下课状态是否相同（不比较剩余时间）"""
+        return other is not None and self[:3] == other[:3]
+
+
+EMPTY_LESSON_STATE = LessonStateSnapshot("", "", False, 0, 0.0)
+
+
+def _subject_name(subject) -> str:
+    """获取课程名称，"???" 表示没有课程"""
+    name = subject.Name if subject else ""
+    if not name or name.strip() == "???":
+        return ""
+    return name
+
+
+def _lesson_state_refresh_delay(
+    requested: bool, since_refresh: float
+) -> Optional[float]:
+    """计算距离下一次刷新课程状态快照还需等待的时间
+
+    推送事件触发的刷新限制频率，无推送时按兜底间隔轮询。
+
+    Args:
+        requested: 是否有待处理的推送事件
+        since_refresh: 距离上一次刷新经过的时间（秒）
+
+    Returns:
+        Optional[float]: 需要等待的秒数，0 表示立即刷新，None 表示无需刷新
+    """
+    if since_refresh >= LESSON_STATE_POLL_INTERVAL:
+        return 0.0
+    if requested:
+        return max(0.0, LESSON_STATE_MIN_REFRESH_INTERVAL - since_refresh)
+    return None
+
+
+def _notify_class_state_changed():
+    """通知上课状态服务课程状态已变化"""
+    from app.common.extraction.class_state import notify_class_state_changed
+
+    notify_class_state_changed()
+
+
 try:
     # 添加 dlls path
     sys.path.append(str(get_data_path("dlls")))
@@ -69,6 +149,9 @@ if CSHARP_AVAILABLE:
             self.is_connected = False
             self._disconnect_logged = False  # 跟踪是否已记录断连日志
             self._last_on_class_left_log_time = 0  # 上次记录距离上课时间的时间
+            self._lessons_service = None  # 长期复用的课程服务代理
+            self._lesson_state = EMPTY_LESSON_STATE
+            self._lesson_state_requested: Optional[asyncio.Event] = None
 
         def start_ipc_client(self) -> bool:
             """
@@ -145,21 +228,15 @@ if CSHARP_AVAILABLE:
 
             return True
 
+        def get_lesson_state(self) -> LessonStateSnapshot:
+            """获取课程状态快照（不进行 IPC 调用，可在任意线程调用）"""
+            if not self.is_running or not self.is_connected:
+                return EMPTY_LESSON_STATE
+            return self._lesson_state
+
         def is_breaking(self) -> bool:
             """是否处于下课时间"""
-            lessonSc = GeneratedIpcFactory.CreateIpcProxy[IPublicLessonsService](
-                self.ipc_client.Provider, self.ipc_client.PeerProxy
-            )
-            state = lessonSc.CurrentState in [
-                getattr(TimeState, "None"),
-                TimeState.PrepareOnClass,
-                TimeState.Breaking,
-                TimeState.AfterSchool,
-            ]
-            logger.debug(
-                f"获取到的 ClassIsland 时间状态: {lessonSc.CurrentState} 是否下课: {state}"
-            )
-            return state
+            return self.get_lesson_state().is_breaking
 
         def get_on_class_left_time(self) -> int:
             """获取距离上课剩余时间（秒）
@@ -167,36 +244,26 @@ if CSHARP_AVAILABLE:
             Returns:
                 int: 距离上课的剩余时间（秒），如果当前正在上课或没有下一节课程则返回0
             """
-            try:
-                import time
+            total_seconds = self.get_lesson_state().seconds_to_class()
 
-                lessonSc = GeneratedIpcFactory.CreateIpcProxy[IPublicLessonsService](
-                    self.ipc_client.Provider, self.ipc_client.PeerProxy
-                )
-                on_class_left_time = lessonSc.OnClassLeftTime
-                total_seconds = int(on_class_left_time.TotalSeconds)
-
-                # 根据距离上课的时间调整日志记录频率
-                # 距离上课3秒前：每30秒记录一次
-                # 距离上课3秒内：每秒记录一次
-                current_time = time.time()
-                should_log = False
-
-                if total_seconds > 0 and total_seconds <= 3:
-                    # 3秒内，每秒记录一次
-                    should_log = True
-                elif current_time - self._last_on_class_left_log_time >= 30:
-                    # 3秒前，每30秒记录一次
-                    should_log = True
-                    self._last_on_class_left_log_time = current_time
-
-                if should_log and total_seconds != 0:
-                    logger.debug(f"获取到的距离上课剩余时间: {total_seconds} 秒")
-
-                return total_seconds
-            except Exception as e:
-                logger.exception(f"获取距离上课时间失败: {e}")
-                return 0
+            # 根据距离上课的时间调整日志记录频率
+            # 距离上课3秒前：每30秒记录一次
+            # 距离上课3秒内：每秒记录一次
+            current_time = time.time()
+            should_log = False
+
+            if total_seconds > 0 and total_seconds <= 3:
+                # 3秒内，每秒记录一次
+                should_log = True
+            elif current_time - self._last_on_class_left_log_time >= 30:
+                # 3秒前，每30秒记录一次
+                should_log = True
+                self._last_on_class_left_log_time = current_time
+
+            if should_log and total_seconds != 0:
+                logger.debug(f"获取到的距离上课剩余时间: {total_seconds} 秒")
+
+            return total_seconds
 
         def get_current_class_info(self) -> dict:
             """获取当前课程信息
@@ -205,33 +272,11 @@ if CSHARP_AVAILABLE:
                 dict: 课程信息字典，包含 name, start_time, end_time, teacher, location
                       如果当前没有课程或获取失败，返回空字典
             """
-            try:
-                if not self.is_running or not self.is_connected:
-                    return {}
-
-                lessonSc = GeneratedIpcFactory.CreateIpcProxy[IPublicLessonsService](
-                    self.ipc_client.Provider, self.ipc_client.PeerProxy
-                )
-
-                # 检查是否有当前课程
-                if not lessonSc.CurrentSubject:
-                    logger.debug("ClassIsland 当前没有课程")
-                    return {}
-
-                # 获取课程名称
-                class_name = (
-                    lessonSc.CurrentSubject.Name if lessonSc.CurrentSubject else ""
-                )
-                # 如果获取到的是 class_name 为空 或者是 "???"，说明当前没有课程
-                if not class_name or class_name.strip() == "???":
-                    logger.debug("ClassIsland 当前没有课程")
-                    return {}
-                logger.info(f"从 ClassIsland 获取当前课程: {class_name}")
-                return {"name": class_name}
-
-            except Exception as e:
-                logger.exception(f"从 ClassIsland 获取课程信息失败: {e}")
+            class_name = self.get_lesson_state().current_subject
+            if not class_name:
+                logger.debug("ClassIsland 当前没有课程")
                 return {}
+            return {"name": class_name}
 
         def get_next_class_info(self) -> dict:
             """获取下一节课的课程信息
@@ -240,33 +285,63 @@ if CSHARP_AVAILABLE:
                 dict: 课程信息字典，包含 name, start_time, end_time, teacher, location
                       如果没有下一节课或获取失败，返回空字典
             """
+            class_name = self.get_lesson_state().next_subject
+            if not class_name:
+                logger.debug("ClassIsland 没有下一节课")
+                return {}
+            return {"name": class_name}
+
+        def request_lesson_state_refresh(self):
+            """请求刷新课程状态快照（可在任意线程调用，由客户端线程执行）"""
+            loop = self.loop
+            event = self._lesson_state_requested
+            if loop is None or event is None:
+                return
             try:
-                if not self.is_running or not self.is_connected:
-                    return {}
-
-                lessonSc = GeneratedIpcFactory.CreateIpcProxy[IPublicLessonsService](
-                    self.ipc_client.Provider, self.ipc_client.PeerProxy
-                )
-
-                # 检查是否有下一节课
-                if not lessonSc.NextClassSubject:
-                    logger.debug("ClassIsland 没有下一节课")
-                    return {}
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                # 事件循环已关闭
+                pass
 
-                # 获取课程名称
-                class_name = (
-                    lessonSc.NextClassSubject.Name if lessonSc.NextClassSubject else ""
+        def _refresh_lesson_state(self):
+            """通过课程服务代理刷新课程状态快照（客户端线程）"""
+            try:
+                if self._lessons_service is None:
+                    self._lessons_service = GeneratedIpcFactory.CreateIpcProxy[
+                        IPublicLessonsService
+                    ](self.ipc_client.Provider, self.ipc_client.PeerProxy)
+                lesson_state = self._read_lesson_state(self._lessons_service)
+            except Exception as e:
+                logger.exception(f"从 ClassIsland 获取课程状态失败: {e}")
+                self._lessons_service = None
+                return
+
+            previous = self._lesson_state
+            self._lesson_state = lesson_state
+            if not lesson_state.same_state(previous):
+                logger.debug(
+                    f"ClassIsland 课程状态: 当前课程={lesson_state.current_subject}, "
+                    f"下一节课={lesson_state.next_subject}, "
+                    f"是否下课={lesson_state.is_breaking}"
                 )
-                if not class_name or class_name.strip() == "???":
-                    logger.debug("ClassIsland 下一节课名称无效")
-                    return {}
+                _notify_class_state_changed()
 
-                logger.info(f"从 ClassIsland 获取下一节课: {class_name}")
-                return {"name": class_name}
-
-            except Exception as e:
-                logger.exception(f"从 ClassIsland 获取下一节课信息失败: {e}")
-                return {}
+        @staticmethod
+        def _read_lesson_state(lessons_service) -> LessonStateSnapshot:
+            """从课程服务读取课程状态"""
+            is_breaking = lessons_service.CurrentState in [
+                getattr(TimeState, "None"),
+                TimeState.PrepareOnClass,
+                TimeState.Breaking,
+                TimeState.AfterSchool,
+            ]
+            return LessonStateSnapshot(
+                _subject_name(lessons_service.CurrentSubject),
+                _subject_name(lessons_service.NextClassSubject),
+                is_breaking,
+                int(lessons_service.OnClassLeftTime.TotalSeconds),
+                time.monotonic(),
+            )
 
         @staticmethod
         def convert_to_call_result(
@@ -284,14 +359,6 @@ if CSHARP_AVAILABLE:
                 result.SelectedStudents.Add(cs_student)
             return result
 
-        def _on_class_test(self):
-            lessonSc = GeneratedIpcFactory.CreateIpcProxy[IPublicLessonsService](
-                self.ipc_client.Provider, self.ipc_client.PeerProxy
-            )
-            logger.debug(
-                f"上课 {lessonSc.CurrentSubject.Name} 时间: {lessonSc.CurrentTimeLayoutItem}"
-            )
-
         def _run_client(self):
             """运行 C# IPC 客户端"""
 
@@ -299,32 +366,67 @@ if CSHARP_AVAILABLE:
                 """异步客户端"""
 
                 self.ipc_client = IpcClient()
-                self.ipc_client.JsonIpcProvider.AddNotifyHandler(
-                    IpcRoutedNotifyIds.OnClassNotifyId,
-                    Action(lambda: self._on_class_test()),
-                )
+                self._lesson_state_requested = asyncio.Event()
+                for notify_id_name in LESSON_STATE_NOTIFY_IDS:
+                    notify_id = getattr(IpcRoutedNotifyIds, notify_id_name, None)
+                    if notify_id is None:
+                        continue
+                    self.ipc_client.JsonIpcProvider.AddNotifyHandler(
+                        notify_id, Action(self.request_lesson_state_refresh)
+                    )
 
                 task = self.ipc_client.Connect()
                 await self.loop.run_in_executor(None, lambda: task.Wait())
                 self.is_connected = True
+                self._refresh_lesson_state()
+                last_refresh_time = time.monotonic()
+                last_alive_check_time = last_refresh_time
 
                 while self.is_running:
-                    await asyncio.sleep(1)
-
-                    if not self._check_alive():
-                        if not self._disconnect_logged:
-                            logger.debug("C# IPC 断连！重连...")
-                            self._disconnect_logged = True
-                        self.is_connected = False
-
-                        task = self.ipc_client.Connect()
-                        await self.loop.run_in_executor(
-                            None, lambda task=task: task.Wait()
+                    # 等待推送事件，最长等待一个连接检查间隔
+                    try:
+                        await asyncio.wait_for(
+                            self._lesson_state_requested.wait(),
+                            timeout=IPC_ALIVE_CHECK_INTERVAL,
                         )
-                        self.is_connected = True
-                        self._disconnect_logged = False
+                    except asyncio.TimeoutError:
+                        pass
+
+                    now = time.monotonic()
+                    if now - last_alive_check_time >= IPC_ALIVE_CHECK_INTERVAL:
+                        last_alive_check_time = now
+                        if not self._check_alive():
+                            if not self._disconnect_logged:
+                                logger.debug("C# IPC 断连！重连...")
+                                self._disconnect_logged = True
+                            self.is_connected = False
+                            _notify_class_state_changed()
+
+                            task = self.ipc_client.Connect()
+                            await self.loop.run_in_executor(
+                                None, lambda task=task: task.Wait()
+                            )
+                            # 重连后重新创建课程服务代理
+                            self._lessons_service = None
+                            self.is_connected = True
+                            self._disconnect_logged = False
+                            self._lesson_state_requested.set()
+
+                    # 推送事件触发的刷新限制频率，无推送时按兜底间隔轮询
+                    delay = _lesson_state_refresh_delay(
+                        self._lesson_state_requested.is_set(),
+                        time.monotonic() - last_refresh_time,
+                    )
+                    if delay == 0:
+                        self._lesson_state_requested.clear()
+                        self._refresh_lesson_state()
+                        last_refresh_time = time.monotonic()
+                    elif delay is not None:
+                        await asyncio.sleep(delay)
 
                 self.ipc_client = None
+                self._lessons_service = None
+                self._lesson_state_requested = None
                 self.is_connected = False
 
             # 启动新的 asyncio 事件循环
@@ -438,7 +540,12 @@ else:
         ) -> object:
             return object
 
-        def _on_class_test(self):
+        def get_lesson_state(self) -> LessonStateSnapshot:
+            """获取课程状态快照（不进行 IPC 调用，可在任意线程调用）"""
+            return EMPTY_LESSON_STATE
+
+        def request_lesson_state_refresh(self):
+            """请求刷新课程状态快照（可在任意线程调用，由客户端线程执行）"""
             pass
 
         def _run_client(self):
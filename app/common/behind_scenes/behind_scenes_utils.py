@@ -84,7 +84,12 @@ class BehindScenesUtils:
 
     @staticmethod
     def apply_probability_weights(
-        students_dict_list, mode, class_name, pool_name=None, prize_list=None
+        students_dict_list,
+        mode,
+        class_name,
+        pool_name=None,
+        prize_list=None,
+        draw_config=None,
     ):
         """应用内幕设置到学生列表
 
@@ -94,12 +99,16 @@ class BehindScenesUtils:
             class_name: 班级名称（用于日志）
             pool_name: 奖池名称（仅在抽奖模式下使用）
             prize_list: 奖品列表（用于提高指定该奖品的学生的权重）
+            draw_config: 抽取设置快照（可选，提供时使用其中的内幕设置）
 
         Returns:
             tuple: (过滤后的学生列表, 权重列表)
         """
         try:
-            settings = BehindScenesUtils.get_behind_scenes_settings()
+            if draw_config is not None:
+                settings = draw_config.behind_scenes_settings
+            else:
+                settings = BehindScenesUtils.get_behind_scenes_settings()
 
             # 构建抽中奖品集合（用于快速查找）
             drawn_prizes = set(prize_list) if prize_list else set()
@@ -0,0 +1,134 @@
+# ==================================================
+# 导入模块
+# ==================================================
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple, Union
+
+
+# ==================================================
+# 文件签名缓存
+# ==================================================
+class FileCache:
+    """有容量上限的 LRU 缓存，条目以其来源文件的签名（mtime + size）校验有效性
+
+    每次读取都会重新获取来源文件签名，文件被修改、删除或新建后条目自动失效；
+    超出容量时淘汰最久未使用的条目。
+    """
+
+    def __init__(self, name: str, max_entries: int):
+        self.name = name
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[tuple, Any]]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._hits = 0
+        self._misses = 0
+        _file_caches[name] = self
+
+    def get(
+        self,
+        key: Hashable,
+        paths: Iterable[Union[str, Path]],
+        loader: Callable[[], Any],
+    ) -> Any:
+        """获取缓存值，未命中或来源文件已变化时调用 loader 重新加载
+
+        loader 抛出的异常会直接传递给调用方，失败的结果不会被缓存。
+
+        Args:
+            key: 缓存键
+            paths: 缓存值依赖的文件路径
+            loader: 加载函数
+
+        Returns:
+            Any: 缓存值（共享对象，调用方不得修改）
+        """
+        signature = tuple(get_file_signature(path) for path in paths)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == signature:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry[1]
+            self._misses += 1
+
+        value = loader()
+
+        with self._lock:
+            self._entries[key] = (signature, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def invalidate(
+        self,
+        key: Optional[Hashable] = None,
+        predicate: Optional[Callable[[Hashable], bool]] = None,
+    ):
+        """使缓存条目失效
+
+        Args:
+            key: 指定的缓存键
+            predicate: 按缓存键筛选要失效的条目
+            两者都为 None 时清空全部条目
+        """
+        with self._lock:
+            if key is not None:
+                self._entries.pop(key, None)
+            elif predicate is not None:
+                for entry_key in [k for k in self._entries if predicate(k)]:
+                    del self._entries[entry_key]
+            else:
+                self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取缓存大小及命中统计"""
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self._max_entries,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / total if total else 0.0,
+            }
+
+    def reset_stats(self):
+        """重置缓存命中统计"""
+        with self._lock:
+            self._hits = 0
+            self._misses = 0
+
+
+_file_caches: Dict[str, FileCache] = {}
+
+
+# ==================================================
+# 文件签名缓存函数
+# ==================================================
+def get_file_signature(path: Union[str, Path]) -> Optional[Tuple[int, int]]:
+    """获取文件签名 (mtime_ns, size)，文件不存在时返回 None
+
+    Args:
+        path: 文件路径
+
+    Returns:
+        Optional[Tuple[int, int]]: 文件签名
+    """
+    try:
+        stat = os.stat(path)
+        return (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        return None
+
+
+def get_file_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """获取所有文件签名缓存的大小及命中统计
+
+    Returns:
+        Dict[str, Dict[str, Any]]: 缓存名称 -> 统计信息
+    """
+    return {name: cache.get_stats() for name, cache in _file_caches.items()}
@@ -6,6 +6,7 @@ from typing import List, Dict, Any, Tuple
 from loguru import logger
 
 from app.tools.path_utils import *
+from app.common.data.roster import Roster, get_roster
 
 
 # ==================================================
@@ -52,7 +53,7 @@ def get_student_list(class_name: str) -> List[Dict[str, Any]]:
     """获取指定班级的学生列表
 
     从 data/list/roll_call_list 文件夹中读取指定班级的名单文件，
-    并返回学生列表
+    并返回学生列表（名单按文件变化缓存，见 get_roster）
 
     Args:
         class_name: 班级名称
@@ -61,37 +62,7 @@ def get_student_list(class_name: str) -> List[Dict[str, Any]]:
         List[Dict[str, Any]]: 学生列表，每个学生是一个字典，包含姓名、ID、性别、小组等信息
     """
     try:
-        # 获取班级名单文件路径
-        roll_call_list_dir = get_data_path("list", "roll_call_list")
-        class_file_path = roll_call_list_dir / f"{class_name}.json"
-
-        # 如果文件不存在，返回空列表
-        if not class_file_path.exists():
-            logger.warning(f"班级名单文件不存在: {class_file_path}")
-            return []
-
-        # 读取JSON文件
-        with open(class_file_path, "r", encoding="utf-8") as f:
-            student_data = json.load(f)
-
-        # 将字典数据转换为列表形式
-        student_list = []
-        for name, info in student_data.items():
-            student = {
-                "name": name,
-                "id": info.get("id", 0),
-                "gender": info.get("gender", "未知"),
-                "group": info.get("group", "未分组"),
-                "exist": info.get("exist", True),
-            }
-            student_list.append(student)
-
-        # 按ID排序
-        student_list.sort(key=lambda x: x["id"])
-
-        # logger.debug(f"班级 {class_name} 共有 {len(student_list)} 名学生")
-        return student_list
-
+        return get_roster(class_name).student_list()
     except Exception as e:
         logger.exception(f"获取学生列表失败: {e}")
         return []
@@ -109,15 +80,7 @@ def get_group_list(class_name: str) -> List[Dict[str, Any]]:
     Returns:
         List[Dict[str, Any]]: 小组列表，每个小组是一个字典，包含小组名称、学生列表等信息
     """
-    student_list = get_student_list(class_name)
-    group_set = set()  # 使用集合确保不重复
-    for student in student_list:
-        group_name = student["group"]
-        group_set.add(group_name)
-
-    # 转换为列表并排序
-    group_list = sorted(list(group_set))
-    return group_list
+    return list(get_roster(class_name).group_names)
 
 
 def get_gender_list(class_name: str) -> List[str]:
@@ -132,15 +95,7 @@ def get_gender_list(class_name: str) -> List[str]:
     Returns:
         List[str]: 性别列表，包含所有学生的性别
     """
-    student_list = get_student_list(class_name)
-    gender_set = set()  # 使用集合确保不重复
-    for student in student_list:
-        gender = student["gender"]
-        gender_set.add(gender)
-
-    # 转换为列表并排序
-    gender_list = sorted(list(gender_set))
-    return gender_list
+    return list(get_roster(class_name).gender_names)
 
 
 def get_group_members(class_name: str, group_name: str) -> List[Dict[str, Any]]:
@@ -156,16 +111,7 @@ def get_group_members(class_name: str, group_name: str) -> List[Dict[str, Any]]:
     Returns:
         List[Dict[str, Any]]: 小组成员列表，每个成员是一个字典，包含姓名、ID、性别、小组等信息
     """
-    student_list = get_student_list(class_name)
-    group_members = []
-
-    for student in student_list:
-        if student["group"] == group_name:
-            group_members.append(student)
-
-    # 按ID排序
-    group_members.sort(key=lambda x: x["id"])
-    return group_members
+    return get_roster(class_name).group_members(group_name)
 
 
 # ==================================================
@@ -328,71 +274,10 @@ def filter_students_data(
     Returns:
         List[Tuple]: 包含(id, name, gender, group, exist)的元组列表
     """
-    students_data = []
-
     try:
-        # 处理全班学生抽取 (group_index = 0)
-        if group_index == 0:
-            if gender_index == 0:  # 抽取所有性别
-                for student_name, student_info in data.items():
-                    if isinstance(student_info, dict) and "id" in student_info:
-                        id = student_info.get("id", "")
-                        name = student_name
-                        gender = student_info.get("gender", "")
-                        group = student_info.get("group", "")
-                        exist = student_info.get("exist", True)
-                        students_data.append((id, name, gender, group, exist))
-            else:  # 抽取特定性别
-                for student_name, student_info in data.items():
-                    if isinstance(student_info, dict) and "id" in student_info:
-                        id = student_info.get("id", "")
-                        name = student_name
-                        gender = student_info.get("gender", "")
-                        group = student_info.get("group", "")
-                        exist = student_info.get("exist", True)
-                        if gender == gender_filter:
-                            students_data.append((id, name, gender, group, exist))
-
-        # 处理小组组号抽取 (group_index = 1)
-        elif group_index == 1:
-            groups_set = set()
-            for student_name, student_info in data.items():
-                if isinstance(student_info, dict) and "id" in student_info:
-                    group = student_info.get("group", "")
-                    gender = student_info.get("gender", "")
-                    exist = student_info.get("exist", True)
-                    if group:  # 只添加非空小组
-                        if (
-                            gender_index == 0 or gender == gender_filter
-                        ):  # 根据性别条件过滤
-                            groups_set.add(group)
-
-            # 对小组进行排序，按小组名称排序
-            # 返回格式为 (id, name, gender, group, exist)，但小组模式下只需要小组名称
-            students_data = []
-            for group_name in sorted(groups_set):
-                # 在小组模式下，我们只需要小组名称，其他字段可以留空或使用默认值
-                students_data.append((None, group_name, None, group_name, True))
-
-        # 处理指定小组抽取 (group_index >= 2)
-        elif group_index >= 2:
-            for student_name, student_info in data.items():
-                if isinstance(student_info, dict) and "id" in student_info:
-                    id = student_info.get("id", "")
-                    name = student_name
-                    gender = student_info.get("gender", "")
-                    group = student_info.get("group", "")
-                    exist = student_info.get("exist", True)
-                    if group == group_filter:  # 匹配指定小组
-                        if (
-                            gender_index == 0 or gender == gender_filter
-                        ):  # 根据性别条件过滤
-                            students_data.append((id, name, gender, group, exist))
-
-        # 过滤学生信息的exist为False的学生
-        students_data = list(filter(lambda x: x[4], students_data))
-
-        return students_data
+        return Roster(data).filter_students(
+            group_index, group_filter, gender_index, gender_filter
+        )
 
     except Exception as e:
         logger.exception(f"过滤学生数据失败: {e}")
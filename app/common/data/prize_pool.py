@@ -0,0 +1,278 @@
+# ==================================================
+# 导入模块
+# ==================================================
+import json
+import threading
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from loguru import logger
+
+from app.common.data.file_cache import FileCache, get_file_signature
+from app.tools.path_utils import get_data_path
+
+# 最多缓存的奖池数量
+PRIZE_POOL_CACHE_MAX_ENTRIES = 8
+
+
+# ==================================================
+# 奖池模型
+# ==================================================
+class PrizePool:
+    """解析后的奖池名单，奖品按 ID 排序后保存在紧凑数组中
+
+    names / ids / base_weights / exist 为按下标对齐的数组，
+    index 为奖品名称到下标的映射。
+    """
+
+    def __init__(self, pool_data: Optional[Dict[str, Any]] = None):
+        items = []
+        for name, info in (pool_data or {}).items():
+            if isinstance(info, dict):
+                items.append((name, info))
+
+        # 与 get_pool_list 一致：按 ID 排序，ID 无法比较时视为读取失败
+        try:
+            items.sort(key=lambda item: item[1].get("id", 0))
+        except Exception as e:
+            logger.exception(f"获取奖池列表失败: {e}")
+            items = []
+
+        self.names: List[str] = []
+        self.ids: List[Any] = []
+        self.base_weights = array("d")
+        self.exist = bytearray()
+        self.index: Dict[str, int] = {}
+        for name, info in items:
+            self.index[name] = len(self.names)
+            self.names.append(name)
+            self.ids.append(info.get("id", 0))
+            self.base_weights.append(_parse_weight(info.get("weight", 1)))
+            self.exist.append(1 if info.get("exist", True) else 0)
+        self.existing_count = sum(self.exist)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def item(self, index: int) -> Dict[str, Any]:
+        """获取奖品字典（与 get_pool_list 的元素格式一致，每次返回新字典）"""
+        return {
+            "name": self.names[index],
+            "id": self.ids[index],
+            "weight": self.base_weights[index],
+            "exist": bool(self.exist[index]),
+        }
+
+
+def _parse_weight(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 1.0
+
+
+# ==================================================
+# 奖品已抽取次数计数器
+# ==================================================
+class PrizeDrawnCounter:
+    """与奖池下标对齐的已抽取次数，以及按阈值缓存的剩余数量
+
+    剩余数量指存在且已抽取次数小于阈值的奖品数量；阈值不变时，
+    record 增量维护剩余数量，查询为 O(1)。
+    """
+
+    def __init__(
+        self,
+        pool: PrizePool,
+        drawn_counts: Dict[str, int],
+        signature: Optional[tuple],
+    ):
+        self.pool = pool
+        self.signature = signature
+        self.counts = array("l", [0] * len(pool))
+        for name, count in drawn_counts.items():
+            index = pool.index.get(name)
+            if index is not None:
+                try:
+                    self.counts[index] = int(count)
+                except (TypeError, ValueError, OverflowError):
+                    continue
+        self._threshold: Optional[int] = None
+        self._remaining = 0
+
+    def remaining_count(self, threshold: int) -> int:
+        """获取存在且已抽取次数小于阈值的奖品数量"""
+        if threshold != self._threshold:
+            exist = self.pool.exist
+            self._remaining = sum(
+                1
+                for index, count in enumerate(self.counts)
+                if exist[index] and count < threshold
+            )
+            self._threshold = threshold
+        return self._remaining
+
+    def available_indices(self, threshold: int) -> List[int]:
+        """获取已抽取次数小于阈值的奖品下标（不区分是否存在，与抽取逻辑一致）"""
+        return [index for index, count in enumerate(self.counts) if count < threshold]
+
+    def record(self, names: Iterable[str]):
+        """累加奖品的已抽取次数，并增量更新剩余数量"""
+        threshold = self._threshold
+        for name in names:
+            index = self.pool.index.get(name)
+            if index is None:
+                continue
+            count = self.counts[index]
+            self.counts[index] = count + 1
+            if (
+                threshold is not None
+                and self.pool.exist[index]
+                and count < threshold <= count + 1
+            ):
+                self._remaining -= 1
+
+
+_prize_pool_cache = FileCache("prize_pool", PRIZE_POOL_CACHE_MAX_ENTRIES)
+_drawn_counters: "OrderedDict[str, PrizeDrawnCounter]" = OrderedDict()
+_drawn_counters_lock = threading.RLock()
+
+
+# ==================================================
+# 奖池获取函数
+# ==================================================
+def get_prize_pool_file_path(pool_name: str) -> Path:
+    """获取奖池名单文件路径
+
+    Args:
+        pool_name: 奖池名称
+
+    Returns:
+        Path: 名单文件路径
+    """
+    return get_data_path("list", "lottery_list") / f"{pool_name}.json"
+
+
+def get_prize_drawn_record_path(pool_name: str) -> Path:
+    """获取奖池已抽取记录文件路径（与 record_drawn_prize 保持一致）
+
+    Args:
+        pool_name: 奖池名称
+
+    Returns:
+        Path: 已抽取记录文件路径
+    """
+    return get_data_path("TEMP", f"draw_until_prize_{pool_name}.json")
+
+
+def get_prize_pool(pool_name: str) -> PrizePool:
+    """获取指定奖池的模型（按名单文件变化缓存，共享对象，调用方不得修改）
+
+    Args:
+        pool_name: 奖池名称
+
+    Returns:
+        PrizePool: 奖池模型，名单文件不存在或读取失败时为空奖池
+    """
+    file_path = get_prize_pool_file_path(pool_name)
+
+    def load_pool() -> PrizePool:
+        if not file_path.exists():
+            logger.warning(f"奖池名单文件不存在: {file_path}")
+            return PrizePool()
+        with open(file_path, "r", encoding="utf-8") as f:
+            return PrizePool(json.load(f))
+
+    try:
+        return _prize_pool_cache.get(pool_name, [file_path], load_pool)
+    except Exception as e:
+        # 解析失败时不缓存，下次重新读取
+        logger.exception(f"读取奖池名单失败: {e}")
+        return PrizePool()
+
+
+def get_prize_drawn_counter(pool_name: str) -> PrizeDrawnCounter:
+    """获取指定奖池的已抽取次数计数器
+
+    奖池名单或已抽取记录文件被其他途径修改时重新读取；
+    通过 record_drawn_prize 写入的记录直接在内存中累加。
+
+    Args:
+        pool_name: 奖池名称
+
+    Returns:
+        PrizeDrawnCounter: 已抽取次数计数器
+    """
+    from app.tools.config import read_drawn_record_simple
+
+    pool = get_prize_pool(pool_name)
+    signature = get_file_signature(get_prize_drawn_record_path(pool_name))
+    with _drawn_counters_lock:
+        counter = _drawn_counters.get(pool_name)
+        if (
+            counter is not None
+            and counter.pool is pool
+            and counter.signature == signature
+        ):
+            _drawn_counters.move_to_end(pool_name)
+            return counter
+
+        drawn_counts = {}
+        for name, count in read_drawn_record_simple(pool_name):
+            drawn_counts[name] = count
+        counter = PrizeDrawnCounter(pool, drawn_counts, signature)
+        _drawn_counters[pool_name] = counter
+        _drawn_counters.move_to_end(pool_name)
+        while len(_drawn_counters) > PRIZE_POOL_CACHE_MAX_ENTRIES:
+            _drawn_counters.popitem(last=False)
+        return counter
+
+
+def record_prize_drawn(
+    pool_name: str, prize_names: Iterable[str], previous_signature: Optional[tuple]
+) -> None:
+    """在已抽取记录文件写入后同步内存计数器
+
+    只有计数器与写入前的记录文件一致时才增量更新，否则丢弃计数器，下次查询时重新读取。
+
+    Args:
+        pool_name: 奖池名称
+        prize_names: 本次抽中的奖品名称
+        previous_signature: 写入前记录文件的签名
+    """
+    signature = get_file_signature(get_prize_drawn_record_path(pool_name))
+    with _drawn_counters_lock:
+        counter = _drawn_counters.get(pool_name)
+        if counter is None:
+            return
+        if counter.signature != previous_signature or signature == previous_signature:
+            # 计数器已过期或记录未能写入
+            del _drawn_counters[pool_name]
+            return
+        counter.record(prize_names)
+        counter.signature = signature
+
+
+def invalidate_prize_pool(pool_name: Optional[str] = None) -> None:
+    """使奖池缓存及已抽取次数计数器失效（名单被修改后调用）
+
+    Args:
+        pool_name: 奖池名称，None 表示全部奖池
+    """
+    _prize_pool_cache.invalidate(pool_name)
+    invalidate_prize_drawn_counter(pool_name)
+
+
+def invalidate_prize_drawn_counter(pool_name: Optional[str] = None) -> None:
+    """使已抽取次数计数器失效（抽取记录被重置后调用）
+
+    Args:
+        pool_name: 奖池名称，None 表示全部奖池
+    """
+    with _drawn_counters_lock:
+        if pool_name is None:
+            _drawn_counters.clear()
+        else:
+            _drawn_counters.pop(pool_name, None)
@@ -0,0 +1,250 @@
+# ==================================================
+# 导入模块
+# ==================================================
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from app.common.data.file_cache import FileCache
+from app.tools.path_utils import get_data_path
+
+# 最多缓存的班级名单数量
+ROSTER_CACHE_MAX_ENTRIES = 16
+
+# filter_students_data 返回的学生元组：(id, name, gender, group, exist)
+StudentTuple = Tuple[Any, str, Any, Any, Any]
+
+
+# ==================================================
+# 学生记录
+# ==================================================
+class StudentRecord:
+    """班级名单中的一名学生
+
+    同时保存两种取值：
+        id / gender / group / exist: 名单列表使用的取值（缺失时为 0 / "未知" / "未分组" / True）
+        raw_id / raw_gender / raw_group: 抽取过滤使用的原始取值（缺失时为 ""）
+    """
+
+    __slots__ = (
+        "name",
+        "id",
+        "gender",
+        "group",
+        "exist",
+        "has_id",
+        "raw_id",
+        "raw_gender",
+        "raw_group",
+    )
+
+    def __init__(self, name: str, info: Dict[str, Any]):
+        self.name = name
+        self.id = info.get("id", 0)
+        self.gender = info.get("gender", "未知")
+        self.group = info.get("group", "未分组")
+        self.exist = info.get("exist", True)
+        self.has_id = "id" in info
+        self.raw_id = info.get("id", "")
+        self.raw_gender = info.get("gender", "")
+        self.raw_group = info.get("group", "")
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为名单列表使用的学生字典（每次返回新字典，调用方可自由修改）"""
+        return {
+            "name": self.name,
+            "id": self.id,
+            "gender": self.gender,
+            "group": self.group,
+            "exist": self.exist,
+        }
+
+    def to_tuple(self) -> StudentTuple:
+        """转换为抽取过滤使用的 (id, name, gender, group, exist) 元组"""
+        return (self.raw_id, self.name, self.raw_gender, self.raw_group, self.exist)
+
+
+# ==================================================
+# 班级名单模型
+# ==================================================
+class Roster:
+    """解析后的班级名单，预先建立小组/性别索引
+
+    名单列表相关的查询（学生列表、小组列表、性别列表、小组成员、人数）
+    以及抽取过滤（filter_students）均为字典查询，无需重新读取和遍历名单文件。
+    """
+
+    def __init__(self, student_data: Optional[Dict[str, Any]] = None):
+        records = []
+        for name, info in (student_data or {}).items():
+            if isinstance(info, dict):
+                records.append(StudentRecord(name, info))
+        self.records: Tuple[StudentRecord, ...] = tuple(records)
+
+        # 名单列表视图：按 ID 排序（ID 无法比较时与原实现一致，视为读取失败）
+        try:
+            sorted_records = sorted(self.records, key=lambda r: r.id)
+        except Exception as e:
+            logger.exception(f"获取学生列表失败: {e}")
+            sorted_records = []
+        self.sorted_records: Tuple[StudentRecord, ...] = tuple(sorted_records)
+
+        self._members_by_group: Dict[Any, List[StudentRecord]] = {}
+        self._existing_count_by_group: Dict[Any, int] = {}
+        self.existing_count = 0
+        gender_set = set()
+        for record in self.sorted_records:
+            self._members_by_group.setdefault(record.group, []).append(record)
+            gender_set.add(record.gender)
+            if record.exist:
+                self.existing_count += 1
+                self._existing_count_by_group[record.group] = (
+                    self._existing_count_by_group.get(record.group, 0) + 1
+                )
+        self.group_names: List[Any] = sorted(self._members_by_group)
+        self.gender_names: List[Any] = sorted(gender_set)
+
+        # 抽取过滤视图：按名单文件顺序，只包含带 ID 的学生
+        self._filter_all: List[StudentTuple] = []
+        self._filter_by_gender: Dict[Any, List[StudentTuple]] = {}
+        self._filter_by_group: Dict[Any, List[StudentTuple]] = {}
+        self._filter_by_group_gender: Dict[Tuple[Any, Any], List[StudentTuple]] = {}
+        draw_groups = set()
+        draw_groups_by_gender: Dict[Any, set] = {}
+        for record in self.records:
+            if not record.has_id:
+                continue
+            # 小组模式不区分学生是否存在，只要求小组名称非空
+            if record.raw_group:
+                draw_groups.add(record.raw_group)
+                draw_groups_by_gender.setdefault(record.raw_gender, set()).add(
+                    record.raw_group
+                )
+            if not record.exist:
+                continue
+            student = record.to_tuple()
+            self._filter_all.append(student)
+            self._filter_by_gender.setdefault(record.raw_gender, []).append(student)
+            self._filter_by_group.setdefault(record.raw_group, []).append(student)
+            self._filter_by_group_gender.setdefault(
+                (record.raw_group, record.raw_gender), []
+            ).append(student)
+        self._draw_groups = sorted(draw_groups)
+        self._draw_groups_by_gender = {
+            gender: sorted(groups) for gender, groups in draw_groups_by_gender.items()
+        }
+
+    def student_list(self) -> List[Dict[str, Any]]:
+        """获取按 ID 排序的学生字典列表"""
+        return [record.to_dict() for record in self.sorted_records]
+
+    def group_members(self, group_name: str) -> List[Dict[str, Any]]:
+        """获取指定小组按 ID 排序的成员字典列表"""
+        members = self._members_by_group.get(group_name, [])
+        return [record.to_dict() for record in members]
+
+    def count_existing(self, group_name: Optional[str] = None) -> int:
+        """获取存在的学生人数
+
+        Args:
+            group_name: 小组名称，None 表示全班
+
+        Returns:
+            int: 学生人数
+        """
+        if group_name is None:
+            return self.existing_count
+        return self._existing_count_by_group.get(group_name, 0)
+
+    def filter_students(
+        self,
+        group_index: int,
+        group_filter: str,
+        gender_index: int,
+        gender_filter: str,
+    ) -> List[StudentTuple]:
+        """根据小组和性别条件过滤学生，参数及返回值与 filter_students_data 一致
+
+        Returns:
+            List[Tuple]: 包含(id, name, gender, group, exist)的元组列表（新列表，可自由修改）
+        """
+        if group_index == 0:
+            if gender_index == 0:
+                return list(self._filter_all)
+            return list(self._filter_by_gender.get(gender_filter, []))
+
+        if group_index == 1:
+            if gender_index == 0:
+                groups = self._draw_groups
+            else:
+                groups = self._draw_groups_by_gender.get(gender_filter, [])
+            return [(None, group, None, group, True) for group in groups]
+
+        if group_index >= 2:
+            if gender_index == 0:
+                return list(self._filter_by_group.get(group_filter, []))
+            return list(
+                self._filter_by_group_gender.get((group_filter, gender_filter), [])
+            )
+
+        return []
+
+
+_roster_cache = FileCache("roster", ROSTER_CACHE_MAX_ENTRIES)
+
+
+# ==================================================
+# 班级名单获取函数
+# ==================================================
+def get_roster_file_path(class_name: str) -> Path:
+    """获取班级名单文件路径
+
+    Args:
+        class_name: 班级名称
+
+    Returns:
+        Path: 名单文件路径
+    """
+    return get_data_path("list", "roll_call_list") / f"{class_name}.json"
+
+
+def get_roster(class_name: str) -> Roster:
+    """获取指定班级的名单模型（共享对象，调用方不得修改）
+
+    Args:
+        class_name: 班级名称
+
+    Returns:
+        Roster: 班级名单模型，名单文件不存在或读取失败时为空名单
+    """
+    file_path = get_roster_file_path(class_name)
+
+    def load_roster() -> Roster:
+        if not file_path.exists():
+            logger.warning(f"班级名单文件不存在: {file_path}")
+            return Roster()
+        with open(file_path, "r", encoding="utf-8") as f:
+            return Roster(json.load(f))
+
+    try:
+        return _roster_cache.get(class_name, [file_path], load_roster)
+    except Exception as e:
+        # 解析失败时不缓存，下次重新读取
+        logger.exception(f"读取班级名单失败: {e}")
+        return Roster()
+
+
+def invalidate_roster(class_name: Optional[str] = None) -> None:
+    """使班级名单缓存失效（名单文件被修改、重命名或删除后调用）
+
+    Args:
+        class_name: 班级名称，None 表示全部班级
+    """
+    _roster_cache.invalidate(class_name)
+
+
+def get_roster_cache_stats() -> Dict[str, Any]:
+    """获取班级名单缓存的大小及命中统计"""
+    return _roster_cache.get_stats()
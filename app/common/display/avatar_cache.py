@@ -0,0 +1,294 @@
+# ==================================================
+# 导入模块
+# ==================================================
+import math
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, Iterable, Optional, Tuple, Union
+
+from loguru import logger
+from PySide6.QtCore import QCoreApplication, QFileSystemWatcher, QThread, Qt
+from PySide6.QtGui import QPixmap
+
+from app.common.data.file_cache import get_file_signature
+from app.tools.path_utils import file_exists, get_data_path
+from app.tools.variable import (
+    PRIZE_IMAGE_FOLDER,
+    STUDENT_IMAGE_FOLDER,
+    SUPPORTED_IMAGE_EXTENSIONS,
+)
+
+# 最多缓存的头像图片数量
+AVATAR_PIXMAP_CACHE_MAX_ENTRIES = 128
+
+# 可能包含动画的图片格式，交给 AvatarWidget 按路径加载
+ANIMATED_IMAGE_EXTENSIONS = (".gif",)
+
+
+# ==================================================
+# 图片目录索引
+# ==================================================
+class ImageIndex:
+    """图片目录索引：名称（不含扩展名）-> 图片路径
+
+    目录只扫描一次，同名图片按 SUPPORTED_IMAGE_EXTENSIONS 的顺序取第一个。
+    在主线程且 QApplication 已创建时挂载文件监视器，目录变化后下次查询重新扫描；
+    无法挂载监视器时（如目录尚不存在）每次查询比较目录签名。
+    """
+
+    def __init__(self, folder: str):
+        self._folder = folder
+        self._paths: Dict[str, str] = {}
+        self._signatures: Dict[str, Optional[Tuple[int, int]]] = {}
+        self._signature: Optional[Tuple[int, int]] = None
+        self._loaded = False
+        self._dirty = False
+        self._watcher: Union[QFileSystemWatcher, None, bool] = None
+        self._lock = threading.RLock()
+
+    def find(self, name: str) -> Optional[str]:
+        """获取图片路径
+
+        Args:
+            name: 图片名称（学生姓名或奖品名称）
+
+        Returns:
+            Optional[str]: 图片路径，没有图片时返回 None
+        """
+        with self._lock:
+            self._ensure_fresh()
+            return self._paths.get(name)
+
+    def invalidate(self) -> None:
+        """标记索引失效，下次查询时重新扫描目录"""
+        with self._lock:
+            self._dirty = True
+
+    def _ensure_fresh(self) -> None:
+        """确保索引与目录一致（调用方需持有锁）"""
+        if self._watcher and self._loaded and not self._dirty:
+            return
+        folder_path = get_data_path(self._folder)
+        signature = get_file_signature(folder_path)
+        if not self._loaded or self._dirty or signature != self._signature:
+            self._rebuild(folder_path, signature)
+        if self._watcher is None:
+            self._attach_file_watcher(folder_path)
+
+    def _rebuild(self, folder_path, signature) -> None:
+        extension_ranks = {
+            ext: rank for rank, ext in enumerate(SUPPORTED_IMAGE_EXTENSIONS)
+        }
+        best: Dict[str, Tuple[int, str, Optional[Tuple[int, int]]]] = {}
+        try:
+            with os.scandir(folder_path) as entries:
+                for entry in entries:
+                    name, ext = os.path.splitext(entry.name)
+                    rank = extension_ranks.get(ext.lower())
+                    if rank is None or not entry.is_file():
+                        continue
+                    current = best.get(name)
+                    if current is None or rank < current[0]:
+                        stat = entry.stat()
+                        best[name] = (
+                            rank,
+                            str(folder_path / entry.name),
+                            (stat.st_mtime_ns, stat.st_size),
+                        )
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"扫描图片目录失败: {e}")
+
+        paths = {name: path for name, (_, path, _) in best.items()}
+        signatures = {path: file_signature for _, path, file_signature in best.values()}
+
+        # 被替换或删除的图片不再使用缓存的缩放结果
+        changed_paths = [
+            path
+            for path, old_signature in self._signatures.items()
+            if signatures.get(path) != old_signature
+        ]
+        if changed_paths:
+            _avatar_pixmap_cache.invalidate_paths(changed_paths)
+
+        self._paths = paths
+        self._signatures = signatures
+        self._signature = signature
+        self._loaded = True
+        self._dirty = False
+
+    def _attach_file_watcher(self, folder_path) -> None:
+        """在主线程且 QApplication 已创建、目录存在时挂载文件监视器"""
+        app = QCoreApplication.instance()
+        if app is None or QThread.currentThread() != app.thread():
+            return
+        if not file_exists(folder_path):
+            return
+        try:
+            watcher = QFileSystemWatcher()
+            watcher.addPath(str(folder_path))
+            watcher.directoryChanged.connect(self._on_directory_changed)
+            self._watcher = watcher
+        except Exception as e:
+            logger.warning(f"图片目录监视器创建失败: {e}")
+            self._watcher = False
+
+    def _on_directory_changed(self, path: str) -> None:
+        """文件监视器回调：标记索引失效，目录被删除时改为按目录签名检查"""
+        with self._lock:
+            self._dirty = True
+            watcher = self._watcher
+            if watcher and not file_exists(path):
+                watcher.removePath(path)
+                watcher.deleteLater()
+                self._watcher = None
+
+
+# ==================================================
+# 头像缩放图片缓存
+# ==================================================
+class AvatarPixmapCache:
+    """有容量上限的 LRU 缓存，保存按头像尺寸预先缩放好的 QPixmap
+
+    缓存键为 (图片路径, 尺寸, 圆角半径)，图片无法解码时同样缓存结果，避免重复读取。
+    QPixmap 只能在主线程中使用。
+    """
+
+    def __init__(self, max_entries: int):
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Optional[QPixmap]]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, image_path: str, size: int, radius: int) -> Optional[QPixmap]:
+        """获取缩放后的图片
+
+        Args:
+            image_path: 图片路径
+            size: 图片边长（设备像素）
+            radius: 头像圆角半径
+
+        Returns:
+            Optional[QPixmap]: 缩放并居中裁剪为正方形的图片，无法解码时返回 None
+        """
+        key = (image_path, size, radius)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return self._entries[key]
+            self._misses += 1
+
+        pixmap = _load_scaled_pixmap(image_path, size)
+
+        with self._lock:
+            self._entries[key] = pixmap
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return pixmap
+
+    def invalidate_paths(self, image_paths: Iterable[str]) -> None:
+        """使指定图片的所有缓存条目失效"""
+        image_paths = set(image_paths)
+        with self._lock:
+            for key in [k for k in self._entries if k[0] in image_paths]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, float]:
+        """获取缓存大小及命中统计"""
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self._max_entries,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / total if total else 0.0,
+            }
+
+
+def _load_scaled_pixmap(image_path: str, size: int) -> Optional[QPixmap]:
+    """读取图片并缩放、居中裁剪为 size x size"""
+    pixmap = QPixmap(image_path)
+    if pixmap.isNull():
+        logger.warning(f"无法读取头像图片: {image_path}")
+        return None
+    if size <= 0:
+        return pixmap
+    scaled = pixmap.scaled(
+        size,
+        size,
+        Qt.AspectRatioMode.KeepAspectRatioByExpanding,
+        Qt.TransformationMode.SmoothTransformation,
+    )
+    return scaled.copy(
+        (scaled.width() - size) // 2, (scaled.height() - size) // 2, size, size
+    )
+
+
+_avatar_pixmap_cache = AvatarPixmapCache(AVATAR_PIXMAP_CACHE_MAX_ENTRIES)
+_image_indexes = {
+    "student": ImageIndex(STUDENT_IMAGE_FOLDER),
+    "prize": ImageIndex(PRIZE_IMAGE_FOLDER),
+}
+
+
+# ==================================================
+# 头像图片获取函数
+# ==================================================
+def find_image_path(
+    name: str, settings_group: str = "roll_call_settings"
+) -> Optional[str]:
+    """查找学生（或奖品）的图片路径
+
+    Args:
+        name: 学生姓名或奖品名称
+        settings_group: 设置组名称，lottery_settings 使用奖品图片目录
+
+    Returns:
+        Optional[str]: 图片路径，没有图片时返回 None
+    """
+    kind = "prize" if settings_group == "lottery_settings" else "student"
+    return _image_indexes[kind].find(str(name))
+
+
+def get_avatar_image(
+    image_path: Optional[str], radius: int, device_pixel_ratio: float = 1.0
+) -> Union[QPixmap, str, None]:
+    """获取用于 AvatarWidget 的头像图片
+
+    Args:
+        image_path: 图片路径，None 表示没有图片
+        radius: 头像圆角半径（头像边长为 2 * radius）
+        device_pixel_ratio: 头像所在屏幕的设备像素比
+
+    Returns:
+        Union[QPixmap, str, None]: 预先缩放的图片；动画图片返回原路径交给 AvatarWidget 加载；
+            没有图片或无法解码时返回 None
+    """
+    if image_path is None:
+        return None
+    if image_path.lower().endswith(ANIMATED_IMAGE_EXTENSIONS):
+        return image_path
+    size = math.ceil(2 * radius * device_pixel_ratio)
+    return _avatar_pixmap_cache.get(image_path, size, radius)
+
+
+def invalidate_image_index() -> None:
+    """使图片目录索引失效（图片被导入或删除后调用）"""
+    for index in _image_indexes.values():
+        index.invalidate()
+
+
+def get_avatar_cache_stats() -> Dict[str, float]:
+    """获取头像缩放图片缓存的大小及命中统计"""
+    return _avatar_pixmap_cache.get_stats()
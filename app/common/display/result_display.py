@@ -7,14 +7,13 @@ import weakref
 from loguru import logger
 
 from PySide6.QtWidgets import QWidget, QHBoxLayout, QVBoxLayout, QMenu, QApplication
-from PySide6.QtGui import QMouseEvent, QPalette
+from PySide6.QtGui import QColor, QMouseEvent, QPalette
 from PySide6.QtCore import Qt, QPoint, QTimer, QEvent
 from qfluentwidgets import BodyLabel, AvatarWidget, qconfig, Theme
 
 from app.tools.variable import (
     STUDENT_ID_FORMAT,
     NAME_SPACING,
-    SUPPORTED_IMAGE_EXTENSIONS,
     AVATAR_LABEL_SPACING,
     DEFAULT_MIN_SATURATION,
     DEFAULT_MAX_SATURATION,
@@ -30,13 +29,14 @@ from app.tools.variable import (
     DARK_THEME_MAX_VALUE,
     LIGHTNESS_THRESHOLD,
     RGB_COLOR_FORMAT,
+    RANDOM_COLOR_PALETTE_SIZE,
     GRID_ITEM_MARGIN,
     GRID_ITEM_SPACING,
     DEFAULT_AVAILABLE_WIDTH,
 )
-from app.tools.path_utils import file_exists, get_data_path
+from app.common.display.avatar_cache import find_image_path, get_avatar_image
 from app.tools.personalised import is_dark_theme
-from app.tools.settings_access import readme_settings_async
+from app.tools.settings_access import readme_settings_async, get_settings_signals
 from app.common.data.list import get_group_members
 
 from random import SystemRandom
@@ -195,6 +195,132 @@ class TouchResultWidget(QWidget):
             )
 
 
+# ==================================================
+# 预先计算的标签样式
+# ==================================================
+# 影响标签样式的设置项，变化时丢弃已计算的样式
+LABEL_STYLE_SETTING_KEYS = ("use_global_font", "custom_font", "animation_fixed_color")
+
+
+class LabelStylePalette:
+    """某一主题、字体设置和颜色模式下预先计算好的标签样式
+
+    colors 中的每种颜色都对应一条完整的样式表（字体 + 颜色）及 QColor，
+    随机颜色模式下每帧只需随机取一个下标，无需读取设置或重新生成颜色。
+    """
+
+    def __init__(self, font_style, colors):
+        self.font_style = font_style
+        self.colors = list(colors)
+        self.style_sheets = [
+            f"{font_style}color: {color} !important;" for color in self.colors
+        ]
+        self.qcolors = [ResultDisplayUtils._to_qcolor(color) for color in self.colors]
+
+    def pick(self):
+        """获取一个颜色下标（只有一种颜色时固定为 0）"""
+        if len(self.colors) > 1:
+            return random.randrange(len(self.colors))
+        return 0
+
+    def style_sheet(self):
+        """获取一条完整的样式表"""
+        return self.style_sheets[self.pick()]
+
+    def qcolor(self):
+        """获取一个文字颜色 (QColor)"""
+        return self.qcolors[self.pick()]
+
+
+# ==================================================
+# 结果标签池
+# ==================================================
+class ResultLabelSlot:
+    """标签池中的一个结果标签（触屏容器 + 文本标签 + 可选头像）"""
+
+    def __init__(self, draw_count, show_image, font_size, font_style):
+        self.container = TouchResultWidget()
+        self.container.setAttribute(Qt.WA_DeleteOnClose)  # 自动清理
+
+        inner_layout = QVBoxLayout() if draw_count == 1 else QHBoxLayout()
+        inner_layout.setContentsMargins(0, 0, 0, 0)
+        inner_layout.setSpacing(0)
+        self.container.setLayout(inner_layout)
+
+        # 字体样式表只设置一次，颜色通过调色板修改，避免每帧重新解析样式表
+        self.label = BodyLabel()
+        self.label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.label.setStyleSheet(font_style)
+
+        self.avatar = None
+        if show_image:
+            content = QWidget()
+            h_layout = QHBoxLayout(content)
+            h_layout.setSpacing(AVATAR_LABEL_SPACING)
+            h_layout.setContentsMargins(0, 0, 0, 0)
+            self.avatar = AvatarWidget()
+            self.avatar.setRadius(
+                ResultDisplayUtils._get_avatar_radius(font_size, draw_count)
+            )
+            h_layout.addWidget(self.avatar)
+            h_layout.addWidget(self.label)
+            inner_layout.addWidget(content)
+        else:
+            inner_layout.addWidget(self.label)
+
+        self._text = None
+        self._color = None
+        self._avatar_source = None
+
+    def update(self, text, color, name, image_path=None):
+        """
+        更新标签内容，只修改发生变化的属性
+
+        参数:
+            text: 显示文本
+            color: 文字颜色 (QColor)
+            name: 显示名称（没有图片时头像显示该名称）
+            image_path: 头像图片路径
+        """
+        if text != self._text:
+            self.label.setText(text)
+            self._text = text
+
+        if self._color is None or color != self._color:
+            palette = self.label.palette()
+            palette.setColor(QPalette.ColorRole.WindowText, color)
+            self.label.setPalette(palette)
+            self._color = QColor(color)
+
+        if self.avatar is not None:
+            avatar_source = (image_path, None if image_path else name)
+            if avatar_source != self._avatar_source:
+                image = get_avatar_image(
+                    image_path,
+                    self.avatar.getRadius(),
+                    self.avatar.devicePixelRatioF(),
+                )
+                self.avatar.setImage(image)
+                if image is None:
+                    self.avatar.setText(name)
+                self._avatar_source = avatar_source
+
+
+class ResultLabelPool:
+    """结果网格的可复用标签池，按抽取人数一次性创建"""
+
+    def __init__(self, key, count, draw_count, show_image, font_size, font_style):
+        self.key = key
+        self.slots = [
+            ResultLabelSlot(draw_count, show_image, font_size, font_style)
+            for _ in range(count)
+        ]
+
+    def containers(self):
+        """获取所有标签的触屏容器"""
+        return [slot.container for slot in self.slots]
+
+
 # ==================================================
 # 结果显示工具类
 # ==================================================
@@ -203,22 +329,38 @@ class ResultDisplayUtils:
 
     _color_cache = {}
     _max_cache_size = 100  # 限制颜色缓存大小
+    _style_palettes = {}  # (设置组, 字号, 自定义字体族, 颜色模式) -> LabelStylePalette
     _weak_widget_refs = weakref.WeakSet()  # 使用弱引用跟踪widget
 
     @staticmethod
     def _clear_color_cache():
-        """清除颜色缓存"""
+        """清除颜色缓存及预先计算的标签样式"""
         ResultDisplayUtils._color_cache.clear()
+        ResultDisplayUtils._style_palettes.clear()
+
+    @staticmethod
+    def _on_setting_changed(first_level_key, second_level_key, value):
+        """字体或固定颜色设置变化时丢弃预先计算的标签样式"""
+        if second_level_key in LABEL_STYLE_SETTING_KEYS:
+            ResultDisplayUtils._style_palettes.clear()
 
     @staticmethod
     def _init_theme_listener():
-        """初始化主题变化监听器"""
+        """初始化主题及样式设置变化监听器"""
         if not hasattr(ResultDisplayUtils, "_theme_listener_initialized"):
             qconfig.themeChanged.connect(ResultDisplayUtils._clear_color_cache)
+            get_settings_signals().settingChanged.connect(
+                ResultDisplayUtils._on_setting_changed
+            )
             ResultDisplayUtils._theme_listener_initialized = True
 
     @staticmethod
-    def _create_avatar_widget(image_path, name, font_size):
+    def _get_avatar_radius(font_size, draw_count):
+        """获取头像圆角半径（单人抽取时头像更大）"""
+        return font_size * 2 if draw_count == 1 else font_size // 2
+
+    @staticmethod
+    def _create_avatar_widget(image_path, name, font_size, draw_count=1):
         """
         创建头像组件
 
@@ -226,14 +368,20 @@ class ResultDisplayUtils:
             image_path: 图片路径
             name: 学生姓名
             font_size: 字体大小
+            draw_count: 抽取人数
 
         返回:
             AvatarWidget: 创建的头像组件
         """
-        if image_path is not None:
-            avatar = AvatarWidget(image_path)
+        avatar = AvatarWidget()
+        avatar.setRadius(ResultDisplayUtils._get_avatar_radius(font_size, draw_count))
+        # 使用按头像尺寸缓存的图片，避免每次创建标签都重新解码
+        image = get_avatar_image(
+            image_path, avatar.getRadius(), avatar.devicePixelRatioF()
+        )
+        if image is not None:
+            avatar.setImage(image)
         else:
-            avatar = AvatarWidget()
             avatar.setText(name)
 
         return avatar
@@ -296,6 +444,151 @@ class ResultDisplayUtils:
             else:
                 return f"{student_id_str} {name}"
 
+    @staticmethod
+    def _find_image_path(selected, settings_group="roll_call_settings"):
+        """
+        查找学生（或奖品）的图片路径
+
+        参数:
+            selected: 学生姓名或奖品名称
+            settings_group: 设置组名称，lottery_settings 使用奖品图片目录
+
+        返回:
+            str: 图片路径，没有图片时返回 None
+        """
+        # 图片目录只扫描一次，目录变化时由文件监视器刷新
+        return find_image_path(selected, settings_group)
+
+    @staticmethod
+    def _build_display_text(
+        class_name,
+        num,
+        selected,
+        draw_count,
+        display_format,
+        group_index,
+        show_random,
+    ):
+        """
+        生成学生的显示名称和显示文本
+
+        参数:
+            class_name: 班级名称
+            num: 学号
+            selected: 学生姓名或小组名称
+            draw_count: 抽取人数
+            display_format: 显示格式 (0:学号+姓名, 1:仅姓名, 2:仅学号)
+            group_index: 小组索引 (0:全班, 1:随机小组, >1:指定小组)
+            show_random: 随机组员显示格式
+
+        返回:
+            tuple: (显示名称, 显示文本)
+        """
+        # 处理学号格式化
+        student_id_str = STUDENT_ID_FORMAT.format(num=num) if num is not None else ""
+
+        # 处理不同模式下的名称显示
+        name = (
+            f"{str(selected)[0]}{NAME_SPACING}{str(selected)[1]}"
+            if len(str(selected)) == 2 and group_index == 0
+            else str(selected)
+        )
+
+        text = ResultDisplayUtils._format_student_text(
+            class_name,
+            display_format,
+            student_id_str,
+            name,
+            draw_count,
+            is_group_mode=(group_index == 1),
+            show_random=show_random,
+        )
+        return name, text
+
+    @staticmethod
+    def _get_label_font_style(font_size, settings_group, custom_font_family=""):
+        """
+        获取标签的字体样式表（不含颜色）
+
+        参数:
+            font_size: 字体大小
+            settings_group: 设置组名称
+            custom_font_family: 自定义字体族
+
+        返回:
+            str: 样式表文本
+        """
+        use_global_font = readme_settings_async(settings_group, "use_global_font")
+        custom_font = None
+        if use_global_font == 1:  # 不使用全局字体，使用自定义字体
+            custom_font = readme_settings_async(settings_group, "custom_font")
+        if custom_font_family:
+            custom_font = custom_font_family
+
+        if custom_font and use_global_font == 1:
+            return f"font-family: '{custom_font}'; font-size: {font_size}pt; "
+        return f"font-size: {font_size}pt; "
+
+    @staticmethod
+    def _get_default_text_color():
+        """获取默认文字颜色（深色主题为白色，浅色主题为黑色）"""
+        try:
+            return "#ffffff" if is_dark_theme(qconfig) else "#000000"
+        except Exception:
+            return "#000000"
+
+    @staticmethod
+    def _get_style_palette(
+        font_size, animation_color, settings_group, custom_font_family=""
+    ):
+        """
+        获取预先计算的标签样式，主题或样式设置变化前一直复用
+
+        参数:
+            font_size: 字体大小
+            animation_color: 动画颜色模式 (0:默认, 1:随机颜色, 2:固定颜色)
+            settings_group: 设置组名称
+            custom_font_family: 自定义字体族
+
+        返回:
+            LabelStylePalette: 标签样式
+        """
+        ResultDisplayUtils._init_theme_listener()
+
+        key = (settings_group, font_size, custom_font_family, animation_color)
+        palette = ResultDisplayUtils._style_palettes.get(key)
+        if palette is not None:
+            return palette
+
+        font_style = ResultDisplayUtils._get_label_font_style(
+            font_size, settings_group, custom_font_family
+        )
+        if animation_color == 1:
+            colors = [
+                ResultDisplayUtils._generate_vibrant_color(use_cache=False)
+                for _ in range(RANDOM_COLOR_PALETTE_SIZE)
+            ]
+        elif animation_color == 2:
+            fixed_color = readme_settings_async(settings_group, "animation_fixed_color")
+            colors = [fixed_color or ResultDisplayUtils._get_default_text_color()]
+        else:
+            colors = [ResultDisplayUtils._get_default_text_color()]
+        palette = LabelStylePalette(font_style, colors)
+
+        style_palettes = ResultDisplayUtils._style_palettes
+        if len(style_palettes) >= ResultDisplayUtils._max_cache_size:
+            style_palettes.clear()
+        style_palettes[key] = palette
+        return palette
+
+    @staticmethod
+    def _to_qcolor(color_str):
+        """将 RGB_COLOR_FORMAT 格式（或 QColor 支持的格式）的颜色文本转换为 QColor"""
+        if color_str.startswith("rgb(") and color_str.endswith(")"):
+            r, g, b = (int(value) for value in color_str[4:-1].split(","))
+            return QColor(r, g, b)
+        return QColor(color_str)
+
     @staticmethod
     def _create_student_label_with_avatar(
         image_path, name, font_size, draw_count, text
@@ -323,8 +616,9 @@ class ResultDisplayUtils:
         h_layout.setContentsMargins(0, 0, 0, 0)
 
         # 创建头像
-        avatar = ResultDisplayUtils._create_avatar_widget(image_path, name, font_size)
-        avatar.setRadius(font_size * 2 if draw_count == 1 else font_size // 2)
+        avatar = ResultDisplayUtils._create_avatar_widget(
+            image_path, name, font_size, draw_count
+        )
 
         # 创建文本标签
         text_label = BodyLabel(text)
@@ -356,17 +650,9 @@ class ResultDisplayUtils:
             settings_group: 设置组名称，默认为roll_call_settings
             custom_font_family: 自定义字体族
         """
-        # 检查是否使用全局字体
-        use_global_font = readme_settings_async(settings_group, "use_global_font")
-        custom_font = None
-        if use_global_font == 1:  # 不使用全局字体，使用自定义字体
-            custom_font = readme_settings_async(settings_group, "custom_font")
-
-        # 如果传入了自定义字体族，则使用传入的字体族
-        if custom_font_family:
-            custom_font = custom_font_family
-
-        fixed_color = readme_settings_async(settings_group, "animation_fixed_color")
+        palette = ResultDisplayUtils._get_style_palette(
+            font_size, animation_color, settings_group, custom_font_family
+        )
         if (
             isinstance(label, QWidget)
             and hasattr(label, "layout")
@@ -379,52 +665,10 @@ class ResultDisplayUtils:
                     widget = item.widget()
                     if isinstance(widget, BodyLabel):
                         widget.setAlignment(Qt.AlignmentFlag.AlignCenter)
-                        if custom_font and use_global_font == 1:
-                            style_sheet = f"font-family: '{custom_font}'; font-size: {font_size}pt; "
-                        else:
-                            style_sheet = f"font-size: {font_size}pt; "
-
-                        if animation_color == 1:
-                            style_sheet += f"color: {ResultDisplayUtils._generate_vibrant_color()} !important;"
-                        elif animation_color == 2:
-                            style_sheet += f"color: {fixed_color} !important;"
-                        else:
-                            try:
-                                from qfluentwidgets import qconfig
-
-                                default_color = (
-                                    "#ffffff" if is_dark_theme(qconfig) else "#000000"
-                                )
-                                style_sheet += f"color: {default_color} !important;"
-                            except Exception:
-                                style_sheet += "color: #000000 !important;"
-
-                        widget.setStyleSheet(style_sheet)
+                        widget.setStyleSheet(palette.style_sheet())
         else:
             label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            if custom_font and use_global_font == 1:
-                style_sheet = (
-                    f"font-family: '{custom_font}'; font-size: {font_size}pt; "
-                )
-            else:
-                style_sheet = f"font-size: {font_size}pt; "
-
-            if animation_color == 1:
-                style_sheet += (
-                    f"color: {ResultDisplayUtils._generate_vibrant_color()} !important;"
-                )
-            elif animation_color == 2:
-                style_sheet += f"color: {fixed_color} !important;"
-            else:
-                try:
-                    from qfluentwidgets import qconfig
-
-                    default_color = "#ffffff" if is_dark_theme(qconfig) else "#000000"
-                    style_sheet += f"color: {default_color} !important;"
-                except Exception:
-                    style_sheet += "color: #000000 !important;"
-
-            label.setStyleSheet(style_sheet)
+            label.setStyleSheet(palette.style_sheet())
 
     @staticmethod
     def create_student_label(
@@ -469,49 +713,20 @@ class ResultDisplayUtils:
         student_labels = [None] * len(selected_students)
 
         for i, (num, selected, exist) in enumerate(selected_students):
-            current_image_path = None
-            # 根据settings_group确定图片目录
-            if show_student_image:
-                image_name = str(selected)
-                # 根据settings_group选择不同的图片目录
-                if settings_group == "lottery_settings":
-                    image_dir = "prize_images"
-                else:
-                    image_dir = "student_images"
-
-                # 内存优化：使用生成器表达式减少内存分配
-                for ext in (
-                    ext
-                    for ext in SUPPORTED_IMAGE_EXTENSIONS
-                    if file_exists(
-                        get_data_path("images", f"{image_dir}/{image_name}{ext}")
-                    )
-                ):
-                    current_image_path = str(
-                        get_data_path("images", f"{image_dir}/{image_name}{ext}")
-                    )
-                    break
-
-            # 处理学号格式化
-            student_id_str = (
-                STUDENT_ID_FORMAT.format(num=num) if num is not None else ""
+            current_image_path = (
+                ResultDisplayUtils._find_image_path(selected, settings_group)
+                if show_student_image
+                else None
             )
 
-            # 处理不同模式下的名称显示
-            name = (
-                f"{str(selected)[0]}{NAME_SPACING}{str(selected)[1]}"
-                if len(str(selected)) == 2 and group_index == 0
-                else str(selected)
-            )
-
-            text = ResultDisplayUtils._format_student_text(
+            name, text = ResultDisplayUtils._build_display_text(
                 class_name,
-                display_format,
-                student_id_str,
-                name,
+                num,
+                selected,
                 draw_count,
-                is_group_mode=(group_index == 1),
-                show_random=show_random,
+                display_format,
+                group_index,
+                show_random,
             )
 
             # 使用支持触屏的容器包装所有内容，确保整个区域都能响应触屏操作
@@ -673,88 +888,82 @@ class ResultDisplayUtils:
             parent_widget.updateGeometry()
 
     @staticmethod
-    def update_grid_labels(result_grid, new_labels, cached_labels):
+    def update_student_labels(
+        result_grid,
+        class_name,
+        selected_students,
+        draw_count=1,
+        font_size=50,
+        animation_color=0,
+        display_format=0,
+        show_student_image=False,
+        group_index=0,
+        show_random=0,
+        settings_group="roll_call_settings",
+        custom_font_family="",
+    ):
         """
-        更新网格布局中的标签内容（优化动画性能）
+        在动画过程中刷新结果网格（参数与 create_student_label 一致）
+
+        复用网格上的标签池，每帧只修改文本、颜色和头像；
+        标签数量、布局方向、是否显示头像或字体变化时才重新创建标签。
 
         参数:
             result_grid: QGridLayout 网格布局
-            new_labels: 新的学生标签列表
-            cached_labels: 缓存的旧标签列表
+            其余参数同 create_student_label
         """
-        if not new_labels:
+        if selected_students is None:
+            logger.warning(
+                "update_student_labels: selected_students 为 None，可能是未设置默认班级或抽取名单"
+            )
             return
 
-        count = result_grid.count()
-        min_count = min(len(new_labels), len(cached_labels))
-
-        for i in range(min_count):
-            old_widget = cached_labels[i]
-            new_widget = new_labels[i]
-
-            if old_widget and new_widget:
-                old_layout = old_widget.layout()
-                new_layout = new_widget.layout()
-
-                if old_layout and new_layout:
-                    for j in range(min(old_layout.count(), new_layout.count())):
-                        old_item = old_layout.itemAt(j)
-                        new_item = new_layout.itemAt(j)
-
-                        if old_item and new_item:
-                            old_content = old_item.widget()
-                            new_content = new_item.widget()
-
-                            # 如果内容是容器（带头像的情况），更新其内部组件
-                            if old_content.layout() and new_content.layout():
-                                old_inner_layout = old_content.layout()
-                                new_inner_layout = new_content.layout()
-
-                                for k in range(
-                                    min(
-                                        old_inner_layout.count(),
-                                        new_inner_layout.count(),
-                                    )
-                                ):
-                                    old_inner_item = old_inner_layout.itemAt(k)
-                                    new_inner_item = new_inner_layout.itemAt(k)
-
-                                    if old_inner_item and new_inner_item:
-                                        old_inner_widget = old_inner_item.widget()
-                                        new_inner_widget = new_inner_item.widget()
-
-                                        # 更新文本标签
-                                        if isinstance(
-                                            old_inner_widget, BodyLabel
-                                        ) and isinstance(new_inner_widget, BodyLabel):
-                                            old_inner_widget.setText(
-                                                new_inner_widget.text()
-                                            )
-                                            old_inner_widget.setStyleSheet(
-                                                new_inner_widget.styleSheet()
-                                            )
-
-                                        # 更新头像组件
-                                        from qfluentwidgets import AvatarWidget
-
-                                        if isinstance(
-                                            old_inner_widget, AvatarWidget
-                                        ) and isinstance(
-                                            new_inner_widget, AvatarWidget
-                                        ):
-                                            old_image = old_inner_widget.getImage()
-                                            new_image = new_inner_widget.getImage()
-                                            if old_image != new_image:
-                                                old_inner_widget.setImage(new_image)
-
-                            # 如果内容是直接标签（不带头像的情况）
-                            elif isinstance(old_content, BodyLabel) and isinstance(
-                                new_content, BodyLabel
-                            ):
-                                old_content.setText(new_content.text())
-                                old_content.setStyleSheet(new_content.styleSheet())
-
-        cached_labels[:] = new_labels
+        palette = ResultDisplayUtils._get_style_palette(
+            font_size, animation_color, settings_group, custom_font_family
+        )
+        font_style = palette.font_style
+        pool_key = (
+            len(selected_students),
+            draw_count == 1,
+            bool(show_student_image),
+            font_size,
+            font_style,
+        )
+        pool = getattr(result_grid, "_result_label_pool", None)
+        rebuild = pool is None or pool.key != pool_key
+        if rebuild:
+            pool = ResultLabelPool(
+                pool_key,
+                len(selected_students),
+                draw_count,
+                bool(show_student_image),
+                font_size,
+                font_style,
+            )
+
+        for slot, (num, selected, exist) in zip(
+            pool.slots, selected_students, strict=True
+        ):
+            name, text = ResultDisplayUtils._build_display_text(
+                class_name,
+                num,
+                selected,
+                draw_count,
+                display_format,
+                group_index,
+                show_random,
+            )
+            image_path = (
+                ResultDisplayUtils._find_image_path(selected, settings_group)
+                if show_student_image
+                else None
+            )
+            slot.update(text, palette.qcolor(), name, image_path)
+
+        if rebuild:
+            # 填入首帧内容后再排列，使列数按实际文本宽度计算
+            ResultDisplayUtils.display_results_in_grid(result_grid, pool.containers())
+            result_grid._result_label_pool = pool
 
     @staticmethod
     def clear_grid(result_grid, log_debug=False):
@@ -765,6 +974,9 @@ class ResultDisplayUtils:
             result_grid: QGridLayout 网格布局
             log_debug: 是否输出调试日志（默认为False）
         """
+        # 标签池中的组件即将被销毁
+        result_grid._result_label_pool = None
+
         count = result_grid.count()
         if count == 0:
             return
@@ -781,8 +993,6 @@ class ResultDisplayUtils:
         if log_debug and count > 0:
             logger.debug(f"本次销毁了{count}个组件")
 
-        ResultDisplayUtils._color_cache.clear()
-
     @staticmethod
     def show_notification_if_enabled(
         class_name,
@@ -823,8 +1033,9 @@ class ResultDisplayUtils:
         清理内存占用，释放不再使用的资源
         建议在大量操作后调用此方法来释放内存
         """
-        # 清理颜色缓存
+        # 清理颜色缓存及预先计算的标签样式
         ResultDisplayUtils._color_cache.clear()
+        ResultDisplayUtils._style_palettes.clear()
 
         # 清理弱引用集合
         ResultDisplayUtils._weak_widget_refs.clear()
@@ -0,0 +1,332 @@
+# ==================================================
+# 导入模块
+# ==================================================
+import threading
+import time
+from typing import NamedTuple, Optional
+
+from loguru import logger
+from PySide6.QtCore import QCoreApplication, QDateTime, QObject, QTimer, Signal
+
+from app.common.extraction.timetable import SECONDS_PER_DAY, get_timetable
+from app.tools.settings_access import get_settings_signals, readme_settings_async
+
+# 状态定时器的最长间隔（毫秒），用于发现外部修改的课程表文件和系统时间变化
+CLASS_STATE_MAX_TIMER_INTERVAL = 60 * 1000
+
+# ClassIsland 数据源的状态刷新间隔（秒），上下课事件推送时会立即刷新
+CLASSISLAND_REFRESH_INTERVAL = 5.0
+
+
+# ==================================================
+# 上课状态
+# ==================================================
+class ClassState(NamedTuple):
+    """某一时刻的上课状态快照
+
+    时刻均为 time.monotonic() 的值。valid_until 之前（下一个上课/下课/提前解禁时刻）
+    状态保持不变，读取时无需重新计算。
+    """
+
+    data_source: int  # 数据源（0=未启用, 1=CSES 文件, 2=ClassIsland）
+    in_class: bool  # 是否在上课时间段内
+    non_class_time: bool  # 课间禁用是否生效（已计入提前解禁时间）
+    current_class: str  # 当前课程名称，不在上课时间段内时为 ""
+    next_class: str  # 下一节课名称，没有下一节课时为 ""
+    next_class_at: Optional[float]  # 下一节课开始时刻，没有下一节课时为 None
+    valid_until: float
+
+    def seconds_to_next_class(self, now: Optional[float] = None) -> int:
+        """距离下一节课的剩余秒数，没有下一节课时返回 0"""
+        if self.next_class_at is None:
+            return 0
+        if now is None:
+            now = time.monotonic()
+        return max(0, round(self.next_class_at - now))
+
+    def current_class_info(self) -> dict:
+        """当前课程信息，不在上课时间段内时返回空字典"""
+        return {"name": self.current_class} if self.current_class else {}
+
+    def break_assignment_class_info(self) -> dict:
+        """课间归属的课程信息（下一节课），没有下一节课时返回空字典"""
+        return {"name": self.next_class} if self.next_class else {}
+
+    def same_as(self, other: Optional["ClassState"]) -> bool:
+        """除时刻外的状态是否相同"""
+        return other is not None and self[:5] == other[:5]
+
+
+def _current_day_and_seconds():
+    """获取当前是星期几（1=星期一，7=星期日）及当天已过的秒数"""
+    current_time = QDateTime.currentDateTime()
+    clock = current_time.time()
+    return (
+        current_time.date().dayOfWeek(),
+        clock.hour() * 3600 + clock.minute() * 60 + clock.second(),
+    )
+
+
+def _non_class_time(
+    instant_draw_disable: bool,
+    in_class: bool,
+    seconds_to_next_class: int,
+    pre_class_enable_time: int,
+) -> bool:
+    """判断课间禁用是否生效：不在上课时间段内，且距离上课超过提前解禁时间"""
+    if not instant_draw_disable or in_class:
+        return False
+    return not 0 < seconds_to_next_class <= pre_class_enable_time
+
+
+# ==================================================
+# 上课状态数据源
+# ==================================================
+class ClassStateSource:
+    """上课状态数据源接口，compute 返回当前时刻的状态及其有效期"""
+
+    data_source = 0
+
+    def compute(
+        self, instant_draw_disable: bool, pre_class_enable_time: int
+    ) -> ClassState:
+        """计算当前时刻的上课状态
+
+        Args:
+            instant_draw_disable: 是否启用课间禁用
+            pre_class_enable_time: 上课前提前解禁时间（秒）
+
+        Returns:
+            ClassState: 上课状态
+        """
+        now = time.monotonic()
+        return ClassState(
+            self.data_source, False, False, "", "", None, now + SECONDS_PER_DAY
+        )
+
+
+class CsesClassStateSource(ClassStateSource):
+    """从已导入的 CSES 课程表计算上课状态"""
+
+    data_source = 1
+
+    def compute(
+        self, instant_draw_disable: bool, pre_class_enable_time: int
+    ) -> ClassState:
+        now = time.monotonic()
+        timetable = get_timetable()
+        if timetable is None:
+            return ClassState(
+                self.data_source, False, False, "", "", None, now + SECONDS_PER_DAY
+            )
+
+        day_of_week, seconds = _current_day_and_seconds()
+        state = timetable.state_at(day_of_week, seconds)
+        seconds_to_next_class = state.seconds_to_next_class(seconds)
+
+        # 当天没有课程时不进行课间禁用
+        non_class_time = len(timetable.get_day(day_of_week)) > 0 and (
+            _non_class_time(
+                instant_draw_disable,
+                state.in_class,
+                seconds_to_next_class,
+                pre_class_enable_time,
+            )
+        )
+
+        # 状态在下一个上课/下课时刻或提前解禁时刻改变
+        valid_for = state.valid_until - seconds
+        if seconds_to_next_class > pre_class_enable_time > 0:
+            valid_for = min(valid_for, seconds_to_next_class - pre_class_enable_time)
+
+        return ClassState(
+            self.data_source,
+            state.in_class,
+            non_class_time,
+            state.current_class,
+            state.next_class,
+            now + seconds_to_next_class if state.next_start is not None else None,
+            now + max(valid_for, 1),
+        )
+
+
+class ClassIslandClassStateSource(ClassStateSource):
+    """从 ClassIsland 获取上课状态，课程名称获取失败时回退到 CSES 课程表
+
+    ClassIsland 只提供距离上课的时间，下课时刻无法预知，因此状态最多保留
+    CLASSISLAND_REFRESH_INTERVAL 秒；上下课事件可通过 ClassStateService.notify_changed 推送。
+    """
+
+    data_source = 2
+
+    def __init__(self):
+        self._fallback = CsesClassStateSource()
+
+    def compute(
+        self, instant_draw_disable: bool, pre_class_enable_time: int
+    ) -> ClassState:
+        from app.common.IPC_URL.csharp_ipc_handler import CSharpIPCHandler
+
+        now = time.monotonic()
+        handler = CSharpIPCHandler.instance()
+        is_breaking = False
+        on_class_left_time = 0
+        current_class = ""
+        next_class = ""
+        if handler.is_connected:
+            try:
+                is_breaking = handler.is_breaking()
+                on_class_left_time = handler.get_on_class_left_time()
+                current_class = handler.get_current_class_info().get("name", "")
+                next_class = handler.get_next_class_info().get("name", "")
+            except Exception as e:
+                logger.exception(f"从 ClassIsland 获取上课状态失败: {e}")
+
+        if not current_class or not next_class:
+            fallback = self._fallback.compute(False, 0)
+            current_class = current_class or fallback.current_class
+            next_class = next_class or fallback.next_class
+
+        non_class_time = (
+            instant_draw_disable
+            and is_breaking
+            and not 0 < on_class_left_time <= pre_class_enable_time
+        )
+
+        valid_for = CLASSISLAND_REFRESH_INTERVAL
+        if on_class_left_time > pre_class_enable_time > 0:
+            valid_for = min(valid_for, on_class_left_time - pre_class_enable_time)
+        elif on_class_left_time > 0:
+            valid_for = min(valid_for, on_class_left_time)
+
+        return ClassState(
+            self.data_source,
+            not is_breaking,
+            non_class_time,
+            current_class,
+            next_class,
+            now + on_class_left_time if on_class_left_time > 0 else None,
+            now + max(valid_for, 1),
+        )
+
+
+# ==================================================
+# 上课状态服务
+# ==================================================
+class ClassStateService(QObject):
+    """上课状态服务
+
+    状态只在下一个上课/下课/提前解禁时刻、联动设置变化或数据源推送时重新计算，
+    抽取时直接读取缓存的状态。状态变化时发出 stateChanged。
+    state() 可在任意线程调用；定时器只在主线程运行，
+    状态过期而定时器尚未触发时（如主线程繁忙）读取方会同步重新计算。
+    """
+
+    stateChanged = Signal(object)  # ClassState
+    _rescheduleRequested = Signal()
+
+    def __init__(self, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self._sources = {
+            1: CsesClassStateSource(),
+            2: ClassIslandClassStateSource(),
+        }
+        self._default_source = ClassStateSource()
+        self._state: Optional[ClassState] = None
+        self._lock = threading.RLock()
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.refresh)
+        self._rescheduleRequested.connect(self._arm_timer)
+        get_settings_signals().settingChanged.connect(self._on_setting_changed)
+
+    def state(self) -> ClassState:
+        """获取当前上课状态"""
+        state = self._state
+        if state is not None and time.monotonic() < state.valid_until:
+            return state
+        return self.refresh()
+
+    def refresh(self) -> ClassState:
+        """立即重新计算上课状态"""
+        with self._lock:
+            state = self._compute()
+            previous = self._state
+            self._state = state
+        self._rescheduleRequested.emit()
+        if not state.same_as(previous):
+            logger.debug(
+                f"上课状态变化: 上课={state.in_class}, 课间禁用={state.non_class_time}, "
+                f"当前课程={state.current_class}, 下节课={state.next_class}"
+            )
+            self.stateChanged.emit(state)
+        return state
+
+    def notify_changed(self) -> None:
+        """数据源推送状态变化（可在任意线程调用），下次读取时重新计算"""
+        with self._lock:
+            state = self._state
+            if state is not None:
+                self._state = state._replace(valid_until=0.0)
+        self._rescheduleRequested.emit()
+
+    def _compute(self) -> ClassState:
+        data_source = readme_settings_async("linkage_settings", "data_source") or 0
+        instant_draw_disable = bool(
+            readme_settings_async("linkage_settings", "instant_draw_disable")
+        )
+        pre_class_enable_time = int(
+            readme_settings_async("linkage_settings", "pre_class_enable_time") or 0
+        )
+        source = self._sources.get(data_source, self._default_source)
+        try:
+            return source.compute(instant_draw_disable, pre_class_enable_time)
+        except Exception as e:
+            logger.exception(f"计算上课状态失败: {e}")
+            return self._default_source.compute(False, 0)
+
+    def _arm_timer(self) -> None:
+        """按当前状态的有效期设置定时器（主线程）"""
+        state = self._state
+        if state is None:
+            return
+        remaining = max(0, state.valid_until - time.monotonic())
+        interval = min(int(remaining * 1000) + 1, CLASS_STATE_MAX_TIMER_INTERVAL)
+        self._timer.start(interval)
+
+    def _on_setting_changed(self, first_key: str, second_key: str, value) -> None:
+        if first_key == "linkage_settings":
+            self.refresh()
+
+
+_class_state_service: Optional[ClassStateService] = None
+_class_state_service_lock = threading.Lock()
+
+
+# ==================================================
+# 上课状态获取函数
+# ==================================================
+def get_class_state_service() -> ClassStateService:
+    """获取上课状态服务单例（在 QApplication 所在线程创建）"""
+    global _class_state_service
+    if _class_state_service is None:
+        with _class_state_service_lock:
+            if _class_state_service is None:
+                service = ClassStateService()
+                app = QCoreApplication.instance()
+                if app is not None and service.thread() != app.thread():
+                    service.moveToThread(app.thread())
+                _class_state_service = service
+    return _class_state_service
+
+
+def get_class_state() -> ClassState:
+    """获取当前上课状态"""
+    return get_class_state_service().state()
+
+
+def notify_class_state_changed() -> None:
+    """通知上课状态可能已变化（导入课程表、ClassIsland 推送上下课事件后调用）"""
+    if _class_state_service is not None:
+        _class_state_service.notify_changed()
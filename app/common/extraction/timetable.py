@@ -0,0 +1,225 @@
+# ==================================================
+# 导入模块
+# ==================================================
+import bisect
+import os
+import threading
+from array import array
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from loguru import logger
+
+from app.common.data.file_cache import FileCache
+from app.common.extraction.cses_parser import CSESParser
+from app.tools.path_utils import get_data_path
+
+# 一天的总秒数
+SECONDS_PER_DAY = 24 * 3600
+
+
+# ==================================================
+# 课程表查询结果
+# ==================================================
+class TimetableState(NamedTuple):
+    """某一时刻的课程表状态
+
+    在 [valid_from, valid_until) 内（下一个课程开始/结束时刻之前）保持不变，
+    距离下一节课的秒数由 next_start 与查询时刻计算。
+    """
+
+    current_class: str  # 当前课程名称，不在上课时间段内时为 ""
+    next_class: str  # 下一节课名称，当天没有下一节课时为 ""
+    next_start: Optional[int]  # 下一节课开始时刻（当天秒数），没有下一节课时为 None
+    in_class: bool  # 是否在上课时间段内
+    valid_from: int
+    valid_until: int
+
+    def seconds_to_next_class(self, current_seconds: int) -> int:
+        """距离下一节课的剩余秒数，没有下一节课时返回 0"""
+        if self.next_start is None:
+            return 0
+        return self.next_start - current_seconds
+
+
+# ==================================================
+# 单日课程表
+# ==================================================
+class DayTimetable:
+    """一天的上课时间段，按开始时间排序后保存为按下标对齐的数组
+
+    starts / ends / names 为各节课的开始、结束时刻（当天秒数）和课程名称，
+    max_ends[i] 为前 i + 1 节课结束时刻的最大值，用于在时间段重叠时查找当前课程。
+    boundaries 为所有开始/结束时刻去重排序后的结果，查询结果在相邻两个时刻之间保持不变。
+    """
+
+    def __init__(self, periods: List[tuple]):
+        periods = sorted(periods, key=lambda period: (period[0], period[1]))
+        self.starts = array("l", (start for start, _, _ in periods))
+        self.ends = array("l", (end for _, end, _ in periods))
+        self.names: List[str] = [name for _, _, name in periods]
+        self.max_ends = array("l")
+        max_end = -1
+        for end in self.ends:
+            max_end = max(max_end, end)
+            self.max_ends.append(max_end)
+        self.boundaries = array("l", sorted(set(self.starts) | set(self.ends)))
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def state_at(self, seconds: int) -> TimetableState:
+        """查询指定时刻的课程表状态（二分查找）"""
+        # 开始时刻不晚于当前时刻的课程数量
+        count = bisect.bisect_right(self.starts, seconds)
+
+        current_class = ""
+        in_class = False
+        if count and seconds < self.max_ends[count - 1]:
+            # 多节课重叠时取开始最早的一节
+            for index in range(count):
+                if seconds < self.ends[index]:
+                    current_class = self.names[index]
+                    in_class = True
+                    break
+
+        if count < len(self.starts):
+            next_class = self.names[count]
+            next_start = self.starts[count]
+        else:
+            next_class = ""
+            next_start = None
+
+        position = bisect.bisect_right(self.boundaries, seconds)
+        valid_from = self.boundaries[position - 1] if position else 0
+        valid_until = (
+            self.boundaries[position]
+            if position < len(self.boundaries)
+            else SECONDS_PER_DAY
+        )
+        return TimetableState(
+            current_class, next_class, next_start, in_class, valid_from, valid_until
+        )
+
+
+# ==================================================
+# 编译后的课程表
+# ==================================================
+class CompiledTimetable:
+    """解析一次 CSES 文件后得到的课程表
+
+    parser 为已加载的 CSESParser（共享对象，调用方不得修改），
+    days 为星期几（1=星期一，7=星期日）到单日课程表的映射。
+    单周/双周课程与原有逻辑一致按“所有周”合并。
+    """
+
+    def __init__(self, parser: CSESParser):
+        self.parser = parser
+        periods_by_day: Dict[Any, List[tuple]] = {}
+        for class_info in parser.get_class_info():
+            start_time_str = class_info.get("start_time", "")
+            end_time_str = class_info.get("end_time", "")
+            if not start_time_str or not end_time_str:
+                continue
+            try:
+                start_seconds = parse_time_string_to_seconds(start_time_str)
+                end_seconds = parse_time_string_to_seconds(end_time_str)
+            except Exception as e:
+                logger.exception(
+                    f"解析时间段失败: {class_info.get('name', '')} = "
+                    f"{start_time_str}-{end_time_str}, 错误: {e}"
+                )
+                continue
+            periods_by_day.setdefault(class_info.get("day_of_week"), []).append(
+                (start_seconds, end_seconds, class_info.get("name", ""))
+            )
+        self.days: Dict[Any, DayTimetable] = {
+            day: DayTimetable(periods) for day, periods in periods_by_day.items()
+        }
+        self._empty_day = DayTimetable([])
+        self._state_cache: Optional[tuple] = None
+        self._lock = threading.Lock()
+
+    def get_day(self, day_of_week: int) -> DayTimetable:
+        """获取指定星期几的课程表，没有课程时返回空课程表"""
+        return self.days.get(day_of_week, self._empty_day)
+
+    def state_at(self, day_of_week: int, seconds: int) -> TimetableState:
+        """查询指定时刻的课程表状态，结果缓存到下一个课程开始/结束时刻"""
+        with self._lock:
+            cached = self._state_cache
+            if (
+                cached is not None
+                and cached[0] == day_of_week
+                and cached[1].valid_from <= seconds < cached[1].valid_until
+            ):
+                return cached[1]
+        state = self.get_day(day_of_week).state_at(seconds)
+        with self._lock:
+            self._state_cache = (day_of_week, state)
+        return state
+
+
+def parse_time_string_to_seconds(time_str: str) -> int:
+    """将时间字符串转换为总秒数
+
+    Args:
+        time_str: 时间字符串，格式为 "HH:MM:SS" 或 "HH:MM"
+
+    Returns:
+        int: 时间的总秒数
+
+    Raises:
+        ValueError: 如果时间字符串格式不正确
+    """
+    time_parts = list(map(int, time_str.split(":")))
+
+    if len(time_parts) < 2 or len(time_parts) > 3:
+        raise ValueError(f"时间字符串格式不正确: {time_str}")
+
+    hours = time_parts[0]
+    minutes = time_parts[1]
+    seconds = time_parts[2] if len(time_parts) > 2 else 0
+
+    return hours * 3600 + minutes * 60 + seconds
+
+
+_timetable_cache = FileCache("cses_timetable", 1)
+
+
+# ==================================================
+# 课程表获取函数
+# ==================================================
+def get_cses_file_path():
+    """获取已导入的 CSES 课程表文件路径"""
+    return get_data_path("CSES", "cses_schedule.yml")
+
+
+def get_timetable() -> Optional[CompiledTimetable]:
+    """获取编译后的课程表（按 CSES 文件变化缓存，共享对象，调用方不得修改）
+
+    Returns:
+        Optional[CompiledTimetable]: 课程表，CSES 文件不存在或加载失败时返回 None
+    """
+    cses_file_path = get_cses_file_path()
+
+    def load_timetable() -> Optional[CompiledTimetable]:
+        if not os.path.exists(cses_file_path):
+            logger.info("CSES文件不存在")
+            return None
+        parser = CSESParser()
+        if not parser.load_from_file(str(cses_file_path)):
+            # 加载失败的结果同样缓存，文件变化后再重新加载
+            logger.exception(f"加载CSES文件失败: {cses_file_path}")
+            return None
+        return CompiledTimetable(parser)
+
+    try:
+        return _timetable_cache.get("cses", [cses_file_path], load_timetable)
+    except Exception as e:
+        logger.exception(f"获取CSES课程表失败: {e}")
+        return None
+
+
+def invalidate_timetable() -> None:
+    """使课程表缓存失效（导入新的 CSES 文件后调用）"""
+    _timetable_cache.invalidate()
@@ -2,9 +2,10 @@
 # 导入库
 # ==================================================
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from loguru import logger
 from app.common.history import *
+from app.common.fair_draw.draw_config import DrawConfig
 from app.tools.settings_access import readme_settings_async
 
 
@@ -82,6 +83,7 @@ def apply_avg_gap_protection(
     class_name: str,
     history_type: str = "roll_call",
     subject_filter: str = "",
+    draw_config: Optional[DrawConfig] = None,
 ) -> List[Dict[str, Any]]:
     """
     应用平均值过滤 + 最大差距保护的公平抽取逻辑
@@ -91,17 +93,26 @@ def apply_avg_gap_protection(
         class_name: 班级名称
         history_type: 历史记录类型，默认为"roll_call"
         subject_filter: 科目过滤，如果指定则只计算该科目的历史记录
+        draw_config: 抽取设置快照（可选，未提供时从当前设置读取）
     Returns:
         处理后的候选池
     """
+    # 集中获取所有配置
+    if draw_config is not None:
+        enabled = draw_config.enable_avg_gap_protection
+        gap_threshold = draw_config.gap_threshold
+        min_pool_size = draw_config.min_pool_size
+    else:
+        enabled = readme_settings_async(
+            "fair_draw_settings", "enable_avg_gap_protection"
+        )
+        gap_threshold = readme_settings_async("fair_draw_settings", "gap_threshold")
+        min_pool_size = readme_settings_async("fair_draw_settings", "min_pool_size")
+
     # 检查功能是否启用
-    if not readme_settings_async("fair_draw_settings", "enable_avg_gap_protection"):
+    if not enabled:
         return candidates
 
-    # 集中获取所有配置
-    gap_threshold = readme_settings_async("fair_draw_settings", "gap_threshold")
-    min_pool_size = readme_settings_async("fair_draw_settings", "min_pool_size")
-
     logger.debug(
         f"应用平均值差值保护，抽取人数: {draw_count}, 差距阈值: {gap_threshold}, 最小池大小: {min_pool_size}"
     )
@@ -114,7 +125,7 @@ def apply_avg_gap_protection(
     try:
         # Step 1: 获取当前抽取单位的次数
         # 加载历史记录
-        history_data = load_history_data(history_type, class_name)
+        history_data = load_history_data(history_type, class_name, readonly=True)
         # 初始化学生抽取次数字典
         student_counts = {}
         for student in candidates:
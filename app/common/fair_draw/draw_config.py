@@ -0,0 +1,199 @@
+# ==================================================
+# 导入库
+# ==================================================
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Dict, Mapping
+
+from loguru import logger
+
+from app.tools.settings_access import readme_settings_async
+from app.Language.obtain_language import get_content_combo_name_async
+from app.common.behind_scenes.behind_scenes_utils import BehindScenesUtils
+
+
+# ==================================================
+# 抽取配置快照
+# ==================================================
+@dataclass(frozen=True)
+class DrawConfig:
+    """一次抽取（或一次动画会话）使用的不可变设置快照
+
+    所有与抽取相关的设置在构建时一次性解析（包括默认值），
+    之后沿抽取流程显式传递，保证同一次抽取内各环节看到的设置一致。
+    """
+
+    # 点名设置
+    draw_type: int = 0
+    half_repeat: int = 0
+
+    # 公平抽取设置
+    fair_draw_enabled: bool = False
+    fair_draw_group_enabled: bool = False
+    fair_draw_gender_enabled: bool = False
+    fair_draw_time_enabled: bool = False
+    base_weight: float = 1.0
+    min_weight: float = 0.1
+    max_weight: float = 5.0
+    frequency_function: int = 1
+    frequency_weight: float = 1.0
+    group_weight: float = 1.0
+    gender_weight: float = 1.0
+    time_weight: float = 1.0
+    cold_start_enabled: bool = False
+    cold_start_rounds: int = 10
+    shield_enabled: bool = False
+    shield_time: float = 0
+    shield_time_unit: int = 0
+
+    # 平均值差值保护设置
+    enable_avg_gap_protection: bool = False
+    gap_threshold: int = 1
+    min_pool_size: int = 5
+
+    # 课程联动设置
+    subject_history_filter_enabled: bool = False
+    data_source: int = 0
+    current_class_info: Mapping[str, Any] = field(
+        default_factory=lambda: MappingProxyType({})
+    )
+
+    # 下拉框“全部”选项文本（用于判断历史记录是否带有小组/性别限制）
+    all_group_label: str = ""
+    all_gender_label: str = ""
+
+    # 内幕设置快照
+    behind_scenes_settings: Mapping[str, Any] = field(
+        default_factory=lambda: MappingProxyType({})
+    )
+
+    @property
+    def subject_filter(self) -> str:
+        """当前课程名称，未启用科目过滤或无课程信息时为空字符串"""
+        return self.current_class_info.get("name", "") or ""
+
+    @classmethod
+    def from_settings(
+        cls, settings_group: str = "roll_call_settings", resolve_subject: bool = True
+    ) -> "DrawConfig":
+        """从当前设置构建快照
+
+        Args:
+            settings_group: 读取 draw_type/half_repeat 的设置组
+            resolve_subject: 是否解析当前课程信息（仅在启用科目历史过滤时生效）
+
+        Returns:
+            DrawConfig: 设置快照
+        """
+
+        def fair(key, fallback):
+            return readme_settings_async("fair_draw_settings", key) or fallback
+
+        subject_history_filter_enabled = (
+            readme_settings_async("linkage_settings", "subject_history_filter_enabled")
+            or False
+        )
+        data_source = readme_settings_async("linkage_settings", "data_source") or 0
+
+        current_class_info = {}
+        if resolve_subject and subject_history_filter_enabled:
+            current_class_info = resolve_current_class_info(data_source)
+
+        range_items = get_content_combo_name_async("roll_call", "range_combobox") or [
+            ""
+        ]
+        gender_items = get_content_combo_name_async("roll_call", "gender_combobox") or [
+            ""
+        ]
+
+        return cls(
+            draw_type=readme_settings_async(settings_group, "draw_type") or 0,
+            half_repeat=readme_settings_async(settings_group, "half_repeat") or 0,
+            fair_draw_enabled=fair("fair_draw", False),
+            fair_draw_group_enabled=fair("fair_draw_group", False),
+            fair_draw_gender_enabled=fair("fair_draw_gender", False),
+            fair_draw_time_enabled=fair("fair_draw_time", False),
+            base_weight=fair("base_weight", 1.0),
+            min_weight=fair("min_weight", 0.1),
+            max_weight=fair("max_weight", 5.0),
+            frequency_function=fair("frequency_function", 1),
+            frequency_weight=fair("frequency_weight", 1.0),
+            group_weight=fair("group_weight", 1.0),
+            gender_weight=fair("gender_weight", 1.0),
+            time_weight=fair("time_weight", 1.0),
+            cold_start_enabled=fair("cold_start_enabled", False),
+            cold_start_rounds=fair("cold_start_rounds", 10),
+            shield_enabled=readme_settings_async("advanced_settings", "shield_enabled")
+            or False,
+            shield_time=readme_settings_async("advanced_settings", "shield_time") or 0,
+            shield_time_unit=readme_settings_async(
+                "advanced_settings", "shield_time_unit"
+            )
+            or 0,
+            enable_avg_gap_protection=bool(
+                readme_settings_async("fair_draw_settings", "enable_avg_gap_protection")
+            ),
+            gap_threshold=readme_settings_async("fair_draw_settings", "gap_threshold"),
+            min_pool_size=readme_settings_async("fair_draw_settings", "min_pool_size"),
+            subject_history_filter_enabled=subject_history_filter_enabled,
+            data_source=data_source,
+            current_class_info=MappingProxyType(dict(current_class_info or {})),
+            all_group_label=range_items[0],
+            all_gender_label=gender_items[0],
+            behind_scenes_settings=MappingProxyType(
+                dict(BehindScenesUtils.get_behind_scenes_settings() or {})
+            ),
+        )
+
+    def weight_settings(self) -> Dict[str, Any]:
+        """返回 calculate_weight 使用的权重配置字典"""
+        return {
+            "fair_draw_enabled": self.fair_draw_enabled,
+            "fair_draw_group_enabled": self.fair_draw_group_enabled,
+            "fair_draw_gender_enabled": self.fair_draw_gender_enabled,
+            "fair_draw_time_enabled": self.fair_draw_time_enabled,
+            "base_weight": self.base_weight,
+            "min_weight": self.min_weight,
+            "max_weight": self.max_weight,
+            "frequency_function": self.frequency_function,
+            "frequency_weight": self.frequency_weight,
+            "group_weight": self.group_weight,
+            "gender_weight": self.gender_weight,
+            "time_weight": self.time_weight,
+            "cold_start_enabled": self.cold_start_enabled,
+            "cold_start_rounds": self.cold_start_rounds,
+            "shield_enabled": self.shield_enabled,
+            "shield_time": self.shield_time,
+            "shield_time_unit": self.shield_time_unit,
+        }
+
+
+# ==================================================
+# 课程信息解析函数
+# ==================================================
+def resolve_current_class_info(data_source: int) -> Dict[str, Any]:
+    """按数据源获取当前课程信息，课间时段归属到下节课
+
+    Args:
+        data_source: 数据源（0=未启用, 1=CSES 文件, 2=ClassIsland）
+
+    Returns:
+        Dict[str, Any]: 课程信息字典，无法获取时返回空字典
+    """
+    from app.common.extraction.class_state import get_class_state
+
+    if data_source == 0:
+        return {}
+
+    try:
+        state = get_class_state()
+
+        current_class_info = state.current_class_info()
+        # 如果当前没有课程信息（课间时段），则使用课间归属的课程信息
+        if not current_class_info and state.non_class_time:
+            current_class_info = state.break_assignment_class_info()
+
+        return dict(current_class_info or {})
+    except Exception as e:
+        logger.exception(f"获取当前课程信息失败: {e}")
+        return {}
@@ -0,0 +1,162 @@
+# ==================================================
+# 导入库
+# ==================================================
+from random import SystemRandom
+from typing import List, Optional, Sequence
+
+from loguru import logger
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy 不可用时退回纯 Python 实现
+    np = None
+
+
+system_random = SystemRandom()
+
+# 候选数量达到该值时使用 NumPy 向量化实现
+NUMPY_MIN_POOL_SIZE = 512
+
+
+# ==================================================
+# 树状数组（Fenwick 树）
+# ==================================================
+class _FenwickTree:
+    """保存权重前缀和的树状数组，支持 O(log n) 的按权重定位与删除"""
+
+    __slots__ = ("size", "tree", "weights", "top_bit")
+
+    def __init__(self, weights: Sequence[float]):
+        self.size = len(weights)
+        self.weights = list(weights)
+        self.tree = [0.0] + self.weights
+        # O(n) 建树
+        for i in range(1, self.size + 1):
+            parent = i + (i & -i)
+            if parent <= self.size:
+                self.tree[parent] += self.tree[i]
+        self.top_bit = 1 << (self.size.bit_length() - 1) if self.size else 0
+
+    def remove(self, index: int) -> None:
+        """将指定下标的权重置零"""
+        delta = -self.weights[index]
+        self.weights[index] = 0.0
+        i = index + 1
+        while i <= self.size:
+            self.tree[i] += delta
+            i += i & -i
+
+    def find(self, value: float) -> int:
+        """返回前缀和首次达到 value 的下标（value 需大于 0）"""
+        pos = 0
+        step = self.top_bit
+        while step:
+            next_pos = pos + step
+            if next_pos <= self.size and self.tree[next_pos] < value:
+                pos = next_pos
+                value -= self.tree[next_pos]
+            step >>= 1
+        return pos
+
+
+# ==================================================
+# 加权不放回抽样函数
+# ==================================================
+def weighted_sample_indices(
+    weights: Sequence[float], count: int, rng: Optional[SystemRandom] = None
+) -> List[int]:
+    """按权重不放回地抽取下标
+
+    与逐个"累加权重线性扫描 + pop"的抽取方式分布一致：每一步按剩余权重成比例抽取，
+    剩余权重全部为 0 时在剩余候选中等概率抽取。负权重按 0 处理。
+
+    Args:
+        weights: 权重列表
+        count: 抽取数量
+        rng: 随机数生成器，默认使用 SystemRandom
+
+    Returns:
+        List[int]: 按抽中顺序排列的下标列表
+    """
+    if rng is None:
+        rng = system_random
+
+    size = len(weights)
+    count = min(count, size)
+    if count <= 0:
+        return []
+
+    clean_weights = [float(w) if w and w > 0 else 0.0 for w in weights]
+
+    if np is not None and size >= NUMPY_MIN_POOL_SIZE:
+        try:
+            return _weighted_sample_indices_numpy(clean_weights, count, rng)
+        except Exception as e:
+            logger.exception(f"NumPy 加权抽样失败，使用纯 Python 实现: {e}")
+
+    selected = []
+    positive_count = sum(1 for w in clean_weights if w > 0)
+    if positive_count:
+        tree = _FenwickTree(clean_weights)
+        total_weight = sum(clean_weights)
+        while len(selected) < count and positive_count:
+            # 取值范围 (0, total]，避免选中权重为 0 的候选
+            value = total_weight * (1.0 - rng.random())
+            index = tree.find(value)
+            if index >= size or tree.weights[index] <= 0:
+                # 浮点误差导致越界时，退回到最后一个仍有权重的候选
+                index = max(i for i in range(size) if tree.weights[i] > 0)
+            selected.append(index)
+            total_weight -= tree.weights[index]
+            tree.remove(index)
+            positive_count -= 1
+
+    if len(selected) < count:
+        chosen = set(selected)
+        remaining = [i for i in range(size) if i not in chosen]
+        selected.extend(rng.sample(remaining, count - len(selected)))
+
+    return selected
+
+
+def _weighted_sample_indices_numpy(
+    weights: List[float], count: int, rng: SystemRandom
+) -> List[int]:
+    """NumPy 实现：为每个候选生成 Exp(1)/w 的排序键，取最小的 count 个
+
+    该方法与逐个按权重抽取等价，权重为 0 的候选排在最后并随机打乱。
+    随机数生成器的种子取自 rng。
+    """
+    generator = np.random.default_rng(rng.getrandbits(128))
+    weight_array = np.asarray(weights, dtype=np.float64)
+    positive = weight_array > 0
+
+    keys = np.full(weight_array.shape, np.inf)
+    keys[positive] = (
+        generator.standard_exponential(int(positive.sum())) / weight_array[positive]
+    )
+    tie_breaker = generator.permutation(weight_array.size)
+
+    order = np.lexsort((tie_breaker, keys))
+    return [int(i) for i in order[:count]]
+
+
+def uniform_sample_indices(
+    size: int, count: int, rng: Optional[SystemRandom] = None
+) -> List[int]:
+    """等概率不放回地抽取下标
+
+    Args:
+        size: 候选数量
+        count: 抽取数量
+        rng: 随机数生成器，默认使用 SystemRandom
+
+    Returns:
+        List[int]: 按抽中顺序排列的下标列表
+    """
+    if rng is None:
+        rng = system_random
+    count = min(count, size)
+    if count <= 0:
+        return []
+    return rng.sample(range(size), count)
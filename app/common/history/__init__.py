@@ -6,9 +6,16 @@
 # 文件工具
 from app.common.history.file_utils import (
     get_history_file_path,
+    get_history_log_path,
     load_history_data,
     save_history_data,
+    append_history_event,
+    compact_history_data,
+    delete_history_data,
     get_all_history_names,
+    get_history_cache_stats,
+    reset_history_cache_stats,
+    invalidate_history_cache,
 )
 
 # 统计函数
@@ -27,6 +34,7 @@ from app.common.history.roll_call_history import save_roll_call_history
 # 权重工具
 from app.common.history.weight_utils import (
     format_weight_for_display,
+    format_weight_values_for_display,
     calculate_weight,
 )
 
@@ -37,6 +45,21 @@ from app.common.history.utils import (
     create_table_item,
 )
 
+# 会话索引
+from app.common.history.session_index import (
+    SessionIndex,
+    get_session_index,
+    record_sessions,
+    invalidate_session_index,
+)
+
+# 表格模型
+from app.common.history.table_model import (
+    HistoryRowStore,
+    LazyRowStore,
+    HistoryTableModel,
+)
+
 # 历史记录读取工具
 from app.common.history.history_reader import (
     # 点名历史读取
@@ -59,9 +82,16 @@ from app.common.history.history_reader import (
 __all__ = [
     # 文件工具
     "get_history_file_path",
+    "get_history_log_path",
     "load_history_data",
     "save_history_data",
+    "append_history_event",
+    "compact_history_data",
+    "delete_history_data",
     "get_all_history_names",
+    "get_history_cache_stats",
+    "reset_history_cache_stats",
+    "invalidate_history_cache",
     # 统计函数
     "get_name_history",
     "get_draw_sessions_history",
@@ -72,11 +102,21 @@ __all__ = [
     "save_roll_call_history",
     # 权重工具
     "format_weight_for_display",
+    "format_weight_values_for_display",
     "calculate_weight",
     # 辅助函数
     "get_all_names",
     "format_table_item",
     "create_table_item",
+    # 会话索引
+    "SessionIndex",
+    "get_session_index",
+    "record_sessions",
+    "invalidate_session_index",
+    # 表格模型
+    "HistoryRowStore",
+    "LazyRowStore",
+    "HistoryTableModel",
     # 历史记录读取工具
     "get_roll_call_student_list",
     "get_roll_call_history_data",
@@ -0,0 +1,379 @@
+# ==================================================
+# 导入库
+# ==================================================
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from loguru import logger
+
+from app.common.history.file_utils import (
+    get_history_file_path,
+    get_history_signature,
+    load_history_data,
+)
+
+# 索引格式版本，结构变化时递增以触发重建
+AGGREGATE_INDEX_VERSION = 1
+
+# 内存中的最新索引（最近一次抽取、重建或从磁盘读取的结果；历史记录可能仍在后台写入，
+# 磁盘签名尚未更新，因此以 log_seq 校验）
+_recent_aggregates: Dict[str, Dict[str, Any]] = {}
+_index_write_lock = threading.Lock()
+
+
+# ==================================================
+# 点名历史聚合索引
+# ==================================================
+# 聚合索引保存在历史记录文件旁（<班级>.index），记录每个学生的累计统计：
+#   total_count / group_count / gender_count / last_drawn_time / rounds_missed
+#   以及按科目划分的 total_count / group_count / gender_count
+# 权重计算只需读取索引，复杂度与学生人数相关，而与历史记录条数无关。
+# 索引中保存了对应历史记录文件及追加日志的签名（mtime + size），历史记录被其他途径修改时自动重建。
+
+
+def get_aggregate_index_path(class_name: str) -> Path:
+    """获取点名历史聚合索引文件路径
+
+    Args:
+        class_name: 班级名称
+
+    Returns:
+        Path: 索引文件路径
+    """
+    return get_history_file_path("roll_call", class_name).with_suffix(".index")
+
+
+def _get_history_signature(class_name: str) -> Optional[list]:
+    """获取历史记录文件及其追加日志的签名（可直接存入 JSON），历史记录文件不存在时返回 None"""
+    signature = get_history_signature("roll_call", class_name)
+    if signature[0] is None:
+        return None
+    return [list(item) if item else None for item in signature]
+
+
+def _new_student_aggregate() -> Dict[str, Any]:
+    return {
+        "total_count": 0,
+        "group_count": 0,
+        "gender_count": 0,
+        "last_drawn_time": "",
+        "rounds_missed": 0,
+        "subjects": {},
+    }
+
+
+def _new_aggregates(all_group_label: str, all_gender_label: str) -> Dict[str, Any]:
+    return {
+        "version": AGGREGATE_INDEX_VERSION,
+        "all_group_label": all_group_label,
+        "all_gender_label": all_gender_label,
+        "signature": None,
+        "log_seq": 0,
+        "students": {},
+        "group_stats": {},
+        "gender_stats": {},
+        "total_stats": 0,
+        "subject_stats": {},
+    }
+
+
+def _count_record(
+    aggregate: Dict[str, Any],
+    record: Dict[str, Any],
+    all_group_label: str,
+    all_gender_label: str,
+) -> None:
+    """将一条历史记录计入学生聚合（小组/性别限制次数及科目统计）"""
+    draw_group = record.get("draw_group", "")
+    draw_gender = record.get("draw_gender", "")
+    group_restricted = bool(draw_group) and draw_group != all_group_label
+    gender_restricted = bool(draw_gender) and draw_gender != all_gender_label
+
+    if group_restricted:
+        aggregate["group_count"] += 1
+    if gender_restricted:
+        aggregate["gender_count"] += 1
+
+    subject_name = record.get("class_name", "")
+    if subject_name:
+        subject = aggregate["subjects"].setdefault(
+            subject_name, {"total_count": 0, "group_count": 0, "gender_count": 0}
+        )
+        subject["total_count"] += 1
+        if group_restricted:
+            subject["group_count"] += 1
+        if gender_restricted:
+            subject["gender_count"] += 1
+
+
+def _sync_summary(aggregates: Dict[str, Any], history_data: Dict[str, Any]) -> None:
+    """同步历史记录中无需逐条统计的字段（总次数、最后抽取时间、未选中轮数、全局统计）"""
+    students = aggregates["students"]
+    for student_name, student_info in history_data.get("students", {}).items():
+        if not isinstance(student_info, dict):
+            continue
+        aggregate = students.setdefault(student_name, _new_student_aggregate())
+        aggregate["total_count"] = student_info.get("total_count", 0)
+        aggregate["last_drawn_time"] = student_info.get("last_drawn_time", "")
+        aggregate["rounds_missed"] = student_info.get("rounds_missed", 0)
+
+    aggregates["group_stats"] = dict(history_data.get("group_stats", {}))
+    aggregates["gender_stats"] = dict(history_data.get("gender_stats", {}))
+    aggregates["total_stats"] = history_data.get("total_stats", 0)
+    aggregates["log_seq"] = history_data.get("log_seq", 0)
+    aggregates["subject_stats"] = json.loads(
+        json.dumps(history_data.get("subject_stats", {}), ensure_ascii=False)
+    )
+
+
+def build_aggregates(
+    history_data: Dict[str, Any], all_group_label: str, all_gender_label: str
+) -> Dict[str, Any]:
+    """从完整的历史记录数据重建聚合索引
+
+    Args:
+        history_data: 点名历史记录数据
+        all_group_label: 小组下拉框“全部”选项文本
+        all_gender_label: 性别下拉框“全部”选项文本
+
+    Returns:
+        Dict[str, Any]: 聚合索引
+    """
+    aggregates = _new_aggregates(all_group_label, all_gender_label)
+    students_history = history_data.get("students", {})
+    if isinstance(students_history, dict):
+        for student_name, student_info in students_history.items():
+            if not isinstance(student_info, dict):
+                continue
+            aggregate = aggregates["students"].setdefault(
+                student_name, _new_student_aggregate()
+            )
+            history = student_info.get("history", [])
+            if isinstance(history, list):
+                for record in history:
+                    if isinstance(record, dict):
+                        _count_record(
+                            aggregate, record, all_group_label, all_gender_label
+                        )
+    _sync_summary(aggregates, history_data)
+    return aggregates
+
+
+def load_aggregates(
+    class_name: str,
+    all_group_label: str,
+    all_gender_label: str,
+    history_data: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """加载点名历史聚合索引，索引缺失或过期时从历史记录重建并保存
+
+    返回的索引为共享对象，调用方不得修改（需要修改时先复制）。
+
+    Args:
+        class_name: 班级名称
+        all_group_label: 小组下拉框“全部”选项文本
+        all_gender_label: 性别下拉框“全部”选项文本
+        history_data: 已加载的历史记录数据（可选，重建时避免重复读取）
+
+    Returns:
+        Dict[str, Any]: 聚合索引
+    """
+    recent = _recent_aggregates.get(class_name)
+    if recent is not None:
+        # 本进程内已有抽取记录，以 log_seq 校验（不依赖磁盘上可能尚未写入的文件）
+        if history_data is None:
+            history_data = load_history_data("roll_call", class_name, readonly=True)
+        if (
+            recent.get("all_group_label") == all_group_label
+            and recent.get("all_gender_label") == all_gender_label
+            and recent.get("log_seq", 0) == history_data.get("log_seq", 0)
+        ):
+            return recent
+        return _rebuild_aggregates(
+            class_name, all_group_label, all_gender_label, history_data
+        )
+
+    signature = _get_history_signature(class_name)
+    if signature is None:
+        return _new_aggregates(all_group_label, all_gender_label)
+
+    index_path = get_aggregate_index_path(class_name)
+    try:
+        if index_path.exists():
+            with open(index_path, "r", encoding="utf-8") as f:
+                aggregates = json.load(f)
+            if (
+                aggregates.get("version") == AGGREGATE_INDEX_VERSION
+                and aggregates.get("all_group_label") == all_group_label
+                and aggregates.get("all_gender_label") == all_gender_label
+                and aggregates.get("signature") == signature
+            ):
+                # 之后的调用直接使用内存中的索引，无需重复读取索引文件
+                _recent_aggregates[class_name] = aggregates
+                return aggregates
+    except Exception as e:
+        logger.exception(f"读取点名历史聚合索引失败，将重新构建: {e}")
+
+    return _rebuild_aggregates(
+        class_name, all_group_label, all_gender_label, history_data
+    )
+
+
+def _rebuild_aggregates(
+    class_name: str,
+    all_group_label: str,
+    all_gender_label: str,
+    history_data: Optional[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """从历史记录重建聚合索引并保存"""
+    if history_data is None:
+        history_data = load_history_data("roll_call", class_name, readonly=True)
+
+    aggregates = build_aggregates(history_data, all_group_label, all_gender_label)
+    _recent_aggregates[class_name] = aggregates
+    save_aggregates(class_name, aggregates)
+    return aggregates
+
+
+def copy_aggregates_for_draw(
+    aggregates: Dict[str, Any], student_names: Iterable[str]
+) -> Dict[str, Any]:
+    """复制聚合索引中会被 record_draw 修改的部分
+
+    record_draw 会同步每名学生的累计字段，因此逐个浅复制学生聚合；
+    只有本次被抽中的学生的科目统计需要另行复制。
+
+    Args:
+        aggregates: 共享的聚合索引（不会被修改）
+        student_names: 本次被抽中的学生名称
+
+    Returns:
+        Dict[str, Any]: 可以传给 record_draw 的聚合索引副本
+    """
+    copied = dict(aggregates)
+    students = {
+        student_name: dict(aggregate)
+        for student_name, aggregate in aggregates.get("students", {}).items()
+    }
+    for student_name in student_names:
+        aggregate = students.get(student_name)
+        if aggregate is not None:
+            aggregate["subjects"] = {
+                subject: dict(subject_aggregate)
+                for subject, subject_aggregate in aggregate.get("subjects", {}).items()
+            }
+    copied["students"] = students
+    return copied
+
+
+def record_draw(
+    class_name: str,
+    aggregates: Dict[str, Any],
+    history_data: Dict[str, Any],
+    new_records: Iterable[Tuple[str, Dict[str, Any]]],
+) -> None:
+    """将本次抽取追加的历史记录计入聚合索引，并作为该班级的最新内存索引
+
+    Args:
+        class_name: 班级名称
+        aggregates: 抽取前聚合索引的副本（由 copy_aggregates_for_draw 复制，之后不应再修改）
+        history_data: 已写入本次抽取结果的历史记录数据
+        new_records: 本次新增的 (学生名称, 历史记录条目) 列表
+    """
+    all_group_label = aggregates["all_group_label"]
+    all_gender_label = aggregates["all_gender_label"]
+    for student_name, record in new_records:
+        aggregate = aggregates["students"].setdefault(
+            student_name, _new_student_aggregate()
+        )
+        _count_record(aggregate, record, all_group_label, all_gender_label)
+    _sync_summary(aggregates, history_data)
+    _recent_aggregates[class_name] = aggregates
+
+
+def invalidate_aggregates(class_name: Optional[str] = None) -> None:
+    """丢弃内存中的聚合索引（历史记录被删除后调用）
+
+    Args:
+        class_name: 班级名称，None 表示全部班级
+    """
+    if class_name is None:
+        _recent_aggregates.clear()
+    else:
+        _recent_aggregates.pop(class_name, None)
+
+
+def save_aggregates(class_name: str, aggregates: Dict[str, Any]) -> bool:
+    """保存聚合索引，并将其与当前历史记录文件签名绑定
+
+    Args:
+        class_name: 班级名称
+        aggregates: 聚合索引
+
+    Returns:
+        bool: 保存是否成功
+    """
+    signature = _get_history_signature(class_name)
+    aggregates["signature"] = signature
+    return _write_aggregates(get_aggregate_index_path(class_name), aggregates)
+
+
+def _write_aggregates(index_path: Path, aggregates: Dict[str, Any]) -> bool:
+    temp_path = index_path.with_suffix(".index.tmp")
+    try:
+        with _index_write_lock:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(aggregates, f, ensure_ascii=False)
+            os.replace(temp_path, index_path)
+        return True
+    except Exception as e:
+        logger.exception(f"保存点名历史聚合索引失败: {e}")
+        return False
+
+
+def get_weight_view(aggregates: Dict[str, Any], subject: str = "") -> Dict[str, Any]:
+    """获取权重计算所需的统计视图
+
+    结果与 filter_roll_call_history_by_subject 过滤后的历史记录统计一致：
+    指定科目时只包含在该科目下有记录的学生，小组/性别统计取自该科目。
+
+    Args:
+        aggregates: 聚合索引
+        subject: 科目名称（可选）
+
+    Returns:
+        Dict[str, Any]: 包含 students / group_stats / gender_stats / total_stats
+    """
+    if not subject:
+        return {
+            "students": aggregates.get("students", {}),
+            "group_stats": aggregates.get("group_stats", {}),
+            "gender_stats": aggregates.get("gender_stats", {}),
+            "total_stats": aggregates.get("total_stats", 0),
+        }
+
+    students = {}
+    for student_name, aggregate in aggregates.get("students", {}).items():
+        subject_aggregate = aggregate.get("subjects", {}).get(subject)
+        if not subject_aggregate or not subject_aggregate.get("total_count"):
+            continue
+        students[student_name] = {
+            "total_count": subject_aggregate.get("total_count", 0),
+            "group_count": subject_aggregate.get("group_count", 0),
+            "gender_count": subject_aggregate.get("gender_count", 0),
+            "last_drawn_time": aggregate.get("last_drawn_time", ""),
+            "rounds_missed": aggregate.get("rounds_missed", 0),
+        }
+
+    subject_data = aggregates.get("subject_stats", {}).get(subject)
+    if not isinstance(subject_data, dict):
+        subject_data = {}
+    return {
+        "students": students,
+        "group_stats": subject_data.get("group_stats", {}),
+        "gender_stats": subject_data.get("gender_stats", {}),
+        "total_stats": subject_data.get("total_stats", 0),
+    }
@@ -1,14 +1,108 @@
 # ==================================================
 # 导入库
 # ==================================================
+import copy
 import json
-from typing import Dict, List, Any
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Tuple
 from pathlib import Path
 
 from loguru import logger
 
 from app.tools.path_utils import get_path
 
+# 追加日志超过该大小（字节）时合并到历史记录文件
+HISTORY_LOG_COMPACT_SIZE = 256 * 1024
+
+# 解析后历史记录缓存的最大条目数
+HISTORY_CACHE_MAX_ENTRIES = 16
+
+
+# ==================================================
+# 历史记录解析缓存
+# ==================================================
+class HistoryCache:
+    """按 (类型, 名称) 缓存解析后的历史记录，以文件签名（mtime + size）校验有效性
+
+    缓存中的文档为共享对象：只读调用方可直接使用，需要修改的调用方应获取副本。
+    尚未写入磁盘的文档以“固定”条目保存（不校验签名、不被淘汰），直到写入完成。
+    """
+
+    def __init__(self, max_entries: int = HISTORY_CACHE_MAX_ENTRIES):
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[tuple, Dict[str, Any]]]" = (
+            OrderedDict()
+        )
+        self._pinned: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._lock = threading.RLock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: Tuple[str, str], signature: tuple) -> Optional[Dict[str, Any]]:
+        """获取签名匹配的缓存文档，未命中时返回 None"""
+        with self._lock:
+            pinned = self._pinned.get(key)
+            if pinned is not None:
+                self._hits += 1
+                return pinned
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == signature:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry[1]
+            self._misses += 1
+            return None
+
+    def put(self, key: Tuple[str, str], signature: tuple, data: Dict[str, Any]):
+        """写入缓存文档，超出容量时淘汰最久未使用的条目"""
+        with self._lock:
+            self._entries[key] = (signature, data)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def pin(self, key: Tuple[str, str], data: Dict[str, Any]):
+        """固定尚未写入磁盘的最新文档"""
+        with self._lock:
+            self._pinned[key] = data
+
+    def unpin(self, key: Tuple[str, str], data: Dict[str, Any], signature: tuple):
+        """文档写入完成后取消固定；期间若已有更新的文档则保持固定"""
+        with self._lock:
+            if self._pinned.get(key) is data:
+                del self._pinned[key]
+                self.put(key, signature, data)
+
+    def invalidate(self, key: Optional[Tuple[str, str]] = None):
+        """使指定条目（或全部条目）失效"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+                self._pinned.clear()
+            else:
+                self._entries.pop(key, None)
+                self._pinned.pop(key, None)
+
+    def get_stats(self) -> Dict[str, int]:
+        """获取缓存命中统计"""
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "entries": len(self._entries),
+            }
+
+    def reset_stats(self):
+        """重置缓存命中统计"""
+        with self._lock:
+            self._hits = 0
+            self._misses = 0
+
+
+_history_cache = HistoryCache()
+
 
 # ==================================================
 # 历史记录文件路径处理函数
@@ -28,37 +122,98 @@ def get_history_file_path(history_type: str, file_name: str) -> Path:
     return history_dir / f"{file_name}.json"
 
 
+def get_history_log_path(history_type: str, file_name: str) -> Path:
+    """获取历史记录追加日志文件路径
+
+    每次抽取以一行 JSON 事件的形式追加到该文件，定期合并到历史记录文件中。
+
+    Args:
+        history_type: 历史记录类型 (roll_call, lottery 等)
+        file_name: 文件名（不含扩展名）
+
+    Returns:
+        Path: 追加日志文件路径
+    """
+    return get_history_file_path(history_type, file_name).with_suffix(".jsonl")
+
+
 # ==================================================
 # 历史记录数据读写函数
 # ==================================================
 
 
-def load_history_data(history_type: str, file_name: str) -> Dict[str, Any]:
+def get_history_signature(history_type: str, file_name: str) -> tuple:
+    """获取历史记录文件及追加日志的签名（mtime + size），文件不存在时对应项为 None"""
+    signature = []
+    for path in (
+        get_history_file_path(history_type, file_name),
+        get_history_log_path(history_type, file_name),
+    ):
+        try:
+            stat = os.stat(path)
+            signature.append((stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            signature.append(None)
+    return tuple(signature)
+
+
+def load_history_data(
+    history_type: str, file_name: str, readonly: bool = False
+) -> Dict[str, Any]:
     """加载历史记录数据
 
+    读取历史记录文件，并重放追加日志中尚未合并的抽取事件。
+    解析结果按文件签名缓存，文件未变化时直接返回缓存。
+
     Args:
         history_type: 历史记录类型 (roll_call, lottery 等)
         file_name: 文件名（不含扩展名）
+        readonly: 为 True 时直接返回共享的缓存文档（调用方不得修改），
+            否则返回可自由修改的副本
 
     Returns:
         Dict[str, Any]: 历史记录数据
     """
+    key = (history_type, file_name)
+    signature = get_history_signature(history_type, file_name)
+    history_data = _history_cache.get(key, signature)
+    if history_data is None:
+        history_data = _parse_history_data(history_type, file_name)
+        _history_cache.put(key, signature, history_data)
+    return history_data if readonly else copy.deepcopy(history_data)
+
+
+def _parse_history_data(history_type: str, file_name: str) -> Dict[str, Any]:
+    """解析历史记录文件并重放追加日志"""
     file_path = get_history_file_path(history_type, file_name)
 
-    if not file_path.exists():
-        return {}
+    history_data = {}
+    if file_path.exists():
+        try:
+            with open(file_path, "r", encoding="utf-8") as f:
+                history_data = json.load(f)
+        except Exception as e:
+            logger.exception(f"加载历史记录数据失败: {e}")
+            return {}
 
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        for event in _read_history_events(history_type, file_name):
+            if event["seq"] <= history_data.get("log_seq", 0):
+                # 已合并到历史记录文件中的事件
+                continue
+            _apply_history_event(history_type, history_data, event)
+            history_data["log_seq"] = event["seq"]
     except Exception as e:
-        logger.exception(f"加载历史记录数据失败: {e}")
-        return {}
+        logger.exception(f"重放历史记录追加日志失败: {e}")
+
+    return history_data
 
 
 def save_history_data(history_type: str, file_name: str, data: Dict[str, Any]) -> bool:
     """保存历史记录数据
 
+    完整写入历史记录文件（先写临时文件再替换），并清除已合并的追加日志。
+
     Args:
         history_type: 历史记录类型 (roll_call, lottery 等)
         file_name: 文件名（不含扩展名）
@@ -68,13 +223,274 @@ def save_history_data(history_type: str, file_name: str, data: Dict[str, Any]) -
         bool: 保存是否成功
     """
     file_path = get_history_file_path(history_type, file_name)
+    temp_path = file_path.with_suffix(".json.tmp")
     try:
-        with open(file_path, "w", encoding="utf-8") as f:
+        with open(temp_path, "w", encoding="utf-8") as f:
             json.dump(data, f, ensure_ascii=False, indent=4)
-        return True
+        os.replace(temp_path, file_path)
     except Exception as e:
         logger.exception(f"保存历史记录数据失败: {e}")
-    return False
+        return False
+
+    # 历史记录文件中已包含日志中的全部事件（由 log_seq 标记），删除日志
+    log_path = get_history_log_path(history_type, file_name)
+    try:
+        if log_path.exists():
+            log_path.unlink()
+    except OSError as e:
+        logger.exception(f"删除历史记录追加日志失败: {e}")
+
+    # 写入的数据即为最新文档，由缓存接管（调用方之后不应再修改）
+    _history_cache.put(
+        (history_type, file_name),
+        get_history_signature(history_type, file_name),
+        data,
+    )
+    return True
+
+
+def append_history_events(
+    history_type: str,
+    file_name: str,
+    events: List[Dict[str, Any]],
+    history_data: Dict[str, Any],
+) -> bool:
+    """追加抽取事件到历史记录（多个事件一次写入）
+
+    Args:
+        history_type: 历史记录类型 (roll_call, lottery 等)
+        file_name: 文件名（不含扩展名）
+        events: 抽取事件列表，每个事件需包含由 log_seq 递增得到的 seq
+        history_data: 已应用这些事件的完整历史记录数据（用于首次创建及合并，
+            写入后由缓存接管，调用方之后不应再修改）
+
+    Returns:
+        bool: 保存是否成功
+    """
+    file_path = get_history_file_path(history_type, file_name)
+    if not file_path.exists():
+        # 首次写入时直接创建历史记录文件，保证其他读取方能发现该记录
+        return save_history_data(history_type, file_name, history_data)
+
+    log_path = get_history_log_path(history_type, file_name)
+    try:
+        lines = "".join(
+            json.dumps(event, ensure_ascii=False, separators=(",", ":")) + "\n"
+            for event in events
+        )
+        with open(log_path, "a+b") as f:
+            # 上次写入中断时日志可能以不完整的行结尾，先换行避免新事件与其拼接
+            if f.seek(0, os.SEEK_END) > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    lines = "\n" + lines
+            f.write(lines.encode("utf-8"))
+    except Exception as e:
+        logger.exception(f"追加历史记录事件失败: {e}")
+        return False
+
+    try:
+        if log_path.stat().st_size >= HISTORY_LOG_COMPACT_SIZE:
+            return save_history_data(history_type, file_name, history_data)
+    except OSError as e:
+        logger.exception(f"合并历史记录追加日志失败: {e}")
+
+    _history_cache.put(
+        (history_type, file_name),
+        get_history_signature(history_type, file_name),
+        history_data,
+    )
+    return True
+
+
+def append_history_event(
+    history_type: str,
+    file_name: str,
+    event: Dict[str, Any],
+    history_data: Dict[str, Any],
+) -> bool:
+    """追加一条抽取事件到历史记录（同步写入）
+
+    Args:
+        history_type: 历史记录类型 (roll_call, lottery 等)
+        file_name: 文件名（不含扩展名）
+        event: 抽取事件，需包含由 history_data["log_seq"] 递增得到的 seq
+        history_data: 已应用该事件的完整历史记录数据
+
+    Returns:
+        bool: 保存是否成功
+    """
+    return append_history_events(history_type, file_name, [event], history_data)
+
+
+def compact_history_data(history_type: str, file_name: str) -> bool:
+    """将追加日志合并到历史记录文件
+
+    Args:
+        history_type: 历史记录类型 (roll_call, lottery 等)
+        file_name: 文件名（不含扩展名）
+
+    Returns:
+        bool: 合并是否成功（没有待合并的日志时返回 True）
+    """
+    if not get_history_log_path(history_type, file_name).exists():
+        return True
+    history_data = load_history_data(history_type, file_name, readonly=True)
+    return save_history_data(history_type, file_name, history_data)
+
+
+def delete_history_data(history_type: str, file_name: str) -> bool:
+    """删除历史记录文件及其追加日志、索引等附属文件
+
+    Args:
+        history_type: 历史记录类型 (roll_call, lottery 等)
+        file_name: 文件名（不含扩展名）
+
+    Returns:
+        bool: 是否删除了历史记录文件
+    """
+    from app.common.history.aggregate_index import invalidate_aggregates
+    from app.common.history.history_writer import flush_history_writes
+    from app.common.history.session_index import invalidate_session_index
+
+    # 先写完待写入的事件，避免删除后被重新创建
+    flush_history_writes(timeout=5.0)
+    _history_cache.invalidate((history_type, file_name))
+    if history_type == "roll_call":
+        invalidate_aggregates(file_name)
+        invalidate_session_index(file_name)
+    file_path = get_history_file_path(history_type, file_name)
+    existed = file_path.exists()
+    _remove_history_files(file_path)
+    remove_history_sidecar_files(history_type, file_name)
+    return existed
+
+
+def remove_history_sidecar_files(history_type: str, file_name: str) -> None:
+    """删除历史记录的追加日志和索引文件（保留历史记录文件本身）
+
+    用新的历史记录文件替换旧文件（如导入备份）前调用，避免旧日志中的事件
+    被重放到新文件中。调用方需先写完待写入的事件并在之后清除相关缓存。
+
+    Args:
+        history_type: 历史记录类型 (roll_call, lottery 等)
+        file_name: 文件名（不含扩展名）
+    """
+    _remove_history_files(
+        get_history_log_path(history_type, file_name),
+        get_history_file_path(history_type, file_name).with_suffix(".index"),
+    )
+
+
+def _remove_history_files(*paths: Path) -> None:
+    for path in paths:
+        try:
+            if path.exists():
+                path.unlink()
+        except OSError as e:
+            logger.exception(f"删除历史记录文件 {path} 失败: {e}")
+
+
+def pin_history_data(
+    history_type: str, file_name: str, history_data: Dict[str, Any]
+) -> None:
+    """将尚未写入磁盘的最新文档固定到缓存中，读取方将直接获得该文档
+
+    Args:
+        history_type: 历史记录类型 (roll_call, lottery 等)
+        file_name: 文件名（不含扩展名）
+        history_data: 最新的历史记录数据
+    """
+    _history_cache.pin((history_type, file_name), history_data)
+
+
+def unpin_history_data(
+    history_type: str, file_name: str, history_data: Dict[str, Any]
+) -> None:
+    """文档写入磁盘后取消固定（期间已有更新的文档时保持固定）
+
+    Args:
+        history_type: 历史记录类型 (roll_call, lottery 等)
+        file_name: 文件名（不含扩展名）
+        history_data: 已写入的历史记录数据
+    """
+    _history_cache.unpin(
+        (history_type, file_name),
+        history_data,
+        get_history_signature(history_type, file_name),
+    )
+
+
+def get_history_cache_stats() -> Dict[str, int]:
+    """获取历史记录解析缓存的命中统计
+
+    Returns:
+        Dict[str, int]: 包含 hits（命中次数）、misses（未命中次数）、entries（缓存条目数）
+    """
+    return _history_cache.get_stats()
+
+
+def reset_history_cache_stats() -> None:
+    """重置历史记录解析缓存的命中统计"""
+    _history_cache.reset_stats()
+
+
+def invalidate_history_cache(
+    history_type: Optional[str] = None, file_name: Optional[str] = None
+) -> None:
+    """使历史记录解析缓存失效
+
+    Args:
+        history_type: 历史记录类型，为 None 时清空全部缓存
+        file_name: 文件名（不含扩展名）
+    """
+    if history_type is None or file_name is None:
+        _history_cache.invalidate()
+    else:
+        _history_cache.invalidate((history_type, file_name))
+
+
+def _read_history_events(history_type: str, file_name: str) -> List[Dict[str, Any]]:
+    """读取追加日志中的全部事件，跳过写入不完整的行及缺少 seq 的事件"""
+    log_path = get_history_log_path(history_type, file_name)
+    if not log_path.exists():
+        return []
+
+    events = []
+    with open(log_path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                event = json.loads(line)
+            except ValueError:
+                logger.warning(f"跳过损坏的历史记录事件: {log_path}")
+                continue
+            if not isinstance(event, dict):
+                continue
+            seq = event.get("seq")
+            if not isinstance(seq, int) or isinstance(seq, bool):
+                logger.warning(f"跳过缺少 seq 的历史记录事件: {log_path}")
+                continue
+            events.append(event)
+    return events
+
+
+def _apply_history_event(
+    history_type: str, history_data: Dict[str, Any], event: Dict[str, Any]
+) -> Optional[list]:
+    """将抽取事件应用到历史记录数据"""
+    if history_type == "roll_call":
+        from app.common.history.roll_call_history import apply_roll_call_event
+
+        return apply_roll_call_event(history_data, event)
+    if history_type == "lottery":
+        from app.common.history.lottery_history import apply_lottery_event
+
+        return apply_lottery_event(history_data, event)
+    logger.warning(f"未知的历史记录类型: {history_type}")
+    return None
 
 
 def get_all_history_names(history_type: str) -> List[str]:
@@ -6,8 +6,9 @@ from typing import Dict, List, Any, Optional, Tuple
 
 from loguru import logger
 
-from app.tools.path_utils import get_data_path, open_file, file_exists
+from app.tools.path_utils import get_data_path, open_file
 from app.common.data.list import get_gender_list, get_group_list
+from app.common.history.file_utils import load_history_data
 
 
 # ==================================================
@@ -58,12 +59,7 @@ def get_roll_call_history_data(
         Dict[str, Any]: 历史记录数据
     """
     try:
-        history_file = get_data_path("history/roll_call_history", f"{class_name}.json")
-        if not file_exists(history_file):
-            return {}
-
-        with open_file(history_file, "r", encoding="utf-8") as f:
-            return json.load(f)
+        return load_history_data("roll_call", class_name)
     except Exception as e:
         logger.exception(f"获取点名历史记录数据失败: {e}")
         return {}
@@ -381,12 +377,7 @@ def get_lottery_history_data(
         Dict[str, Any]: 历史记录数据
     """
     try:
-        history_file = get_data_path("history/lottery_history", f"{pool_name}.json")
-        if not file_exists(history_file):
-            return {}
-
-        with open_file(history_file, "r", encoding="utf-8") as f:
-            return json.load(f)
+        return load_history_data("lottery", pool_name)
     except Exception as e:
         logger.exception(f"获取抽奖历史记录数据失败: {e}")
         return {}
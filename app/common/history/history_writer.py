@@ -0,0 +1,241 @@
+# ==================================================
+# 导入库
+# ==================================================
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from app.common.history.file_utils import (
+    append_history_events,
+    invalidate_history_cache,
+    pin_history_data,
+    unpin_history_data,
+)
+
+# 单批事件写入失败后的重试次数及重试间隔（秒，按次数递增）
+HISTORY_WRITE_RETRIES = 3
+HISTORY_WRITE_RETRY_DELAY = 0.2
+
+
+# ==================================================
+# 历史记录后台写入线程
+# ==================================================
+class HistoryWriter:
+    """在后台线程中写入历史记录事件
+
+    提交后立即把最新文档固定到历史记录缓存中，读取方无需等待写入完成；
+    同一记录的多个待写入事件合并为一次写入。
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        # (类型, 名称) -> {"events": [...], "data": 最新文档, "on_written": 回调}
+        self._pending: "OrderedDict[Tuple[str, str], Dict[str, Any]]" = OrderedDict()
+        self._busy = False
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(
+        self,
+        history_type: str,
+        file_name: str,
+        event: Dict[str, Any],
+        history_data: Dict[str, Any],
+        on_written: Optional[Callable[[], None]] = None,
+    ) -> bool:
+        """提交一条待写入的抽取事件
+
+        Args:
+            history_type: 历史记录类型 (roll_call, lottery 等)
+            file_name: 文件名（不含扩展名）
+            event: 抽取事件
+            history_data: 已应用该事件的完整历史记录数据（提交后调用方不应再修改）
+            on_written: 写入完成后在后台线程中执行的回调（同一记录只执行最后提交的回调）
+
+        Returns:
+            bool: 是否已提交（写入线程已停止时直接同步写入）
+        """
+        key = (history_type, file_name)
+        with self._condition:
+            if self._stopping:
+                written = append_history_events(
+                    history_type, file_name, [event], history_data
+                )
+                if written and on_written is not None:
+                    on_written()
+                return written
+
+            pin_history_data(history_type, file_name, history_data)
+            pending = self._pending.setdefault(
+                key, {"events": [], "data": None, "on_written": None}
+            )
+            pending["events"].append(event)
+            pending["data"] = history_data
+            if on_written is not None:
+                pending["on_written"] = on_written
+
+            self._ensure_thread()
+            self._condition.notify_all()
+        return True
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """等待所有待写入事件写入完成
+
+        Args:
+            timeout: 最长等待时间（秒），None 表示一直等待
+
+        Returns:
+            bool: 是否已全部写入
+        """
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: not self._pending and not self._busy, timeout
+            )
+
+    def shutdown(self, timeout: Optional[float] = 5.0) -> bool:
+        """写入所有待写入事件并停止后台线程
+
+        Args:
+            timeout: 最长等待时间（秒）
+
+        Returns:
+            bool: 是否已全部写入
+        """
+        flushed = self.flush(timeout)
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        if not flushed:
+            logger.warning("历史记录写入超时，部分记录可能未保存")
+        return flushed
+
+    def pending_count(self) -> int:
+        """获取待写入的事件数量"""
+        with self._condition:
+            return sum(len(p["events"]) for p in self._pending.values())
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._run, name="HistoryWriter", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending or self._stopping)
+                if not self._pending:
+                    return
+                key, pending = self._pending.popitem(last=False)
+                self._busy = True
+
+            try:
+                written = self._write(key, pending["events"], pending["data"])
+                if written and pending["on_written"] is not None:
+                    pending["on_written"]()
+            except Exception as e:
+                logger.exception(f"后台写入历史记录失败: {e}")
+            finally:
+                with self._condition:
+                    self._busy = False
+                    self._condition.notify_all()
+
+    def _write(
+        self, key: Tuple[str, str], events: List[Dict[str, Any]], data: Dict[str, Any]
+    ) -> bool:
+        history_type, file_name = key
+        for attempt in range(HISTORY_WRITE_RETRIES + 1):
+            if attempt:
+                time.sleep(HISTORY_WRITE_RETRY_DELAY * attempt)
+            # 重试时部分事件可能已写入，重复的事件在重放时按 seq 跳过
+            if append_history_events(history_type, file_name, events, data):
+                unpin_history_data(history_type, file_name, data)
+                return True
+            logger.warning(
+                f"写入历史记录失败（第 {attempt + 1} 次）: {history_type}/{file_name}"
+            )
+
+        seq_range = f"{events[0].get('seq')}-{events[-1].get('seq')}"
+        with self._condition:
+            newer = self._pending.get(key)
+            if newer is not None:
+                # 更新的文档已包含这些事件，并入其待写入事件中一起写入，保持固定
+                newer["events"][:0] = events
+                logger.error(
+                    f"写入历史记录失败，事件 seq {seq_range} "
+                    f"将随后续事件重新写入: {history_type}/{file_name}"
+                )
+            else:
+                # 没有更新的文档，丢弃内存中的文档，之后以磁盘内容为准
+                invalidate_history_cache(history_type, file_name)
+                logger.error(
+                    f"写入历史记录失败，已丢弃事件 seq {seq_range}: "
+                    f"{history_type}/{file_name}"
+                )
+        return False
+
+
+_history_writer = HistoryWriter()
+
+
+# ==================================================
+# 历史记录后台写入函数
+# ==================================================
+def get_history_writer() -> HistoryWriter:
+    """获取全局历史记录写入器"""
+    return _history_writer
+
+
+def submit_history_event(
+    history_type: str,
+    file_name: str,
+    event: Dict[str, Any],
+    history_data: Dict[str, Any],
+    on_written: Optional[Callable[[], None]] = None,
+) -> bool:
+    """提交抽取事件到后台写入队列
+
+    Args:
+        history_type: 历史记录类型 (roll_call, lottery 等)
+        file_name: 文件名（不含扩展名）
+        event: 抽取事件
+        history_data: 已应用该事件的完整历史记录数据（提交后调用方不应再修改）
+        on_written: 写入完成后在后台线程中执行的回调
+
+    Returns:
+        bool: 是否提交成功
+    """
+    return _history_writer.submit(
+        history_type, file_name, event, history_data, on_written
+    )
+
+
+def flush_history_writes(timeout: Optional[float] = None) -> bool:
+    """等待所有历史记录写入完成
+
+    Args:
+        timeout: 最长等待时间（秒），None 表示一直等待
+
+    Returns:
+        bool: 是否已全部写入
+    """
+    return _history_writer.flush(timeout)
+
+
+def shutdown_history_writer(timeout: Optional[float] = 5.0) -> bool:
+    """写入所有待写入的历史记录并停止后台写入线程（程序退出时调用）
+
+    Args:
+        timeout: 最长等待时间（秒）
+
+    Returns:
+        bool: 是否已全部写入
+    """
+    return _history_writer.shutdown(timeout)
@@ -7,7 +7,8 @@ from typing import Dict, List, Any
 from loguru import logger
 
 from app.common.extraction.extract import _get_current_class_info
-from app.common.history.file_utils import load_history_data, save_history_data
+from app.common.history.file_utils import load_history_data
+from app.common.history.history_writer import submit_history_event
 
 
 # ==================================================
@@ -37,60 +38,126 @@ def save_lottery_history(
         # 获取当前课程信息
         current_class_info = _get_current_class_info()
 
-        history_data = load_history_data("lottery", pool_name)
-        lotterys = history_data.get("lotterys", {})
-        group_stats = history_data.get("group_stats", {})
-        gender_stats = history_data.get("gender_stats", {})
-        total_stats = history_data.get("total_stats", 0)
+        # 共享的缓存文档，不得修改
+        cached_data = load_history_data("lottery", pool_name, readonly=True)
 
-        for student in selected_students or []:
-            name = student.get("name", "")
-            if not name:
-                continue
-            entry = lotterys.get(name)
-            if not isinstance(entry, dict):
-                entry = {
-                    "total_count": 0,
-                    "rounds_missed": 0,
-                    "last_drawn_time": "",
-                    "history": [],
-                }
-            entry["total_count"] = int(entry.get("total_count", 0)) + 1
-            entry["last_drawn_time"] = current_time
-            hist = entry.get("history", [])
-            if not isinstance(hist, list):
-                hist = []
-            hist.append(
-                {
-                    "draw_time": current_time,
-                    "draw_lottery_numbers": len(selected_students),
-                    "draw_group": group_filter,
-                    "draw_gender": gender_filter,
-                }
-            )
-            # 如果能获取到课程信息，则添加到历史记录中
-            if current_class_info:
-                hist[-1]["class_name"] = current_class_info.get("name", "")
-            entry["history"] = hist
-            lotterys[name] = entry
-
-        # 更新统计
-        if group_filter:
-            group_stats[group_filter] = int(group_stats.get(group_filter, 0)) + len(
-                selected_students or []
-            )
-        if gender_filter:
-            gender_stats[gender_filter] = int(gender_stats.get(gender_filter, 0)) + len(
-                selected_students or []
-            )
-        total_stats = int(total_stats) + len(selected_students or [])
-
-        history_data["lotterys"] = lotterys
-        history_data["group_stats"] = group_stats
-        history_data["gender_stats"] = gender_stats
-        history_data["total_stats"] = total_stats
-
-        return save_history_data("lottery", pool_name, history_data)
+        event = {
+            "seq": cached_data.get("log_seq", 0) + 1,
+            "draw_time": current_time,
+            "group_filter": group_filter,
+            "gender_filter": gender_filter,
+            # None 表示未获取到课程信息
+            "subject": current_class_info.get("name", "")
+            if current_class_info
+            else None,
+            "names": [student.get("name", "") for student in selected_students or []],
+        }
+
+        # 只复制本次抽奖会修改的部分，其余子对象与缓存文档共享
+        history_data = copy_for_lottery_event(cached_data, event)
+        apply_lottery_event(history_data, event)
+        history_data["log_seq"] = event["seq"]
+
+        # 交给后台线程写入历史记录
+        return submit_history_event("lottery", pool_name, event, history_data)
     except Exception as e:
         logger.exception(f"保存抽奖历史失败: {e}")
         return False
+
+
+# ==================================================
+# 抽奖事件应用函数
+# ==================================================
+def copy_for_lottery_event(
+    history_data: Dict[str, Any], event: Dict[str, Any]
+) -> Dict[str, Any]:
+    """复制历史记录中会被 apply_lottery_event 修改的部分
+
+    只复制被抽中者的记录及其历史记录列表、小组/性别统计，其余子对象与原文档共享。
+
+    Args:
+        history_data: 历史记录数据（不会被修改）
+        event: 抽奖事件
+
+    Returns:
+        Dict[str, Any]: 可以安全应用该事件的历史记录数据
+    """
+    data = dict(history_data)
+    lotterys = history_data.get("lotterys")
+    if isinstance(lotterys, dict):
+        lotterys = dict(lotterys)
+        for name in event.get("names", []):
+            entry = lotterys.get(name)
+            if isinstance(entry, dict):
+                entry = dict(entry)
+                if isinstance(entry.get("history"), list):
+                    entry["history"] = list(entry["history"])
+                lotterys[name] = entry
+        data["lotterys"] = lotterys
+    for key in ("group_stats", "gender_stats"):
+        if isinstance(history_data.get(key), dict):
+            data[key] = dict(history_data[key])
+    return data
+
+
+def apply_lottery_event(history_data: Dict[str, Any], event: Dict[str, Any]) -> None:
+    """将一次抽奖事件应用到历史记录数据
+
+    Args:
+        history_data: 历史记录数据（就地修改）
+        event: 抽奖事件
+    """
+    current_time = event.get("draw_time", "")
+    group_filter = event.get("group_filter")
+    gender_filter = event.get("gender_filter")
+    subject_name = event.get("subject")
+    names = event.get("names", [])
+
+    lotterys = history_data.get("lotterys", {})
+    group_stats = history_data.get("group_stats", {})
+    gender_stats = history_data.get("gender_stats", {})
+    total_stats = history_data.get("total_stats", 0)
+
+    for name in names:
+        if not name:
+            continue
+        entry = lotterys.get(name)
+        if not isinstance(entry, dict):
+            entry = {
+                "total_count": 0,
+                "rounds_missed": 0,
+                "last_drawn_time": "",
+                "history": [],
+            }
+        entry["total_count"] = int(entry.get("total_count", 0)) + 1
+        entry["last_drawn_time"] = current_time
+        hist = entry.get("history", [])
+        if not isinstance(hist, list):
+            hist = []
+        hist.append(
+            {
+                "draw_time": current_time,
+                "draw_lottery_numbers": len(names),
+                "draw_group": group_filter,
+                "draw_gender": gender_filter,
+            }
+        )
+        # 如果能获取到课程信息，则添加到历史记录中
+        if subject_name is not None:
+            hist[-1]["class_name"] = subject_name
+        entry["history"] = hist
+        lotterys[name] = entry
+
+    # 更新统计
+    if group_filter:
+        group_stats[group_filter] = int(group_stats.get(group_filter, 0)) + len(names)
+    if gender_filter:
+        gender_stats[gender_filter] = int(gender_stats.get(gender_filter, 0)) + len(
+            names
+        )
+    total_stats = int(total_stats) + len(names)
+
+    history_data["lotterys"] = lotterys
+    history_data["group_stats"] = group_stats
+    history_data["gender_stats"] = gender_stats
+    history_data["total_stats"] = total_stats
@@ -1,16 +1,23 @@
 # ==================================================
 # 导入库
 # ==================================================
+import copy
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 
 from loguru import logger
 
-from app.tools.settings_access import readme_settings_async
 from app.common.data.list import get_student_list
-from app.Language.obtain_language import get_content_combo_name_async
-from app.common.extraction.extract import _get_current_class_info
-from app.common.history.file_utils import load_history_data, save_history_data
+from app.common.fair_draw.draw_config import DrawConfig
+from app.common.history.file_utils import load_history_data
+from app.common.history.history_writer import submit_history_event
+from app.common.history.aggregate_index import (
+    copy_aggregates_for_draw,
+    load_aggregates,
+    record_draw,
+    save_aggregates,
+)
+from app.common.history.session_index import record_sessions
 from app.common.history.weight_utils import calculate_weight
 
 
@@ -22,6 +29,7 @@ def save_roll_call_history(
     selected_students: List[Dict[str, Any]],
     group_filter: Optional[str] = None,
     gender_filter: Optional[str] = None,
+    draw_config: Optional[DrawConfig] = None,
 ) -> bool:
     """保存点名历史记录
 
@@ -31,6 +39,7 @@ def save_roll_call_history(
         students_dict_list: 完整的学生列表，用于计算权重
         group_filter: 小组过滤器，指定本次抽取的小组范围，None表示不限制
         gender_filter: 性别过滤器，指定本次抽取的性别范围，None表示不限制
+        draw_config: 抽取时使用的设置快照，None 时按当前设置重新构建
 
     Returns:
         bool: 保存是否成功
@@ -39,199 +48,283 @@ def save_roll_call_history(
         # 获取当前时间
         current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-        # 加载现有历史记录
-        history_data = load_history_data("roll_call", class_name)
-
-        # 初始化数据结构
-        if "students" not in history_data:
-            history_data["students"] = {}
-        if "group_stats" not in history_data:
-            history_data["group_stats"] = {}
-        if "gender_stats" not in history_data:
-            history_data["gender_stats"] = {}
-        if "total_rounds" not in history_data:
-            history_data["total_rounds"] = 0
-        if "total_stats" not in history_data:
-            history_data["total_stats"] = 0
-        if "subject_stats" not in history_data:
-            history_data["subject_stats"] = {}
-
-        # 获取被选中的学生名称列表
-        selected_names = [s.get("name", "") for s in selected_students]
-
-        # 获取当前课程信息（用于科目过滤）
-        current_class_info = None
-        subject_history_filter_enabled = (
-            readme_settings_async("linkage_settings", "subject_history_filter_enabled")
-            or False
-        )
+        # 加载现有历史记录（共享的缓存文档，不得修改）
+        cached_data = load_history_data("roll_call", class_name, readonly=True)
+
+        # 获取当前课程信息（用于科目过滤），与抽取时的设置快照保持一致
+        if draw_config is None:
+            draw_config = DrawConfig.from_settings()
+        current_class_info = dict(draw_config.current_class_info)
+        subject_filter = draw_config.subject_filter
+        all_group = draw_config.all_group_label
+        all_gender = draw_config.all_gender_label
 
-        if subject_history_filter_enabled:
-            data_source = readme_settings_async("linkage_settings", "data_source")
-            if data_source == 2:
-                from app.common.IPC_URL.csharp_ipc_handler import CSharpIPCHandler
-
-                current_class_info = (
-                    CSharpIPCHandler.instance().get_current_class_info()
-                )
-            elif data_source == 1:
-                current_class_info = _get_current_class_info()
-            else:
-                current_class_info = None
-
-            # 如果当前没有课程信息（课间时段），则使用课间归属的课程信息
-            if not current_class_info:
-                from app.common.extraction.extract import (
-                    _is_non_class_time,
-                    _get_break_assignment_class_info,
-                )
-
-                if _is_non_class_time():
-                    current_class_info = _get_break_assignment_class_info()
-
-        # 提取科目名称
-        subject_filter = ""
-        if current_class_info:
-            subject_filter = current_class_info.get("name", "")
+        # 加载写入前的聚合索引
+        aggregates = load_aggregates(class_name, all_group, all_gender, cached_data)
 
         # 计算权重
         students_dict_list = get_student_list(class_name)
         students_with_weight = calculate_weight(
-            students_dict_list, class_name, subject_filter
+            students_dict_list, class_name, subject_filter, draw_config
+        )
+        next_weights = {
+            student.get("name"): student.get("next_weight", 0)
+            for student in students_with_weight
+        }
+
+        # 构建抽取事件
+        event = {
+            "seq": cached_data.get("log_seq", 0) + 1,
+            "draw_time": current_time,
+            "group_filter": group_filter,
+            "gender_filter": gender_filter,
+            # None 表示未获取到课程信息
+            "subject": current_class_info.get("name", "")
+            if current_class_info
+            else None,
+            "all_group": all_group,
+            "all_gender": all_gender,
+            "students": [
+                {
+                    "name": student.get("name", ""),
+                    "group": student.get("group", ""),
+                    "gender": student.get("gender", ""),
+                    "weight": next_weights.get(student.get("name", "")),
+                }
+                for student in selected_students
+            ],
+        }
+
+        # 只复制本次抽取会修改的部分，其余子对象与缓存文档共享
+        previous_seq = cached_data.get("log_seq", 0)
+        history_data = copy_for_roll_call_event(cached_data, event)
+        new_records = apply_roll_call_event(history_data, event)
+        history_data["log_seq"] = event["seq"]
+
+        # 更新聚合索引及会话索引
+        aggregates = copy_aggregates_for_draw(
+            aggregates, [student_name for student_name, _ in new_records]
+        )
+        record_draw(class_name, aggregates, history_data, new_records)
+        record_sessions(class_name, previous_seq, history_data, new_records)
+
+        # 交给后台线程写入历史记录，写入完成后保存聚合索引
+        return submit_history_event(
+            "roll_call",
+            class_name,
+            event,
+            history_data,
+            on_written=lambda: save_aggregates(class_name, aggregates),
         )
 
-        # 更新每个被选中学生的历史记录
-        for student in selected_students:
-            student_name = student.get("name", "")
-            if not student_name:
-                continue
+    except Exception as e:
+        logger.exception(f"保存点名历史记录失败: {e}")
+        return False
 
-            # 如果学生不存在于历史记录中，创建新记录
-            if student_name not in history_data["students"]:
-                history_data["students"][student_name] = {
-                    "total_count": 0,
-                    "group_gender_count": 0,
-                    "last_drawn_time": "",
-                    "rounds_missed": 0,
-                    "history": [],
-                    "subject_stats": {},
-                }
 
-            # 更新学生的基本信息
-            student_data = history_data["students"][student_name]
-            student_data["total_count"] += 1
-            student_data["last_drawn_time"] = current_time
-            student_data["rounds_missed"] = 0  # 重置未选中次数
-
-            draw_method = 1
-
-            # 获取当前被选中学生的权重信息
-            current_student_weight = None
-            for student_with_weight in students_with_weight:
-                if student_with_weight.get("name") == student_name:
-                    current_student_weight = student_with_weight.get("next_weight", 0)
-                    break
-
-            history_entry = {
-                "draw_method": draw_method,
-                "draw_time": current_time,
-                "draw_people_numbers": len(selected_students),
-                "draw_group": group_filter,
-                "draw_gender": gender_filter,
-                "weight": current_student_weight,
-            }
+# ==================================================
+# 点名事件应用函数
+# ==================================================
+def copy_for_roll_call_event(
+    history_data: Dict[str, Any], event: Dict[str, Any]
+) -> Dict[str, Any]:
+    """复制历史记录中会被 apply_roll_call_event 修改的部分
 
-            # 如果能获取到课程信息，则添加到历史记录中并更新学科统计
-            if current_class_info:
-                subject_name = current_class_info.get("name", "")
-                history_entry["class_name"] = subject_name
+    每名学生的记录都会更新未选中次数，因此逐个浅复制；被选中学生的历史记录列表
+    和科目统计另行复制。其余子对象（未选中学生的历史记录等）与原文档共享，
+    复制开销与学生人数相关，而与历史记录条数无关。
 
-                # 更新学生级别的学科统计
-                if "subject_stats" not in student_data:
-                    student_data["subject_stats"] = {}
+    Args:
+        history_data: 历史记录数据（不会被修改）
+        event: 抽取事件
 
-                if subject_name not in student_data["subject_stats"]:
-                    student_data["subject_stats"][subject_name] = {
-                        "total_count": 0,
-                        "group_gender_count": 0,
-                    }
+    Returns:
+        Dict[str, Any]: 可以安全应用该事件的历史记录数据
+    """
+    selected_names = {student.get("name", "") for student in event.get("students", [])}
+    data = dict(history_data)
+
+    students = history_data.get("students")
+    if isinstance(students, dict):
+        copied_students = {}
+        for student_name, student_data in students.items():
+            if isinstance(student_data, dict):
+                student_data = dict(student_data)
+                if student_name in selected_names:
+                    if isinstance(student_data.get("history"), list):
+                        student_data["history"] = list(student_data["history"])
+                    if "subject_stats" in student_data:
+                        student_data["subject_stats"] = copy.deepcopy(
+                            student_data["subject_stats"]
+                        )
+            copied_students[student_name] = student_data
+        data["students"] = copied_students
+
+    for key in ("group_stats", "gender_stats", "subject_stats"):
+        if isinstance(history_data.get(key), dict):
+            data[key] = dict(history_data[key])
+    subject_name = event.get("subject")
+    subject_stats = data.get("subject_stats")
+    if (
+        subject_name
+        and isinstance(subject_stats, dict)
+        and subject_name in subject_stats
+    ):
+        subject_stats[subject_name] = copy.deepcopy(subject_stats[subject_name])
+    return data
+
+
+def apply_roll_call_event(
+    history_data: Dict[str, Any], event: Dict[str, Any]
+) -> List[Tuple[str, Dict[str, Any]]]:
+    """将一次点名抽取事件应用到历史记录数据
 
-                subject_stat = student_data["subject_stats"][subject_name]
-                subject_stat["total_count"] += 1
+    Args:
+        history_data: 历史记录数据（就地修改）
+        event: 抽取事件
 
-                # 统计 group_gender_count（小组和性别都有限制）
-                all_group = get_content_combo_name_async("roll_call", "range_combobox")[
-                    0
-                ]
-                all_gender = get_content_combo_name_async(
-                    "roll_call", "gender_combobox"
-                )[0]
+    Returns:
+        List[Tuple[str, Dict[str, Any]]]: 新增的 (学生名称, 历史记录条目) 列表
+    """
+    # 初始化数据结构
+    if "students" not in history_data:
+        history_data["students"] = {}
+    if "group_stats" not in history_data:
+        history_data["group_stats"] = {}
+    if "gender_stats" not in history_data:
+        history_data["gender_stats"] = {}
+    if "total_rounds" not in history_data:
+        history_data["total_rounds"] = 0
+    if "total_stats" not in history_data:
+        history_data["total_stats"] = 0
+    if "subject_stats" not in history_data:
+        history_data["subject_stats"] = {}
+
+    current_time = event.get("draw_time", "")
+    group_filter = event.get("group_filter")
+    gender_filter = event.get("gender_filter")
+    subject_name = event.get("subject")
+    selected_students = event.get("students", [])
+
+    # 获取被选中的学生名称列表
+    selected_names = [s.get("name", "") for s in selected_students]
+
+    new_records = []
+
+    # 更新每个被选中学生的历史记录
+    for student in selected_students:
+        student_name = student.get("name", "")
+        if not student_name:
+            continue
+
+        # 如果学生不存在于历史记录中，创建新记录
+        if student_name not in history_data["students"]:
+            history_data["students"][student_name] = {
+                "total_count": 0,
+                "group_gender_count": 0,
+                "last_drawn_time": "",
+                "rounds_missed": 0,
+                "history": [],
+                "subject_stats": {},
+            }
 
-                if group_filter and group_filter != all_group:
-                    if gender_filter and gender_filter != all_gender:
-                        subject_stat["group_gender_count"] += 1
+        # 更新学生的基本信息
+        student_data = history_data["students"][student_name]
+        student_data["total_count"] += 1
+        student_data["last_drawn_time"] = current_time
+        student_data["rounds_missed"] = 0  # 重置未选中次数
+
+        draw_method = 1
+
+        history_entry = {
+            "draw_method": draw_method,
+            "draw_time": current_time,
+            "draw_people_numbers": len(selected_students),
+            "draw_group": group_filter,
+            "draw_gender": gender_filter,
+            "weight": student.get("weight"),
+        }
+
+        # 如果能获取到课程信息，则添加到历史记录中并更新学科统计
+        if subject_name is not None:
+            history_entry["class_name"] = subject_name
+
+            # 更新学生级别的学科统计
+            if "subject_stats" not in student_data:
+                student_data["subject_stats"] = {}
+
+            if subject_name not in student_data["subject_stats"]:
+                student_data["subject_stats"][subject_name] = {
+                    "total_count": 0,
+                    "group_gender_count": 0,
+                }
 
-            student_data["history"].append(history_entry)
+            subject_stat = student_data["subject_stats"][subject_name]
+            subject_stat["total_count"] += 1
+
+            # 统计 group_gender_count（小组和性别都有限制）
+            all_group = event.get("all_group", "")
+            all_gender = event.get("all_gender", "")
+
+            if group_filter and group_filter != all_group:
+                if gender_filter and gender_filter != all_gender:
+                    subject_stat["group_gender_count"] += 1
+
+        student_data["history"].append(history_entry)
+        new_records.append((student_name, history_entry))
+
+    # 更新未被选中的学生的未选中次数
+    for student_name, student_data in history_data["students"].items():
+        if student_name not in selected_names:
+            student_data["rounds_missed"] += 1
+
+    # 更新小组和性别统计
+    for student in selected_students:
+        group = student.get("group", "")
+        gender = student.get("gender", "")
+
+        # 更新小组统计
+        if group not in history_data["group_stats"]:
+            history_data["group_stats"][group] = 0
+        history_data["group_stats"][group] += 1
+
+        # 更新性别统计
+        if gender not in history_data["gender_stats"]:
+            history_data["gender_stats"][gender] = 0
+        history_data["gender_stats"][gender] += 1
+
+    # 更新学科统计（顶层）
+    if subject_name:
+        if subject_name not in history_data["subject_stats"]:
+            history_data["subject_stats"][subject_name] = {
+                "group_stats": {},
+                "gender_stats": {},
+                "total_rounds": 0,
+                "total_stats": 0,
+            }
 
-        # 更新未被选中的学生的未选中次数
-        for student_name, student_data in history_data["students"].items():
-            if student_name not in selected_names:
-                student_data["rounds_missed"] += 1
+        subject_stat = history_data["subject_stats"][subject_name]
+        subject_stat["total_rounds"] += 1
+        subject_stat["total_stats"] += len(selected_students)
 
-        # 更新小组和性别统计
         for student in selected_students:
             group = student.get("group", "")
             gender = student.get("gender", "")
 
-            # 更新小组统计
-            if group not in history_data["group_stats"]:
-                history_data["group_stats"][group] = 0
-            history_data["group_stats"][group] += 1
-
-            # 更新性别统计
-            if gender not in history_data["gender_stats"]:
-                history_data["gender_stats"][gender] = 0
-            history_data["gender_stats"][gender] += 1
-
-        # 更新学科统计（顶层）
-        if current_class_info:
-            subject_name = current_class_info.get("name", "")
-            if subject_name:
-                if subject_name not in history_data["subject_stats"]:
-                    history_data["subject_stats"][subject_name] = {
-                        "group_stats": {},
-                        "gender_stats": {},
-                        "total_rounds": 0,
-                        "total_stats": 0,
-                    }
-
-                subject_stat = history_data["subject_stats"][subject_name]
-                subject_stat["total_rounds"] += 1
-                subject_stat["total_stats"] += len(selected_students)
-
-                for student in selected_students:
-                    group = student.get("group", "")
-                    gender = student.get("gender", "")
-
-                    # 更新学科小组统计
-                    if group:
-                        if group not in subject_stat["group_stats"]:
-                            subject_stat["group_stats"][group] = 0
-                        subject_stat["group_stats"][group] += 1
-
-                    # 更新学科性别统计
-                    if gender:
-                        if gender not in subject_stat["gender_stats"]:
-                            subject_stat["gender_stats"][gender] = 0
-                        subject_stat["gender_stats"][gender] += 1
-
-        # 更新总轮数和总统计数
-        history_data["total_rounds"] += 1
-        history_data["total_stats"] += len(selected_students)
-
-        # 保存历史记录
-        return save_history_data("roll_call", class_name, history_data)
+            # 更新学科小组统计
+            if group:
+                if group not in subject_stat["group_stats"]:
+                    subject_stat["group_stats"][group] = 0
+                subject_stat["group_stats"][group] += 1
 
-    except Exception as e:
-        logger.exception(f"保存点名历史记录失败: {e}")
-        return False
+            # 更新学科性别统计
+            if gender:
+                if gender not in subject_stat["gender_stats"]:
+                    subject_stat["gender_stats"][gender] = 0
+                subject_stat["gender_stats"][gender] += 1
+
+    # 更新总轮数和总统计数
+    history_data["total_rounds"] += 1
+    history_data["total_stats"] += len(selected_students)
+
+    return new_records
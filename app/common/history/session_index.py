@@ -0,0 +1,318 @@
+# ==================================================
+# 导入库
+# ==================================================
+import bisect
+import math
+import threading
+from array import array
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from loguru import logger
+
+from app.common.history.file_utils import load_history_data
+
+# 最多缓存的班级会话索引数量
+SESSION_INDEX_CACHE_MAX_ENTRIES = 8
+
+# 历史记录中 draw_time 的格式
+DRAW_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+# ==================================================
+# 点名会话索引
+# ==================================================
+# 会话索引把所有学生的 history 条目按抽取时间升序保存为按下标对齐的列式数组：
+#   times: 抽取时间（draw_time 按 UTC 换算的纪元秒数，不做时区转换）
+#   students: 学生下标（对应 student_names）
+#   subjects: 课程下标（对应 subject_names，无课程记录时为 -1）
+#   weights: 抽取时记录的权重（缺失时为 NaN）
+# 会话视图按课程筛选、按时间范围分页时只需二分查找，无需展开全部记录。
+# 索引只保存在内存中，以构建时的历史记录文档（或增量追加后的文档）校验有效性。
+
+
+class SessionIndex:
+    """点名历史记录的列式会话索引"""
+
+    def __init__(self):
+        self.times = array("q")
+        self.students = array("l")
+        self.subjects = array("l")
+        self.weights = array("d")
+        self.student_names: List[str] = []
+        self.subject_names: List[str] = []
+        self._student_ids: Dict[str, int] = {}
+        self._subject_ids: Dict[str, int] = {}
+        # 课程下标 -> 该课程记录的时间及位置（均为升序）
+        self._subject_times: Dict[int, array] = {}
+        self._subject_positions: Dict[int, array] = {}
+        self.log_seq = 0
+        self.source: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def from_history(cls, history_data: Dict[str, Any]) -> "SessionIndex":
+        """从历史记录数据构建会话索引
+
+        Args:
+            history_data: 点名历史记录数据
+
+        Returns:
+            SessionIndex: 会话索引
+        """
+        index = cls()
+        entries = []
+        skipped = 0
+        for student_name, student_info in history_data.get("students", {}).items():
+            if not isinstance(student_info, dict):
+                continue
+            student_id = index._get_student_id(student_name)
+            for record in student_info.get("history", []):
+                draw_time = record.get("draw_time", "")
+                if not draw_time:
+                    continue
+                timestamp = parse_draw_time(draw_time)
+                if timestamp is None:
+                    skipped += 1
+                    continue
+                entries.append((timestamp, student_id, record))
+        if skipped:
+            logger.warning(f"跳过 {skipped} 条抽取时间无法解析的点名历史记录")
+
+        # 同一时间的记录保持学生顺序
+        entries.sort(key=lambda entry: (entry[0], entry[1]))
+        for timestamp, student_id, record in entries:
+            index._append(timestamp, student_id, record)
+
+        index.log_seq = history_data.get("log_seq", 0)
+        index.source = history_data
+        return index
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def append(self, student_name: str, record: Dict[str, Any]) -> bool:
+        """追加一条新的历史记录条目
+
+        Args:
+            student_name: 学生名称
+            record: 历史记录条目
+
+        Returns:
+            bool: 是否追加成功（抽取时间早于已有记录时返回 False，需要重建索引）
+        """
+        draw_time = record.get("draw_time", "")
+        if not draw_time:
+            return True
+        timestamp = parse_draw_time(draw_time)
+        if timestamp is None or (self.times and timestamp < self.times[-1]):
+            return False
+        self._append(timestamp, self._get_student_id(student_name), record)
+        return True
+
+    def get_subject_id(self, subject_name: str) -> int:
+        """获取课程下标，索引中没有该课程的记录时返回 -1"""
+        return self._subject_ids.get(subject_name, -1)
+
+    def positions(
+        self,
+        subject_name: Optional[str] = None,
+        start_time: Optional[int] = None,
+        end_time: Optional[int] = None,
+    ) -> Sequence[int]:
+        """获取符合条件的记录位置（按抽取时间升序）
+
+        Args:
+            subject_name: 课程名称，为空时不按课程筛选
+            start_time: 起始时间（纪元秒数，包含），None 表示不限制
+            end_time: 结束时间（纪元秒数，不包含），None 表示不限制
+
+        Returns:
+            Sequence[int]: 记录位置
+        """
+        if subject_name:
+            subject_id = self._subject_ids.get(subject_name)
+            if subject_id is None:
+                return range(0)
+            times = self._subject_times[subject_id]
+            positions = self._subject_positions[subject_id]
+        else:
+            times = self.times
+            positions = None
+
+        low = 0 if start_time is None else bisect.bisect_left(times, start_time)
+        high = len(times) if end_time is None else bisect.bisect_left(times, end_time)
+        if positions is None:
+            return range(low, max(low, high))
+        return positions[low:high]
+
+    def page(
+        self,
+        subject_name: Optional[str] = None,
+        offset: int = 0,
+        limit: Optional[int] = None,
+        descending: bool = True,
+        start_time: Optional[int] = None,
+        end_time: Optional[int] = None,
+    ) -> Sequence[int]:
+        """按时间顺序分页获取记录位置
+
+        Args:
+            subject_name: 课程名称，为空时不按课程筛选
+            offset: 跳过的记录数
+            limit: 最多返回的记录数，None 表示不限制
+            descending: 是否按时间倒序（最新的记录在前）
+            start_time: 起始时间（纪元秒数，包含）
+            end_time: 结束时间（纪元秒数，不包含）
+
+        Returns:
+            Sequence[int]: 记录位置
+        """
+        positions = self.positions(subject_name, start_time, end_time)
+        if descending:
+            positions = positions[::-1]
+        stop = None if limit is None else offset + limit
+        return positions[offset:stop]
+
+    def session(self, position: int) -> Dict[str, Any]:
+        """获取指定位置的记录
+
+        Returns:
+            Dict[str, Any]: 包含 draw_time / name / class_name / weight 的字典
+        """
+        subject_id = self.subjects[position]
+        weight = self.weights[position]
+        return {
+            "draw_time": format_draw_time(self.times[position]),
+            "name": self.student_names[self.students[position]],
+            "class_name": self.subject_names[subject_id] if subject_id >= 0 else "",
+            "weight": "" if math.isnan(weight) else weight,
+        }
+
+    def _get_student_id(self, student_name: str) -> int:
+        student_id = self._student_ids.get(student_name)
+        if student_id is None:
+            student_id = len(self.student_names)
+            self._student_ids[student_name] = student_id
+            self.student_names.append(student_name)
+        return student_id
+
+    def _append(self, timestamp: int, student_id: int, record: Dict[str, Any]):
+        position = len(self.times)
+        self.times.append(timestamp)
+        self.students.append(student_id)
+        self.weights.append(_parse_weight(record.get("weight")))
+
+        subject_name = record.get("class_name", "")
+        if subject_name:
+            subject_id = self._subject_ids.get(subject_name)
+            if subject_id is None:
+                subject_id = len(self.subject_names)
+                self._subject_ids[subject_name] = subject_id
+                self.subject_names.append(subject_name)
+                self._subject_times[subject_id] = array("q")
+                self._subject_positions[subject_id] = array("l")
+            self._subject_times[subject_id].append(timestamp)
+            self._subject_positions[subject_id].append(position)
+        else:
+            subject_id = -1
+        self.subjects.append(subject_id)
+
+
+def parse_draw_time(draw_time: str) -> Optional[int]:
+    """将 draw_time 文本转换为纪元秒数，无法解析时返回 None"""
+    try:
+        return int((datetime.fromisoformat(draw_time) - _EPOCH).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def format_draw_time(timestamp: int) -> str:
+    """将纪元秒数转换为 draw_time 文本"""
+    return (_EPOCH + timedelta(seconds=timestamp)).strftime(DRAW_TIME_FORMAT)
+
+
+def _parse_weight(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+_session_indexes: "OrderedDict[str, SessionIndex]" = OrderedDict()
+_session_indexes_lock = threading.RLock()
+
+
+# ==================================================
+# 点名会话索引获取函数
+# ==================================================
+def get_session_index(class_name: str) -> SessionIndex:
+    """获取指定班级的会话索引（共享对象，调用方不得修改）
+
+    历史记录文档未变化时直接返回缓存的索引，否则重新构建。
+
+    Args:
+        class_name: 班级名称
+
+    Returns:
+        SessionIndex: 会话索引
+    """
+    history_data = load_history_data("roll_call", class_name, readonly=True)
+    with _session_indexes_lock:
+        index = _session_indexes.get(class_name)
+        if index is not None and index.source is history_data:
+            _session_indexes.move_to_end(class_name)
+            return index
+
+        index = SessionIndex.from_history(history_data)
+        _session_indexes[class_name] = index
+        _session_indexes.move_to_end(class_name)
+        while len(_session_indexes) > SESSION_INDEX_CACHE_MAX_ENTRIES:
+            _session_indexes.popitem(last=False)
+        return index
+
+
+def record_sessions(
+    class_name: str,
+    previous_seq: int,
+    history_data: Dict[str, Any],
+    new_records: Iterable[Tuple[str, Dict[str, Any]]],
+) -> None:
+    """将本次抽取新增的历史记录追加到会话索引
+
+    只有索引与抽取前的历史记录一致时才增量追加，否则丢弃索引，下次查询时重新构建。
+
+    Args:
+        class_name: 班级名称
+        previous_seq: 抽取前历史记录的 log_seq
+        history_data: 已写入本次抽取结果的历史记录数据
+        new_records: 本次新增的 (学生名称, 历史记录条目) 列表
+    """
+    with _session_indexes_lock:
+        index = _session_indexes.get(class_name)
+        if index is None:
+            return
+        if index.log_seq != previous_seq:
+            del _session_indexes[class_name]
+            return
+        for student_name, record in new_records:
+            if not index.append(student_name, record):
+                del _session_indexes[class_name]
+                return
+        index.log_seq = history_data.get("log_seq", 0)
+        index.source = history_data
+
+
+def invalidate_session_index(class_name: Optional[str] = None) -> None:
+    """丢弃内存中的会话索引（历史记录被删除后调用）
+
+    Args:
+        class_name: 班级名称，None 表示全部班级
+    """
+    with _session_indexes_lock:
+        if class_name is None:
+            _session_indexes.clear()
+        else:
+            _session_indexes.pop(class_name, None)
@@ -38,7 +38,7 @@ def get_draw_sessions_history(history_type: str, class_name: str) -> int:
     Returns:
         int: 抽取会话历史记录数量
     """
-    history_data = load_history_data(history_type, class_name)
+    history_data = load_history_data(history_type, class_name, readonly=True)
     session_count = 0
     if history_type == "roll_call":
         key = "students"
@@ -68,7 +68,7 @@ def get_individual_statistics(
     Returns:
         int: 个人统计记录数量
     """
-    history_data = load_history_data(history_type, class_name)
+    history_data = load_history_data(history_type, class_name, readonly=True)
     if history_type == "roll_call":
         key = "students"
     elif history_type == "lottery":
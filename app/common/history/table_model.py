@@ -0,0 +1,198 @@
+# ==================================================
+# 导入库
+# ==================================================
+import math
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+
+# ==================================================
+# 历史记录行数据
+# ==================================================
+class HistoryRowStore:
+    """历史记录表格的行数据，每次切换班级/奖池、课程或查看模式时构建一次
+
+    rows 中的每一行为已格式化的显示文本；各列的排序键及排序后的行顺序
+    在首次按该列排序时计算并缓存，之后滚动和排序都不再读取文件或重新计算权重。
+    """
+
+    def __init__(self, rows: Optional[List[Sequence[str]]] = None):
+        self.rows: List[Sequence[str]] = rows or []
+        self._sort_keys: Dict[int, List[Tuple[int, Any]]] = {}
+        self._orders: Dict[Tuple[int, bool], Sequence[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def row(self, row: int) -> Sequence[str]:
+        """获取一行各列的显示文本"""
+        return self.rows[row]
+
+    def cell(self, row: int, column: int) -> str:
+        """获取单元格显示文本，超出该行列数时返回空字符串"""
+        values = self.row(row)
+        return values[column] if column < len(values) else ""
+
+    def order(self, column: int, descending: bool = False) -> Sequence[int]:
+        """获取按指定列排序后的行顺序
+
+        Args:
+            column: 排序列索引，小于 0 时保持构建时的顺序
+            descending: 是否降序
+
+        Returns:
+            Sequence[int]: 排序后每个位置对应的行索引
+        """
+        if column < 0:
+            return range(len(self))
+        key = (column, descending)
+        order = self._orders.get(key)
+        if order is None:
+            sort_keys = self._get_sort_keys(column)
+            order = sorted(
+                range(len(self)), key=sort_keys.__getitem__, reverse=descending
+            )
+            self._orders[key] = order
+        return order
+
+    def _get_sort_keys(self, column: int) -> List[Tuple[int, Any]]:
+        sort_keys = self._sort_keys.get(column)
+        if sort_keys is None:
+            sort_keys = [
+                _cell_sort_key(self.cell(row, column)) for row in range(len(self))
+            ]
+            self._sort_keys[column] = sort_keys
+        return sort_keys
+
+
+class LazyRowStore(HistoryRowStore):
+    """按需生成行数据的 HistoryRowStore，只为显示过（或参与排序）的行生成显示文本
+
+    适用于行数很多且已有预排序顺序的数据（如按时间排列的会话索引）：
+    presorted 中给出的排序结果直接使用，无需生成整列排序键。
+    """
+
+    def __init__(
+        self,
+        row_count: int,
+        build_row: Callable[[int], Sequence[str]],
+        presorted: Optional[Dict[Tuple[int, bool], Sequence[int]]] = None,
+    ):
+        super().__init__()
+        self._row_count = row_count
+        self._build_row = build_row
+        self._row_cache: Dict[int, Sequence[str]] = {}
+        self._orders.update(presorted or {})
+
+    def __len__(self) -> int:
+        return self._row_count
+
+    def row(self, row: int) -> Sequence[str]:
+        values = self._row_cache.get(row)
+        if values is None:
+            values = self._build_row(row)
+            self._row_cache[row] = values
+        return values
+
+
+def _cell_sort_key(text: str) -> Tuple[int, Any]:
+    """数字（含补零的编号、对齐后的权重）按数值排序，其余按文本排序"""
+    try:
+        value = float(text)
+        if math.isfinite(value):
+            return (0, value)
+    except (TypeError, ValueError):
+        pass
+    return (1, str(text))
+
+
+# ==================================================
+# 历史记录表格模型
+# ==================================================
+class HistoryTableModel(QAbstractTableModel):
+    """基于 HistoryRowStore 的只读表格模型，只绘制可见行"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._headers: List[str] = []
+        self._store = HistoryRowStore()
+        self._order: Sequence[int] = range(0)
+
+    def set_store(
+        self,
+        headers: List[str],
+        store: HistoryRowStore,
+        sort_column: int = -1,
+        sort_order: Qt.SortOrder = Qt.SortOrder.AscendingOrder,
+    ):
+        """替换表头和行数据
+
+        Args:
+            headers: 表头文本
+            store: 行数据
+            sort_column: 排序列索引，小于 0 或超出列数时保持行数据原有顺序
+            sort_order: 排序方向
+        """
+        self.beginResetModel()
+        self._headers = list(headers)
+        self._store = store
+        if sort_column >= len(self._headers):
+            sort_column = -1
+        self._order = store.order(
+            sort_column, sort_order == Qt.SortOrder.DescendingOrder
+        )
+        self.endResetModel()
+
+    def clear(self):
+        """清空行数据，保留表头"""
+        self.set_store(self._headers, HistoryRowStore())
+
+    def rowCount(self, parent=None) -> int:
+        if parent is None:
+            parent = QModelIndex()
+        if parent.isValid():
+            return 0
+        return len(self._order)
+
+    def columnCount(self, parent=None) -> int:
+        if parent is None:
+            parent = QModelIndex()
+        if parent.isValid():
+            return 0
+        return len(self._headers)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self._store.cell(self._order[index.row()], index.column())
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return Qt.AlignmentFlag.AlignCenter
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if (
+            role == Qt.ItemDataRole.DisplayRole
+            and orientation == Qt.Orientation.Horizontal
+            and 0 <= section < len(self._headers)
+        ):
+            return self._headers[section]
+        return super().headerData(section, orientation, role)
+
+    def sort(self, column: int, order=Qt.SortOrder.AscendingOrder):
+        """按列排序，使用行数据中缓存的排序结果"""
+        self.layoutAboutToBeChanged.emit()
+        old_indexes = self.persistentIndexList()
+        old_rows = [self._order[index.row()] for index in old_indexes]
+        self._order = self._store.order(column, order == Qt.SortOrder.DescendingOrder)
+        if old_indexes:
+            positions = {row: position for position, row in enumerate(self._order)}
+            self.changePersistentIndexList(
+                old_indexes,
+                [
+                    self.index(positions[row], index.column())
+                    for row, index in zip(old_rows, old_indexes, strict=True)
+                ],
+            )
+        self.layoutChanged.emit()
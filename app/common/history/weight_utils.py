@@ -2,13 +2,12 @@
 # 导入库
 # ==================================================
 import math
+from typing import Iterable
 from random import SystemRandom
 from loguru import logger
 
-from app.tools.settings_access import readme_settings_async
-from app.Language.obtain_language import get_content_combo_name_async
-from app.common.history.file_utils import load_history_data
-from app.common.history.history_reader import filter_roll_call_history_by_subject
+from app.common.fair_draw.draw_config import DrawConfig
+from app.common.history.aggregate_index import load_aggregates, get_weight_view
 
 system_random = SystemRandom()
 
@@ -23,6 +22,20 @@ def format_weight_for_display(weights_data: list, weight_key: str = "weight") ->
         weights_data: 包含权重数据的列表
         weight_key: 权重在数据项中的键名，默认为'weight'
 
+    Returns:
+        tuple: (格式化函数, 整数部分最大长度, 小数部分最大长度)
+    """
+    return format_weight_values_for_display(
+        item.get(weight_key, 0) for item in weights_data
+    )
+
+
+def format_weight_values_for_display(weights: Iterable) -> tuple:
+    """格式化权重显示，确保小数点对齐（直接传入权重值）
+
+    Args:
+        weights: 权重值
+
     Returns:
         tuple: (格式化函数, 整数部分最大长度, 小数部分最大长度)
     """
@@ -30,8 +43,7 @@ def format_weight_for_display(weights_data: list, weight_key: str = "weight") ->
     max_int_length = 0  # 整数部分最大长度
     max_dec_length = 2  # 固定为两位小数
 
-    for item in weights_data:
-        weight = item.get(weight_key, 0)
+    for weight in weights:
         weight_str = str(weight)
         if "." in weight_str:
             int_part, _ = weight_str.split(".", 1)
@@ -66,74 +78,33 @@ def format_weight_for_display(weights_data: list, weight_key: str = "weight") ->
 # ==================================================
 # 公平抽取权重计算函数
 # ==================================================
-def calculate_weight(students_data: list, class_name: str, subject: str = "") -> list:
+def calculate_weight(
+    students_data: list,
+    class_name: str,
+    subject: str = "",
+    draw_config: DrawConfig | None = None,
+) -> list:
     """计算学生权重
 
     Args:
         students_data: 学生数据列表
         class_name: 班级名称
         subject: 科目名称（可选，用于按科目筛选历史记录）
+        draw_config: 抽取设置快照（可选，未提供时从当前设置构建）
 
     Returns:
         list: 更新后的学生数据列表，包含权重信息
     """
-    # 从设置中加载权重相关配置
-    settings = {
-        "fair_draw_enabled": readme_settings_async("fair_draw_settings", "fair_draw")
-        or False,
-        "fair_draw_group_enabled": readme_settings_async(
-            "fair_draw_settings", "fair_draw_group"
-        )
-        or False,
-        "fair_draw_gender_enabled": readme_settings_async(
-            "fair_draw_settings", "fair_draw_gender"
-        )
-        or False,
-        "fair_draw_time_enabled": readme_settings_async(
-            "fair_draw_settings", "fair_draw_time"
-        )
-        or False,
-        "base_weight": readme_settings_async("fair_draw_settings", "base_weight")
-        or 1.0,
-        "min_weight": readme_settings_async("fair_draw_settings", "min_weight") or 0.1,
-        "max_weight": readme_settings_async("fair_draw_settings", "max_weight") or 5.0,
-        "frequency_function": readme_settings_async(
-            "fair_draw_settings", "frequency_function"
-        )
-        or 1,
-        "frequency_weight": readme_settings_async(
-            "fair_draw_settings", "frequency_weight"
-        )
-        or 1.0,
-        "group_weight": readme_settings_async("fair_draw_settings", "group_weight")
-        or 1.0,
-        "gender_weight": readme_settings_async("fair_draw_settings", "gender_weight")
-        or 1.0,
-        "time_weight": readme_settings_async("fair_draw_settings", "time_weight")
-        or 1.0,
-        "cold_start_enabled": readme_settings_async(
-            "fair_draw_settings", "cold_start_enabled"
-        )
-        or False,
-        "cold_start_rounds": readme_settings_async(
-            "fair_draw_settings", "cold_start_rounds"
-        )
-        or 10,
-        "shield_enabled": readme_settings_async("advanced_settings", "shield_enabled")
-        or False,
-        "shield_time": readme_settings_async("advanced_settings", "shield_time") or 0,
-        "shield_time_unit": readme_settings_async(
-            "advanced_settings", "shield_time_unit"
-        )
-        or 0,
-    }
-
-    # 加载历史记录数据
-    history_data = load_history_data("roll_call", class_name)
+    # 从设置快照中加载权重相关配置
+    if draw_config is None:
+        draw_config = DrawConfig.from_settings(resolve_subject=False)
+    settings = draw_config.weight_settings()
+    all_group_label = draw_config.all_group_label
+    all_gender_label = draw_config.all_gender_label
 
-    # 如果指定了科目，按科目筛选历史记录
-    if subject:
-        history_data = filter_roll_call_history_by_subject(history_data, subject)
+    # 加载历史聚合索引（按科目筛选时使用该科目的统计）
+    aggregates = load_aggregates(class_name, all_group_label, all_gender_label)
+    history_data = get_weight_view(aggregates, subject)
 
     # 获取小组和性别统计
     group_stats = history_data.get("group_stats", {})
@@ -157,50 +128,18 @@ def calculate_weight(students_data: list, class_name: str, subject: str = "") ->
             "rounds_missed": 0,
         }
 
-    # 从历史记录中提取权重信息
-    if isinstance(history_data, dict) and "students" in history_data:
-        students_history = history_data.get("students", {})
-        if isinstance(students_history, dict):
-            for student_name, student_info in students_history.items():
-                if student_name in weight_data and isinstance(student_info, dict):
-                    # 更新总计数和最后抽取时间
-                    weight_data[student_name]["total_count"] = student_info.get(
-                        "total_count", 0
-                    )
-                    weight_data[student_name]["rounds_missed"] = student_info.get(
-                        "rounds_missed", 0
-                    )
-
-                    last_drawn_time = student_info.get("last_drawn_time", "")
-                    if last_drawn_time:
-                        weight_data[student_name]["last_drawn_time"] = last_drawn_time
-
-                    # 从历史记录中获取小组和性别信息
-                    history = student_info.get("history", [])
-                    if isinstance(history, list):
-                        for record in history:
-                            if isinstance(record, dict):
-                                # 更新小组计数
-                                draw_group = record.get("draw_group", "")
-                                if (
-                                    draw_group
-                                    and draw_group
-                                    != get_content_combo_name_async(
-                                        "roll_call", "range_combobox"
-                                    )[0]
-                                ):
-                                    weight_data[student_name]["group_count"] += 1
-
-                                # 更新性别计数
-                                draw_gender = record.get("draw_gender", "")
-                                if (
-                                    draw_gender
-                                    and draw_gender
-                                    != get_content_combo_name_async(
-                                        "roll_call", "gender_combobox"
-                                    )[0]
-                                ):
-                                    weight_data[student_name]["gender_count"] += 1
+    # 从聚合索引中提取权重信息
+    for student_name, aggregate in history_data["students"].items():
+        if student_name in weight_data:
+            student_weight_data = weight_data[student_name]
+            student_weight_data["total_count"] = aggregate.get("total_count", 0)
+            student_weight_data["rounds_missed"] = aggregate.get("rounds_missed", 0)
+            student_weight_data["group_count"] = aggregate.get("group_count", 0)
+            student_weight_data["gender_count"] = aggregate.get("gender_count", 0)
+
+            last_drawn_time = aggregate.get("last_drawn_time", "")
+            if last_drawn_time:
+                student_weight_data["last_drawn_time"] = last_drawn_time
 
     # 获取所有学生的总抽取次数，用于计算相对频率
     all_total_counts = [data["total_count"] for data in weight_data.values()]
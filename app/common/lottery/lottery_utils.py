@@ -1,31 +1,21 @@
 # ==================================================
 # 点名工具类
 # ==================================================
-import json
-from random import SystemRandom
-
-from app.common.data.list import (
-    get_group_list,
-    get_student_list,
-    filter_students_data,
-    get_pool_list,
-)
+from app.common.data.prize_pool import get_prize_drawn_counter, get_prize_pool
+from app.common.data.roster import get_roster
 from app.common.roll_call.roll_call_utils import RollCallUtils
+from app.common.fair_draw.weighted_sampler import weighted_sample_indices
 from app.common.history import calculate_weight
+from app.common.fair_draw.draw_config import DrawConfig
 from app.common.behind_scenes.behind_scenes_utils import BehindScenesUtils
 from app.tools.config import (
     calculate_remaining_count,
-    read_drawn_record,
-    read_drawn_record_simple,
     reset_drawn_record,
 )
-from app.tools.path_utils import get_data_path, open_file
 from app.tools.settings_access import readme_settings_async, get_safe_font_size
 
 from app.Language.obtain_language import get_any_position_value
 
-system_random = SystemRandom()
-
 
 class LotteryUtils:
     """抽奖工具类，提供通用的抽奖相关功能"""
@@ -43,20 +33,13 @@ class LotteryUtils:
         Returns:
             int: 总人数
         """
+        roster = get_roster(list_combobox_text)
         if range_combobox_index == 0:  # 全班
-            students = get_student_list(list_combobox_text)
-            total_count = len([s for s in students if s.get("exist", True)])
+            total_count = roster.count_existing()
         elif range_combobox_index == 1:  # 小组模式 - 计算小组数量
-            total_count = len(get_group_list(list_combobox_text))
+            total_count = len(roster.group_names)
         else:  # 特定小组 - 计算该小组的学生数量
-            students = get_student_list(list_combobox_text)
-            total_count = len(
-                [
-                    s
-                    for s in students
-                    if s["group"] == range_combobox_text and s.get("exist", True)
-                ]
-            )
+            total_count = roster.count_existing(range_combobox_text)
         return total_count
 
     @staticmethod
@@ -124,10 +107,13 @@ class LotteryUtils:
         half_repeat,
         pool_name=None,
         prize_list=None,
+        draw_config=None,
     ):
         """
         抽取随机学生
 
+        名单、已抽取记录和历史权重均与点名共用缓存，动画每一帧调用时无需重新读取文件
+
         Args:
             class_name: 班级名称
             group_index: 小组索引
@@ -138,16 +124,16 @@ class LotteryUtils:
             half_repeat: 半重复设置
             pool_name: 奖池名称（用于抽奖模式下应用内幕设置）
             prize_list: 奖品列表（用于提高指定该奖品的学生的权重）
+            draw_config: 抽取设置快照（可选，未提供时按点名设置构建）
 
         Returns:
             dict: 包含抽取结果的字典
         """
-        student_file = get_data_path("list/roll_call_list", f"{class_name}.json")
-        with open_file(student_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        if draw_config is None:
+            draw_config = DrawConfig.from_settings()
 
-        students_data = filter_students_data(
-            data, group_index, group_filter, gender_index, gender_filter
+        students_data = get_roster(class_name).filter_students(
+            group_index, group_filter, gender_index, gender_filter
         )
 
         if group_index == 1:
@@ -167,9 +153,8 @@ class LotteryUtils:
                 students_dict_list.append(student_dict)
 
             # 处理小组模式下的特殊逻辑
-            draw_type = readme_settings_async("roll_call_settings", "draw_type")
             selected_groups = RollCallUtils.draw_random_groups(
-                students_dict_list, current_count, draw_type
+                students_dict_list, current_count, draw_config.draw_type
             )
 
             return {
@@ -193,7 +178,9 @@ class LotteryUtils:
             students_dict_list.append(student_dict)
 
         if half_repeat > 0:
-            drawn_records = read_drawn_record(class_name, gender_filter, group_filter)
+            drawn_records = RollCallUtils.read_drawn_records(
+                class_name, gender_filter, group_filter
+            )
             drawn_counts = {name: count for name, count in drawn_records}
 
             filtered_students = []
@@ -211,9 +198,13 @@ class LotteryUtils:
             # 注意：这里我们返回一个特殊的标记，让调用者处理
             return {"reset_required": True}
 
-        draw_type = readme_settings_async("roll_call_settings", "draw_type")
-        if draw_type == 1:
-            students_with_weight = calculate_weight(students_dict_list, class_name)
+        if draw_config.draw_type == 1:
+            students_with_weight = calculate_weight(
+                students_dict_list,
+                class_name,
+                draw_config.subject_filter,
+                draw_config,
+            )
             weights = []
             for student in students_with_weight:
                 weights.append(student.get("weight", 1.0))
@@ -258,27 +249,9 @@ class LotteryUtils:
             # 使用内幕设置的权重
             weights = behind_scenes_weights
 
-        draw_count = current_count
-        draw_count = min(draw_count, len(students_with_weight))
-
         selected_students = []
         selected_students_dict = []
-        for _ in range(draw_count):
-            if not students_with_weight:
-                break
-            total_weight = sum(weights)
-            if total_weight <= 0:
-                random_index = system_random.randint(0, len(students_with_weight) - 1)
-            else:
-                rand_value = system_random.uniform(0, total_weight)
-                cumulative_weight = 0
-                random_index = 0
-                for i, weight in enumerate(weights):
-                    cumulative_weight += weight
-                    if rand_value <= cumulative_weight:
-                        random_index = i
-                        break
-
+        for random_index in weighted_sample_indices(weights, current_count):
             selected_student = students_with_weight[random_index]
             id = selected_student.get("id", "")
             random_name = selected_student.get("name", "")
@@ -286,9 +259,6 @@ class LotteryUtils:
             selected_students.append((id, random_name, exist))
             selected_students_dict.append(selected_student)
 
-            students_with_weight.pop(random_index)
-            weights.pop(random_index)
-
         return {
             "selected_students": selected_students,
             "class_name": class_name,
@@ -301,10 +271,7 @@ class LotteryUtils:
     def get_prize_total_count(pool_name: str) -> int:
         """获取奖池奖品总数"""
         try:
-            from app.common.data.list import get_pool_list
-
-            items = get_pool_list(pool_name)
-            return len([item for item in items if item.get("exist", True)])
+            return get_prize_pool(pool_name).existing_count
         except Exception:
             return 0
 
@@ -356,27 +323,24 @@ class LotteryUtils:
     def draw_random_prizes(pool_name: str, current_count: int):
         """按权重抽取奖品"""
         try:
-            items = get_pool_list(pool_name)
-            if not items:
+            pool = get_prize_pool(pool_name)
+            if not len(pool):
                 return {
                     "selected_prizes": [],
                     "pool_name": pool_name,
                     "selected_prizes_dict": [],
                 }
-            # 非重复/半重复处理：根据 TEMP 记录过滤已达阈值的奖品（与 roll_call 一致）
+            # 非重复/半重复处理：根据已抽取次数过滤已达阈值的奖品（与 roll_call 一致）
             threshold = LotteryUtils._get_prize_draw_threshold()
             if threshold is not None:
-                drawn_records = read_drawn_record_simple(pool_name)
-                drawn_counts = {name: cnt for name, cnt in drawn_records}
-                available = []
-                for i in items:
-                    name = i.get("name", "")
-                    cnt = int(drawn_counts.get(name, 0))
-                    if cnt < threshold:
-                        available.append(i)
-                items = available
-                if not items:
+                indices = get_prize_drawn_counter(pool_name).available_indices(
+                    threshold
+                )
+                if not indices:
                     return {"reset_required": True}
+            else:
+                indices = range(len(pool))
+            items = [pool.item(index) for index in indices]
 
             # 应用内幕设置
             items, behind_scenes_weights = (
@@ -408,35 +372,18 @@ class LotteryUtils:
             # 准备权重
             weights = []
             for i, item in enumerate(items):
-                base_weight = float(item.get("weight", 1))
+                base_weight = item["weight"]
                 behind_scenes_weight = behind_scenes_weights[i]
                 weights.append(base_weight * behind_scenes_weight)
 
-            draw = min(current_count, len(items))
             selected = []
             selected_dict = []
-            for _ in range(draw):
-                if not items:
-                    break
-                total_weight = sum(weights)
-                if total_weight <= 0:
-                    idx = system_random.randint(0, len(items) - 1)
-                else:
-                    rv = system_random.uniform(0, total_weight)
-                    cum = 0
-                    idx = 0
-                    for i, w in enumerate(weights):
-                        cum += w
-                        if rv <= cum:
-                            idx = i
-                            break
+            for idx in weighted_sample_indices(weights, current_count):
                 chosen = items[idx]
                 selected.append(
                     (chosen.get("id"), chosen.get("name"), chosen.get("exist", True))
                 )
                 selected_dict.append(chosen)
-                items.pop(idx)
-                weights.pop(idx)
             return {
                 "selected_prizes": selected,
                 "pool_name": pool_name,
@@ -471,24 +418,10 @@ class LotteryUtils:
     def calculate_prize_remaining_count(pool_name: str) -> int:
         """计算剩余可抽奖品数量，考虑不重复/半重复设置"""
         try:
-            from app.common.data.list import get_pool_list
-
             threshold = LotteryUtils._get_prize_draw_threshold()
-            items = [
-                item for item in get_pool_list(pool_name) if item.get("exist", True)
-            ]
-            total = len(items)
             if threshold is None:
-                return total
-            drawn_records = read_drawn_record_simple(pool_name)
-            drawn_counts = {name: cnt for name, cnt in drawn_records}
-            remain = 0
-            for i in items:
-                name = i.get("name", "")
-                cnt = int(drawn_counts.get(name, 0))
-                if cnt < threshold:
-                    remain += 1
-            return remain
+                return get_prize_pool(pool_name).existing_count
+            return get_prize_drawn_counter(pool_name).remaining_count(threshold)
         except Exception:
             return 0
 
@@ -505,53 +438,9 @@ class LotteryUtils:
         Returns:
             list: 选中的小组列表
         """
-        # 小组模式下，students_data已经只包含小组信息
-        # 直接使用小组数据进行抽取
-        draw_count = min(current_count, len(students_dict_list))
-
-        selected_groups = []
-        if draw_type == 1:
-            # 权重抽取模式下，所有小组权重相同
-            weights = [1.0] * len(students_dict_list)
-
-            # 根据权重抽取小组
-            for _ in range(draw_count):
-                if not students_dict_list:
-                    break
-                total_weight = sum(weights)
-                if total_weight <= 0:
-                    random_index = system_random.randint(0, len(students_dict_list) - 1)
-                else:
-                    rand_value = system_random.uniform(0, total_weight)
-                    cumulative_weight = 0
-                    random_index = 0
-                    for i, weight in enumerate(weights):
-                        cumulative_weight += weight
-                        if rand_value <= cumulative_weight:
-                            random_index = i
-                            break
-
-                selected_group = students_dict_list[random_index]
-                selected_groups.append(
-                    (None, selected_group["name"], True)
-                )  # (id, name, exist)
-
-                students_dict_list.pop(random_index)
-                weights.pop(random_index)
-        else:
-            # 随机抽取模式
-            for _ in range(draw_count):
-                if not students_dict_list:
-                    break
-                random_index = system_random.randint(0, len(students_dict_list) - 1)
-                selected_group = students_dict_list[random_index]
-                selected_groups.append(
-                    (None, selected_group["name"], True)
-                )  # (id, name, exist)
-
-                students_dict_list.pop(random_index)
-
-        return selected_groups
+        return RollCallUtils.draw_random_groups(
+            students_dict_list, current_count, draw_type
+        )
 
     @staticmethod
     def prepare_notification_settings():
@@ -617,6 +506,9 @@ class LotteryUtils:
         """
         reset_drawn_record(window, class_name, gender_filter, group_filter)
 
+        # 清除缓存，确保下次抽取时重新读取记录
+        RollCallUtils.invalidate_drawn_records(class_name)
+
     @staticmethod
     def update_start_button_state(button, total_count):
         """
@@ -1,12 +1,19 @@
 # ==================================================
 # 点名工具类
 # ==================================================
-import json
-from random import SystemRandom
-
-from app.common.data.list import get_group_list, get_student_list, filter_students_data
+from app.common.data.file_cache import FileCache
+from app.common.data.roster import (
+    get_roster,
+    get_roster_cache_stats,
+    invalidate_roster,
+)
 from app.common.history import calculate_weight
 from app.common.fair_draw.avg_gap_protection import apply_avg_gap_protection
+from app.common.fair_draw.draw_config import DrawConfig
+from app.common.fair_draw.weighted_sampler import (
+    weighted_sample_indices,
+    uniform_sample_indices,
+)
 from app.common.behind_scenes.behind_scenes_utils import BehindScenesUtils
 from app.tools.config import (
     calculate_remaining_count,
@@ -14,27 +21,101 @@ from app.tools.config import (
     reset_drawn_record,
     record_drawn_student,
 )
-from app.tools.path_utils import get_data_path, open_file
 from app.tools.settings_access import readme_settings_async, get_safe_font_size
 from app.common.display.result_display import ResultDisplayUtils
 from app.common.history import save_roll_call_history
-from app.common.extraction.extract import (
-    _get_current_class_info,
-    _is_non_class_time,
-    _get_break_assignment_class_info,
-)
+from app.tools.path_utils import get_data_path
 
 from app.Language.obtain_language import get_any_position_value
 
-system_random = SystemRandom()
+# 最多缓存的已抽取记录数量（班级 × 性别 × 小组 组合）
+DRAWN_RECORD_CACHE_MAX_ENTRIES = 64
 
 
 class RollCallUtils:
     """点名工具类，提供通用的点名相关功能"""
 
-    _student_data_cache = {}
-    _drawn_record_cache = {}
-    _behind_scenes_cache = {}
+    # 已抽取记录缓存，键为 (班级, 性别, 小组)，以 draw_until_*.json 文件签名校验
+    _drawn_record_cache = FileCache("drawn_record", DRAWN_RECORD_CACHE_MAX_ENTRIES)
+
+    @staticmethod
+    def get_drawn_record_path(class_name, gender_filter, group_filter):
+        """
+        获取已抽取记录文件路径（与 record_drawn_student 保持一致）
+
+        Args:
+            class_name: 班级名称
+            gender_filter: 性别过滤器
+            group_filter: 小组过滤器
+
+        Returns:
+            Path: 已抽取记录文件路径
+        """
+        return get_data_path(
+            "TEMP", f"draw_until_{class_name}_{gender_filter}_{group_filter}.json"
+        )
+
+    @staticmethod
+    def read_drawn_records(class_name, gender_filter, group_filter):
+        """
+        读取已抽取记录（按记录文件变化缓存）
+
+        Args:
+            class_name: 班级名称
+            gender_filter: 性别过滤器
+            group_filter: 小组过滤器
+
+        Returns:
+            list: (名称, 次数) 元组列表（共享对象，调用方不得修改）
+        """
+        return RollCallUtils._drawn_record_cache.get(
+            (class_name, gender_filter, group_filter),
+            [
+                RollCallUtils.get_drawn_record_path(
+                    class_name, gender_filter, group_filter
+                )
+            ],
+            lambda: read_drawn_record(class_name, gender_filter, group_filter),
+        )
+
+    @staticmethod
+    def invalidate_drawn_records(class_name=None):
+        """
+        使已抽取记录缓存失效（已抽取记录被重置后调用）
+
+        Args:
+            class_name: 班级名称，None 表示全部班级
+        """
+        if class_name is None:
+            RollCallUtils._drawn_record_cache.invalidate()
+        else:
+            RollCallUtils._drawn_record_cache.invalidate(
+                predicate=lambda key: key[0] == class_name
+            )
+
+    @staticmethod
+    def invalidate_caches(class_name=None):
+        """
+        使名单及已抽取记录缓存失效（名单被修改后调用）
+
+        Args:
+            class_name: 班级名称，None 表示全部班级
+        """
+        invalidate_roster(class_name)
+        RollCallUtils.invalidate_drawn_records(class_name)
+
+    @staticmethod
+    def get_cache_stats():
+        """
+        获取名单及已抽取记录缓存的大小和命中率
+
+        Returns:
+            dict: 缓存名称 -> {entries, max_entries, hits, misses, hit_rate}
+        """
+        return {
+            "roster": get_roster_cache_stats(),
+            "drawn_record": RollCallUtils._drawn_record_cache.get_stats(),
+        }
 
     @staticmethod
     def get_total_count(list_combobox_text, range_combobox_index, range_combobox_text):
@@ -49,20 +130,13 @@ class RollCallUtils:
         Returns:
             int: 总人数
         """
+        roster = get_roster(list_combobox_text)
         if range_combobox_index == 0:  # 全班
-            students = get_student_list(list_combobox_text)
-            total_count = len([s for s in students if s.get("exist", True)])
+            total_count = roster.count_existing()
         elif range_combobox_index == 1:  # 小组模式 - 计算小组数量
-            total_count = len(get_group_list(list_combobox_text))
+            total_count = len(roster.group_names)
         else:  # 特定小组 - 计算该小组的学生数量
-            students = get_student_list(list_combobox_text)
-            total_count = len(
-                [
-                    s
-                    for s in students
-                    if s["group"] == range_combobox_text and s.get("exist", True)
-                ]
-            )
+            total_count = roster.count_existing(range_combobox_text)
         return total_count
 
     @staticmethod
@@ -161,6 +235,7 @@ class RollCallUtils:
         gender_filter,
         current_count,
         half_repeat,
+        draw_config=None,
     ):
         """
         抽取随机学生
@@ -173,26 +248,71 @@ class RollCallUtils:
             gender_filter: 性别过滤器
             current_count: 当前抽取数量
             half_repeat: 半重复设置
+            draw_config: 抽取设置快照（可选，动画会话中应复用同一个快照）
 
         Returns:
             dict: 包含抽取结果的字典
         """
-        cache_key = (
-            f"{class_name}_{group_index}_{group_filter}_{gender_index}_{gender_filter}"
+        draw_pool = RollCallUtils.prepare_draw_pool(
+            class_name,
+            group_index,
+            group_filter,
+            gender_index,
+            gender_filter,
+            current_count,
+            half_repeat,
+            draw_config,
         )
+        return RollCallUtils.draw_from_pool(draw_pool, current_count)
 
-        if cache_key not in RollCallUtils._student_data_cache:
-            student_file = get_data_path("list/roll_call_list", f"{class_name}.json")
-            with open_file(student_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
+    @staticmethod
+    def prepare_draw_pool(
+        class_name,
+        group_index,
+        group_filter,
+        gender_index,
+        gender_filter,
+        current_count,
+        half_repeat,
+        draw_config=None,
+    ):
+        """
+        执行完整的公平抽取流程（已抽取过滤、平均值差值保护、内幕设置、权重计算），
+        返回可供抽样的候选池
 
-            students_data = filter_students_data(
-                data, group_index, group_filter, gender_index, gender_filter
-            )
+        动画开始时调用一次，之后每一帧只需用 draw_from_pool 从候选池中抽样，
+        停止时再调用 draw_random_students 执行一次完整的正式抽取。
 
-            RollCallUtils._student_data_cache[cache_key] = students_data
-        else:
-            students_data = RollCallUtils._student_data_cache[cache_key]
+        Args:
+            class_name: 班级名称
+            group_index: 小组索引
+            group_filter: 小组过滤器
+            gender_index: 性别索引
+            gender_filter: 性别过滤器
+            current_count: 当前抽取数量
+            half_repeat: 半重复设置
+            draw_config: 抽取设置快照（可选）
+
+        Returns:
+            dict: 候选池；需要重置已抽取记录时为 {"reset_required": True}
+        """
+        if draw_config is None:
+            draw_config = DrawConfig.from_settings()
+
+        draw_pool = {
+            "class_name": class_name,
+            "group_filter": group_filter,
+            "gender_filter": gender_filter,
+            "group_mode": False,
+            "draw_type": draw_config.draw_type,
+            "guaranteed": None,
+            "candidates": [],
+            "weights": [],
+        }
+
+        students_data = get_roster(class_name).filter_students(
+            group_index, group_filter, gender_index, gender_filter
+        )
 
         if group_index == 1:
             students_data = sorted(students_data, key=lambda x: x[3])
@@ -208,18 +328,9 @@ class RollCallUtils:
                 }
                 students_dict_list.append(student_dict)
 
-            draw_type = readme_settings_async("roll_call_settings", "draw_type")
-            selected_groups = RollCallUtils.draw_random_groups(
-                students_dict_list, current_count, draw_type
-            )
-
-            return {
-                "selected_students": selected_groups,
-                "class_name": class_name,
-                "selected_students_dict": [],
-                "group_filter": group_filter,
-                "gender_filter": gender_filter,
-            }
+            draw_pool["group_mode"] = True
+            draw_pool["candidates"] = students_dict_list
+            return draw_pool
 
         students_dict_list = []
         for student_tuple in students_data:
@@ -233,15 +344,9 @@ class RollCallUtils:
             students_dict_list.append(student_dict)
 
         if half_repeat > 0:
-            record_key = f"{class_name}_{gender_filter}_{group_filter}"
-            if record_key not in RollCallUtils._drawn_record_cache:
-                drawn_records = read_drawn_record(
-                    class_name, gender_filter, group_filter
-                )
-                RollCallUtils._drawn_record_cache[record_key] = drawn_records
-            else:
-                drawn_records = RollCallUtils._drawn_record_cache[record_key]
-
+            drawn_records = RollCallUtils.read_drawn_records(
+                class_name, gender_filter, group_filter
+            )
             drawn_counts = {name: count for name, count in drawn_records}
 
             filtered_students = []
@@ -258,43 +363,21 @@ class RollCallUtils:
         if not students_dict_list:
             return {"reset_required": True}
 
-        # 获取当前课程信息（用于科目过滤）
-        current_class_info = None
-        subject_history_filter_enabled = (
-            readme_settings_async("linkage_settings", "subject_history_filter_enabled")
-            or False
-        )
-
-        if subject_history_filter_enabled:
-            data_source = readme_settings_async("linkage_settings", "data_source")
-            if data_source == 2:
-                from app.common.IPC_URL.csharp_ipc_handler import CSharpIPCHandler
-
-                current_class_info = (
-                    CSharpIPCHandler.instance().get_current_class_info()
-                )
-            elif data_source == 1:
-                current_class_info = _get_current_class_info()
-            else:
-                current_class_info = None
-
-            # 如果当前没有课程信息（课间时段），则使用课间归属的课程信息
-            if not current_class_info:
-                if _is_non_class_time():
-                    current_class_info = _get_break_assignment_class_info()
-
-        # 提取科目名称
-        subject_filter = ""
-        if current_class_info:
-            subject_filter = current_class_info.get("name", "")
+        # 当前课程信息（用于科目过滤）已在设置快照中解析
+        subject_filter = draw_config.subject_filter
 
         students_dict_list = apply_avg_gap_protection(
-            students_dict_list, current_count, class_name, "roll_call", subject_filter
+            students_dict_list,
+            current_count,
+            class_name,
+            "roll_call",
+            subject_filter,
+            draw_config=draw_config,
         )
 
         students_dict_list, behind_scenes_weights = (
             BehindScenesUtils.apply_probability_weights(
-                students_dict_list, 0, class_name
+                students_dict_list, 0, class_name, draw_config=draw_config
             )
         )
 
@@ -303,31 +386,12 @@ class RollCallUtils:
             students_dict_list, behind_scenes_weights, class_name
         )
         if guaranteed_students is not None:
-            # 存在必中人员，直接返回
-            selected_students = []
-            selected_students_dict = []
-            for student in guaranteed_students:
-                selected_students.append(
-                    (
-                        student.get("id", ""),
-                        student.get("name", ""),
-                        student.get("exist", True),
-                    )
-                )
-                selected_students_dict.append(student)
-
-            return {
-                "selected_students": selected_students,
-                "class_name": class_name,
-                "selected_students_dict": selected_students_dict,
-                "group_filter": group_filter,
-                "gender_filter": gender_filter,
-            }
+            draw_pool["guaranteed"] = guaranteed_students
+            return draw_pool
 
-        draw_type = readme_settings_async("roll_call_settings", "draw_type")
-        if draw_type == 1:
+        if draw_config.draw_type == 1:
             students_with_weight = calculate_weight(
-                students_dict_list, class_name, subject_filter
+                students_dict_list, class_name, subject_filter, draw_config
             )
             weights = []
             for i, student in enumerate(students_with_weight):
@@ -341,27 +405,60 @@ class RollCallUtils:
             students_with_weight = students_dict_list
             weights = behind_scenes_weights
 
-        draw_count = current_count
-        draw_count = min(draw_count, len(students_with_weight))
-
-        selected_students = []
-        selected_students_dict = []
-        for _ in range(draw_count):
-            if not students_with_weight:
-                break
-            total_weight = sum(weights)
-            if total_weight <= 0:
-                random_index = system_random.randint(0, len(students_with_weight) - 1)
-            else:
-                rand_value = system_random.uniform(0, total_weight)
-                cumulative_weight = 0
-                random_index = 0
-                for i, weight in enumerate(weights):
-                    cumulative_weight += weight
-                    if rand_value <= cumulative_weight:
-                        random_index = i
-                        break
+        draw_pool["candidates"] = students_with_weight
+        draw_pool["weights"] = weights
+        return draw_pool
+
+    @staticmethod
+    def draw_from_pool(draw_pool, current_count):
+        """
+        从 prepare_draw_pool 返回的候选池中按权重抽样
 
+        候选池本身不会被修改，可在动画的每一帧重复调用。
+
+        Args:
+            draw_pool: 候选池
+            current_count: 当前抽取数量
+
+        Returns:
+            dict: 包含抽取结果的字典，格式与 draw_random_students 相同
+        """
+        if draw_pool.get("reset_required"):
+            return {"reset_required": True}
+
+        result = {
+            "selected_students": [],
+            "class_name": draw_pool["class_name"],
+            "selected_students_dict": [],
+            "group_filter": draw_pool["group_filter"],
+            "gender_filter": draw_pool["gender_filter"],
+        }
+
+        if draw_pool["group_mode"]:
+            result["selected_students"] = RollCallUtils.draw_random_groups(
+                list(draw_pool["candidates"]), current_count, draw_pool["draw_type"]
+            )
+            return result
+
+        if draw_pool["guaranteed"] is not None:
+            # 存在必中人员，直接返回
+            for student in draw_pool["guaranteed"]:
+                result["selected_students"].append(
+                    (
+                        student.get("id", ""),
+                        student.get("name", ""),
+                        student.get("exist", True),
+                    )
+                )
+                result["selected_students_dict"].append(student)
+            return result
+
+        students_with_weight = draw_pool["candidates"]
+        weights = draw_pool["weights"]
+
+        selected_students = result["selected_students"]
+        selected_students_dict = result["selected_students_dict"]
+        for random_index in weighted_sample_indices(weights, current_count):
             selected_student = students_with_weight[random_index]
             id = selected_student.get("id", "")
             random_name = selected_student.get("name", "")
@@ -369,16 +466,7 @@ class RollCallUtils:
             selected_students.append((id, random_name, exist))
             selected_students_dict.append(selected_student)
 
-            students_with_weight.pop(random_index)
-            weights.pop(random_index)
-
-        return {
-            "selected_students": selected_students,
-            "class_name": class_name,
-            "selected_students_dict": selected_students_dict,
-            "group_filter": group_filter,
-            "gender_filter": gender_filter,
-        }
+        return result
 
     @staticmethod
     def draw_random_groups(students_dict_list, current_count, draw_type):
@@ -395,49 +483,22 @@ class RollCallUtils:
         """
         # 小组模式下，students_data已经只包含小组信息
         # 直接使用小组数据进行抽取
-        draw_count = min(current_count, len(students_dict_list))
-
-        selected_groups = []
         if draw_type == 1:
             # 权重抽取模式下，所有小组权重相同
             weights = [1.0] * len(students_dict_list)
-
-            # 根据权重抽取小组
-            for _ in range(draw_count):
-                if not students_dict_list:
-                    break
-                total_weight = sum(weights)
-                if total_weight <= 0:
-                    random_index = system_random.randint(0, len(students_dict_list) - 1)
-                else:
-                    rand_value = system_random.uniform(0, total_weight)
-                    cumulative_weight = 0
-                    random_index = 0
-                    for i, weight in enumerate(weights):
-                        cumulative_weight += weight
-                        if rand_value <= cumulative_weight:
-                            random_index = i
-                            break
-
-                selected_group = students_dict_list[random_index]
-                selected_groups.append(
-                    (None, selected_group["name"], True)
-                )  # (id, name, exist)
-
-                students_dict_list.pop(random_index)
-                weights.pop(random_index)
+            selected_indices = weighted_sample_indices(weights, current_count)
         else:
             # 随机抽取模式
-            for _ in range(draw_count):
-                if not students_dict_list:
-                    break
-                random_index = system_random.randint(0, len(students_dict_list) - 1)
-                selected_group = students_dict_list[random_index]
-                selected_groups.append(
-                    (None, selected_group["name"], True)
-                )  # (id, name, exist)
+            selected_indices = uniform_sample_indices(
+                len(students_dict_list), current_count
+            )
 
-                students_dict_list.pop(random_index)
+        selected_groups = []
+        for random_index in selected_indices:
+            selected_group = students_dict_list[random_index]
+            selected_groups.append(
+                (None, selected_group["name"], True)
+            )  # (id, name, exist)
 
         return selected_groups
 
@@ -504,11 +565,9 @@ class RollCallUtils:
             group_filter: 小组过滤器
         """
         reset_drawn_record(window, class_name, gender_filter, group_filter)
-        
-        # 清除缓存，确保下次抽取时重新读取记录
-        record_key = f"{class_name}_{gender_filter}_{group_filter}"
-        if record_key in RollCallUtils._drawn_record_cache:
-            del RollCallUtils._drawn_record_cache[record_key]
+
+        # 清除缓存，确保下次抽取时重新读取记录（重置可能删除该班级的多个记录文件）
+        RollCallUtils.invalidate_drawn_records(class_name)
 
     @staticmethod
     def update_start_button_state(button, total_count):
@@ -623,6 +682,7 @@ class RollCallUtils:
         gender_filter,
         group_filter,
         half_repeat,
+        draw_config=None,
     ):
         """
         记录已抽取的学生
@@ -634,6 +694,7 @@ class RollCallUtils:
             gender_filter: 性别过滤器
             group_filter: 小组过滤器
             half_repeat: 半重复设置
+            draw_config: 抽取设置快照（可选，与抽取时使用的快照保持一致）
         """
         if half_repeat > 0:
             record_drawn_student(
@@ -642,11 +703,11 @@ class RollCallUtils:
                 group=group_filter,
                 student_name=selected_students,
             )
-            
+
             # 清除缓存，确保下次抽取时重新读取最新的已抽取记录
-            record_key = f"{class_name}_{gender_filter}_{group_filter}"
-            if record_key in RollCallUtils._drawn_record_cache:
-                del RollCallUtils._drawn_record_cache[record_key]
+            RollCallUtils._drawn_record_cache.invalidate(
+                (class_name, gender_filter, group_filter)
+            )
 
         if selected_students_dict:
             save_roll_call_history(
@@ -654,6 +715,7 @@ class RollCallUtils:
                 selected_students=selected_students_dict,
                 group_filter=group_filter,
                 gender_filter=gender_filter,
+                draw_config=draw_config,
             )
 
     @staticmethod
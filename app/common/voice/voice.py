@@ -8,6 +8,7 @@
 import json
 import asyncio
 import concurrent.futures
+import hashlib
 import os
 import platform
 import queue
@@ -17,7 +18,7 @@ import time
 from collections import OrderedDict
 from io import BytesIO
 from queue import Queue, Empty
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 # --------- 第三方库 ---------
 import edge_tts
@@ -57,6 +58,38 @@ def require_permission(permission: str):
     return decorator
 
 
+def load_audio_settings(class_name: str) -> Dict[str, Any]:
+    """读取班级的音频设置（学生的 TTS 别名、前缀和后缀），文件不存在时返回空字典"""
+    if not class_name:
+        return {}
+    audio_file = get_audio_path(f"{class_name}.json")
+    if not audio_file.exists():
+        return {}
+    with open(str(audio_file), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def build_announcement_text(name: str, audio_settings: Dict[str, Any]) -> str:
+    """应用TTS别名、前缀和后缀，构建最终的播报文本"""
+    # 获取对应的音频设置，如果不存在则使用默认值
+    settings = audio_settings.get(name, {})
+    tts_alias = settings.get("tts_alias", "")
+    prefix = settings.get("prefix", "")
+    suffix = settings.get("suffix", "")
+
+    announcement_text = []
+    if prefix:
+        announcement_text.append(prefix)
+    if tts_alias:
+        announcement_text.append(tts_alias)
+    else:
+        announcement_text.append(name)
+    if suffix:
+        announcement_text.append(suffix)
+
+    return " ".join(announcement_text)
+
+
 class VoicePlaybackSystem:
     """语音播报核心引擎"""
 
@@ -282,25 +315,111 @@ class VoicePlaybackSystem:
                 break
 
 
-class VoiceCacheManager:
-    """智能语音缓存系统"""
+class EdgeTTSBackend:
+    """Edge TTS 在线合成后端"""
+
+    async def synthesize(self, text: str, voice: str) -> bytes:
+        """合成语音，返回编码后的音频数据"""
+        communicate = edge_tts.Communicate(text, voice)
+
+        audio_buffer = BytesIO()
+        audio_chunks = 0
+        async for chunk in communicate.stream():
+            if chunk["type"] == "audio":
+                audio_buffer.write(chunk["data"])
+                audio_chunks += 1
+
+        logger.debug(f"接收到{audio_chunks}个音频数据块")
+        return audio_buffer.getvalue()
 
-    # 智能语音缓存系统
-    # 内存缓存大小限制（条） - 优化为更小的缓存以减少内存占用
-    MEMORY_CACHE_SIZE = 25
-    # 缓存过期时间（秒）
-    CACHE_EXPIRY_TIME = 3600 * 24  # 24小时
+
+class LocalTTSBackend:
+    """离线替身合成后端
+
+    按文本生成一段提示音并模拟网络延迟，用于在没有网络时测量合成流水线的耗时。
+    生成的音频不是真实语音，应配合单独的缓存目录使用，避免写入正式的语音缓存。
+    """
+
+    def __init__(self, latency: float = 0.3, sample_rate: int = 24000):
+        self.latency: float = latency  # 模拟的单次合成耗时（秒）
+        self.sample_rate: int = sample_rate
+
+    async def synthesize(self, text: str, voice: str) -> bytes:
+        """生成提示音，返回 WAV 编码的音频数据"""
+        if self.latency > 0:
+            await asyncio.sleep(self.latency)
+
+        # 时长随文本长度增加，音高由文本决定，便于区分播放顺序
+        duration = min(0.15 + 0.08 * len(text), 3.0)
+        frequency = 330 + sum(map(ord, text)) % 440
+        t = np.arange(int(self.sample_rate * duration)) / self.sample_rate
+        data = 0.2 * np.sin(2 * np.pi * frequency * t)
+
+        buffer = BytesIO()
+        sf.write(buffer, data, self.sample_rate, format="WAV")
+        return buffer.getvalue()
+
+
+class VoiceCacheManager:
+    """智能语音缓存系统
+
+    两级缓存，均按字节数限制容量并按最近访问时间淘汰：
+        内存缓存：解码后的音频数据，上限 memory_budget_bytes
+        磁盘缓存：FLAC 压缩的音频文件，上限 disk_budget_bytes，文件的修改时间即最近访问时间
+    缓存键为语音名称和文本的 SHA-1 摘要，不受文本中特殊字符和文件名长度的影响。
+    """
+
+    # 内存缓存容量上限（字节）
+    MEMORY_CACHE_MAX_BYTES = 32 * 1024 * 1024
+    # 磁盘缓存容量上限（字节）
+    DISK_CACHE_MAX_BYTES = 256 * 1024 * 1024
+    # 磁盘缓存文件格式
+    CACHE_FILE_EXTENSION = ".flac"
+    CACHE_FILE_FORMAT = "FLAC"
+    CACHE_FILE_SUBTYPE = "PCM_16"
+    # 旧版本使用的未压缩缓存文件扩展名（{voice}_{text}.wav）
+    LEGACY_CACHE_FILE_EXTENSION = ".wav"
     # 清理间隔时间（秒）
     CLEANUP_INTERVAL = 3600  # 1小时
 
-    def __init__(self, audio_dir: Optional[str] = None):
+    def __init__(
+        self,
+        audio_dir: Optional[str] = None,
+        backend: Optional[Union[EdgeTTSBackend, LocalTTSBackend]] = None,
+        memory_budget_bytes: Optional[int] = None,
+        disk_budget_bytes: Optional[int] = None,
+    ):
         self.audio_dir: str = audio_dir if audio_dir else get_audio_path("voices")
         ensure_dir(self.audio_dir)
+        # 语音合成后端，默认使用 Edge TTS
+        self.backend = backend if backend is not None else EdgeTTSBackend()
+        self.memory_budget_bytes: int = (
+            memory_budget_bytes
+            if memory_budget_bytes is not None
+            else self.MEMORY_CACHE_MAX_BYTES
+        )
+        self.disk_budget_bytes: int = (
+            disk_budget_bytes
+            if disk_budget_bytes is not None
+            else self.DISK_CACHE_MAX_BYTES
+        )
+
         # 使用OrderedDict实现LRU缓存
         self._memory_cache: Dict[str, Tuple[np.ndarray, int]] = OrderedDict()
-        self._disk_cache_lock: threading.Lock = threading.Lock()
+        self._memory_bytes: int = 0
         self._memory_cache_lock: threading.Lock = threading.Lock()
-        self._last_cleanup_time: float = time.time()
+        # 磁盘缓存索引：文件路径 -> 文件大小，按最近访问时间排列，首次使用时扫描目录建立
+        self._disk_index: Optional[Dict[str, int]] = None
+        self._disk_bytes: int = 0
+        self._disk_cache_lock: threading.Lock = threading.Lock()
+        # 统计计数：内存缓存相关及未命中次数由内存缓存锁保护，磁盘缓存相关由磁盘缓存锁保护
+        self._stats: Dict[str, int] = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "memory_evictions": 0,
+            "disk_evictions": 0,
+        }
 
         # 启动缓存清理线程
         self._cleanup_thread: threading.Thread = threading.Thread(
@@ -322,9 +441,16 @@ class VoiceCacheManager:
 
         logger.debug(f"获取语音: text='{text}', voice='{voice}'")
 
-        # 检查并执行缓存清理
-        self._check_and_cleanup()
+        # 1-2. 检查内存缓存和磁盘缓存
+        cached = self.lookup_voice(text, voice)
+        if cached is not None:
+            return cached
 
+        # 3. 实时生成并缓存
+        return asyncio.run(self.synthesize_voice(text, voice))
+
+    def lookup_voice(self, text: str, voice: str) -> Optional[Tuple[np.ndarray, int]]:
+        """只查找内存缓存和磁盘缓存，未命中时返回 None"""
         # 1. 检查内存缓存
         cache_key: str = self._generate_cache_key(text, voice)
         with self._memory_cache_lock:
@@ -332,6 +458,7 @@ class VoiceCacheManager:
                 logger.debug(f"命中内存缓存: {cache_key}")
                 # 移到末尾表示最近使用
                 self._memory_cache.move_to_end(cache_key)
+                self._stats["memory_hits"] += 1
                 return self._memory_cache[cache_key]
 
         # 2. 检查磁盘缓存
@@ -340,27 +467,61 @@ class VoiceCacheManager:
             logger.debug(f"命中磁盘缓存: {file_path}")
             try:
                 data, fs = sf.read(file_path)
-                # 更新文件的访问时间和修改时间，延长缓存有效期
-                current_time = time.time()
-                os.utime(file_path, times=(current_time, current_time))
+                self._touch_disk_entry(file_path)
+                with self._disk_cache_lock:
+                    self._stats["disk_hits"] += 1
                 # 加入内存缓存
                 self._add_to_memory_cache(cache_key, data, fs)
                 return data, fs
             except Exception as e:
                 logger.exception(f"读取缓存失败: {e}")
-        else:
-            logger.debug(f"未命中缓存，生成新语音: {cache_key}")
 
-        # 3. 实时生成并缓存
-        data, fs = asyncio.run(self._generate_voice(text, voice))
+        # 旧版本的未压缩缓存文件：读取后转存为新格式
+        legacy_path: str = self._get_legacy_cache_file_path(text, voice)
+        if os.path.exists(legacy_path):
+            logger.debug(f"命中旧版磁盘缓存: {legacy_path}")
+            try:
+                data, fs = sf.read(legacy_path)
+                with self._disk_cache_lock:
+                    self._stats["disk_hits"] += 1
+                self._save_in_background(file_path, data, fs, legacy_path)
+                self._add_to_memory_cache(cache_key, data, fs)
+                return data, fs
+            except Exception as e:
+                logger.exception(f"读取缓存失败: {e}")
+
+        logger.debug(f"未命中缓存，生成新语音: {cache_key}")
+        with self._memory_cache_lock:
+            self._stats["misses"] += 1
+        return None
+
+    def has_cached_voice(self, text: str, voice: str) -> bool:
+        """语音是否已在内存缓存或磁盘缓存中（不读取音频数据）"""
+        with self._memory_cache_lock:
+            if self._generate_cache_key(text, voice) in self._memory_cache:
+                return True
+        return os.path.exists(self._get_cache_file_path(text, voice)) or os.path.exists(
+            self._get_legacy_cache_file_path(text, voice)
+        )
+
+    async def synthesize_voice(
+        self, text: str, voice: str, remember: bool = True
+    ) -> Tuple[np.ndarray, int]:
+        """生成语音并写入磁盘缓存
+
+        Args:
+            text: 播报文本
+            voice: 语音名称
+            remember: 是否同时加入内存缓存（预热时为 False，避免挤掉常用语音）
+        """
+        data, fs = await self._generate_voice(text, voice)
 
         # 异步保存到磁盘
-        threading.Thread(
-            target=self._save_to_disk, args=(file_path, data, fs), daemon=True
-        ).start()
+        self._save_in_background(self._get_cache_file_path(text, voice), data, fs)
 
         # 加入内存缓存
-        self._add_to_memory_cache(cache_key, data, fs)
+        if remember:
+            self._add_to_memory_cache(self._generate_cache_key(text, voice), data, fs)
         return data, fs
 
     async def _generate_voice(self, text: str, voice: str) -> Tuple[np.ndarray, int]:
@@ -376,22 +537,14 @@ class VoiceCacheManager:
 
         while retry_count < max_retries:
             try:
-                communicate = edge_tts.Communicate(text, voice)
-
-                audio_buffer = BytesIO()
-                audio_chunks = 0
-                async for chunk in communicate.stream():
-                    if chunk["type"] == "audio":
-                        audio_buffer.write(chunk["data"])
-                        audio_chunks += 1
-
-                logger.debug(f"接收到{audio_chunks}个音频数据块")
-
-                if audio_chunks == 0:
+                audio_bytes = await self.backend.synthesize(text, voice)
+                if not audio_bytes:
                     raise RuntimeError("未接收到任何音频数据")
 
-                audio_buffer.seek(0)  # 重置指针位置
-                data, fs = sf.read(audio_buffer)
+                # 解码放到线程池中，避免并发合成时阻塞事件循环
+                data, fs = await asyncio.get_running_loop().run_in_executor(
+                    None, sf.read, BytesIO(audio_bytes)
+                )
                 logger.debug(f"成功生成语音: 数据长度={len(data)}, 采样率={fs}")
                 return data, fs
             except NoAudioReceived as e:
@@ -421,23 +574,16 @@ class VoiceCacheManager:
         raise RuntimeError("生成语音失败")
 
     def _generate_cache_key(self, text: str, voice: str) -> str:
-        """生成缓存键，使用语音模型名称和文本的组合"""
-        # 生成安全的文件名，移除或替换不安全的字符
-        safe_text = (
-            text.replace("/", "_")
-            .replace("\\", "_")
-            .replace(":", "_")
-            .replace("*", "_")
-            .replace("?", "_")
-            .replace('"', "_")
-            .replace("<", "_")
-            .replace(">", "_")
-            .replace("|", "_")
-        )
-        return f"{voice}_{safe_text}"
+        """生成缓存键：语音模型名称和文本的 SHA-1 摘要"""
+        return hashlib.sha1(f"{voice}\n{text}".encode("utf-8")).hexdigest()
 
     def _get_cache_file_path(self, text: str, voice: str) -> str:
-        """获取缓存文件路径，使用语音模型名称和学生/奖品名称作为文件名"""
+        """获取缓存文件路径，文件名为缓存键"""
+        filename = f"{self._generate_cache_key(text, voice)}{self.CACHE_FILE_EXTENSION}"
+        return os.path.join(self.audio_dir, filename)
+
+    def _get_legacy_cache_file_path(self, text: str, voice: str) -> str:
+        """获取旧版本的缓存文件路径（语音模型名称和学生/奖品名称作为文件名）"""
         # 生成安全的文件名，移除或替换不安全的字符
         safe_text = (
             text.replace("/", "_")
@@ -450,66 +596,384 @@ class VoiceCacheManager:
             .replace(">", "_")
             .replace("|", "_")
         )
-        filename = f"{voice}_{safe_text}.wav"
+        filename = f"{voice}_{safe_text}{self.LEGACY_CACHE_FILE_EXTENSION}"
         return os.path.join(self.audio_dir, filename)
 
     def _add_to_memory_cache(self, cache_key: str, data: np.ndarray, fs: int) -> None:
-        """添加到内存缓存，实现LRU机制"""
+        """添加到内存缓存，按字节数淘汰最久未使用的项"""
+        size = int(getattr(data, "nbytes", 0))
+        if size > self.memory_budget_bytes:
+            return
         with self._memory_cache_lock:
             if cache_key in self._memory_cache:
                 # 如果已存在，移到末尾
                 self._memory_cache.move_to_end(cache_key)
-            else:
-                # 检查是否超过容量限制
-                if len(self._memory_cache) >= self.MEMORY_CACHE_SIZE:
-                    # 删除最久未使用的项并释放内存
-                    old_key, (old_data, old_fs) = self._memory_cache.popitem(last=False)
-                    # 清理旧数据
-                    del old_data
-                    del old_fs
-                    # 强制垃圾回收
-                    import gc
-
-                    gc.collect()
-                    logger.debug(f"移除过期缓存项: {old_key}, 已回收内存")
-                # 添加新项到末尾
-                self._memory_cache[cache_key] = (data, fs)
-
-    def _save_to_disk(self, file_path: str, data: np.ndarray, fs: int) -> None:
-        """异步保存到磁盘"""
+                return
+            # 删除最久未使用的项，直到能放下新项
+            while (
+                self._memory_cache
+                and self._memory_bytes + size > self.memory_budget_bytes
+            ):
+                old_key, (old_data, _) = self._memory_cache.popitem(last=False)
+                self._memory_bytes -= int(getattr(old_data, "nbytes", 0))
+                self._stats["memory_evictions"] += 1
+                logger.debug(f"移除内存缓存项: {old_key}")
+            # 添加新项到末尾
+            self._memory_cache[cache_key] = (data, fs)
+            self._memory_bytes += size
+
+    def _save_in_background(
+        self,
+        file_path: str,
+        data: np.ndarray,
+        fs: int,
+        legacy_path: Optional[str] = None,
+    ) -> None:
+        """在后台线程中保存到磁盘"""
+        threading.Thread(
+            target=self._save_to_disk,
+            args=(file_path, data, fs, legacy_path),
+            daemon=True,
+        ).start()
+
+    def _save_to_disk(
+        self,
+        file_path: str,
+        data: np.ndarray,
+        fs: int,
+        legacy_path: Optional[str] = None,
+    ) -> None:
+        """压缩保存到磁盘，写入后按容量上限淘汰最久未使用的文件
+
+        Args:
+            file_path: 缓存文件路径
+            data: 音频数据
+            fs: 采样率
+            legacy_path: 转存完成后删除的旧版缓存文件
+        """
+        temp_path = f"{file_path}.tmp"
         try:
             with self._disk_cache_lock:
-                sf.write(file_path, data, fs)
+                sf.write(
+                    temp_path,
+                    data,
+                    fs,
+                    format=self.CACHE_FILE_FORMAT,
+                    subtype=self.CACHE_FILE_SUBTYPE,
+                )
+                os.replace(temp_path, file_path)
+                index = self._ensure_disk_index()
+                self._disk_bytes -= index.pop(file_path, 0)
+                size = os.path.getsize(file_path)
+                index[file_path] = size
+                self._disk_bytes += size
+
+                if legacy_path:
+                    try:
+                        self._remove_disk_entry(legacy_path)
+                    except OSError as e:
+                        logger.warning(f"删除旧版缓存文件失败: {e}")
+
+                self._evict_disk_entries()
         except Exception as e:
             logger.exception(f"保存缓存失败: {e}")
+            try:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+            except OSError:
+                pass
+
+    def _ensure_disk_index(self) -> Dict[str, int]:
+        """获取磁盘缓存索引，首次使用时扫描缓存目录（调用方需持有磁盘缓存锁）"""
+        if self._disk_index is None:
+            extensions = (self.CACHE_FILE_EXTENSION, self.LEGACY_CACHE_FILE_EXTENSION)
+            entries = []
+            try:
+                with os.scandir(self.audio_dir) as it:
+                    for entry in it:
+                        if entry.is_file() and entry.name.endswith(extensions):
+                            stat = entry.stat()
+                            entries.append((stat.st_mtime, entry.path, stat.st_size))
+            except OSError as e:
+                logger.warning(f"扫描语音缓存目录失败: {e}")
+            entries.sort()
+            self._disk_index = OrderedDict(
+                (file_path, size) for _, file_path, size in entries
+            )
+            self._disk_bytes = sum(size for _, _, size in entries)
+        return self._disk_index
 
-    def _check_and_cleanup(self) -> None:
-        """检查并执行缓存清理"""
-        current_time: float = time.time()
-        if current_time - self._last_cleanup_time >= self.CLEANUP_INTERVAL:
-            # 执行清理
-            self._cleanup_expired_cache()
-            self._last_cleanup_time = current_time
+    def _touch_disk_entry(self, file_path: str) -> None:
+        """记录磁盘缓存文件被访问：更新修改时间并移到索引末尾"""
+        try:
+            current_time = time.time()
+            os.utime(file_path, times=(current_time, current_time))
+        except OSError as e:
+            logger.warning(f"更新缓存文件访问时间失败: {e}")
+        with self._disk_cache_lock:
+            index = self._ensure_disk_index()
+            if file_path in index:
+                index.move_to_end(file_path)
+
+    def _remove_disk_entry(self, file_path: str) -> None:
+        """删除磁盘缓存文件（调用方需持有磁盘缓存锁）"""
+        try:
+            os.remove(file_path)
+        except FileNotFoundError:
+            pass
+        self._disk_bytes -= self._ensure_disk_index().pop(file_path, 0)
+
+    def _evict_disk_entries(self) -> None:
+        """删除最久未访问的缓存文件，直到不超过磁盘容量上限（调用方需持有磁盘缓存锁）"""
+        index = self._ensure_disk_index()
+        while index and self._disk_bytes > self.disk_budget_bytes:
+            file_path = next(iter(index))
+            try:
+                self._remove_disk_entry(file_path)
+                self._stats["disk_evictions"] += 1
+                logger.debug(f"移除磁盘缓存文件: {file_path}")
+            except OSError as e:
+                logger.warning(f"删除缓存文件失败: {e}")
+                self._disk_bytes -= index.pop(file_path, 0)
+
+    def get_stats(self) -> Dict[str, int]:
+        """获取缓存命中、未命中、淘汰次数及两级缓存的占用字节数"""
+        with self._memory_cache_lock:
+            memory_entries = len(self._memory_cache)
+            memory_bytes = self._memory_bytes
+            memory_stats = {
+                key: self._stats[key]
+                for key in ("memory_hits", "misses", "memory_evictions")
+            }
+        with self._disk_cache_lock:
+            disk_entries = len(self._ensure_disk_index())
+            disk_bytes = self._disk_bytes
+            disk_stats = {
+                key: self._stats[key] for key in ("disk_hits", "disk_evictions")
+            }
+        return {
+            **memory_stats,
+            **disk_stats,
+            "memory_entries": memory_entries,
+            "memory_bytes": memory_bytes,
+            "memory_budget_bytes": self.memory_budget_bytes,
+            "disk_entries": disk_entries,
+            "disk_bytes": disk_bytes,
+            "disk_budget_bytes": self.disk_budget_bytes,
+        }
 
     def _cache_cleanup_worker(self) -> None:
         """缓存清理线程"""
         while True:
-            time.sleep(self.CLEANUP_INTERVAL)
             self._cleanup_expired_cache()
+            time.sleep(self.CLEANUP_INTERVAL)
 
     def _cleanup_expired_cache(self) -> None:
-        """清理过期缓存文件
-
-        注意：根据需求，本地音频文件不会过期，所以此方法不再删除文件
-        但保留缓存清理线程，以便未来扩展其他清理逻辑
-        """
+        """按磁盘容量上限清理最久未访问的缓存文件（同时重新扫描缓存目录）"""
         try:
-            logger.info("缓存清理：本地音频文件不会过期，跳过文件删除")
-            # 可以在这里添加其他清理逻辑，如日志清理等
+            with self._disk_cache_lock:
+                self._disk_index = None
+                self._evict_disk_entries()
         except Exception as e:
             logger.exception(f"缓存清理失败: {e}")
 
 
+class VoiceSynthesisPipeline:
+    """Edge TTS 合成流水线
+
+    在一个常驻的事件循环线程中并发合成未命中缓存的语音（并发数有上限），
+    并按名单顺序把已就绪的语音依次交给播放系统：前面的语音一就绪就开始播放，
+    后面的语音在播放期间继续合成。
+    """
+
+    # 同时进行的在线合成数量上限
+    MAX_CONCURRENCY: int = 4
+    # 预热时两次在线合成之间的最小间隔（秒）
+    PREWARM_INTERVAL: float = 1.0
+    # 预热等待播报结束时的检查间隔（秒）
+    PREWARM_IDLE_CHECK_INTERVAL: float = 0.5
+
+    def __init__(
+        self, cache_manager: VoiceCacheManager, max_concurrency: Optional[int] = None
+    ):
+        self.cache_manager: VoiceCacheManager = cache_manager
+        self.max_concurrency: int = max_concurrency or self.MAX_CONCURRENCY
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_lock: threading.Lock = threading.Lock()
+        self._current: Optional[concurrent.futures.Future] = None
+        self._prewarm: Optional[concurrent.futures.Future] = None
+        self._announcing: int = 0  # 正在进行的播报批次数量（只在事件循环线程中修改）
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """获取常驻事件循环，首次使用时启动事件循环线程"""
+        with self._loop_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=self._run_loop,
+                    args=(loop,),
+                    daemon=True,
+                    name="VoiceSynthesisLoop",
+                ).start()
+                self._loop = loop
+            return self._loop
+
+    @staticmethod
+    def _run_loop(loop: asyncio.AbstractEventLoop) -> None:
+        """事件循环线程主函数"""
+        asyncio.set_event_loop(loop)
+        loop.run_forever()
+
+    def submit(
+        self,
+        texts: List[str],
+        voice: str,
+        on_ready: Callable[[Tuple[np.ndarray, int]], bool],
+    ) -> concurrent.futures.Future:
+        """开始合成一批语音，并取消尚未完成的上一批
+
+        Args:
+            texts: 按播放顺序排列的播报文本
+            voice: 语音名称
+            on_ready: 语音就绪时按顺序调用，参数为 (音频数据, 采样率)，返回是否提交成功
+
+        Returns:
+            concurrent.futures.Future: 整批合成完成（或被取消）时结束
+        """
+        self.cancel()
+        future = asyncio.run_coroutine_threadsafe(
+            self._synthesize_in_order(list(texts), voice, on_ready),
+            self._ensure_loop(),
+        )
+        self._current = future
+        return future
+
+    def cancel(self) -> None:
+        """取消正在进行的一批合成，已交给播放系统的语音不受影响"""
+        future = self._current
+        self._current = None
+        if future is not None and not future.done():
+            future.cancel()
+
+    async def _synthesize_in_order(
+        self,
+        texts: List[str],
+        voice: str,
+        on_ready: Callable[[Tuple[np.ndarray, int]], bool],
+    ) -> None:
+        self._announcing += 1
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        # 同一批中重复的文本只合成一次
+        tasks: Dict[str, asyncio.Future] = {}
+        for text in texts:
+            if text not in tasks:
+                tasks[text] = asyncio.ensure_future(
+                    self._synthesize(text, voice, semaphore)
+                )
+
+        try:
+            for text in texts:
+                try:
+                    data, fs = await tasks[text]
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.exception(f"处理{text}失败: {e}")
+                    continue
+                # 提交播放任务
+                if not on_ready((data, fs)):
+                    logger.exception(f"提交播放任务失败: {text}")
+            logger.debug("所有语音已按顺序提交播放")
+        finally:
+            self._announcing -= 1
+            # 被取消时停止剩余的合成
+            for task in tasks.values():
+                task.cancel()
+
+    async def _synthesize(
+        self, text: str, voice: str, semaphore: asyncio.Semaphore
+    ) -> Tuple[np.ndarray, int]:
+        """获取一条语音：先查缓存（在线程池中读取磁盘），未命中时受并发上限约束在线合成"""
+        loop = asyncio.get_running_loop()
+        cached = await loop.run_in_executor(
+            None, self.cache_manager.lookup_voice, text, voice
+        )
+        if cached is not None:
+            return cached
+        async with semaphore:
+            return await self.cache_manager.synthesize_voice(text, voice)
+
+    def prewarm(
+        self,
+        texts: List[str],
+        voice: str,
+        on_progress: Optional[Callable[[int, int], None]] = None,
+    ) -> concurrent.futures.Future:
+        """在后台低优先级合成缺失的语音，只写入磁盘缓存，并取消尚未完成的上一次预热
+
+        一次只合成一条，两次合成之间至少间隔 PREWARM_INTERVAL 秒，有播报时暂停。
+
+        Args:
+            texts: 需要预热的播报文本
+            voice: 语音名称
+            on_progress: 每处理完一条文本时调用，参数为 (已处理数量, 总数)
+
+        Returns:
+            concurrent.futures.Future: 结果为 {"total", "synthesized", "failed"} 统计
+        """
+        self.cancel_prewarm()
+        future = asyncio.run_coroutine_threadsafe(
+            self._prewarm_texts(list(texts), voice, on_progress),
+            self._ensure_loop(),
+        )
+        self._prewarm = future
+        return future
+
+    def cancel_prewarm(self) -> None:
+        """取消正在进行的预热"""
+        future = self._prewarm
+        self._prewarm = None
+        if future is not None and not future.done():
+            future.cancel()
+
+    async def _prewarm_texts(
+        self,
+        texts: List[str],
+        voice: str,
+        on_progress: Optional[Callable[[int, int], None]],
+    ) -> Dict[str, int]:
+        loop = asyncio.get_running_loop()
+        stats = {"total": len(texts), "synthesized": 0, "failed": 0}
+        for done, text in enumerate(texts, start=1):
+            cached = await loop.run_in_executor(
+                None, self.cache_manager.has_cached_voice, text, voice
+            )
+            if not cached:
+                # 播报优先，预热在播报结束后继续
+                while self._announcing:
+                    await asyncio.sleep(self.PREWARM_IDLE_CHECK_INTERVAL)
+                try:
+                    await self.cache_manager.synthesize_voice(
+                        text, voice, remember=False
+                    )
+                    stats["synthesized"] += 1
+                except Exception as e:
+                    stats["failed"] += 1
+                    logger.exception(f"预热语音{text}失败: {e}")
+                await asyncio.sleep(self.PREWARM_INTERVAL)
+
+            if on_progress is not None:
+                try:
+                    on_progress(done, len(texts))
+                except Exception as e:
+                    logger.exception(f"预热进度回调失败: {e}")
+
+        logger.info(
+            f"语音缓存预热完成: 共{stats['total']}条，新合成{stats['synthesized']}条，失败{stats['failed']}条"
+        )
+        return stats
+
+
 class LoadBalancer:
     """系统负载均衡器"""
 
@@ -612,9 +1076,16 @@ class LoadBalancer:
 class TTSHandler:
     """语音处理主控制器"""
 
-    def __init__(self):
+    def __init__(
+        self,
+        audio_dir: Optional[str] = None,
+        backend: Optional[Union[EdgeTTSBackend, LocalTTSBackend]] = None,
+    ):
         self.playback_system: VoicePlaybackSystem = VoicePlaybackSystem()
-        self.cache_manager: VoiceCacheManager = VoiceCacheManager()
+        self.cache_manager: VoiceCacheManager = VoiceCacheManager(audio_dir, backend)
+        self.synthesis_pipeline: VoiceSynthesisPipeline = VoiceSynthesisPipeline(
+            self.cache_manager
+        )
         self.playback_system.start()
         self.voice_engine: Optional[Any] = None
         self.system_tts_lock: threading.Lock = (
@@ -739,34 +1210,12 @@ class TTSHandler:
             self.playback_system.start()
 
             # 读取音频设置文件
-            audio_settings = {}
-            if class_name:
-                audio_file = get_audio_path(f"{class_name}.json")
-                if audio_file.exists():
-                    with open(str(audio_file), "r", encoding="utf-8") as f:
-                        audio_settings = json.load(f)
+            audio_settings = load_audio_settings(class_name)
 
             # 应用TTS别名、前缀和后缀
-            processed_names = []
-            for name in student_names:
-                # 获取对应的音频设置，如果不存在则使用默认值
-                settings = audio_settings.get(name, {})
-                tts_alias = settings.get("tts_alias", "")
-                prefix = settings.get("prefix", "")
-                suffix = settings.get("suffix", "")
-
-                # 构建最终的播报文本
-                announcement_text = []
-                if prefix:
-                    announcement_text.append(prefix)
-                if tts_alias:
-                    announcement_text.append(tts_alias)
-                else:
-                    announcement_text.append(name)
-                if suffix:
-                    announcement_text.append(suffix)
-
-                processed_names.append(" ".join(announcement_text))
+            processed_names = [
+                build_announcement_text(name, audio_settings) for name in student_names
+            ]
 
             # 添加日志，记录要播放的学生名单
             logger.debug(f"准备播放语音，原始学生名单: {student_names}")
@@ -882,17 +1331,77 @@ class TTSHandler:
         # 设置播放语速
         self.playback_system.set_speed(config["voice_speed"])
 
-        for name in student_names:
-            try:
-                # 获取语音数据（自动缓存）
-                data, fs = self.cache_manager.get_voice(name, voice_name)
-                # 提交播放任务
-                if not self.playback_system.add_task((data, fs)):
-                    logger.exception(f"提交播放任务失败: {name}")
-            except Exception as e:
-                logger.exception(f"处理{name}失败: {e}")
+        # 并发合成未命中缓存的语音，并按顺序提交播放
+        texts = [name for name in student_names if isinstance(name, str) and name]
+        self.synthesis_pipeline.submit(texts, voice_name, self.playback_system.add_task)
 
-        logger.debug("所有语音播放任务已提交，将异步播放")
+        logger.debug("所有语音合成任务已提交，将按顺序异步播放")
+
+    def _get_class_announcement_texts(self, class_name: str) -> List[str]:
+        """获取班级名单中所有存在的学生的播报文本（去重，保持名单顺序）"""
+        from app.common.data.roster import get_roster
+
+        audio_settings = load_audio_settings(class_name)
+        texts = {}
+        for record in get_roster(class_name).sorted_records:
+            if record.exist:
+                texts[build_announcement_text(record.name, audio_settings)] = None
+        return list(texts)
+
+    def prewarm_class(
+        self,
+        class_name: str,
+        voice_name: str,
+        on_progress: Optional[Callable[[int, int], None]] = None,
+    ) -> Optional[concurrent.futures.Future]:
+        """在后台为班级名单预先合成缺失的 Edge TTS 语音
+
+        Args:
+            class_name: 班级名称
+            voice_name: Edge TTS 语音名称
+            on_progress: 进度回调，参数为 (已处理数量, 总数)，在后台线程中调用
+
+        Returns:
+            Optional[concurrent.futures.Future]: 预热任务，读取名单失败时返回 None
+        """
+        try:
+            texts = self._get_class_announcement_texts(class_name)
+        except Exception as e:
+            logger.exception(f"读取班级{class_name}的播报文本失败: {e}")
+            return None
+        logger.debug(f"开始预热班级{class_name}的语音缓存，共{len(texts)}条")
+        return self.synthesis_pipeline.prewarm(texts, voice_name, on_progress)
+
+    def cancel_prewarm(self) -> None:
+        """取消正在进行的语音缓存预热"""
+        self.synthesis_pipeline.cancel_prewarm()
+
+    def get_voice_cache_coverage(
+        self, class_name: str, voice_name: str
+    ) -> Dict[str, Union[int, float]]:
+        """获取班级名单的语音缓存覆盖率
+
+        Args:
+            class_name: 班级名称
+            voice_name: Edge TTS 语音名称
+
+        Returns:
+            Dict[str, Union[int, float]]: {"total", "cached", "coverage"}，coverage 为 0.0-1.0
+        """
+        try:
+            texts = self._get_class_announcement_texts(class_name)
+        except Exception as e:
+            logger.exception(f"读取班级{class_name}的播报文本失败: {e}")
+            texts = []
+        cached = sum(
+            1 for text in texts if self.cache_manager.has_cached_voice(text, voice_name)
+        )
+        total = len(texts)
+        return {
+            "total": total,
+            "cached": cached,
+            "coverage": cached / total if total else 1.0,
+        }
 
     def stop(self) -> None:
         """停止所有播放
@@ -900,6 +1409,8 @@ class TTSHandler:
         注意：不会关闭线程池，仅停止当前播放任务
         线程池将在对象销毁时自动关闭
         """
+        # 先取消尚未完成的合成，避免旧语音在停止后继续进入播放队列
+        self.synthesis_pipeline.cancel()
         self.playback_system.stop()
 
         # 系统TTS引擎也需要停止
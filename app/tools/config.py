@@ -30,8 +30,13 @@ from app.tools.path_utils import (
     get_path,
 )
 from app.tools.personalised import get_theme_icon
-from app.tools.settings_access import readme_settings_async
+from app.tools.settings_access import readme_settings_async, invalidate_settings_cache
 from app.common.data.list import get_student_list, get_group_list
+from app.common.data.file_cache import get_file_signature
+from app.common.data.prize_pool import (
+    invalidate_prize_drawn_counter,
+    record_prize_drawn,
+)
 from app.tools.variable import (
     SPECIAL_VERSION,
     LOG_DIR,
@@ -759,6 +764,7 @@ def import_settings(parent: Optional[QWidget] = None) -> None:
                 # 写入新设置
                 with open(settings_path, "w", encoding="utf-8") as f:
                     json.dump(imported_settings, f, ensure_ascii=False, indent=4)
+                invalidate_settings_cache()
 
                 # 显示成功消息
                 success_dialog = MessageBox(
@@ -1366,6 +1372,39 @@ def export_all_data(parent: Optional[QWidget] = None) -> None:
         dialog.exec()
 
 
+def _prepare_history_import(history_members: list) -> None:
+    """导入历史记录前写完待写入的事件，并删除将被替换的历史记录的追加日志和索引
+
+    Args:
+        history_members: 压缩包中 history/ 目录下的成员路径
+    """
+    from app.common.history.file_utils import remove_history_sidecar_files
+    from app.common.history.history_writer import flush_history_writes
+
+    # 先写完待写入的事件，避免导入后旧日志中的事件被重放到导入的历史记录中
+    flush_history_writes(timeout=5.0)
+    for member in history_members:
+        parts = member.parts
+        if (
+            len(parts) == 3
+            and parts[1].endswith("_history")
+            and member.suffix == ".json"
+        ):
+            history_type = parts[1][: -len("_history")]
+            remove_history_sidecar_files(history_type, member.stem)
+
+
+def _invalidate_history_caches() -> None:
+    """导入历史记录后清除历史记录、聚合索引和会话索引的内存缓存"""
+    from app.common.history.aggregate_index import invalidate_aggregates
+    from app.common.history.file_utils import invalidate_history_cache
+    from app.common.history.session_index import invalidate_session_index
+
+    invalidate_history_cache()
+    invalidate_aggregates()
+    invalidate_session_index()
+
+
 def import_all_data(parent: Optional[QWidget] = None) -> None:
     """从文件导入所有数据
 
@@ -1573,6 +1612,14 @@ def import_all_data(parent: Optional[QWidget] = None) -> None:
                         "logs": Path("logs"),
                     }
 
+                    history_members = [
+                        Path(member)
+                        for member in zipf.namelist()
+                        if Path(member).parts[0] == "history"
+                    ]
+                    if history_members:
+                        _prepare_history_import(history_members)
+
                     for member in zipf.namelist():
                         # 跳过版本信息文件
                         if member == "version.json":
@@ -1594,6 +1641,10 @@ def import_all_data(parent: Optional[QWidget] = None) -> None:
                                 ):
                                     shutil.copyfileobj(source, target)
 
+                invalidate_settings_cache()
+                if history_members:
+                    _invalidate_history_caches()
+
                 # 显示成功消息
                 success_dialog = MessageBox(
                     get_any_position_value_async(
@@ -2044,6 +2095,7 @@ def calculate_remaining_count(
 def record_drawn_prize(pool_name: str, prize_names):
     file_path = get_data_path("TEMP", f"draw_until_prize_{pool_name}.json")
     os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    previous_signature = get_file_signature(file_path)
     drawn_records = _load_drawn_records(file_path)
     names = _extract_student_names(prize_names)
     for name in names:
@@ -2052,6 +2104,8 @@ def record_drawn_prize(pool_name: str, prize_names):
         else:
             drawn_records[name] = 1
     _save_drawn_records(file_path, drawn_records)
+    # 同步奖池的已抽取次数计数器
+    record_prize_drawn(pool_name, names, previous_signature)
 
 
 def read_drawn_record_simple(pool_name: str):
@@ -2084,6 +2138,7 @@ def reset_drawn_prize_record(self, pool_name: str):
                 os.remove(fp)
             except OSError as e:
                 logger.error(f"删除文件{fp}失败: {e}")
+        invalidate_prize_drawn_counter(pool_name)
         show_notification(
             NotificationType.INFO,
             NotificationConfig(
@@ -3,10 +3,13 @@
 # ==================================================
 import os
 import json
+import hashlib
+import marshal
+import time
 from typing import Dict, Optional, Any, List
 from loguru import logger
 
-from app.tools.path_utils import get_path, get_data_path
+from app.tools.path_utils import get_path, get_data_path, ensure_dir
 from app.tools.settings_access import readme_settings
 
 # from app.Language.ZH_CN import ZH_CN
@@ -17,44 +20,57 @@ import pkgutil
 
 from app.tools.variable import LANGUAGE_MODULE_DIR
 
+# 语言目录缓存文件格式版本，缓存结构变化时递增
+LANGUAGE_CATALOG_FORMAT_VERSION = 1
+
 
 # ==================================================
 # 简化的语言管理器类
 # ==================================================
 class SimpleLanguageManager:
-    """负责获取当前语言和全部语言"""
+    """负责获取当前语言和全部语言
+
+    语言按需加载：启动时只合并当前语言。合并结果以 marshal 格式缓存到
+    data/cache 下，缓存键为全部语言模块源文件的哈希，模块未修改时无需导入语言模块。
+    """
 
     def __init__(self):
         self._current_language: Optional[str] = None
 
-        # 从模块文件动态扫描所有可用语言并合并
+        # 已加载（合并）的语言数据，按需填充
         self._loaded_languages: Dict[str, Dict[str, Any]] = {}
-        self._load_languages_from_modules()
-
-        # 加载data/Language文件夹下的所有语言文件
-        self._load_all_languages()
-
-    def _get_available_languages_from_modules(self) -> set[str]:
-        """
-        扫描模块文件，获取所有可用的语言代码
+        # 语言代码 -> 语言信息（translate_JSON_file 字段）
+        self._language_infos: Optional[Dict[str, Dict[str, Any]]] = None
+        # data/Language 文件夹下的语言代码 -> 文件路径
+        self._json_language_files: Dict[str, str] = {}
+        self._modules: Optional[List[Any]] = None
+        self._catalog_key: Optional[str] = None
+
+    # ==================================================
+    # 语言模块
+    # ==================================================
+    def _get_module_entries(self) -> List[tuple[str, Optional[str]]]:
+        """枚举语言模块
 
         Returns:
-            语言代码集合
+            (模块名, 文件路径) 列表，打包环境中文件路径为 None
         """
-        available_languages: set[str] = set()
         language_dir = get_path(LANGUAGE_MODULE_DIR)
 
         module_entries: List[tuple[str, Optional[str]]] = []
 
         if os.path.isdir(language_dir):
+            # 开发环境：直接从文件系统查找
             language_module_files = glob.glob(os.path.join(language_dir, "*.py"))
-            for file_path in language_module_files:
+            for file_path in sorted(language_module_files):
                 if file_path.endswith("__init__.py"):
                     continue
                 module_entries.append(
                     (os.path.splitext(os.path.basename(file_path))[0], file_path)
                 )
         else:
+            # 打包环境：利用包信息进行枚举
+            logger.warning(f"语言模块目录不存在: {language_dir}")
             try:
                 language_package = importlib.import_module("app.Language.modules")
                 discovered = {
@@ -69,12 +85,26 @@ class SimpleLanguageManager:
                     module_entries.extend(
                         (module_name, None) for module_name in sorted(discovered)
                     )
-            except Exception as e:
-                logger.exception(f"枚举语言模块失败: {e}")
+                else:
+                    logger.warning("未能通过 pkgutil.walk_packages 发现语言模块")
+            except Exception as discovery_error:
+                logger.exception(f"枚举语言模块失败: {discovery_error}")
 
-        # 扫描所有模块，收集语言代码
-        for module_name, file_path in module_entries:
+        return module_entries
+
+    def _import_language_modules(self) -> List[Any]:
+        """导入全部语言模块（只导入一次）
+
+        Returns:
+            已导入的模块列表
+        """
+        if self._modules is not None:
+            return self._modules
+
+        modules = []
+        for module_name, file_path in self._get_module_entries():
             try:
+                # 优先使用标准导入（适用于打包环境）
                 try:
                     module = __import__(
                         f"app.Language.modules.{module_name}",
@@ -83,44 +113,52 @@ class SimpleLanguageManager:
                 except ImportError:
                     if not file_path:
                         raise
+                    # 如果直接导入失败且存在文件路径，使用动态加载（开发环境）
                     spec = importlib.util.spec_from_file_location(
                         module_name, file_path
                     )
-                    if spec is None or spec.loader is None:
+                    if spec is None:
+                        logger.warning(f"无法创建模块规范: {file_path}")
                         continue
+
                     module = importlib.util.module_from_spec(spec)
-                    spec.loader.exec_module(module)
+                    if spec.loader is None:
+                        logger.warning(f"模块加载器为空: {file_path}")
+                        continue
 
-                for attr_name in dir(module):
-                    attr_value = getattr(module, attr_name)
-                    if isinstance(attr_value, dict):
-                        # 收集字典中的所有语言代码键
-                        for key in attr_value.keys():
-                            if isinstance(key, str) and key.isupper() and "_" in key:
-                                available_languages.add(key)
+                    spec.loader.exec_module(module)
+                modules.append(module)
             except Exception as e:
-                logger.debug(f"扫描模块 {module_name} 时出错: {e}")
+                logger.exception(f"导入语言模块 {file_path} 时出错: {e}")
                 continue
 
-        # 确保至少有 ZH_CN
-        available_languages.add("ZH_CN")
-        return available_languages
+        if not modules:
+            logger.warning("未找到任何语言模块，返回空语言数据")
+        self._modules = modules
+        return modules
 
-    def _load_languages_from_modules(self) -> None:
-        """从模块文件加载所有语言"""
-        available_languages = self._get_available_languages_from_modules()
+    def _get_available_languages_from_modules(self) -> set[str]:
+        """
+        扫描模块文件，获取所有可用的语言代码
+
+        Returns:
+            语言代码集合
+        """
+        available_languages: set[str] = set()
 
-        # 首先加载 ZH_CN 作为基础
-        zh_cn_merged = self._merge_language_files("ZH_CN", None)
-        self._loaded_languages["ZH_CN"] = zh_cn_merged
+        # 扫描所有模块，收集语言代码
+        for module in self._import_language_modules():
+            for attr_name in dir(module):
+                attr_value = getattr(module, attr_name)
+                if isinstance(attr_value, dict):
+                    # 收集字典中的所有语言代码键
+                    for key in attr_value.keys():
+                        if isinstance(key, str) and key.isupper() and "_" in key:
+                            available_languages.add(key)
 
-        # 然后加载其他语言，以 ZH_CN 为基础进行深度合并
-        for language_code in available_languages:
-            if language_code == "ZH_CN":
-                continue
-            merged = self._merge_language_files(language_code, zh_cn_merged)
-            if merged:
-                self._loaded_languages[language_code] = merged
+        # 确保至少有 ZH_CN
+        available_languages.add("ZH_CN")
+        return available_languages
 
     def _deep_merge(
         self, base: Dict[str, Any], override: Dict[str, Any]
@@ -128,6 +166,8 @@ class SimpleLanguageManager:
         """
         深度合并两个字典，override 中的值会覆盖 base 中的值
 
+        只复制被覆盖路径上的字典，未被覆盖的子树与 base 共享（语言数据只读）。
+
         Args:
             base: 基础字典（如 ZH_CN）
             override: 覆盖字典（如 EN_US）
@@ -135,9 +175,7 @@ class SimpleLanguageManager:
         Returns:
             合并后的字典
         """
-        import copy
-
-        result = copy.deepcopy(base)
+        result = dict(base)
 
         for key, value in override.items():
             if (
@@ -149,7 +187,7 @@ class SimpleLanguageManager:
                 result[key] = self._deep_merge(result[key], value)
             else:
                 # 直接覆盖
-                result[key] = copy.deepcopy(value)
+                result[key] = value
 
         return result
 
@@ -163,106 +201,154 @@ class SimpleLanguageManager:
 
         Args:
             language_code: 语言代码，默认为"ZH_CN"
+            base_language: 作为基础的语言字典（ZH_CN），目标语言缺失的内容从中补全
 
         Returns:
             合并后的语言字典
         """
         merged = {}
         language_code = "ZH_CN" if not language_code else language_code
-        language_dir = get_path(LANGUAGE_MODULE_DIR)
 
-        module_entries: List[tuple[str, Optional[str]]] = []
+        for module in self._import_language_modules():
+            # 遍历模块中的所有属性
+            for attr_name in dir(module):
+                attr_value = getattr(module, attr_name)
+                # 如果属性是字典
+                if isinstance(attr_value, dict):
+                    # 获取目标语言的数据
+                    target_data = attr_value.get(language_code)
+                    zh_cn_data = attr_value.get("ZH_CN")
+
+                    if target_data is not None:
+                        if base_language is not None and attr_name in base_language:
+                            # 以 ZH_CN 为基础，深度合并目标语言
+                            merged[attr_name] = self._deep_merge(
+                                base_language[attr_name], target_data
+                            )
+                        else:
+                            merged[attr_name] = target_data
+                    elif language_code != "ZH_CN" and zh_cn_data is not None:
+                        # 目标语言不存在，回退到 ZH_CN
+                        merged[attr_name] = zh_cn_data
 
-        if os.path.isdir(language_dir):
-            # 开发环境：直接从文件系统查找
-            language_module_files = glob.glob(os.path.join(language_dir, "*.py"))
-            for file_path in language_module_files:
-                if file_path.endswith("__init__.py"):
-                    continue
-                module_entries.append(
-                    (os.path.splitext(os.path.basename(file_path))[0], file_path)
-                )
-        else:
-            # 打包环境：利用包信息进行枚举
-            logger.warning(f"语言模块目录不存在: {language_dir}")
-            try:
-                language_package = importlib.import_module("app.Language.modules")
-                discovered = {
-                    name.rsplit(".", 1)[-1]
-                    for _, name, is_pkg in pkgutil.walk_packages(
-                        getattr(language_package, "__path__", []),
-                        language_package.__name__ + ".",
-                    )
-                    if not is_pkg and not name.endswith(".__init__")
-                }
-                if discovered:
-                    module_entries.extend(
-                        (module_name, None) for module_name in sorted(discovered)
-                    )
-                else:
-                    logger.warning("未能通过 pkgutil.walk_packages 发现语言模块")
-            except Exception as discovery_error:
-                logger.exception(f"枚举语言模块失败: {discovery_error}")
+        return merged
 
-        if not module_entries:
-            logger.warning("未找到任何语言模块，返回空语言数据")
-            return merged
+    # ==================================================
+    # 语言目录缓存
+    # ==================================================
+    def _get_catalog_key(self) -> Optional[str]:
+        """计算语言目录缓存键（全部语言模块源文件的哈希）
 
-        # 遍历所有模块并导入
-        for module_name, file_path in module_entries:
-            try:
-                # 优先使用标准导入（适用于打包环境）
-                try:
-                    module = __import__(
-                        f"app.Language.modules.{module_name}",
-                        fromlist=[module_name],
-                    )
-                except ImportError:
-                    if not file_path:
-                        raise
-                    # 如果直接导入失败且存在文件路径，使用动态加载（开发环境）
-                    spec = importlib.util.spec_from_file_location(
-                        module_name, file_path
-                    )
-                    if spec is None:
-                        logger.warning(f"无法创建模块规范: {file_path}")
-                        continue
+        Returns:
+            缓存键，打包环境中没有模块源文件时返回 None（不使用缓存）
+        """
+        if self._catalog_key is not None:
+            return self._catalog_key or None
 
-                    module = importlib.util.module_from_spec(spec)
-                    if spec.loader is None:
-                        logger.warning(f"模块加载器为空: {file_path}")
-                        continue
+        digest = hashlib.sha1(str(LANGUAGE_CATALOG_FORMAT_VERSION).encode())
+        try:
+            module_entries = self._get_module_entries()
+            if not module_entries or any(path is None for _, path in module_entries):
+                self._catalog_key = ""
+                return None
+            for module_name, file_path in module_entries:
+                digest.update(module_name.encode("utf-8"))
+                with open(file_path, "rb") as f:
+                    digest.update(hashlib.sha1(f.read()).digest())
+        except OSError as e:
+            logger.warning(f"计算语言目录缓存键失败: {e}")
+            self._catalog_key = ""
+            return None
 
-                    spec.loader.exec_module(module)
+        self._catalog_key = digest.hexdigest()
+        return self._catalog_key
 
-                # 遍历模块中的所有属性
-                for attr_name in dir(module):
-                    attr_value = getattr(module, attr_name)
-                    # 如果属性是字典
-                    if isinstance(attr_value, dict):
-                        # 获取目标语言的数据
-                        target_data = attr_value.get(language_code)
-                        zh_cn_data = attr_value.get("ZH_CN")
-
-                        if target_data is not None:
-                            if base_language is not None and attr_name in base_language:
-                                # 以 ZH_CN 为基础，深度合并目标语言
-                                merged[attr_name] = self._deep_merge(
-                                    base_language[attr_name], target_data
-                                )
-                            else:
-                                merged[attr_name] = target_data
-                        elif language_code != "ZH_CN" and zh_cn_data is not None:
-                            # 目标语言不存在，回退到 ZH_CN
-                            merged[attr_name] = zh_cn_data
+    def _get_catalog_path(self, name: str):
+        return get_data_path("cache", f"language_{name}.marshal")
 
-            except Exception as e:
-                logger.exception(f"导入语言模块 {file_path} 时出错: {e}")
-                continue
+    def _read_catalog(self, name: str) -> Optional[Any]:
+        """读取语言目录缓存，缓存不存在或已过期时返回 None"""
+        key = self._get_catalog_key()
+        if key is None:
+            return None
+        try:
+            with open(self._get_catalog_path(name), "rb") as f:
+                cached = marshal.load(f)
+            if isinstance(cached, dict) and cached.get("key") == key:
+                return cached.get("data")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"读取语言目录缓存 {name} 失败: {e}")
+        return None
 
-        return merged
+    def _write_catalog(self, name: str, data: Any) -> None:
+        """写入语言目录缓存（先写临时文件再替换，避免写入中断留下损坏的缓存）"""
+        key = self._get_catalog_key()
+        if key is None:
+            return
+        catalog_path = self._get_catalog_path(name)
+        temp_path = f"{catalog_path}.{os.getpid()}.tmp"
+        try:
+            payload = marshal.dumps({"key": key, "data": data})
+            ensure_dir(get_data_path("cache"))
+            with open(temp_path, "wb") as f:
+                f.write(payload)
+            os.replace(temp_path, catalog_path)
+        except Exception as e:
+            logger.warning(f"写入语言目录缓存 {name} 失败: {e}")
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+
+    # ==================================================
+    # 语言加载
+    # ==================================================
+    def _get_language_infos(self) -> Dict[str, Dict[str, Any]]:
+        """获取所有可用语言的信息（translate_JSON_file 字段），不合并语言数据
 
-    def _load_all_languages(self) -> None:
+        Returns:
+            语言代码 -> 语言信息
+        """
+        if self._language_infos is not None:
+            return self._language_infos
+
+        language_infos = self._read_catalog("index")
+        if not isinstance(language_infos, dict):
+            language_infos = self._build_module_language_infos()
+            self._write_catalog("index", language_infos)
+
+        # 加载data/Language文件夹下的所有语言文件的信息
+        self._load_all_languages(language_infos)
+
+        self._language_infos = language_infos
+        return language_infos
+
+    def _build_module_language_infos(self) -> Dict[str, Dict[str, Any]]:
+        """从语言模块收集可用语言及其信息"""
+        translate_info: Dict[str, Any] = {}
+        for module in self._import_language_modules():
+            value = getattr(module, "translate_JSON_file", None)
+            if isinstance(value, dict):
+                translate_info = value
+                break
+
+        zh_cn_info = translate_info.get("ZH_CN") or {}
+        available_languages = self._get_available_languages_from_modules()
+        # ZH_CN 排在最前，其余语言按代码排序
+        language_infos = {"ZH_CN": zh_cn_info}
+        for language_code in sorted(available_languages - {"ZH_CN"}):
+            info = translate_info.get(language_code)
+            # 与合并后的语言数据一致：缺失的信息从 ZH_CN 补全
+            language_infos[language_code] = (
+                self._deep_merge(zh_cn_info, info)
+                if isinstance(info, dict)
+                else zh_cn_info
+            )
+        return language_infos
+
+    def _load_all_languages(self, language_infos: Dict[str, Dict[str, Any]]) -> None:
         """加载data/Language文件夹下的所有语言文件"""
         try:
             # 获取语言文件夹路径
@@ -272,12 +358,12 @@ class SimpleLanguageManager:
                 return
 
             # 遍历文件夹中的所有.json文件
-            for filename in os.listdir(language_dir):
+            for filename in sorted(os.listdir(language_dir)):
                 if filename.endswith(".json"):
                     language_code = filename[:-5]  # 去掉.json后缀
 
                     # 跳过已加载的语言
-                    if language_code in self._loaded_languages:
+                    if language_code in language_infos:
                         continue
 
                     file_path = os.path.join(language_dir, filename)
@@ -287,12 +373,47 @@ class SimpleLanguageManager:
                         with open(file_path, "r", encoding="utf-8") as f:
                             language_data = json.load(f)
                             self._loaded_languages[language_code] = language_data
+                            self._json_language_files[language_code] = file_path
+                            language_infos[language_code] = language_data.get(
+                                "translate_JSON_file", {}
+                            )
                     except Exception as e:
                         logger.exception(f"加载语言文件 {filename} 时出错: {e}")
 
         except Exception as e:
             logger.exception(f"加载语言文件夹时出错: {e}")
 
+    def _load_language(self, language_code: str) -> Dict[str, Any]:
+        """加载（合并）指定语言，优先使用语言目录缓存
+
+        Args:
+            language_code: 语言代码，必须是可用语言
+
+        Returns:
+            合并后的语言数据字典
+        """
+        language_data = self._loaded_languages.get(language_code)
+        if language_data is not None:
+            return language_data
+
+        start_time = time.perf_counter()
+        language_data = self._read_catalog(language_code)
+        from_cache = isinstance(language_data, dict)
+        if not from_cache:
+            base_language = (
+                None if language_code == "ZH_CN" else self._load_language("ZH_CN")
+            )
+            language_data = self._merge_language_files(language_code, base_language)
+            self._write_catalog(language_code, language_data)
+
+        self._loaded_languages[language_code] = language_data
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
+        logger.debug(
+            f"加载语言 {language_code} 耗时 {elapsed_ms:.1f}ms"
+            f"（{'命中缓存' if from_cache else '合并语言模块'}）"
+        )
+        return language_data
+
     def get_current_language(self) -> str:
         """获取当前语言代码
 
@@ -309,7 +430,7 @@ class SimpleLanguageManager:
                 self._current_language = self._get_language_code_by_name(saved_language)
                 if self._current_language is None:
                     # 如果找不到匹配，检查是否直接是语言代码
-                    if saved_language in self._loaded_languages:
+                    if saved_language in self._get_language_infos():
                         self._current_language = saved_language
                     else:
                         self._current_language = "ZH_CN"
@@ -325,8 +446,7 @@ class SimpleLanguageManager:
         Returns:
             语言代码（如 "ZH_CN"、"EN_US"），如果找不到返回 None
         """
-        for code, data in self._loaded_languages.items():
-            language_info = data.get("translate_JSON_file", {})
+        for code, language_info in self._get_language_infos().items():
             if language_info.get("name") == name:
                 return code
         return None
@@ -340,10 +460,10 @@ class SimpleLanguageManager:
         language_code = self.get_current_language()
 
         # 如果语言未加载，返回默认中文
-        if language_code not in self._loaded_languages:
-            return self._loaded_languages["ZH_CN"]
+        if language_code not in self._get_language_infos():
+            return self._load_language("ZH_CN")
 
-        return self._loaded_languages[language_code]
+        return self._load_language(language_code)
 
     def get_all_languages(self) -> Dict[str, Dict[str, Any]]:
         """获取所有已加载的语言数据
@@ -351,7 +471,21 @@ class SimpleLanguageManager:
         Returns:
             包含所有语言数据的字典，键为语言代码，值为语言数据字典
         """
-        return dict(self._loaded_languages)
+        return {
+            language_code: self._load_language(language_code)
+            for language_code in self._get_language_infos()
+        }
+
+    def get_language_names(self) -> List[str]:
+        """获取所有可用语言的名称（不加载语言数据）
+
+        Returns:
+            语言名称列表
+        """
+        return [
+            language_info.get("name", code)
+            for code, language_info in self._get_language_infos().items()
+        ]
 
     def get_language_info(self, language_code: str) -> Optional[Dict[str, Any]]:
         """获取指定语言的信息（translate_JSON_file字段）
@@ -362,13 +496,12 @@ class SimpleLanguageManager:
         Returns:
             语言信息字典，如果语言不存在则返回None
         """
-        if language_code not in self._loaded_languages:
+        language_infos = self._get_language_infos()
+        if language_code not in language_infos:
             return None
 
-        language_data = self._loaded_languages[language_code]
-
         # 返回translate_JSON_file字段，如果不存在则返回空字典
-        return language_data.get("translate_JSON_file", {})
+        return language_infos[language_code] or {}
 
 
 # 创建全局语言管理器实例
@@ -410,12 +543,7 @@ def get_all_languages_name() -> List[str]:
     Returns:
         包含所有语言名称的列表，每个元素为语言名称
     """
-    language_names = []
-    for code, data in get_all_languages().items():
-        language_info = data.get("translate_JSON_file", {})
-        name = language_info.get("name", code)
-        language_names.append(name)
-    return language_names
+    return get_simple_language_manager().get_language_names()
 
 
 def get_current_language_data() -> Dict[str, Any]:
@@ -7,16 +7,224 @@ from PySide6.QtWidgets import *
 from PySide6.QtCore import *
 from PySide6.QtNetwork import *
 
+import os
+import copy
 import json
 import asyncio
+import threading
 from loguru import logger
-from typing import Any
+from typing import Any, Dict, Optional
 
 from app.tools.variable import *
 from app.tools.path_utils import *
 from app.tools.settings_default import *
 
 
+# ==================================================
+# 设置内存存储
+# ==================================================
+class SettingsStore:
+    """进程级设置存储
+
+    设置文件只在首次访问、文件 mtime/大小变化、文件监视器通知或
+    update_settings 写入之后重新解析，其余查找都直接命中内存字典。
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._data: Dict[str, Any] = {}
+        self._signature: Optional[tuple] = None
+        self._loaded = False
+        self._dirty = False
+        # 最近一次解析设置文件是否失败（此时 _data 为上一次成功解析的结果）
+        self._load_failed = False
+        self._watcher = None
+        # 可选的读取统计，默认关闭，避免在热路径上增加开销
+        self._stats_enabled = False
+        self._disk_reads = 0
+        self._lookups = 0
+
+    @staticmethod
+    def _file_signature(settings_path) -> Optional[tuple]:
+        """获取设置文件签名 (mtime_ns, size)，文件不存在时返回 None"""
+        try:
+            stat = os.stat(settings_path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    @staticmethod
+    def _read_file(settings_path) -> Dict[str, Any]:
+        """解析设置文件，内容不是 JSON 对象时抛出 ValueError"""
+        with open_file(settings_path, "r", encoding="utf-8") as f:
+            loaded = json.load(f)
+        if not isinstance(loaded, dict):
+            raise ValueError("设置文件内容不是 JSON 对象")
+        return loaded
+
+    def _reload(self, settings_path, signature: Optional[tuple]) -> None:
+        """从磁盘重新解析设置文件
+
+        解析失败（如写入中断、手动编辑出错）时保留上一次成功解析的设置，
+        并标记加载失败，write() 在文件恢复之前不会覆盖它。
+        """
+        if signature is None:
+            self._data = {}
+            self._load_failed = False
+        else:
+            try:
+                self._data = self._read_file(settings_path)
+                self._load_failed = False
+            except (ValueError, OSError) as e:
+                logger.warning(f"解析设置文件失败，继续使用上一次读取的设置: {e}")
+                self._load_failed = True
+            if self._stats_enabled:
+                self._disk_reads += 1
+        self._signature = signature
+        self._loaded = True
+        self._dirty = False
+
+    def _ensure_fresh(self) -> None:
+        """确保内存中的设置与磁盘一致（调用方需持有锁）"""
+        settings_path = get_settings_path()
+        signature = self._file_signature(settings_path)
+        if not self._loaded or self._dirty or signature != self._signature:
+            self._reload(settings_path, signature)
+        if self._watcher is None:
+            self._attach_file_watcher(settings_path)
+
+    def _attach_file_watcher(self, settings_path) -> None:
+        """在主线程且 QApplication 已创建时挂载文件监视器
+
+        部分文件系统（如 U 盘常见的 FAT32）mtime 精度只有 2 秒，
+        监视器可以补上 mtime 检测不到的外部修改。
+        """
+        app = QCoreApplication.instance()
+        if app is None or QThread.currentThread() != app.thread():
+            return
+        try:
+            watcher = QFileSystemWatcher()
+            watcher.addPath(str(settings_path.parent))
+            if file_exists(settings_path):
+                watcher.addPath(str(settings_path))
+            watcher.fileChanged.connect(self._on_file_changed)
+            watcher.directoryChanged.connect(self._on_file_changed)
+            self._watcher = watcher
+        except Exception as e:
+            logger.warning(f"设置文件监视器创建失败: {e}")
+            self._watcher = False
+
+    def _on_file_changed(self, path: str) -> None:
+        """文件监视器回调：标记缓存失效并重新关注被替换的文件"""
+        self.invalidate()
+        watcher = self._watcher
+        if watcher:
+            settings_path = str(get_settings_path())
+            if file_exists(settings_path) and settings_path not in watcher.files():
+                watcher.addPath(settings_path)
+
+    def invalidate(self) -> None:
+        """标记缓存失效，下次访问时重新读取设置文件"""
+        with self._lock:
+            self._dirty = True
+
+    def get(self, first_level_key: str, second_level_key: str, default: Any = None):
+        """读取设置值，键不存在时返回 default
+
+        返回的列表/字典为副本，调用方修改它们不会污染缓存。
+        """
+        with self._lock:
+            self._ensure_fresh()
+            if self._stats_enabled:
+                self._lookups += 1
+            section = self._data.get(first_level_key)
+            if not isinstance(section, dict) or second_level_key not in section:
+                return default
+            value = section[second_level_key]
+        if isinstance(value, (dict, list)):
+            return copy.deepcopy(value)
+        return value
+
+    def write(self, first_level_key: str, second_level_key: str, value: Any) -> None:
+        """更新设置值并写回磁盘，写入后直接刷新缓存签名
+
+        设置文件无法解析时重新读取一次，仍然失败则抛出异常且不写入，
+        避免用内存中的设置覆盖用户的设置文件。
+        """
+        with self._lock:
+            self._ensure_fresh()
+            settings_path = get_settings_path()
+            if self._load_failed:
+                # 仍然无法解析时直接抛出，由调用方记录错误
+                self._data = self._read_file(settings_path)
+                self._load_failed = False
+            ensure_dir(settings_path.parent)
+            settings_data = copy.deepcopy(self._data)
+            if not isinstance(settings_data.get(first_level_key), dict):
+                settings_data[first_level_key] = {}
+            settings_data[first_level_key][second_level_key] = value
+            with open_file(settings_path, "w", encoding="utf-8") as f:
+                json.dump(settings_data, f, ensure_ascii=False, indent=4)
+            self._data = settings_data
+            self._signature = self._file_signature(settings_path)
+            self._loaded = True
+            self._dirty = False
+
+    def set_stats_enabled(self, enabled: bool) -> None:
+        """开启或关闭读取统计（开启时会清零计数）"""
+        with self._lock:
+            self._stats_enabled = bool(enabled)
+            self._disk_reads = 0
+            self._lookups = 0
+
+    def get_stats(self) -> Dict[str, int]:
+        """获取读取统计
+
+        Returns:
+            dict: disk_reads 为解析设置文件的次数，lookups 为设置查找次数
+        """
+        with self._lock:
+            return {"disk_reads": self._disk_reads, "lookups": self._lookups}
+
+    def reset_stats(self) -> None:
+        """清零读取统计"""
+        with self._lock:
+            self._disk_reads = 0
+            self._lookups = 0
+
+
+# 创建全局设置存储实例
+_settings_store = SettingsStore()
+
+
+def get_settings_store() -> SettingsStore:
+    """获取设置存储实例"""
+    return _settings_store
+
+
+def invalidate_settings_cache() -> None:
+    """使设置缓存失效（绕过 update_settings 直接写设置文件后调用）"""
+    _settings_store.invalidate()
+
+
+def enable_settings_read_stats(enabled: bool = True) -> None:
+    """开启/关闭设置读取统计，用于确认每次抽取的磁盘读取次数"""
+    _settings_store.set_stats_enabled(enabled)
+
+
+def get_settings_read_stats() -> Dict[str, int]:
+    """获取设置读取统计"""
+    return _settings_store.get_stats()
+
+
+def reset_settings_read_stats() -> None:
+    """清零设置读取统计"""
+    _settings_store.reset_stats()
+
+
+_MISSING = object()
+
+
 # ==================================================
 # 设置访问函数
 # ==================================================
@@ -43,20 +251,11 @@ class SettingsReaderWorker(QObject):
 
     def _read_setting_value(self):
         """从设置文件或默认设置中读取值"""
-        settings_path = get_settings_path()
-        if file_exists(settings_path):
-            try:
-                with open_file(settings_path, "r", encoding="utf-8") as f:
-                    settings_data = json.load(f)
-                    if (
-                        self.first_level_key in settings_data
-                        and self.second_level_key in settings_data[self.first_level_key]
-                    ):
-                        return settings_data[self.first_level_key][
-                            self.second_level_key
-                        ]
-            except (json.JSONDecodeError, KeyError):
-                pass
+        value = _settings_store.get(
+            self.first_level_key, self.second_level_key, _MISSING
+        )
+        if value is not _MISSING:
+            return value
         return self._get_default_value()
 
     def _get_default_value(self):
@@ -142,17 +341,10 @@ def readme_settings(first_level_key: str, second_level_key: str):
         返回设置值
     """
     try:
-        settings_path = get_settings_path()
-        if file_exists(settings_path):
-            with open_file(settings_path, "r", encoding="utf-8") as f:
-                settings_data = json.load(f)
-                if (
-                    first_level_key in settings_data
-                    and second_level_key in settings_data[first_level_key]
-                ):
-                    value = settings_data[first_level_key][second_level_key]
-                    # logger.debug(f"从设置文件读取: {first_level_key}.{second_level_key} = {value}")
-                    return value
+        value = _settings_store.get(first_level_key, second_level_key, _MISSING)
+        if value is not _MISSING:
+            # logger.debug(f"从设置文件读取: {first_level_key}.{second_level_key} = {value}")
+            return value
 
         default_setting = _get_default_setting(first_level_key, second_level_key)
         if isinstance(default_setting, dict) and "default_value" in default_setting:
@@ -216,28 +408,8 @@ def update_settings(first_level_key: str, second_level_key: str, value: Any):
         bool: 更新是否成功
     """
     try:
-        # 获取设置文件路径
-        settings_path = get_settings_path()
-
-        # 确保设置目录存在
-        ensure_dir(settings_path.parent)
-
-        # 读取现有设置
-        settings_data = {}
-        if file_exists(settings_path):
-            with open_file(settings_path, "r", encoding="utf-8") as f:
-                settings_data = json.load(f)
-
-        # 更新设置
-        if first_level_key not in settings_data:
-            settings_data[first_level_key] = {}
-
-        # 直接保存值，不保存嵌套结构
-        settings_data[first_level_key][second_level_key] = value
-
-        # 写入设置文件
-        with open_file(settings_path, "w", encoding="utf-8") as f:
-            json.dump(settings_data, f, ensure_ascii=False, indent=4)
+        # 直接保存值，不保存嵌套结构；写入后设置存储同步刷新
+        _settings_store.write(first_level_key, second_level_key, value)
 
         logger.debug(f"设置更新成功: {first_level_key}.{second_level_key} = {value}")
 
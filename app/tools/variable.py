@@ -176,6 +176,7 @@ DARK_THEME_MIN_VALUE = 0.85  # 深色主题最小亮度值
 DARK_THEME_MAX_VALUE = 1.0  # 深色主题最大亮度值
 LIGHTNESS_THRESHOLD = 127  # 浅色/深色主题亮度阈值
 RGB_COLOR_FORMAT = "rgb({r},{g},{b})"  # RGB颜色格式字符串
+RANDOM_COLOR_PALETTE_SIZE = 64  # 随机颜色模式预先生成的颜色数量
 
 # 图片相关
 SUPPORTED_IMAGE_EXTENSIONS = [
@@ -19,6 +19,7 @@ from app.tools.settings_default import *
 from app.tools.settings_access import *
 from app.Language.obtain_language import *
 from app.tools.config import *
+from app.common.data.prize_pool import invalidate_prize_pool
 
 
 class ImportPrizeNameWindow(QWidget):
@@ -704,6 +705,7 @@ class ImportPrizeNameWindow(QWidget):
         # 保存到文件
         with open_file(pool_file, "w", encoding="utf-8") as f:
             json.dump(all_items, f, ensure_ascii=False, indent=4)
+        invalidate_prize_pool(pool_name)
 
         if action == "overwrite":
             logger.info(f"已覆盖奖池 '{pool_name}' 的数据，共 {len(all_items)} 项")
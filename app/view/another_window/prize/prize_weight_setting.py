@@ -18,6 +18,7 @@ from app.tools.settings_access import *
 from app.Language.obtain_language import *
 from app.tools.config import *
 from app.common.data.list import *
+from app.common.data.prize_pool import invalidate_prize_pool
 
 
 class PrizeWeightSettingWindow(QWidget):
@@ -290,6 +291,7 @@ class PrizeWeightSettingWindow(QWidget):
             # 保存到文件
             with open_file(list_file, "w", encoding="utf-8") as f:
                 json.dump(updated_data, f, ensure_ascii=False, indent=4)
+            invalidate_prize_pool(pool_name)
 
             # 显示保存成功通知
             config = NotificationConfig(
@@ -18,6 +18,7 @@ from app.tools.settings_access import *
 from app.Language.obtain_language import *
 from app.tools.config import *
 from app.common.data.list import *
+from app.common.data.prize_pool import invalidate_prize_pool
 
 
 class SetPoolNameWindow(QWidget):
@@ -275,13 +276,12 @@ class SetPoolNameWindow(QWidget):
                         if pool_file.exists():
                             pool_file.unlink()
                             deleted_count += 1
+                        invalidate_prize_pool(pool_name)
 
                         # 删除对应的抽奖历史记录
-                        from app.common.history import get_history_file_path
+                        from app.common.history import delete_history_data
 
-                        history_file_path = get_history_file_path("lottery", pool_name)
-                        if history_file_path.exists():
-                            history_file_path.unlink()
+                        if delete_history_data("lottery", pool_name):
                             logger.info(f"已删除奖池 '{pool_name}' 的抽奖历史记录")
 
                     # 显示删除成功消息
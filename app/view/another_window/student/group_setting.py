@@ -18,6 +18,7 @@ from app.tools.settings_access import *
 from app.Language.obtain_language import *
 from app.tools.config import *
 from app.common.data.list import *
+from app.common.data.roster import invalidate_roster
 
 
 class GroupSettingWindow(QWidget):
@@ -284,6 +285,7 @@ class GroupSettingWindow(QWidget):
             # 保存到文件
             with open_file(list_file, "w", encoding="utf-8") as f:
                 json.dump(updated_data, f, ensure_ascii=False, indent=4)
+            invalidate_roster(class_name)
 
             # 显示保存成功通知
             config = NotificationConfig(
@@ -19,6 +19,7 @@ from app.tools.settings_default import *
 from app.tools.settings_access import *
 from app.Language.obtain_language import *
 from app.tools.config import *
+from app.common.data.roster import invalidate_roster
 
 
 class ImportStudentNameWindow(QWidget):
@@ -745,6 +746,7 @@ class ImportStudentNameWindow(QWidget):
         # 保存到文件
         with open_file(class_file, "w", encoding="utf-8") as f:
             json.dump(all_students, f, ensure_ascii=False, indent=4)
+        invalidate_roster(class_name)
 
         if action == "overwrite":
             logger.info(
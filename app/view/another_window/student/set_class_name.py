@@ -18,6 +18,7 @@ from app.tools.settings_access import *
 from app.Language.obtain_language import *
 from app.tools.config import *
 from app.common.data.list import *
+from app.common.data.roster import invalidate_roster
 
 
 class SetClassNameWindow(QWidget):
@@ -275,15 +276,12 @@ class SetClassNameWindow(QWidget):
                         if class_file.exists():
                             class_file.unlink()
                             deleted_count += 1
+                        invalidate_roster(class_name)
 
                         # 删除对应的点名历史记录
-                        from app.common.history import get_history_file_path
+                        from app.common.history import delete_history_data
 
-                        history_file_path = get_history_file_path(
-                            "roll_call", class_name
-                        )
-                        if history_file_path.exists():
-                            history_file_path.unlink()
+                        if delete_history_data("roll_call", class_name):
                             logger.info(f"已删除班级 '{class_name}' 的点名历史记录")
 
                     # 显示删除成功消息
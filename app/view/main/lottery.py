@@ -20,6 +20,7 @@ from app.common.history import *
 from app.common.display.result_display import *
 from app.tools.config import *
 from app.common.lottery.lottery_utils import LotteryUtils
+from app.common.fair_draw.draw_config import DrawConfig
 from app.tools.variable import *
 from app.common.voice.voice import TTSHandler
 from app.common.music.music_player import music_player
@@ -57,6 +58,7 @@ class Lottery(QWidget):
         self.tts_handler = TTSHandler()
 
         self.is_animating = False
+        self.draw_config = None
 
         self.initUI()
         self.setupSettingsListener()
@@ -571,6 +573,9 @@ class Lottery(QWidget):
                 "Error disconnecting start_button clicked (ignored): {}", e
             )
 
+        # 整个动画会话共用一份设置快照，避免每帧重新解析设置
+        self.draw_config = DrawConfig.from_settings()
+
         self.draw_random()
         animation = readme_settings_async("lottery_settings", "animation")
         autoplay_count = readme_settings_async("lottery_settings", "autoplay_count")
@@ -635,6 +640,7 @@ class Lottery(QWidget):
                     group_filter=self.final_group_filter,
                     gender_filter=self.final_gender_filter,
                 )
+            self.draw_config = None
             self.start_button.clicked.connect(lambda: self.start_draw())
 
     def start_draw(self):
@@ -663,6 +669,7 @@ class Lottery(QWidget):
         )
         self.start_button.setEnabled(True)
         self.is_animating = False
+        self.draw_config = None
         try:
             self.start_button.clicked.disconnect()
         except Exception as e:
@@ -851,6 +858,7 @@ class Lottery(QWidget):
                     0,
                     pool_name,  # 传入奖池名称，用于应用内幕设置
                     prize_names,  # 传入奖品列表，用于提高指定该奖品的学生的权重
+                    draw_config=self.draw_config,
                 )
                 student_names = [
                     s[1] for s in (student_result.get("selected_students") or [])
@@ -943,7 +951,9 @@ class Lottery(QWidget):
         show_student_image = readme_settings_async("lottery_settings", "student_image")
         show_random = readme_settings_async("lottery_settings", "show_random")
 
-        student_labels = ResultDisplayUtils.create_student_label(
+        # 复用网格中的标签，每帧只更新文本、颜色和头像
+        ResultDisplayUtils.update_student_labels(
+            self.result_grid,
             class_name=pool_name,
             selected_students=selected_students,
             draw_count=self.current_count,
@@ -956,8 +966,6 @@ class Lottery(QWidget):
             settings_group="lottery_settings",
         )
 
-        ResultDisplayUtils.display_results_in_grid(self.result_grid, student_labels)
-
     def _do_reset_count(self):
         """实际执行重置奖数的逻辑"""
         self.current_count = 1
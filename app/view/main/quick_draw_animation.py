@@ -11,6 +11,7 @@ from app.common.history import *
 from app.tools.settings_access import *
 from app.common.music.music_player import music_player
 from app.common.roll_call.roll_call_utils import RollCallUtils
+from app.common.fair_draw.draw_config import DrawConfig
 from app.Language.obtain_language import get_content_combo_name_async
 
 
@@ -38,6 +39,8 @@ class QuickDrawAnimation(QObject):
         self.final_selected_students_dict = None
         self.final_group_filter = None
         self.final_gender_filter = None
+        self.draw_config = None
+        self.preview_pool = None
 
     def start_animation(self, quick_draw_settings):
         """开始闪抽动画
@@ -72,6 +75,19 @@ class QuickDrawAnimation(QObject):
                 fade_in=True,
             )
 
+        if class_name:
+            # 动画帧只从预先计算好的候选池中抽样，正式结果在停止时抽取
+            self.preview_pool = RollCallUtils.prepare_draw_pool(
+                class_name,
+                group_index,
+                group_filter,
+                gender_index,
+                gender_filter,
+                current_count,
+                half_repeat,
+                draw_config=self.draw_config,
+            )
+
         animation_mode = quick_draw_settings["animation"]
         animation_interval = quick_draw_settings["animation_interval"]
         autoplay_count = quick_draw_settings["autoplay_count"]
@@ -105,6 +121,13 @@ class QuickDrawAnimation(QObject):
 
         BehindScenesUtils.clear_cache()
 
+        # 动画结束，丢弃预览候选池，执行一次完整的正式抽取
+        if self.preview_pool is not None:
+            self.preview_pool = None
+            if not self.draw_random_students():
+                # 已抽取记录已重置，重新抽取一次
+                self.draw_random_students()
+
         music_player.stop_music(fade_out=True)
 
         result_music = readme_settings_async("quick_draw_settings", "result_music")
@@ -138,7 +161,7 @@ class QuickDrawAnimation(QObject):
 
     def _animate_result(self):
         """动画过程中更新显示"""
-        self.draw_random_students()
+        self.draw_random_students(preview=True)
 
         # 检查是否成功抽取到学生，如果没有则停止动画
         if not self.final_selected_students or self.final_selected_students is None:
@@ -167,8 +190,12 @@ class QuickDrawAnimation(QObject):
         """
         return self.is_animating
 
-    def draw_random_students(self):
-        """独立的随机学生抽取逻辑，不依赖roll_call_widget的状态"""
+    def draw_random_students(self, preview=False):
+        """独立的随机学生抽取逻辑，不依赖roll_call_widget的状态
+
+        Args:
+            preview: 是否为动画预览帧（从预览候选池中抽样，不执行完整公平抽取流程）
+        """
         class_name = readme_settings_async("quick_draw_settings", "default_class")
         if not class_name:
             # 未设置默认班级，初始化为空结果并停止动画
@@ -192,20 +219,35 @@ class QuickDrawAnimation(QObject):
         current_count = readme_settings_async("quick_draw_settings", "draw_count")
         half_repeat = readme_settings_async("quick_draw_settings", "half_repeat")
 
-        result = RollCallUtils.draw_random_students(
-            class_name,
-            group_index,
-            group_filter,
-            gender_index,
-            gender_filter,
-            current_count,
-            half_repeat,
-        )
+        if preview and self.preview_pool is not None:
+            result = RollCallUtils.draw_from_pool(self.preview_pool, current_count)
+        else:
+            result = RollCallUtils.draw_random_students(
+                class_name,
+                group_index,
+                group_filter,
+                gender_index,
+                gender_filter,
+                current_count,
+                half_repeat,
+                draw_config=self.draw_config,
+            )
 
         if "reset_required" in result and result["reset_required"]:
             RollCallUtils.reset_drawn_records(
                 self.roll_call_widget, class_name, gender_filter, group_filter
             )
+            if preview and self.preview_pool is not None:
+                self.preview_pool = RollCallUtils.prepare_draw_pool(
+                    class_name,
+                    group_index,
+                    group_filter,
+                    gender_index,
+                    gender_filter,
+                    current_count,
+                    half_repeat,
+                    draw_config=self.draw_config,
+                )
             return False
 
         # 保存抽取结果
@@ -236,6 +278,8 @@ class QuickDrawAnimation(QObject):
 
         # 保存闪抽设置，用于动画过程中更新显示和浮窗通知
         self.quick_draw_settings = quick_draw_settings
+        # 整个闪抽流程共用一份抽取设置快照
+        self.draw_config = DrawConfig.from_settings()
 
         try:
             self.animation_finished.connect(
@@ -327,6 +371,7 @@ class QuickDrawAnimation(QObject):
                 gender_filter=self.final_gender_filter,
                 group_filter=self.final_group_filter,
                 half_repeat=half_repeat,
+                draw_config=self.draw_config,
             )
 
         except Exception as e:
@@ -364,7 +409,9 @@ class QuickDrawAnimation(QObject):
             display_settings: 显示设置字典
             draw_count: 抽取人数
         """
-        student_labels = ResultDisplayUtils.create_student_label(
+        # 复用网格中的标签，每帧只更新文本、颜色和头像
+        ResultDisplayUtils.update_student_labels(
+            self.roll_call_widget.result_grid,
             class_name=class_name,
             selected_students=selected_students,
             draw_count=draw_count,
@@ -376,7 +423,3 @@ class QuickDrawAnimation(QObject):
             show_random=display_settings["show_random"],
             settings_group="quick_draw_settings",
         )
-
-        ResultDisplayUtils.display_results_in_grid(
-            self.roll_call_widget.result_grid, student_labels
-        )
@@ -20,6 +20,7 @@ from app.common.history import *
 from app.common.display.result_display import *
 from app.tools.config import *
 from app.common.roll_call.roll_call_utils import RollCallUtils
+from app.common.fair_draw.draw_config import DrawConfig
 from app.tools.variable import *
 from app.common.voice.voice import TTSHandler
 from app.common.music.music_player import music_player
@@ -55,6 +56,8 @@ class roll_call(QWidget):
         self.tts_handler = TTSHandler()
 
         self.is_animating = False
+        self.draw_config = None
+        self.preview_pool = None
 
         self.initUI()
         self.setupSettingsListener()
@@ -461,6 +464,9 @@ class roll_call(QWidget):
                 and self.remaining_list_page is not None
             ):
                 QTimer.singleShot(APP_INIT_DELAY, self._update_remaining_list_delayed)
+
+            # 后台预热新班级的语音缓存
+            QTimer.singleShot(APP_INIT_DELAY, self._prewarm_voice_cache)
         except Exception as e:
             logger.exception(f"切换班级时发生错误: {e}")
         finally:
@@ -550,7 +556,14 @@ class roll_call(QWidget):
                 "Error disconnecting start_button clicked (ignored): {}", e
             )
 
-        self.draw_random()
+        # 整个动画会话共用一份设置快照，避免每帧重新解析设置
+        self.draw_config = DrawConfig.from_settings()
+
+        animation = readme_settings_async("roll_call_settings", "animation")
+        if animation != 2:
+            # 动画帧只从预先计算好的候选池中抽样，正式结果在停止时抽取
+            self.preview_pool = self._prepare_preview_pool()
+            self.draw_random()
 
         animation_music = readme_settings_async("roll_call_settings", "animation_music")
         if animation_music:
@@ -561,7 +574,6 @@ class roll_call(QWidget):
                 fade_in=True,
             )
 
-        animation = readme_settings_async("roll_call_settings", "animation")
         autoplay_count = readme_settings_async("roll_call_settings", "autoplay_count")
         animation_interval = readme_settings_async(
             "roll_call_settings", "animation_interval"
@@ -635,6 +647,13 @@ class roll_call(QWidget):
             )
         self.start_button.clicked.connect(lambda: self.start_draw())
 
+        # 动画结束，丢弃预览候选池，执行一次完整的正式抽取
+        self.preview_pool = None
+        if not is_quick_draw:
+            if not self._draw_students():
+                # 已抽取记录已重置，重新抽取一次
+                self._draw_students()
+
         half_repeat = readme_settings_async("roll_call_settings", "half_repeat")
         RollCallUtils.record_drawn_students(
             class_name=self.final_class_name,
@@ -643,7 +662,9 @@ class roll_call(QWidget):
             gender_filter=self.final_gender_filter,
             group_filter=self.final_group_filter,
             half_repeat=half_repeat,
+            draw_config=self.draw_config,
         )
+        self.draw_config = None
 
         if half_repeat > 0:
             self.update_many_count_label()
@@ -719,47 +740,106 @@ class roll_call(QWidget):
         except Exception as e:
             logger.exception(f"播放语音失败: {e}", exc_info=True)
 
+    def _prewarm_voice_cache(self):
+        """为当前班级在后台预先合成缺失的 Edge TTS 语音，首次抽到学生时无需等待合成"""
+        try:
+            self.tts_handler.cancel_prewarm()
+            voice_enable = readme_settings_async("basic_voice_settings", "voice_enable")
+            voice_engine = readme_settings_async("basic_voice_settings", "voice_engine")
+            class_name = self.list_combobox.currentText()
+            if not voice_enable or voice_engine != "Edge TTS" or not class_name:
+                return
+
+            edge_tts_voice_name = readme_settings_async(
+                "basic_voice_settings", "edge_tts_voice_name"
+            )
+            coverage = self.tts_handler.get_voice_cache_coverage(
+                class_name, edge_tts_voice_name
+            )
+            logger.debug(
+                f"班级{class_name}语音缓存覆盖率: {coverage['cached']}/{coverage['total']}"
+            )
+            if coverage["cached"] < coverage["total"]:
+                self.tts_handler.prewarm_class(class_name, edge_tts_voice_name)
+        except Exception as e:
+            logger.exception(f"预热语音缓存失败: {e}")
+
     def animate_result(self):
         """动画过程中更新显示"""
         self.draw_random()
 
-    def draw_random(self):
-        """抽取随机结果"""
-        class_name = self.list_combobox.currentText()
-        group_index = self.range_combobox.currentIndex()
-        group_filter = self.range_combobox.currentText()
-        gender_index = self.gender_combobox.currentIndex()
-        gender_filter = self.gender_combobox.currentText()
-        half_repeat = readme_settings_async("roll_call_settings", "half_repeat")
+    def _prepare_preview_pool(self):
+        """为动画预览准备候选池（完整公平抽取流程只执行一次）
 
-        result = RollCallUtils.draw_random_students(
-            class_name,
-            group_index,
-            group_filter,
-            gender_index,
-            gender_filter,
+        Returns:
+            dict: 候选池
+        """
+        half_repeat = readme_settings_async("roll_call_settings", "half_repeat")
+        return RollCallUtils.prepare_draw_pool(
+            self.list_combobox.currentText(),
+            self.range_combobox.currentIndex(),
+            self.range_combobox.currentText(),
+            self.gender_combobox.currentIndex(),
+            self.gender_combobox.currentText(),
             self.current_count,
             half_repeat,
+            draw_config=self.draw_config,
         )
 
+    def _draw_students(self, preview=False):
+        """抽取学生并保存结果
+
+        Args:
+            preview: 是否为动画预览帧（从预览候选池中抽样，不执行完整公平抽取流程）
+
+        Returns:
+            bool: 是否抽取成功（需要重置已抽取记录时返回 False）
+        """
+        class_name = self.list_combobox.currentText()
+        group_filter = self.range_combobox.currentText()
+        gender_filter = self.gender_combobox.currentText()
+
+        if preview and self.preview_pool is not None:
+            result = RollCallUtils.draw_from_pool(self.preview_pool, self.current_count)
+        else:
+            half_repeat = readme_settings_async("roll_call_settings", "half_repeat")
+            result = RollCallUtils.draw_random_students(
+                class_name,
+                self.range_combobox.currentIndex(),
+                group_filter,
+                self.gender_combobox.currentIndex(),
+                gender_filter,
+                self.current_count,
+                half_repeat,
+                draw_config=self.draw_config,
+            )
+
         if "reset_required" in result and result["reset_required"]:
             RollCallUtils.reset_drawn_records(
                 self, class_name, gender_filter, group_filter
             )
-            return
+            if preview and self.preview_pool is not None:
+                self.preview_pool = self._prepare_preview_pool()
+            return False
 
         self.final_selected_students = result["selected_students"]
         self.final_class_name = result["class_name"]
         self.final_selected_students_dict = result["selected_students_dict"]
         self.final_group_filter = result["group_filter"]
         self.final_gender_filter = result["gender_filter"]
+        return True
+
+    def draw_random(self):
+        """抽取随机结果"""
+        if not self._draw_students(preview=True):
+            return
 
         if self.is_animating:
             self.display_result_animated(
-                result["selected_students"], result["class_name"]
+                self.final_selected_students, self.final_class_name
             )
         else:
-            self.display_result(result["selected_students"], result["class_name"])
+            self.display_result(self.final_selected_students, self.final_class_name)
 
         # 检查是否启用了通知服务
         call_notification_service = readme_settings_async(
@@ -831,7 +911,9 @@ class roll_call(QWidget):
         group_index = self.range_combobox.currentIndex()
         display_dict = RollCallUtils.create_display_settings("roll_call_settings")
 
-        student_labels = ResultDisplayUtils.create_student_label(
+        # 复用网格中的标签，每帧只更新文本、颜色和头像
+        ResultDisplayUtils.update_student_labels(
+            self.result_grid,
             class_name=class_name,
             selected_students=selected_students,
             draw_count=self.current_count,
@@ -844,8 +926,6 @@ class roll_call(QWidget):
             settings_group="roll_call_settings",
         )
 
-        ResultDisplayUtils.display_results_in_grid(self.result_grid, student_labels)
-
     def _do_reset_count(self):
         """实际执行重置人数的逻辑"""
         self.current_count = 1
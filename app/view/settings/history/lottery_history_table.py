@@ -1,8 +1,6 @@
 # ==================================================
 # 导入库
 # ==================================================
-import json
-
 from loguru import logger
 from PySide6.QtWidgets import *
 from PySide6.QtGui import *
@@ -24,6 +22,7 @@ from app.common.history.history_reader import (
     get_lottery_session_data,
     get_lottery_prize_stats_data,
 )
+from app.common.history.table_model import HistoryRowStore, HistoryTableModel
 
 
 # ==================================================
@@ -46,10 +45,6 @@ class lottery_history_table(GroupHeaderCardWidget):
         self.current_pool_name = pool_history[0] if pool_history else ""
         self.current_mode = 0
         self.current_subject = ""  # 当前选择的课程
-        self.batch_size = 30  # 每次加载的行数
-        self.current_row = 0  # 当前加载到的行数
-        self.total_rows = 0  # 总行数
-        self.is_loading = False  # 是否正在加载数据
         self.has_class_record = False  # 是否有课程记录
         self.available_subjects = []  # 可用的课程列表
 
@@ -139,13 +134,15 @@ class lottery_history_table(GroupHeaderCardWidget):
 
     def create_table(self):
         """创建表格区域"""
-        # 创建表格
-        self.table = TableWidget()
+        # 创建表格，行数据由模型提供，只绘制可见行
+        self.table_model = HistoryTableModel(self)
+        self.table = TableView()
+        self.table.setModel(self.table_model)
         self.table.setBorderVisible(True)
         self.table.setBorderRadius(8)
         self.table.setWordWrap(False)
         self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
-        # 暂时禁用排序，在数据加载完成后再启用
+        # 排序由表头点击事件处理，使用行数据中缓存的排序结果
         self.table.setSortingEnabled(False)
         self.table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
         self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
@@ -156,58 +153,29 @@ class lottery_history_table(GroupHeaderCardWidget):
         self.sort_order = Qt.SortOrder.AscendingOrder
 
         # 根据当前选择的模式设置表格头
-        self.update_table_headers()
+        self.table_model.set_store(self.update_table_headers(), HistoryRowStore())
 
         # 设置表格属性
-        for i in range(self.table.columnCount()):
-            self.table.horizontalHeader().setSectionResizeMode(
-                i, QHeaderView.ResizeMode.Stretch
-            )
-            self.table.horizontalHeader().setDefaultAlignment(
-                Qt.AlignmentFlag.AlignCenter
-            )
-            self.table.horizontalHeader().setSectionsClickable(True)
+        self.table.horizontalHeader().setSectionResizeMode(
+            QHeaderView.ResizeMode.Stretch
+        )
+        self.table.horizontalHeader().setDefaultAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.table.horizontalHeader().setSectionsClickable(True)
 
         # 初始状态下不显示排序指示器
         self.table.horizontalHeader().setSortIndicatorShown(False)
 
-        # 连接滚动事件，用于分段加载
-        self.table.verticalScrollBar().valueChanged.connect(self._on_scroll)
-
-        # 连接排序信号，在排序时重新加载数据
+        # 连接排序信号，在排序时重新排列已构建的行数据
         self.table.horizontalHeader().sectionClicked.connect(self._on_header_clicked)
 
         self.layout().addWidget(self.table)
 
-    def _on_scroll(self, value):
-        """处理表格滚动事件，实现分段加载
-
-        Args:
-            value: 滚动条当前位置
-        """
-        # 如果正在加载或没有更多数据，直接返回
-        if self.is_loading or self.current_row >= self.total_rows:
-            return
-
-        # 获取滚动条最大值和当前值
-        max_value = self.table.verticalScrollBar().maximum()
-        current_value = self.table.verticalScrollBar().value()
-
-        # 使用更精确的滚动检测，确保在滚动到底部时触发
-        scroll_threshold = max(20, max_value * 0.1)  # 至少20像素或10%的位置
-        if current_value >= max_value - scroll_threshold:
-            self._load_more_data()
-
     def _on_header_clicked(self, column):
         """处理表头点击事件，实现排序
 
         Args:
             column: 被点击的列索引
         """
-        # 如果正在加载数据，不处理排序
-        if self.is_loading:
-            return
-
         # 获取当前排序状态，优先使用我们自己的状态变量
         current_sort_column = self.sort_column if self.sort_column >= 0 else -1
         current_sort_order = (
@@ -233,140 +201,17 @@ class lottery_history_table(GroupHeaderCardWidget):
         self.table.horizontalHeader().setSortIndicator(column, new_sort_order)
         self.table.horizontalHeader().setSortIndicatorShown(True)
 
-        # 重置数据加载状态
-        self.current_row = 0
-        self.table.setRowCount(0)
-
-        # 重新加载数据
-        self.refresh_data()
-
-    def _sort_current_data(self):
-        """对已加载的数据进行排序，不重新加载数据"""
-        # 获取当前表格中的所有数据
-        table_data = []
-        for row in range(self.table.rowCount()):
-            row_data = []
-            for col in range(self.table.columnCount()):
-                item = self.table.item(row, col)
-                if item:
-                    row_data.append(item.text())
-                else:
-                    row_data.append("")
-            table_data.append(row_data)
-
-        # 如果没有数据，直接返回
-        if not table_data:
-            return
-
-        # 根据排序状态对数据进行排序
-        def sort_key(row):
-            # 尝试将数据转换为数字，如果失败则使用字符串比较
-            try:
-                # 对于权重列，需要特殊处理
-                # 在模式0（奖品数据）中：没有课程列
-                #   - 权重列索引为3
-                # 在模式1（会话数据）中：
-                #   - 有课程时：权重列索引为4
-                #   - 无课程时：权重列索引为3
-                # 在模式2（统计数据）中：
-                #   - 有课程时：权重列索引为4
-                #   - 无课程时：权重列索引为3
-                if self.current_mode == 0:
-                    # 模式0：奖品数据，权重列索引为3
-                    if self.sort_column == 3:
-                        weight_str = row[self.sort_column]
-                        weight_str = weight_str.lstrip("0")
-                        if not weight_str:
-                            return 0.0
-                        return float(weight_str)
-                elif self.current_mode in [1, 2]:
-                    # 模式1和2：会话数据和统计数据
-                    if self.sort_column == 3:
-                        # 列3可能是课程或权重
-                        if self.has_class_record:
-                            # 有课程，列3是课程，列4是权重
-                            return row[self.sort_column]
-                        else:
-                            # 无课程，列3是权重
-                            weight_str = row[self.sort_column]
-                            weight_str = weight_str.lstrip("0")
-                            if not weight_str:
-                                return 0.0
-                            return float(weight_str)
-                    elif self.sort_column == 4 and self.has_class_record:
-                        # 有课程时，列4是权重
-                        weight_str = row[self.sort_column]
-                        weight_str = weight_str.lstrip("0")
-                        if not weight_str:
-                            return 0.0
-                        return float(weight_str)
-                return float(row[self.sort_column])
-            except (ValueError, IndexError):
-                return row[self.sort_column]
-
-        # 应用排序
-        reverse_order = self.sort_order == Qt.SortOrder.DescendingOrder
-        table_data.sort(key=sort_key, reverse=reverse_order)
-
-        # 清空表格
-        self.table.setRowCount(0)
-
-        # 重新填充排序后的数据
-        self.table.setRowCount(len(table_data))
-        for row_idx, row_data in enumerate(table_data):
-            for col_idx, cell_data in enumerate(row_data):
-                item = create_table_item(cell_data)
-                self.table.setItem(row_idx, col_idx, item)
-
-    def _load_more_data(self):
-        """加载更多数据"""
-        if self.is_loading or self.current_row >= self.total_rows:
-            return
-
-        self.is_loading = True
-
-        # 计算新的行数
-        new_row_count = min(self.current_row + self.batch_size, self.total_rows)
-
-        # 增加表格行数
-        self.table.setRowCount(new_row_count)
-
-        # 根据当前模式加载数据，与refresh_data方法保持一致
-        if hasattr(self, "mode_comboBox"):
-            self.current_mode = self.mode_comboBox.currentIndex()
-        else:
-            self.current_mode = 0
-
-        if self.current_mode == 0:
-            self._load_more_lotterys_data()
-        elif self.current_mode == 1:
-            self._load_more_sessions_data()
-        else:
-            # 当模式值大于等于2时，表示选择了特定的奖品名称
-            if hasattr(self, "mode_comboBox"):
-                self.current_lottery_name = self.mode_comboBox.currentText()
-            else:
-                # 如果没有mode_comboBox，从设置中获取奖品名称
-                self.current_lottery_name = readme_settings_async(
-                    "lottery_history_table", "select_lottery_name"
-                )
-            self._load_more_stats_data(self.current_lottery_name)
-
-        # 数据加载完成后启用排序
-        if self.current_row >= self.total_rows:
-            self.table.setSortingEnabled(True)
-            if self.sort_column >= 0:
-                self.table.horizontalHeader().setSortIndicator(
-                    self.sort_column, self.sort_order
-                )
-                self.table.horizontalHeader().setSortIndicatorShown(True)
+        # 排序只重新排列行数据，不读取文件也不重新计算权重
+        self.table_model.sort(column, new_sort_order)
 
-        self.is_loading = False
+    def _build_lotterys_rows(self):
+        """构建奖品数据行
 
-    def _load_more_lotterys_data(self):
-        """加载更多奖品数据"""
+        Returns:
+            list: 表格行，每行为各列的显示文本
+        """
         if not self.current_pool_name:
-            return
+            return []
         try:
             cleaned_lotterys = get_lottery_pool_list(self.current_pool_name)
             history_data = get_lottery_history_data(self.current_pool_name)
@@ -375,56 +220,30 @@ class lottery_history_table(GroupHeaderCardWidget):
 
             format_weight, _, _ = format_weight_for_display(lotterys_data, "weight")
 
-            if self.sort_column >= 0:
-
-                def sort_key(lottery):
-                    if self.sort_column == 0:
-                        return lottery.get("id", "")
-                    elif self.sort_column == 1:
-                        return lottery.get("name", "")
-                    elif self.sort_column == 2:
-                        return lottery.get("total_count", 0)
-                    elif self.sort_column == 3:
-                        return lottery.get("weight", "")
-                    return ""
-
-                reverse_order = self.sort_order == Qt.SortOrder.DescendingOrder
-                lotterys_data.sort(key=sort_key, reverse=reverse_order)
-
-            start_row = self.current_row
-            end_row = min(start_row + self.batch_size, self.total_rows)
-
-            for i in range(start_row, end_row):
-                if i >= len(lotterys_data):
-                    break
-
-                lottery = lotterys_data[i]
-                row = i
-
-                id_item = create_table_item(lottery.get("id", str(row + 1)))
-                self.table.setItem(row, 0, id_item)
-
-                name_item = create_table_item(lottery.get("name", ""))
-                self.table.setItem(row, 1, name_item)
-
-                total_count_item = create_table_item(
-                    str(lottery.get("total_count_str", lottery.get("total_count", 0)))
-                )
-                self.table.setItem(row, 2, total_count_item)
-
-                weight_item = create_table_item(format_weight(lottery.get("weight", 0)))
-                self.table.setItem(row, 3, weight_item)
-
-            self.current_row = end_row
+            rows = []
+            for row, lottery in enumerate(lotterys_data):
+                values = [
+                    lottery.get("id", str(row + 1)),
+                    lottery.get("name", ""),
+                    str(lottery.get("total_count_str", lottery.get("total_count", 0))),
+                    format_weight(lottery.get("weight", 0)),
+                ]
+                rows.append([format_table_item(value) for value in values])
+            return rows
 
         except Exception as e:
             logger.exception(f"加载奖品数据失败: {e}")
             Dialog("错误", f"加载奖品数据失败: {e}", self).exec()
+            return []
 
-    def _load_more_sessions_data(self):
-        """加载更多会话数据"""
+    def _build_sessions_rows(self):
+        """构建会话数据行
+
+        Returns:
+            list: 表格行，每行为各列的显示文本
+        """
         if not self.current_pool_name:
-            return
+            return []
         try:
             cleaned_lotterys = get_lottery_pool_list(self.current_pool_name)
             history_data = get_lottery_history_data(self.current_pool_name)
@@ -437,72 +256,41 @@ class lottery_history_table(GroupHeaderCardWidget):
                 lottery.get("class_name", "") for lottery in lotterys_data
             )
 
-            self.update_table_headers()
-
             format_weight, _, _ = format_weight_for_display(lotterys_data, "weight")
 
-            if self.sort_column >= 0:
-
-                def sort_key(lottery):
-                    if self.sort_column == 0:
-                        return lottery.get("draw_time", "")
-                    elif self.sort_column == 1:
-                        return lottery.get("id", "")
-                    elif self.sort_column == 2:
-                        return lottery.get("name", "")
-                    elif self.sort_column == 3:
-                        return lottery.get("class_name", "")
-                    elif self.sort_column == 4:
-                        return lottery.get("weight", "")
-                    return ""
-
-                reverse_order = self.sort_order == Qt.SortOrder.DescendingOrder
-                lotterys_data.sort(key=sort_key, reverse=reverse_order)
-            else:
-                lotterys_data.sort(key=lambda x: x.get("draw_time", ""), reverse=True)
-
-            start_row = self.current_row
-            end_row = min(start_row + self.batch_size, self.total_rows)
-
-            for i in range(start_row, end_row):
-                if i >= len(lotterys_data):
-                    break
-
-                lottery = lotterys_data[i]
-                row = i
-
-                draw_time_item = create_table_item(lottery.get("draw_time", ""))
-                self.table.setItem(row, 0, draw_time_item)
-
-                id_item = create_table_item(lottery.get("id", str(row + 1)))
-                self.table.setItem(row, 1, id_item)
-
-                name_item = create_table_item(lottery.get("name", ""))
-                self.table.setItem(row, 2, name_item)
+            # 默认按抽取时间倒序显示
+            lotterys_data.sort(key=lambda x: x.get("draw_time", ""), reverse=True)
 
+            rows = []
+            for row, lottery in enumerate(lotterys_data):
+                values = [
+                    lottery.get("draw_time", ""),
+                    lottery.get("id", str(row + 1)),
+                    lottery.get("name", ""),
+                ]
                 if self.has_class_record:
                     class_name = lottery.get("class_name", "")
-                    class_item = create_table_item(
-                        str(class_name) if class_name else ""
-                    )
-                    self.table.setItem(row, 3, class_item)
-                    col = 4
-                else:
-                    col = 3
-
-                weight_item = create_table_item(format_weight(lottery.get("weight", 0)))
-                self.table.setItem(row, col, weight_item)
-
-            self.current_row = end_row
+                    values.append(str(class_name) if class_name else "")
+                values.append(format_weight(lottery.get("weight", 0)))
+                rows.append([format_table_item(value) for value in values])
+            return rows
 
         except Exception as e:
             logger.exception(f"加载会话数据失败: {e}")
             Dialog("错误", f"加载会话数据失败: {e}", self).exec()
+            return []
 
-    def _load_more_stats_data(self, lottery_name):
-        """加载更多统计数据"""
+    def _build_stats_rows(self, lottery_name):
+        """构建奖品统计数据行
+
+        Args:
+            lottery_name: 奖品名称
+
+        Returns:
+            list: 表格行，每行为各列的显示文本
+        """
         if not self.current_pool_name:
-            return
+            return []
         try:
             cleaned_lotterys = get_lottery_pool_list(self.current_pool_name)
             history_data = get_lottery_history_data(self.current_pool_name)
@@ -515,66 +303,28 @@ class lottery_history_table(GroupHeaderCardWidget):
                 lottery.get("class_name", "") for lottery in lotterys_data
             )
 
-            self.update_table_headers()
-
             format_weight, _, _ = format_weight_for_display(lotterys_data, "weight")
 
-            if self.sort_column >= 0:
-
-                def sort_key(lottery):
-                    if self.sort_column == 0:
-                        return lottery.get("draw_time", "")
-                    elif self.sort_column == 1:
-                        return int(lottery.get("draw_lottery_numbers", 0))
-                    elif self.sort_column == 2:
-                        return lottery.get("class_name", "")
-                    elif self.sort_column == 3:
-                        return float(lottery.get("weight", ""))
-                    return ""
-
-                reverse_order = self.sort_order == Qt.SortOrder.DescendingOrder
-                lotterys_data.sort(key=sort_key, reverse=reverse_order)
-            else:
-                lotterys_data.sort(key=lambda x: x.get("draw_time", ""), reverse=True)
-
-            start_row = self.current_row
-            end_row = min(start_row + self.batch_size, self.total_rows)
-
-            for i in range(start_row, end_row):
-                if i >= len(lotterys_data):
-                    break
-
-                lottery = lotterys_data[i]
-                row = i
-
-                time_item = create_table_item(lottery.get("draw_time", ""))
-                self.table.setItem(row, 0, time_item)
-
-                draw_lottery_numbers_item = create_table_item(
-                    str(lottery.get("draw_lottery_numbers", 0))
-                )
-                self.table.setItem(row, 1, draw_lottery_numbers_item)
+            # 默认按抽取时间倒序显示
+            lotterys_data.sort(key=lambda x: x.get("draw_time", ""), reverse=True)
 
+            rows = []
+            for lottery in lotterys_data:
+                values = [
+                    lottery.get("draw_time", ""),
+                    str(lottery.get("draw_lottery_numbers", 0)),
+                ]
                 if self.has_class_record:
                     class_name = lottery.get("class_name", "")
-                    class_item = create_table_item(
-                        str(class_name) if class_name else ""
-                    )
-                    self.table.setItem(row, 2, class_item)
-                    col = 3
-                else:
-                    col = 2
-
-                weight_item = create_table_item(
-                    format_weight(lottery.get("weight", ""))
-                )
-                self.table.setItem(row, col, weight_item)
-
-            self.current_row = end_row
+                    values.append(str(class_name) if class_name else "")
+                values.append(format_weight(lottery.get("weight", "")))
+                rows.append([format_table_item(value) for value in values])
+            return rows
 
         except Exception as e:
             logger.exception(f"加载统计数据失败: {e}")
             Dialog("错误", f"加载统计数据失败: {e}", self).exec()
+            return []
 
     def setup_file_watcher(self):
         """设置文件系统监视器，监控奖池历史记录文件夹的变化"""
@@ -656,14 +406,18 @@ class lottery_history_table(GroupHeaderCardWidget):
         self.refresh_data()
 
     def refresh_data(self):
-        """刷新表格数据"""
+        """刷新表格数据
+
+        每次切换奖池、课程或查看模式时读取一次历史记录并构建全部行数据，
+        之后的滚动和排序只访问内存中的行数据。
+        """
         if not hasattr(self, "table"):
             return
         if not hasattr(self, "pool_comboBox"):
             return
         pool_name = self.pool_comboBox.currentText()
         if not pool_name:
-            self.table.setRowCount(0)
+            self.table_model.clear()
             return
         self.current_pool_name = pool_name
 
@@ -673,98 +427,28 @@ class lottery_history_table(GroupHeaderCardWidget):
         # 重置课程记录标志
         self.has_class_record = False
 
-        self.update_table_headers()
-
-        # 重置数据加载状态
-        self.current_row = 0
-        self.is_loading = False
-        self.table.setRowCount(0)
-        self.table.blockSignals(True)
-
         try:
-            if not hasattr(self, "mode_comboBox"):
+            if hasattr(self, "mode_comboBox"):
+                self.current_mode = self.mode_comboBox.currentIndex()
+            else:
                 self.current_mode = 0
-                if self.current_mode == 0:
-                    # 获取奖品记录数量
-                    lotterys_count = get_name_history("lottery", pool_name)
-                    if lotterys_count:
-                        self.total_rows = lotterys_count
-                        # 设置初始行数为批次大小或总行数，取较小值
-                        initial_rows = min(self.batch_size, self.total_rows)
-                        self.table.setRowCount(initial_rows)
-                        # 加载第一批数据
-                        self._load_more_lotterys_data()
-                elif self.current_mode == 1:
-                    # 获取会话记录数量
-                    sessions_count = get_draw_sessions_history("lottery", pool_name)
-                    if sessions_count:
-                        self.total_rows = sessions_count
-                        # 设置初始行数为批次大小或总行数，取较小值
-                        initial_rows = min(self.batch_size, self.total_rows)
-                        self.table.setRowCount(initial_rows)
-                        # 加载第一批数据
-                        self._load_more_sessions_data()
-                else:
-                    # 当模式值大于等于2时，从设置中获取奖品名称
-                    self.current_lottery_name = readme_settings_async(
-                        "lottery_history_table", "select_lottery_name"
-                    )
-                    # 获取个人统计记录数量
-                    stats_count = get_individual_statistics(
-                        "lottery", pool_name, self.current_lottery_name
-                    )
-                    if stats_count:
-                        self.total_rows = stats_count
-                        # 设置初始行数为批次大小或总行数，取较小值
-                        initial_rows = min(self.batch_size, self.total_rows)
-                        self.table.setRowCount(initial_rows)
-                        # 加载第一批数据
-                        self._load_more_stats_data(self.current_lottery_name)
-                return
 
-            self.current_mode = self.mode_comboBox.currentIndex()
             if self.current_mode == 0:
-                # 获取奖品记录数量
-                lotterys_count = get_name_history("lottery", pool_name)
-                if lotterys_count:
-                    self.total_rows = lotterys_count
-                    # 设置初始行数为批次大小或总行数，取较小值
-                    initial_rows = min(self.batch_size, self.total_rows)
-                    self.table.setRowCount(initial_rows)
-                    # 加载第一批数据
-                    self._load_more_lotterys_data()
+                rows = self._build_lotterys_rows()
             elif self.current_mode == 1:
-                # 获取会话记录数量
-                sessions_count = get_draw_sessions_history("lottery", pool_name)
-                if sessions_count:
-                    self.total_rows = sessions_count
-                    # 设置初始行数为批次大小或总行数，取较小值
-                    initial_rows = min(self.batch_size, self.total_rows)
-                    self.table.setRowCount(initial_rows)
-                    # 加载第一批数据
-                    self._load_more_sessions_data()
+                rows = self._build_sessions_rows()
             else:
-                # 获取个人统计记录数量
-                stats_count = get_individual_statistics(
-                    "lottery", pool_name, self.mode_comboBox.currentText()
-                )
-                if stats_count:
-                    self.total_rows = stats_count
-                    # 设置初始行数为批次大小或总行数，取较小值
-                    initial_rows = min(self.batch_size, self.total_rows)
-                    self.table.setRowCount(initial_rows)
-                    self.current_lottery_name = self.mode_comboBox.currentText()
-                    # 加载第一批数据
-                    self._load_more_stats_data(self.current_lottery_name)
-
-            # 设置表格列属性
-            for i in range(self.table.columnCount()):
-                self.table.horizontalHeader().setSectionResizeMode(
-                    i, QHeaderView.ResizeMode.Stretch
-                )
-                self.table.horizontalHeader().setDefaultAlignment(
-                    Qt.AlignmentFlag.AlignCenter
-                )
+                # 当模式值大于等于2时，表示选择了特定的奖品名称
+                self.current_lottery_name = self.mode_comboBox.currentText()
+                rows = self._build_stats_rows(self.current_lottery_name)
+
+            # 课程列是否显示取决于构建行数据时统计的课程记录
+            self.table_model.set_store(
+                self.update_table_headers(),
+                HistoryRowStore(rows),
+                self.sort_column,
+                self.sort_order,
+            )
 
             # 如果有排序设置，应用排序
             if self.sort_column >= 0:
@@ -775,14 +459,13 @@ class lottery_history_table(GroupHeaderCardWidget):
 
         except Exception as e:
             logger.exception(f"刷新表格数据失败: {str(e)}")
-        finally:
-            self.table.blockSignals(False)
 
     def update_table_headers(self):
-        """更新表格标题"""
-        if not hasattr(self, "table"):
-            return
+        """获取当前模式的表格标题
 
+        Returns:
+            list: 表格标题列表
+        """
         if hasattr(self, "mode_comboBox"):
             self.current_mode = self.mode_comboBox.currentIndex()
         else:
@@ -805,8 +488,7 @@ class lottery_history_table(GroupHeaderCardWidget):
         if not self.has_class_record and self.current_mode >= 1:
             headers = headers[:-2] + headers[-1:]
 
-        self.table.setColumnCount(len(headers))
-        self.table.setHorizontalHeaderLabels(headers)
+        return list(headers)
 
     def on_subject_changed(self, index):
         """课程选择变化时刷新表格数据"""
@@ -828,16 +510,16 @@ class lottery_history_table(GroupHeaderCardWidget):
             return
 
         try:
-            history_file = get_data_path(
-                "history/lottery_history", f"{self.current_pool_name}.json"
-            )
+            history_file = get_history_file_path("lottery", self.current_pool_name)
 
             if not file_exists(history_file):
                 self.available_subjects = []
                 return
 
-            with open_file(history_file, "r", encoding="utf-8") as f:
-                history_data = json.load(f)
+            # 只读取课程名称，使用共享的缓存文档（不得修改）
+            history_data = load_history_data(
+                "lottery", self.current_pool_name, readonly=True
+            )
 
             # 收集所有课程名称
             subjects = set()
@@ -1,7 +1,7 @@
 # ==================================================
 # 导入库
 # ==================================================
-import json
+import math
 
 from loguru import logger
 from PySide6.QtWidgets import *
@@ -22,10 +22,16 @@ from app.common.history.history_reader import (
     get_roll_call_history_data,
     filter_roll_call_history_by_subject,
     get_roll_call_students_data,
-    get_roll_call_session_data,
     get_roll_call_student_stats_data,
     check_class_has_gender_or_group,
 )
+from app.common.history.session_index import get_session_index
+from app.common.history.table_model import (
+    HistoryRowStore,
+    LazyRowStore,
+    HistoryTableModel,
+)
+from app.common.history.weight_utils import format_weight_values_for_display
 
 
 # ==================================================
@@ -48,10 +54,6 @@ class roll_call_history_table(GroupHeaderCardWidget):
         self.current_class_name = class_history[0] if class_history else ""
         self.current_mode = 0
         self.current_subject = ""  # 当前选择的课程
-        self.batch_size = 30  # 每次加载的行数
-        self.current_row = 0  # 当前加载到的行数
-        self.total_rows = 0  # 总行数
-        self.is_loading = False  # 是否正在加载数据
         self.has_class_record = False  # 是否有课程记录
         self.available_subjects = []  # 可用的课程列表
 
@@ -145,13 +147,15 @@ class roll_call_history_table(GroupHeaderCardWidget):
 
     def create_table(self):
         """创建表格区域"""
-        # 创建表格
-        self.table = TableWidget()
+        # 创建表格，行数据由模型提供，只绘制可见行
+        self.table_model = HistoryTableModel(self)
+        self.table = TableView()
+        self.table.setModel(self.table_model)
         self.table.setBorderVisible(True)
         self.table.setBorderRadius(8)
         self.table.setWordWrap(False)
         self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
-        # 暂时禁用排序，在数据加载完成后再启用
+        # 排序由表头点击事件处理，使用行数据中缓存的排序结果
         self.table.setSortingEnabled(False)
         self.table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
         self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
@@ -162,58 +166,29 @@ class roll_call_history_table(GroupHeaderCardWidget):
         self.sort_order = Qt.SortOrder.AscendingOrder
 
         # 根据当前选择的模式设置表格头
-        self.update_table_headers()
+        self.table_model.set_store(self.update_table_headers(), HistoryRowStore())
 
         # 设置表格属性
-        for i in range(self.table.columnCount()):
-            self.table.horizontalHeader().setSectionResizeMode(
-                i, QHeaderView.ResizeMode.Stretch
-            )
-            self.table.horizontalHeader().setDefaultAlignment(
-                Qt.AlignmentFlag.AlignCenter
-            )
-            self.table.horizontalHeader().setSectionsClickable(True)
+        self.table.horizontalHeader().setSectionResizeMode(
+            QHeaderView.ResizeMode.Stretch
+        )
+        self.table.horizontalHeader().setDefaultAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.table.horizontalHeader().setSectionsClickable(True)
 
         # 初始状态下不显示排序指示器
         self.table.horizontalHeader().setSortIndicatorShown(False)
 
-        # 连接滚动事件，用于分段加载
-        self.table.verticalScrollBar().valueChanged.connect(self._on_scroll)
-
-        # 连接排序信号，在排序时重新加载数据
+        # 连接排序信号，在排序时重新排列已构建的行数据
         self.table.horizontalHeader().sectionClicked.connect(self._on_header_clicked)
 
         self.layout().addWidget(self.table)
 
-    def _on_scroll(self, value):
-        """处理表格滚动事件，实现分段加载
-
-        Args:
-            value: 滚动条当前位置
-        """
-        # 如果正在加载或没有更多数据，直接返回
-        if self.is_loading or self.current_row >= self.total_rows:
-            return
-
-        # 获取滚动条最大值和当前值
-        max_value = self.table.verticalScrollBar().maximum()
-        current_value = self.table.verticalScrollBar().value()
-
-        # 使用更精确的滚动检测，确保在滚动到底部时触发
-        scroll_threshold = max(20, max_value * 0.1)  # 至少20像素或10%的位置
-        if current_value >= max_value - scroll_threshold:
-            self._load_more_data()
-
     def _on_header_clicked(self, column):
         """处理表头点击事件，实现排序
 
         Args:
             column: 被点击的列索引
         """
-        # 如果正在加载数据，不处理排序
-        if self.is_loading:
-            return
-
         # 获取当前排序状态，优先使用我们自己的状态变量
         current_sort_column = self.sort_column if self.sort_column >= 0 else -1
         current_sort_order = (
@@ -239,145 +214,17 @@ class roll_call_history_table(GroupHeaderCardWidget):
         self.table.horizontalHeader().setSortIndicator(column, new_sort_order)
         self.table.horizontalHeader().setSortIndicatorShown(True)
 
-        # 重置数据加载状态
-        self.current_row = 0
-        self.table.setRowCount(0)
-
-        # 重新加载数据
-        self.refresh_data()
-
-    def _sort_current_data(self):
-        """对已加载的数据进行排序，不重新加载数据"""
-        # 获取当前表格中的所有数据
-        table_data = []
-        for row in range(self.table.rowCount()):
-            row_data = []
-            for col in range(self.table.columnCount()):
-                item = self.table.item(row, col)
-                if item:
-                    row_data.append(item.text())
-                else:
-                    row_data.append("")
-            table_data.append(row_data)
-
-        # 如果没有数据，直接返回
-        if not table_data:
-            return
-
-        # 根据排序状态对数据进行排序
-        def sort_key(row):
-            # 尝试将数据转换为数字，如果失败则使用字符串比较
-            try:
-                # 对于权重列，需要特殊处理
-                # 在模式0（学生数据）中：
-                #   - 有课程时：权重列索引为6
-                #   - 无课程时：权重列索引为5
-                # 在模式1（会话数据）中：
-                #   - 有课程时：权重列索引为6
-                #   - 无课程时：权重列索引为5
-                # 在模式2（统计数据）中：
-                #   - 有课程时：权重列索引为6
-                #   - 无课程时：权重列索引为5
-                if self.current_mode == 0:
-                    # 模式0：学生数据
-                    if self.sort_column == 5:
-                        # 列5可能是课程或权重
-                        if self.has_class_record:
-                            # 有课程，列5是课程，列6是权重
-                            return row[self.sort_column]
-                        else:
-                            # 无课程，列5是权重
-                            weight_str = row[self.sort_column]
-                            weight_str = weight_str.lstrip("0")
-                            if not weight_str:
-                                return 0.0
-                            return float(weight_str)
-                    elif self.sort_column == 6 and self.has_class_record:
-                        # 有课程时，列6是权重
-                        weight_str = row[self.sort_column]
-                        weight_str = weight_str.lstrip("0")
-                        if not weight_str:
-                            return 0.0
-                        return float(weight_str)
-                elif self.current_mode in [1, 2]:
-                    # 模式1和2：会话数据和统计数据
-                    if self.sort_column == 5:
-                        # 有课程，列5是课程
-                        return row[self.sort_column]
-                    elif self.sort_column == 6 and self.has_class_record:
-                        # 有课程时，列6是权重
-                        weight_str = row[self.sort_column]
-                        weight_str = weight_str.lstrip("0")
-                        if not weight_str:
-                            return 0.0
-                        return float(weight_str)
-                return float(row[self.sort_column])
-            except (ValueError, IndexError):
-                return row[self.sort_column]
-
-        # 应用排序
-        reverse_order = self.sort_order == Qt.SortOrder.DescendingOrder
-        table_data.sort(key=sort_key, reverse=reverse_order)
-
-        # 清空表格
-        self.table.setRowCount(0)
-
-        # 重新填充排序后的数据
-        self.table.setRowCount(len(table_data))
-        for row_idx, row_data in enumerate(table_data):
-            for col_idx, cell_data in enumerate(row_data):
-                item = create_table_item(cell_data)
-                self.table.setItem(row_idx, col_idx, item)
-
-    def _load_more_data(self):
-        """加载更多数据"""
-        if self.is_loading or self.current_row >= self.total_rows:
-            return
+        # 排序只重新排列行数据，不读取文件也不重新计算权重
+        self.table_model.sort(column, new_sort_order)
 
-        self.is_loading = True
+    def _build_students_rows(self):
+        """构建学生数据行（每次切换班级、课程或模式时计算一次权重）
 
-        # 计算新的行数
-        new_row_count = min(self.current_row + self.batch_size, self.total_rows)
-
-        # 增加表格行数
-        self.table.setRowCount(new_row_count)
-
-        # 根据当前模式加载数据，与refresh_data方法保持一致
-        if hasattr(self, "mode_comboBox"):
-            self.current_mode = self.mode_comboBox.currentIndex()
-        else:
-            self.current_mode = 0
-
-        if self.current_mode == 0:
-            self._load_more_students_data()
-        elif self.current_mode == 1:
-            self._load_more_sessions_data()
-        else:
-            # 当模式值大于等于2时，表示选择了特定的学生姓名
-            if hasattr(self, "mode_comboBox"):
-                self.current_student_name = self.mode_comboBox.currentText()
-            else:
-                # 如果没有mode_comboBox，从设置中获取学生姓名
-                self.current_student_name = readme_settings_async(
-                    "roll_call_history_table", "select_student_name"
-                )
-            self._load_more_stats_data(self.current_student_name)
-
-        # 数据加载完成后启用排序
-        if self.current_row >= self.total_rows:
-            self.table.setSortingEnabled(True)
-            if self.sort_column >= 0:
-                self.table.horizontalHeader().setSortIndicator(
-                    self.sort_column, self.sort_order
-                )
-                self.table.horizontalHeader().setSortIndicatorShown(True)
-
-        self.is_loading = False
-
-    def _load_more_students_data(self):
-        """加载更多学生数据"""
+        Returns:
+            list: 表格行，每行为各列的显示文本
+        """
         if not self.current_class_name:
-            return
+            return []
         try:
             cleaned_students = get_roll_call_student_list(self.current_class_name)
             history_data = get_roll_call_history_data(self.current_class_name)
@@ -399,200 +246,125 @@ class roll_call_history_table(GroupHeaderCardWidget):
                 students_weight_data, "next_weight"
             )
 
-            if self.sort_column >= 0:
-
-                def sort_key(student):
-                    if self.sort_column == 0:
-                        return student.get("id", "")
-                    elif self.sort_column == 1:
-                        return student.get("name", "")
-                    elif self.sort_column == 2:
-                        return student.get("gender", "")
-                    elif self.sort_column == 3:
-                        return student.get("group", "")
-                    elif self.sort_column == 4:
-                        return student.get("total_count", 0)
-                    elif self.sort_column == 5:
-                        for weight_student in students_weight_data:
-                            if weight_student.get("id") == student.get(
-                                "id"
-                            ) and weight_student.get("name") == student.get("name"):
-                                return weight_student.get("next_weight", 1.0)
-                        return 1.0
-                    return ""
-
-                reverse_order = self.sort_order == Qt.SortOrder.DescendingOrder
-                students_data.sort(key=sort_key, reverse=reverse_order)
-                sorted_weight_data = []
-                for student in students_data:
-                    for weight_student in students_weight_data:
-                        if weight_student.get("id") == student.get(
-                            "id"
-                        ) and weight_student.get("name") == student.get("name"):
-                            sorted_weight_data.append(weight_student)
-                            break
-                students_weight_data = sorted_weight_data
-
-            start_row = self.current_row
-            end_row = min(start_row + self.batch_size, self.total_rows)
-
             has_gender, has_group = check_class_has_gender_or_group(
                 self.current_class_name
             )
 
-            for i in range(start_row, end_row):
-                if i >= len(students_data):
-                    break
-
-                student = students_data[i]
-                row = i
-                col = 0
-
-                id_item = create_table_item(student.get("id", str(row + 1)))
-                self.table.setItem(row, col, id_item)
-                col += 1
-
-                name_item = create_table_item(student.get("name", ""))
-                self.table.setItem(row, col, name_item)
-                col += 1
-
+            rows = []
+            for row, (student, weight_student) in enumerate(
+                zip(students_data, students_weight_data, strict=True)
+            ):
+                values = [
+                    student.get("id", str(row + 1)),
+                    student.get("name", ""),
+                ]
                 if has_gender:
-                    gender_item = create_table_item(student.get("gender", ""))
-                    self.table.setItem(row, col, gender_item)
-                    col += 1
-
+                    values.append(student.get("gender", ""))
                 if has_group:
-                    group_item = create_table_item(student.get("group", ""))
-                    self.table.setItem(row, col, group_item)
-                    col += 1
-
-                total_count_item = create_table_item(
+                    values.append(student.get("group", ""))
+                values.append(
                     str(student.get("total_count_str", student.get("total_count", 0)))
                 )
-                self.table.setItem(row, col, total_count_item)
-                col += 1
-
-                if self.table.columnCount() > col:
-                    weight_item = create_table_item(
-                        str(
-                            format_weight(
-                                students_weight_data[i].get("next_weight", "")
-                            )
-                        )
-                    )
-                    self.table.setItem(row, col, weight_item)
-
-            self.current_row = end_row
+                values.append(str(format_weight(weight_student.get("next_weight", ""))))
+                rows.append([format_table_item(value) for value in values])
+            return rows
 
         except Exception as e:
             logger.exception(f"加载学生数据失败: {e}")
+            return []
 
-    def _load_more_sessions_data(self):
-        """加载更多会话数据"""
+    def _build_sessions_store(self):
+        """构建会话数据（基于会话索引按时间倒序排列，只为显示的行生成文本）
+
+        Returns:
+            HistoryRowStore: 行数据
+        """
         if not self.current_class_name:
-            return
+            return HistoryRowStore()
         try:
             cleaned_students = get_roll_call_student_list(self.current_class_name)
-            history_data = get_roll_call_history_data(self.current_class_name)
+            session_index = get_session_index(self.current_class_name)
 
-            students_data = get_roll_call_session_data(
-                cleaned_students, history_data, self.current_subject
+            max_id_length = (
+                max(len(str(student[0])) for student in cleaned_students)
+                if cleaned_students
+                else 0
             )
-
+            students = {
+                name: (str(student_id).zfill(max_id_length), gender, group)
+                for student_id, name, gender, group in cleaned_students
+            }
+            # 索引中的学生下标 -> 名单信息（已不在名单中的学生为 None）
+            student_info = [students.get(name) for name in session_index.student_names]
+
+            positions = session_index.page(self.current_subject, descending=True)
+            if any(info is None for info in student_info):
+                # 只显示名单中仍存在的学生的记录
+                positions = [
+                    position
+                    for position in positions
+                    if student_info[session_index.students[position]] is not None
+                ]
+
+            subjects = session_index.subjects
             self.has_class_record = any(
-                student.get("class_name", "") for student in students_data
+                subjects[position] >= 0 for position in positions
             )
 
-            self.update_table_headers()
-
-            format_weight, _, _ = format_weight_for_display(students_data, "weight")
-
-            if self.sort_column >= 0:
-
-                def sort_key(student):
-                    if self.sort_column == 0:
-                        return student.get("draw_time", "")
-                    elif self.sort_column == 1:
-                        return student.get("id", "")
-                    elif self.sort_column == 2:
-                        return student.get("name", "")
-                    elif self.sort_column == 3:
-                        return student.get("gender", "")
-                    elif self.sort_column == 4:
-                        return student.get("group", "")
-                    elif self.sort_column == 5:
-                        return student.get("class_name", "")
-                    elif self.sort_column == 6:
-                        return student.get("weight", "")
-                    return ""
-
-                reverse_order = self.sort_order == Qt.SortOrder.DescendingOrder
-                students_data.sort(key=sort_key, reverse=reverse_order)
-            else:
-                students_data.sort(key=lambda x: x.get("draw_time", ""), reverse=True)
-
-            start_row = self.current_row
-            end_row = min(start_row + self.batch_size, self.total_rows)
+            weights = session_index.weights
+            format_weight, _, _ = format_weight_values_for_display(
+                weights[position]
+                for position in positions
+                if not math.isnan(weights[position])
+            )
 
             has_gender, has_group = check_class_has_gender_or_group(
                 self.current_class_name
             )
-
-            for i in range(start_row, end_row):
-                if i >= len(students_data):
-                    break
-
-                student = students_data[i]
-                row = i
-                col = 0
-
-                draw_time_item = create_table_item(student.get("draw_time", ""))
-                self.table.setItem(row, col, draw_time_item)
-                col += 1
-
-                id_item = create_table_item(student.get("id", str(row + 1)))
-                self.table.setItem(row, col, id_item)
-                col += 1
-
-                name_item = create_table_item(student.get("name", ""))
-                self.table.setItem(row, col, name_item)
-                col += 1
-
+            has_class_record = self.has_class_record
+
+            def build_row(row):
+                position = positions[row]
+                session = session_index.session(position)
+                student_id, gender, group = student_info[
+                    session_index.students[position]
+                ]
+                values = [session["draw_time"], student_id, session["name"]]
                 if has_gender:
-                    gender = student.get("gender", "")
-                    gender_item = create_table_item(str(gender) if gender else "")
-                    self.table.setItem(row, col, gender_item)
-                    col += 1
-
+                    values.append(str(gender) if gender else "")
                 if has_group:
-                    group = student.get("group", "")
-                    group_item = create_table_item(str(group) if group else "")
-                    self.table.setItem(row, col, group_item)
-                    col += 1
-
-                if self.has_class_record:
-                    class_name = student.get("class_name", "")
-                    class_item = create_table_item(
-                        str(class_name) if class_name else ""
-                    )
-                    self.table.setItem(row, col, class_item)
-                    col += 1
-
-                if self.table.columnCount() > col:
-                    weight_item = create_table_item(
-                        str(format_weight(student.get("weight", "")))
-                    )
-                    self.table.setItem(row, col, weight_item)
-
-            self.current_row = end_row
+                    values.append(str(group) if group else "")
+                if has_class_record:
+                    values.append(session["class_name"])
+                values.append(str(format_weight(session["weight"])))
+                return [format_table_item(value) for value in values]
+
+            # 行按抽取时间倒序排列，按时间列排序时无需生成排序键
+            row_count = len(positions)
+            return LazyRowStore(
+                row_count,
+                build_row,
+                presorted={
+                    (0, True): range(row_count),
+                    (0, False): range(row_count - 1, -1, -1),
+                },
+            )
 
         except Exception as e:
             logger.exception(f"加载会话数据失败: {e}")
+            return HistoryRowStore()
 
-    def _load_more_stats_data(self, student_name):
-        """加载更多统计数据"""
+    def _build_stats_rows(self, student_name):
+        """构建个人统计数据行
+
+        Args:
+            student_name: 学生姓名
+
+        Returns:
+            list: 表格行，每行为各列的显示文本
+        """
         if not self.current_class_name:
-            return
+            return []
         try:
             cleaned_students = get_roll_call_student_list(self.current_class_name)
             history_data = get_roll_call_history_data(self.current_class_name)
@@ -605,104 +377,53 @@ class roll_call_history_table(GroupHeaderCardWidget):
                 student.get("class_name", "") for student in students_data
             )
 
-            self.update_table_headers()
-
             format_weight, _, _ = format_weight_for_display(students_data, "weight")
 
-            if self.sort_column >= 0:
-
-                def sort_key(student):
-                    if self.sort_column == 0:
-                        return student.get("draw_time", "")
-                    elif self.sort_column == 1:
-                        return str(student.get("draw_method", ""))
-                    elif self.sort_column == 2:
-                        return int(student.get("draw_people_numbers", 0))
-                    elif self.sort_column == 3:
-                        return str(student.get("draw_gender", ""))
-                    elif self.sort_column == 4:
-                        return str(student.get("draw_group", ""))
-                    elif self.sort_column == 5:
-                        return str(student.get("class_name", ""))
-                    elif self.sort_column == 6:
-                        return float(student.get("weight", ""))
-                    return ""
-
-                reverse_order = self.sort_order == Qt.SortOrder.DescendingOrder
-                students_data.sort(key=sort_key, reverse=reverse_order)
-            else:
-                students_data.sort(key=lambda x: x.get("draw_time", ""), reverse=True)
-
-            start_row = self.current_row
-            end_row = min(start_row + self.batch_size, self.total_rows)
+            # 默认按抽取时间倒序显示
+            students_data.sort(key=lambda x: x.get("draw_time", ""), reverse=True)
 
             has_gender, has_group = check_class_has_gender_or_group(
                 self.current_class_name
             )
 
-            for i in range(start_row, end_row):
-                if i >= len(students_data):
-                    break
-
-                student = students_data[i]
-                row = i
-                col = 0
-
-                time_item = create_table_item(student.get("draw_time", ""))
-                self.table.setItem(row, col, time_item)
-                col += 1
+            draw_method_random = get_content_name_async(
+                "roll_call_history_table", "draw_method_random"
+            )
+            draw_method_weight = get_content_name_async(
+                "roll_call_history_table", "draw_method_weight"
+            )
 
+            rows = []
+            for student in students_data:
                 draw_method = student.get("draw_method", "")
                 if draw_method == "0":
-                    mode_text = get_content_name_async(
-                        "roll_call_history_table", "draw_method_random"
-                    )
+                    mode_text = draw_method_random
                 elif draw_method == "1":
-                    mode_text = get_content_name_async(
-                        "roll_call_history_table", "draw_method_weight"
-                    )
+                    mode_text = draw_method_weight
                 else:
                     mode_text = str(draw_method)
-                mode_item = create_table_item(mode_text)
-                self.table.setItem(row, col, mode_item)
-                col += 1
-
-                draw_people_numbers_item = create_table_item(
-                    str(student.get("draw_people_numbers", 0))
-                )
-                self.table.setItem(row, col, draw_people_numbers_item)
-                col += 1
 
+                values = [
+                    student.get("draw_time", ""),
+                    mode_text,
+                    str(student.get("draw_people_numbers", 0)),
+                ]
                 if has_gender:
                     draw_gender = student.get("draw_gender", "")
-                    gender_item = create_table_item(draw_gender if draw_gender else "")
-                    self.table.setItem(row, col, gender_item)
-                    col += 1
-
+                    values.append(draw_gender if draw_gender else "")
                 if has_group:
                     draw_group = student.get("draw_group", "")
-                    group_item = create_table_item(draw_group if draw_group else "")
-                    self.table.setItem(row, col, group_item)
-                    col += 1
-
+                    values.append(draw_group if draw_group else "")
                 if self.has_class_record:
                     class_name = student.get("class_name", "")
-                    class_item = create_table_item(
-                        str(class_name) if class_name else ""
-                    )
-                    self.table.setItem(row, col, class_item)
-                    col += 1
-
-                if self.table.columnCount() > col:
-                    weight_item = create_table_item(
-                        str(format_weight(student.get("weight", 0)))
-                    )
-                    self.table.setItem(row, col, weight_item)
-
-            self.current_row = end_row
+                    values.append(str(class_name) if class_name else "")
+                values.append(str(format_weight(student.get("weight", 0))))
+                rows.append([format_table_item(value) for value in values])
+            return rows
 
         except Exception as e:
             logger.exception(f"加载统计数据失败: {e}")
+            return []
 
     def setup_file_watcher(self):
         """设置文件系统监视器，监控班级历史记录文件夹的变化"""
@@ -808,16 +529,16 @@ class roll_call_history_table(GroupHeaderCardWidget):
             return
 
         try:
-            history_file = get_data_path(
-                "history/roll_call_history", f"{self.current_class_name}.json"
-            )
+            history_file = get_history_file_path("roll_call", self.current_class_name)
 
             if not file_exists(history_file):
                 self.available_subjects = []
                 return
 
-            with open_file(history_file, "r", encoding="utf-8") as f:
-                history_data = json.load(f)
+            # 只读取课程名称，使用共享的缓存文档（不得修改）
+            history_data = load_history_data(
+                "roll_call", self.current_class_name, readonly=True
+            )
 
             # 收集所有课程名称
             subjects = set()
@@ -870,14 +591,18 @@ class roll_call_history_table(GroupHeaderCardWidget):
             self.available_subjects = []
 
     def refresh_data(self):
-        """刷新表格数据"""
+        """刷新表格数据
+
+        每次切换班级、课程或查看模式时读取一次历史记录并构建全部行数据，
+        之后的滚动和排序只访问内存中的行数据。
+        """
         if not hasattr(self, "table"):
             return
         if not hasattr(self, "class_comboBox"):
             return
         class_name = self.class_comboBox.currentText()
         if not class_name:
-            self.table.setRowCount(0)
+            self.table_model.clear()
             return
         self.current_class_name = class_name
 
@@ -887,98 +612,31 @@ class roll_call_history_table(GroupHeaderCardWidget):
         # 重置课程记录标志
         self.has_class_record = False
 
-        self.update_table_headers()
-
-        # 重置数据加载状态
-        self.current_row = 0
-        self.is_loading = False
-        self.table.setRowCount(0)
-        self.table.blockSignals(True)
-
         try:
-            if not hasattr(self, "mode_comboBox"):
+            if hasattr(self, "mode_comboBox"):
+                self.current_mode = self.mode_comboBox.currentIndex()
+            else:
                 self.current_mode = 0
-                if self.current_mode == 0:
-                    # 获取学生记录数量
-                    students_count = get_name_history("roll_call", class_name)
-                    if students_count:
-                        self.total_rows = students_count
-                        # 设置初始行数为批次大小或总行数，取较小值
-                        initial_rows = min(self.batch_size, self.total_rows)
-                        self.table.setRowCount(initial_rows)
-                        # 加载第一批数据
-                        self._load_more_students_data()
-                elif self.current_mode == 1:
-                    # 获取会话记录数量
-                    sessions_count = get_draw_sessions_history("roll_call", class_name)
-                    if sessions_count:
-                        self.total_rows = sessions_count
-                        # 设置初始行数为批次大小或总行数，取较小值
-                        initial_rows = min(self.batch_size, self.total_rows)
-                        self.table.setRowCount(initial_rows)
-                        # 加载第一批数据
-                        self._load_more_sessions_data()
-                else:
-                    # 当模式值大于等于2时，从设置中获取学生姓名
-                    self.current_student_name = readme_settings_async(
-                        "roll_call_history_table", "select_student_name"
-                    )
-                    # 获取个人统计记录数量
-                    stats_count = get_individual_statistics(
-                        "roll_call", class_name, self.current_student_name
-                    )
-                    if stats_count:
-                        self.total_rows = stats_count
-                        # 设置初始行数为批次大小或总行数，取较小值
-                        initial_rows = min(self.batch_size, self.total_rows)
-                        self.table.setRowCount(initial_rows)
-                        # 加载第一批数据
-                        self._load_more_stats_data(self.current_student_name)
-                return
 
-            self.current_mode = self.mode_comboBox.currentIndex()
             if self.current_mode == 0:
-                # 获取学生记录数量
-                students_count = get_name_history("roll_call", class_name)
-                if students_count:
-                    self.total_rows = students_count
-                    # 设置初始行数为批次大小或总行数，取较小值
-                    initial_rows = min(self.batch_size, self.total_rows)
-                    self.table.setRowCount(initial_rows)
-                    # 加载第一批数据
-                    self._load_more_students_data()
+                store = HistoryRowStore(self._build_students_rows())
             elif self.current_mode == 1:
-                # 获取会话记录数量
-                sessions_count = get_draw_sessions_history("roll_call", class_name)
-                if sessions_count:
-                    self.total_rows = sessions_count
-                    # 设置初始行数为批次大小或总行数，取较小值
-                    initial_rows = min(self.batch_size, self.total_rows)
-                    self.table.setRowCount(initial_rows)
-                    # 加载第一批数据
-                    self._load_more_sessions_data()
+                store = self._build_sessions_store()
             else:
-                stats = get_individual_statistics(
-                    "roll_call", class_name, self.mode_comboBox.currentText()
-                )
-                if stats:
-                    self.total_rows = stats
-                    # 设置初始行数为批次大小或总行数，取较小值
-                    initial_rows = min(self.batch_size, self.total_rows)
-                    self.table.setRowCount(initial_rows)
-                    self.current_student_name = self.mode_comboBox.currentText()
-                    # 加载第一批数据
-                    self._load_more_stats_data(self.current_student_name)
-
-            # 设置表格列属性
-            for i in range(self.table.columnCount()):
-                self.table.horizontalHeader().setSectionResizeMode(
-                    i, QHeaderView.ResizeMode.Stretch
-                )
-                self.table.horizontalHeader().setDefaultAlignment(
-                    Qt.AlignmentFlag.AlignCenter
+                # 当模式值大于等于2时，表示选择了特定的学生姓名
+                self.current_student_name = self.mode_comboBox.currentText()
+                store = HistoryRowStore(
+                    self._build_stats_rows(self.current_student_name)
                 )
 
+            # 课程列是否显示取决于构建行数据时统计的课程记录
+            self.table_model.set_store(
+                self.update_table_headers(),
+                store,
+                self.sort_column,
+                self.sort_order,
+            )
+
             # 如果有排序设置，应用排序
             if self.sort_column >= 0:
                 self.table.horizontalHeader().setSortIndicator(
@@ -988,14 +646,13 @@ class roll_call_history_table(GroupHeaderCardWidget):
 
         except Exception as e:
             logger.exception(f"刷新表格数据失败: {str(e)}")
-        finally:
-            self.table.blockSignals(False)
 
     def update_table_headers(self):
-        """更新表格标题"""
-        if not hasattr(self, "table"):
-            return
+        """获取当前模式的表格标题
 
+        Returns:
+            list: 表格标题列表
+        """
         if hasattr(self, "mode_comboBox"):
             self.current_mode = self.mode_comboBox.currentIndex()
         else:
@@ -1046,5 +703,4 @@ class roll_call_history_table(GroupHeaderCardWidget):
             if not self.has_class_record:
                 headers = headers[:-2] + headers[-1:]
 
-        self.table.setColumnCount(len(headers))
-        self.table.setHorizontalHeaderLabels(headers)
+        return list(headers)
@@ -18,6 +18,7 @@ from app.tools.settings_default import *
 from app.tools.settings_access import *
 from app.Language.obtain_language import *
 from app.common.data.list import *
+from app.common.data.prize_pool import invalidate_prize_pool
 from .shared_file_watcher import get_shared_file_watcher
 
 
@@ -331,6 +332,7 @@ class lottery_table(GroupHeaderCardWidget):
             # 共享监视器会自动处理多个回调，避免循环触发
             with open_file(pool_file, "w", encoding="utf-8") as f:
                 json.dump(pool_data, f, ensure_ascii=False, indent=4)
+            invalidate_prize_pool(pool_name)
             # logger.debug(f"抽奖池数据更新成功: {pool_name}")
 
             # 保存成功后设置列宽
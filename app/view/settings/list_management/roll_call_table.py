@@ -18,6 +18,7 @@ from app.tools.settings_default import *
 from app.tools.settings_access import *
 from app.Language.obtain_language import *
 from app.common.data.list import *
+from app.common.data.roster import invalidate_roster
 from .shared_file_watcher import get_shared_file_watcher
 
 # ==================================================
@@ -336,6 +337,7 @@ class roll_call_table(GroupHeaderCardWidget):
             # 共享监视器会自动处理多个回调，避免循环触发
             with open_file(student_file, "w", encoding="utf-8") as f:
                 json.dump(student_data, f, ensure_ascii=False, indent=4)
+            invalidate_roster(class_name)
             # logger.debug(f"学生数据更新成功: {student_name}")
 
             # 保存成功后设置列宽
@@ -183,6 +183,12 @@ def main():
         exit_code = app.exec()
         logger.debug("Qt 事件循环已结束")
 
+        # 写入尚未保存的历史记录
+        from app.common.history.history_writer import shutdown_history_writer
+
+        if shutdown_history_writer(timeout=5.0):
+            logger.debug("历史记录已全部写入")
+
         # 尝试停止所有后台服务
         if "cs_ipc_handler" in locals() and cs_ipc_handler:
             cs_ipc_handler.stop_ipc_client()
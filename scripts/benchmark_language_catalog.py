@@ -0,0 +1,123 @@
+"""测量语言目录冷启动（合并语言模块）与命中缓存时的耗时。
+
+分别测量两项：
+- 加载语言信息及指定语言的耗时
+- 从进程启动到导入 app.Language.obtain_language 完成的耗时（该模块导入时
+  按设置加载当前语言，是显示主窗口前的必经步骤）
+
+每次测量在独立的子进程中进行，避免已导入的语言模块影响结果。
+冷启动测量前会删除 data/cache 下的语言目录缓存，测量结束后缓存会重新生成。
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT_DIR))
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="测量语言目录冷启动与命中缓存的加载耗时。"
+    )
+    parser.add_argument(
+        "-l", "--language", default="ZH_CN", help="要加载的语言代码，默认为ZH_CN"
+    )
+    parser.add_argument(
+        "-n", "--repeat", type=int, default=5, help="每种方式的测量次数，默认为5"
+    )
+    parser.add_argument("--measure", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--startup", action="store_true", help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def measure(language_code: str) -> float:
+    """加载语言信息及指定语言，返回耗时（毫秒，子进程中调用）"""
+    from app.tools.language_manager import SimpleLanguageManager
+
+    manager = SimpleLanguageManager()
+    start = time.perf_counter()
+    if language_code not in manager._get_language_infos():
+        raise RuntimeError(f"未找到语言 {language_code}")
+    manager._load_language(language_code)
+    return (time.perf_counter() - start) * 1000
+
+
+def startup() -> float:
+    """导入 obtain_language，返回导入完成时的时间戳（秒，子进程中调用）"""
+    import app.Language.obtain_language  # noqa: F401
+
+    return time.time()
+
+
+def remove_catalogs() -> None:
+    from app.tools.path_utils import get_data_path
+
+    for catalog_path in Path(get_data_path("cache")).glob("language_*.marshal"):
+        catalog_path.unlink()
+
+
+def run_child(*args: str) -> float:
+    output = subprocess.run(
+        [sys.executable, __file__, *args],
+        check=True,
+        capture_output=True,
+        text=True,
+        cwd=ROOT_DIR,
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def run_measure(language_code: str) -> float:
+    return run_child("--measure", "--language", language_code)
+
+
+def run_startup() -> float:
+    """返回从启动子进程到导入 obtain_language 完成的耗时（毫秒）"""
+    start = time.time()
+    return (run_child("--startup") - start) * 1000
+
+
+def compare(label: str, run, repeat: int) -> None:
+    cold = []
+    for _ in range(repeat):
+        remove_catalogs()
+        cold.append(run())
+    # 最后一次冷启动已重新生成缓存
+    cached = [run() for _ in range(repeat)]
+
+    cold_ms = statistics.median(cold)
+    cached_ms = statistics.median(cached)
+    print(f"{label}:")
+    print(f"  冷启动（合并语言模块）: {cold_ms:.2f} ms")
+    print(f"  命中缓存: {cached_ms:.2f} ms")
+    if cached_ms > 0:
+        print(f"  加速比: {cold_ms / cached_ms:.2f}x")
+
+
+def main() -> None:
+    args = parse_args()
+    if args.measure:
+        print(f"{measure(args.language):.3f}")
+        return
+    if args.startup:
+        print(f"{startup():.6f}")
+        return
+
+    print(f"每种方式测量 {args.repeat} 次（取中位数）")
+    compare(
+        f"加载语言 {args.language}", lambda: run_measure(args.language), args.repeat
+    )
+    compare(
+        "进程启动到导入 obtain_language（当前设置的语言）", run_startup, args.repeat
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""测量抽奖"跟随学生"模式下每个动画帧抽取学生的耗时。
+
+对比三种方式，需在已配置名单的环境中运行：
+- 旧实现：每帧用 json.load 读取名单文件、filter_students_data 过滤，
+  读取设置并在计算权重时重新加载历史记录
+- 每帧构建快照：名单和聚合索引走缓存，但每帧重新构建设置快照
+- 复用会话快照：当前实现，整个动画会话复用同一份设置快照
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT_DIR))
+
+from PySide6.QtWidgets import QApplication
+
+from app.common.behind_scenes.behind_scenes_utils import BehindScenesUtils
+from app.common.data.list import filter_students_data
+from app.common.fair_draw.draw_config import DrawConfig
+from app.common.fair_draw.weighted_sampler import weighted_sample_indices
+from app.common.history import calculate_weight
+from app.common.history.file_utils import invalidate_history_cache, load_history_data
+from app.common.lottery.lottery_utils import LotteryUtils
+from app.tools.path_utils import get_data_path, open_file
+
+STUDENT_KEYS = ("id", "name", "gender", "group", "exist")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="测量抽奖动画每帧抽取学生的耗时。")
+    parser.add_argument("class_name", help="抽奖跟随的班级名称")
+    parser.add_argument("--pool", default=None, help="奖池名称（用于内幕设置）")
+    parser.add_argument("--count", type=int, default=1, help="每帧抽取的人数，默认为1")
+    parser.add_argument(
+        "--ticks", type=int, default=500, help="每种方式模拟的动画帧数，默认为500"
+    )
+    return parser.parse_args()
+
+
+def draw_baseline_tick(args: argparse.Namespace) -> None:
+    """按旧实现的流程完成一帧抽取（不走名单、历史记录缓存）"""
+    student_file = get_data_path("list/roll_call_list", f"{args.class_name}.json")
+    with open_file(student_file, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    students = [
+        dict(zip(STUDENT_KEYS, student, strict=True))
+        for student in filter_students_data(data, 0, "", 0, "")
+    ]
+    if not students:
+        return
+
+    # 旧实现每帧读取设置，并在计算权重时重新读取、解析历史记录
+    draw_config = DrawConfig.from_settings()
+    if draw_config.draw_type == 1:
+        invalidate_history_cache("roll_call", args.class_name)
+        load_history_data("roll_call", args.class_name)
+        students = calculate_weight(
+            students, args.class_name, draw_config.subject_filter, draw_config
+        )
+        weights = [student.get("weight", 1.0) for student in students]
+    else:
+        weights = [1.0] * len(students)
+
+    if args.pool:
+        students, weights = BehindScenesUtils.apply_probability_weights(
+            students, 1, args.class_name, args.pool, None
+        )
+        guaranteed = BehindScenesUtils.ensure_guaranteed_selection(
+            students, weights, args.class_name, args.pool
+        )
+        if guaranteed is not None:
+            return
+    weighted_sample_indices(weights, args.count)
+
+
+def run_baseline_ticks(args: argparse.Namespace) -> list[float]:
+    """模拟旧实现的动画帧，返回每帧耗时（毫秒）"""
+    durations = []
+    for _ in range(args.ticks):
+        start = time.perf_counter()
+        draw_baseline_tick(args)
+        durations.append((time.perf_counter() - start) * 1000)
+    return durations
+
+
+def run_ticks(args: argparse.Namespace, reuse_snapshot: bool) -> list[float]:
+    """模拟动画帧，返回每帧耗时（毫秒）"""
+    draw_config = DrawConfig.from_settings() if reuse_snapshot else None
+    durations = []
+    for _ in range(args.ticks):
+        start = time.perf_counter()
+        LotteryUtils.draw_random_students(
+            args.class_name,
+            0,
+            "",
+            0,
+            "",
+            args.count,
+            0,
+            args.pool,
+            None,
+            draw_config=draw_config,
+        )
+        durations.append((time.perf_counter() - start) * 1000)
+    return durations
+
+
+def report(label: str, durations: list[float]) -> float:
+    mean = statistics.fmean(durations)
+    p95 = statistics.quantiles(durations, n=20)[-1]
+    print(f"{label}: 平均 {mean:.3f} ms/帧，p95 {p95:.3f} ms/帧")
+    return mean
+
+
+def main() -> None:
+    args = parse_args()
+    _app = QApplication.instance() or QApplication(sys.argv)
+
+    # 预热名单、聚合索引等缓存，当前实现的每帧耗时不包含首次加载
+    run_ticks(args, reuse_snapshot=True)
+
+    baseline = report("旧实现（每帧读取名单和历史记录）", run_baseline_ticks(args))
+    report("每帧构建快照", run_ticks(args, reuse_snapshot=False))
+    current = report("复用会话快照（当前实现）", run_ticks(args, reuse_snapshot=True))
+    if current > 0:
+        print(f"当前实现相对旧实现: {baseline / current:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
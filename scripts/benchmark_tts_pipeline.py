@@ -0,0 +1,106 @@
+"""离线测量语音播报的串行合成与流水线合成耗时。
+
+使用 LocalTTSBackend 模拟在线合成延迟，每种方式使用独立的临时缓存目录，
+不会读写正式的语音缓存。
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT_DIR))
+
+from app.common.voice.voice import (
+    LocalTTSBackend,
+    VoiceCacheManager,
+    VoiceSynthesisPipeline,
+)
+
+VOICE_NAME = "zh-CN-XiaoxiaoNeural"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="离线测量串行与流水线语音合成的耗时。")
+    parser.add_argument("--names", type=int, default=10, help="播报的人数，默认为10")
+    parser.add_argument(
+        "--latency", type=float, default=0.3, help="模拟的单次合成耗时（秒），默认为0.3"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=VoiceSynthesisPipeline.MAX_CONCURRENCY,
+        help="流水线的并发合成数量",
+    )
+    return parser.parse_args()
+
+
+def make_cache_manager(audio_dir: str, latency: float) -> VoiceCacheManager:
+    return VoiceCacheManager(audio_dir=audio_dir, backend=LocalTTSBackend(latency))
+
+
+def wait_for_disk_writes(audio_dir: str, count: int, timeout: float = 10.0) -> None:
+    """等待后台线程写完磁盘缓存，再删除临时目录"""
+    extension = VoiceCacheManager.CACHE_FILE_EXTENSION
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if len(list(Path(audio_dir).glob(f"*{extension}"))) >= count:
+            return
+        time.sleep(0.05)
+
+
+def run_serial(texts: list[str], latency: float) -> tuple[float, float]:
+    """旧方式：逐条合成，每条合成完成后才开始下一条，返回（首条就绪耗时，总耗时）"""
+    with tempfile.TemporaryDirectory() as audio_dir:
+        cache_manager = make_cache_manager(audio_dir, latency)
+        start = time.perf_counter()
+        first_ready = None
+        for text in texts:
+            cache_manager.get_voice(text, VOICE_NAME)
+            if first_ready is None:
+                first_ready = time.perf_counter() - start
+        total = time.perf_counter() - start
+        wait_for_disk_writes(audio_dir, len(set(texts)))
+        return first_ready or 0.0, total
+
+
+def run_pipelined(
+    texts: list[str], latency: float, concurrency: int
+) -> tuple[float, float]:
+    """流水线：并发合成并按顺序交付，返回（首条就绪耗时，总耗时）"""
+    with tempfile.TemporaryDirectory() as audio_dir:
+        cache_manager = make_cache_manager(audio_dir, latency)
+        pipeline = VoiceSynthesisPipeline(cache_manager, concurrency)
+        ready_times: list[float] = []
+        start = time.perf_counter()
+
+        def on_ready(_audio) -> bool:
+            ready_times.append(time.perf_counter() - start)
+            return True
+
+        pipeline.submit(texts, VOICE_NAME, on_ready).result()
+        total = time.perf_counter() - start
+        wait_for_disk_writes(audio_dir, len(set(texts)))
+        return (ready_times[0] if ready_times else 0.0), total
+
+
+def main() -> None:
+    args = parse_args()
+    texts = [f"学生{i + 1}" for i in range(args.names)]
+
+    serial_first, serial_total = run_serial(texts, args.latency)
+    pipe_first, pipe_total = run_pipelined(texts, args.latency, args.concurrency)
+
+    print(f"播报人数: {len(texts)}，模拟合成耗时: {args.latency:.2f} s/条")
+    print(f"串行合成: 首条就绪 {serial_first:.3f} s，全部就绪 {serial_total:.3f} s")
+    print(f"流水线合成: 首条就绪 {pipe_first:.3f} s，全部就绪 {pipe_total:.3f} s")
+    if pipe_total > 0:
+        print(f"加速比: {serial_total / pipe_total:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
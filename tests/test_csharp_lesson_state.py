@@ -0,0 +1,340 @@
+"""CSharpIPCHandler 课程状态快照测试
+
+用假的 .NET 模块加载 Python.NET 分支，并用鸭子类型的假 IPublicLessonsService
+驱动 _read_lesson_state / _refresh_lesson_state；客户端循环用假的 IpcClient 驱动。
+"""
+
+import importlib.util
+import sys
+import time
+import types
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+MODULE_NAME = "app.common.IPC_URL.csharp_ipc_handler"
+MODULE_PATH = (
+    Path(__file__).resolve().parent.parent
+    / "app"
+    / "common"
+    / "IPC_URL"
+    / "csharp_ipc_handler.py"
+)
+
+# ClassIsland.Shared.Enums.TimeState 的替身（"None" 是 Python 关键字，只能用 getattr 访问）
+TimeState = SimpleNamespace(
+    **{"None": 0, "OnClass": 1, "PrepareOnClass": 2, "Breaking": 3, "AfterSchool": 4}
+)
+BREAKING_STATES = ["None", "PrepareOnClass", "Breaking", "AfterSchool"]
+
+
+def _fake_dotnet_modules():
+    """构造 csharp_ipc_handler 导入所需的 .NET 程序集模块"""
+    names = {
+        "pythonnet": {"load": lambda *args, **kwargs: None},
+        "clr": {"AddReference": lambda name: None},
+        "System": {"Action": lambda func: func},
+        "ClassIsland": {},
+        "ClassIsland.Shared": {},
+        "ClassIsland.Shared.Enums": {"TimeState": TimeState},
+        "ClassIsland.Shared.IPC": {
+            "IpcClient": object,
+            "IpcRoutedNotifyIds": SimpleNamespace(),
+        },
+        "ClassIsland.Shared.IPC.Abstractions": {},
+        "ClassIsland.Shared.IPC.Abstractions.Services": {
+            "IPublicLessonsService": object
+        },
+        "dotnetCampus": {},
+        "dotnetCampus.Ipc": {},
+        "dotnetCampus.Ipc.CompilerServices": {},
+        "dotnetCampus.Ipc.CompilerServices.GeneratedProxies": {
+            "GeneratedIpcFactory": object
+        },
+        "SecRandom4Ci": {},
+        "SecRandom4Ci.Interface": {},
+        "SecRandom4Ci.Interface.Services": {"ISecRandomService": object},
+        "SecRandom4Ci.Interface.Models": {"CallResult": object, "Student": object},
+    }
+    modules = {}
+    for name, attrs in names.items():
+        module = types.ModuleType(name)
+        module.__dict__.update(attrs)
+        modules[name] = module
+    return modules
+
+
+class FakeLessonsService:
+    """鸭子类型的 IPublicLessonsService，只提供读取课程状态用到的属性"""
+
+    def __init__(self, current="语文", next_subject="数学", state=1, left=0):
+        self.set(current, next_subject, state, left)
+        self.fail = False
+
+    def set(self, current, next_subject, state, left):
+        self._current = current
+        self._next = next_subject
+        self._state = state
+        self._left = left
+
+    @staticmethod
+    def _subject(name):
+        return None if name is None else SimpleNamespace(Name=name)
+
+    def _check(self):
+        if self.fail:
+            raise RuntimeError("IPC 连接已断开")
+
+    @property
+    def CurrentSubject(self):
+        self._check()
+        return self._subject(self._current)
+
+    @property
+    def NextClassSubject(self):
+        self._check()
+        return self._subject(self._next)
+
+    @property
+    def CurrentState(self):
+        self._check()
+        return self._state
+
+    @property
+    def OnClassLeftTime(self):
+        self._check()
+        return SimpleNamespace(TotalSeconds=float(self._left))
+
+
+class FakeIpcClient:
+    """IpcClient 的替身，保存注册的推送处理函数"""
+
+    def __init__(self):
+        self.handlers = {}
+        self.JsonIpcProvider = SimpleNamespace(
+            AddNotifyHandler=self.handlers.__setitem__
+        )
+        self.Provider = None
+        self.PeerProxy = None
+
+    def Connect(self):
+        return SimpleNamespace(Wait=lambda: True)
+
+    def notify(self, notify_id):
+        self.handlers[notify_id]()
+
+
+def wait_until(predicate, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "等待超时"
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def ipc(monkeypatch):
+    for name, module in _fake_dotnet_modules().items():
+        monkeypatch.setitem(sys.modules, name, module)
+    # 直接按文件加载，不执行 IPC_URL 包的 __init__（其中导入了仅 Windows 可用的 winreg）
+    spec = importlib.util.spec_from_file_location(MODULE_NAME, MODULE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    assert module.CSHARP_AVAILABLE
+    return module
+
+
+@pytest.fixture
+def handler(ipc, monkeypatch):
+    notifications = []
+    monkeypatch.setattr(
+        ipc, "_notify_class_state_changed", lambda: notifications.append(1)
+    )
+    handler = ipc.CSharpIPCHandler()
+    handler.is_running = True
+    handler.is_connected = True
+    handler._lessons_service = FakeLessonsService()
+    handler.notifications = notifications
+    return handler
+
+
+@pytest.fixture
+def client_loop(ipc, monkeypatch):
+    """在后台线程运行 _run_client，记录每次刷新课程状态的时刻"""
+    monkeypatch.setattr(ipc, "IpcClient", FakeIpcClient)
+    monkeypatch.setattr(
+        ipc,
+        "IpcRoutedNotifyIds",
+        SimpleNamespace(**{name: name for name in ipc.LESSON_STATE_NOTIFY_IDS}),
+    )
+    # 缩短等待推送事件的超时，让循环及时检查兜底轮询
+    monkeypatch.setattr(ipc, "IPC_ALIVE_CHECK_INTERVAL", 0.05)
+
+    handler = ipc.CSharpIPCHandler()
+    refreshes = []
+    monkeypatch.setattr(handler, "_check_alive", lambda: True)
+    monkeypatch.setattr(
+        handler, "_refresh_lesson_state", lambda: refreshes.append(time.monotonic())
+    )
+    handler.refreshes = refreshes
+    yield handler
+
+    handler.stop_ipc_client()
+    handler.client_thread.join(timeout=3)
+    assert not handler.client_thread.is_alive()
+
+
+# ==================================================
+# 刷新时机
+# ==================================================
+@pytest.mark.parametrize(
+    ("requested", "since_refresh", "delay"),
+    [
+        (False, 0.0, None),
+        (False, 4.9, None),
+        (False, 5.0, 0.0),
+        (True, 0.1, 0.4),
+        (True, 0.5, 0.0),
+        (True, 6.0, 0.0),
+    ],
+)
+def test_refresh_delay(ipc, requested, since_refresh, delay):
+    result = ipc._lesson_state_refresh_delay(requested, since_refresh)
+    if delay is None:
+        assert result is None
+    else:
+        assert result == pytest.approx(delay)
+
+
+def test_notification_burst_refreshes_once(client_loop, ipc, monkeypatch):
+    monkeypatch.setattr(ipc, "LESSON_STATE_POLL_INTERVAL", 60.0)
+    handler = client_loop
+    assert handler.start_ipc_client()
+    # 连接后立即刷新一次
+    wait_until(lambda: handler.refreshes)
+    assert set(handler.ipc_client.handlers) == set(ipc.LESSON_STATE_NOTIFY_IDS)
+
+    for _ in range(5):
+        for notify_id in ipc.LESSON_STATE_NOTIFY_IDS:
+            handler.ipc_client.notify(notify_id)
+
+    wait_until(lambda: len(handler.refreshes) >= 2)
+    time.sleep(ipc.LESSON_STATE_MIN_REFRESH_INTERVAL * 2)
+    assert len(handler.refreshes) == 2
+    gap = handler.refreshes[1] - handler.refreshes[0]
+    assert gap >= ipc.LESSON_STATE_MIN_REFRESH_INTERVAL
+
+
+def test_quiet_period_polls_after_fallback_interval(client_loop, ipc, monkeypatch):
+    poll_interval = 0.3
+    monkeypatch.setattr(ipc, "LESSON_STATE_POLL_INTERVAL", poll_interval)
+    handler = client_loop
+    assert handler.start_ipc_client()
+    wait_until(lambda: handler.refreshes)
+
+    time.sleep(poll_interval / 2)
+    assert len(handler.refreshes) == 1
+    wait_until(lambda: len(handler.refreshes) >= 2)
+    assert handler.refreshes[1] - handler.refreshes[0] >= poll_interval
+
+
+# ==================================================
+# 读取课程状态
+# ==================================================
+@pytest.mark.parametrize("name", ["???", " ??? ", "", None])
+def test_missing_subject_reads_as_empty(ipc, name):
+    service = FakeLessonsService(current=name, next_subject=name)
+    state = ipc.CSharpIPCHandler._read_lesson_state(service)
+    assert state.current_subject == ""
+    assert state.next_subject == ""
+
+
+def test_subject_names_are_kept(ipc):
+    state = ipc.CSharpIPCHandler._read_lesson_state(FakeLessonsService())
+    assert (state.current_subject, state.next_subject) == ("语文", "数学")
+
+
+@pytest.mark.parametrize(
+    ("state_name", "is_breaking"),
+    [(name, True) for name in BREAKING_STATES] + [("OnClass", False)],
+)
+def test_time_state_maps_to_is_breaking(ipc, state_name, is_breaking):
+    service = FakeLessonsService(state=getattr(TimeState, state_name))
+    assert ipc.CSharpIPCHandler._read_lesson_state(service).is_breaking is is_breaking
+
+
+def test_read_lesson_state_records_left_time(ipc, monkeypatch):
+    monkeypatch.setattr(ipc.time, "monotonic", lambda: 1000.0)
+    service = FakeLessonsService(state=TimeState.Breaking, left=299.7)
+    state = ipc.CSharpIPCHandler._read_lesson_state(service)
+    assert state.on_class_left_time == 299
+    assert state.updated_at == 1000.0
+
+
+# ==================================================
+# 距离上课时间推算
+# ==================================================
+def test_seconds_to_class_extrapolates_from_snapshot(ipc):
+    state = ipc.LessonStateSnapshot("", "数学", True, 120, 100.0)
+    assert state.seconds_to_class(100.0) == 120
+    assert state.seconds_to_class(130.9) == 90
+    assert state.seconds_to_class(219.0) == 1
+    assert state.seconds_to_class(500.0) == 0
+
+
+def test_seconds_to_class_is_zero_without_next_class(ipc):
+    state = ipc.LessonStateSnapshot("语文", "", False, 0, 100.0)
+    assert state.seconds_to_class(100.0) == 0
+
+
+def test_handler_left_time_counts_down_between_refreshes(handler, ipc, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(ipc.time, "monotonic", lambda: clock[0])
+    handler._lessons_service.set("", "数学", TimeState.Breaking, 60)
+    handler._refresh_lesson_state()
+
+    clock[0] += 25
+    assert handler.get_on_class_left_time() == 35
+    clock[0] += 60
+    assert handler.get_on_class_left_time() == 0
+
+
+# ==================================================
+# 刷新课程状态快照
+# ==================================================
+def test_refresh_notifies_only_when_state_changes(handler):
+    service = handler._lessons_service
+    handler._refresh_lesson_state()
+    assert handler.get_current_class_info() == {"name": "语文"}
+    assert handler.get_next_class_info() == {"name": "数学"}
+    assert not handler.is_breaking()
+    assert len(handler.notifications) == 1
+
+    # 只有剩余时间变化时不通知
+    service.set("语文", "数学", TimeState.OnClass, 5)
+    handler._refresh_lesson_state()
+    assert len(handler.notifications) == 1
+
+    service.set("???", "数学", TimeState.Breaking, 300)
+    handler._refresh_lesson_state()
+    assert handler.get_current_class_info() == {}
+    assert handler.is_breaking()
+    assert len(handler.notifications) == 2
+
+
+def test_refresh_failure_keeps_snapshot_and_drops_proxy(handler):
+    handler._refresh_lesson_state()
+    previous = handler.get_lesson_state()
+
+    handler._lessons_service.fail = True
+    handler._refresh_lesson_state()
+    assert handler._lessons_service is None
+    assert handler.get_lesson_state() is previous
+    assert len(handler.notifications) == 1
+
+
+def test_disconnected_handler_reports_empty_state(handler, ipc):
+    handler._refresh_lesson_state()
+    handler.is_connected = False
+    assert handler.get_lesson_state() is ipc.EMPTY_LESSON_STATE
+    assert handler.get_on_class_left_time() == 0
@@ -0,0 +1,200 @@
+"""weighted_sampler 与原有"累加权重线性扫描 + pop"抽取方式的分布一致性测试
+
+每个测试用固定种子分别运行旧抽取方式与新实现，对两组结果做卡方齐性检验
+（显著性水平 0.001）。
+"""
+
+import math
+import random
+from collections import Counter
+
+import pytest
+
+from app.common.fair_draw import weighted_sampler
+from app.common.fair_draw.weighted_sampler import (
+    NUMPY_MIN_POOL_SIZE,
+    uniform_sample_indices,
+    weighted_sample_indices,
+)
+
+TRIALS = 20000
+
+
+# ==================================================
+# 旧的抽取方式
+# ==================================================
+def linear_scan_weighted_sample(weights, count, rng):
+    """原有实现：每次累加权重线性扫描，抽中后从列表中 pop"""
+    indices = list(range(len(weights)))
+    weights = [w if w and w > 0 else 0 for w in weights]
+    selected = []
+    for _ in range(min(count, len(indices))):
+        total_weight = sum(weights)
+        if total_weight <= 0:
+            random_index = rng.randint(0, len(indices) - 1)
+        else:
+            rand_value = rng.uniform(0, total_weight)
+            cumulative_weight = 0
+            random_index = 0
+            for i, weight in enumerate(weights):
+                cumulative_weight += weight
+                if rand_value <= cumulative_weight:
+                    random_index = i
+                    break
+        selected.append(indices.pop(random_index))
+        weights.pop(random_index)
+    return selected
+
+
+def linear_scan_uniform_sample(size, count, rng):
+    """原有实现：每次等概率抽取一个下标后 pop"""
+    indices = list(range(size))
+    return [
+        indices.pop(rng.randint(0, len(indices) - 1)) for _ in range(min(count, size))
+    ]
+
+
+# ==================================================
+# 卡方齐性检验
+# ==================================================
+def chi_square_critical(df, z=3.090232):
+    """卡方分布上分位点（Wilson-Hilferty 近似），默认 z 对应显著性水平 0.001"""
+    factor = 2.0 / (9.0 * df)
+    return df * (1.0 - factor + z * math.sqrt(factor)) ** 3
+
+
+def assert_same_distribution(expected: Counter, actual: Counter):
+    """两组样本数量相同，检验其类别分布是否一致"""
+    assert sum(expected.values()) == sum(actual.values())
+    cells = set(expected) | set(actual)
+    assert len(cells) > 1
+    statistic = sum(
+        (expected[cell] - actual[cell]) ** 2 / (expected[cell] + actual[cell])
+        for cell in cells
+    )
+    critical = chi_square_critical(len(cells) - 1)
+    assert statistic < critical, (statistic, critical, expected, actual)
+
+
+def sample_counts(sampler, trials, seed, key=tuple):
+    rng = random.Random(seed)
+    return Counter(key(sampler(rng)) for _ in range(trials))
+
+
+# ==================================================
+# 加权抽样
+# ==================================================
+@pytest.mark.parametrize(
+    ("weights", "count"),
+    [
+        ([5, 1, 3, 0.5, 2], 3),
+        ([4, 0, 1, 0, 2.5, 0], 2),
+        ([2, 0, 1, 0], 4),  # k == n，权重为 0 的候选等概率排在最后
+        ([0, 0, 0, 0], 2),  # 全部为 0 时等概率抽取
+        ([3, 1, 1], 5),  # k > n
+    ],
+)
+def test_weighted_sample_matches_linear_scan(weights, count):
+    expected = sample_counts(
+        lambda rng: linear_scan_weighted_sample(weights, count, rng), TRIALS, 1
+    )
+    actual = sample_counts(
+        lambda rng: weighted_sample_indices(weights, count, rng), TRIALS, 2
+    )
+    assert_same_distribution(expected, actual)
+
+
+def test_weighted_sample_zero_weights_drawn_last():
+    weights = [2, 0, 1, 0, 3]
+    rng = random.Random(3)
+    for _ in range(1000):
+        selected = weighted_sample_indices(weights, len(weights), rng)
+        assert sorted(selected) == list(range(len(weights)))
+        assert set(selected[:3]) == {0, 2, 4}
+
+
+def test_weighted_sample_count_bounds():
+    rng = random.Random(4)
+    assert weighted_sample_indices([1, 2, 3], 0, rng) == []
+    assert weighted_sample_indices([], 3, rng) == []
+    assert sorted(weighted_sample_indices([1, 0, 3], 10, rng)) == [0, 1, 2]
+
+
+def large_pool_weights():
+    """NUMPY_MIN_POOL_SIZE 以上的候选：少量高权重、大量低权重及部分零权重"""
+    size = NUMPY_MIN_POOL_SIZE + 88
+    weights = []
+    for i in range(size):
+        if i % 100 == 0:
+            weights.append(40.0)
+        elif i % 7 == 0:
+            weights.append(0.0)
+        else:
+            weights.append(1.0 + (i % 3))
+    return weights
+
+
+def weight_class_key(weights):
+    """按权重分组统计前两个抽中的候选，保证每个类别有足够样本"""
+    return lambda selected: tuple(weights[i] for i in selected)
+
+
+def compare_large_pool(trials=4000):
+    weights = large_pool_weights()
+    key = weight_class_key(weights)
+    expected = sample_counts(
+        lambda rng: linear_scan_weighted_sample(weights, 2, rng), trials, 5, key
+    )
+    actual = sample_counts(
+        lambda rng: weighted_sample_indices(weights, 2, rng), trials, 6, key
+    )
+    assert_same_distribution(expected, actual)
+
+
+def test_numpy_path_matches_linear_scan(monkeypatch):
+    pytest.importorskip("numpy")
+    calls = []
+    numpy_sampler = weighted_sampler._weighted_sample_indices_numpy
+
+    def spy(*args):
+        calls.append(args)
+        return numpy_sampler(*args)
+
+    monkeypatch.setattr(weighted_sampler, "_weighted_sample_indices_numpy", spy)
+    compare_large_pool()
+    assert calls
+
+
+def test_fenwick_path_matches_linear_scan_for_large_pool(monkeypatch):
+    monkeypatch.setattr(weighted_sampler, "np", None)
+    compare_large_pool()
+
+
+def test_numpy_path_draws_every_index_when_count_exceeds_size():
+    pytest.importorskip("numpy")
+    weights = large_pool_weights()
+    selected = weighted_sample_indices(weights, len(weights) + 10, random.Random(7))
+    assert sorted(selected) == list(range(len(weights)))
+    positive = sum(1 for w in weights if w > 0)
+    assert all(weights[i] > 0 for i in selected[:positive])
+
+
+# ==================================================
+# 等概率抽样
+# ==================================================
+@pytest.mark.parametrize(("size", "count"), [(6, 2), (4, 4), (3, 5)])
+def test_uniform_sample_matches_linear_scan(size, count):
+    expected = sample_counts(
+        lambda rng: linear_scan_uniform_sample(size, count, rng), TRIALS, 8
+    )
+    actual = sample_counts(
+        lambda rng: uniform_sample_indices(size, count, rng), TRIALS, 9
+    )
+    assert_same_distribution(expected, actual)
+
+
+def test_uniform_sample_count_bounds():
+    rng = random.Random(10)
+    assert uniform_sample_indices(0, 3, rng) == []
+    assert uniform_sample_indices(5, 0, rng) == []
+    assert sorted(uniform_sample_indices(3, 10, rng)) == [0, 1, 2]